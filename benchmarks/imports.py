@@ -0,0 +1,68 @@
+import statistics
+import subprocess  # noqa S404
+import sys
+from typing import Dict, List
+
+# Statements timed in a fresh interpreter, after the import of the dependencies
+# so only the time spent in the library is measured
+STATEMENTS = {
+    "package": "import statsuite_lib",
+    "sfs": "from statsuite_lib import SFSClient",
+    "transfer": "from statsuite_lib import TransferClient",
+    "all": (
+        "from statsuite_lib import AuthClient, ConfigClient, NSIClient, SFSClient,"
+        " TransferClient"
+    ),
+}
+
+_TIMER = """
+import time
+import httpx, pydantic
+started = time.perf_counter()
+{statement}
+print(time.perf_counter() - started)
+"""
+
+
+def time_import(statement: str) -> float:
+    """Time an import statement in a fresh interpreter
+
+    Args:
+        statement: The import statement
+
+    Returns:
+        float: Duration (secs) of the statement
+    """
+    output = subprocess.run(  # noqa S603
+        [sys.executable, "-c", _TIMER.format(statement=statement)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output)
+
+
+def measure_imports(repeat: int) -> Dict[str, dict]:
+    """Time the imports of the library, like a short lived script would
+
+    Args:
+        repeat: Number of interpreters started for each statement
+
+    Returns:
+        dict: Durations (secs) of each statement, in the format of the
+        scenario results so they can be compared with a baseline
+    """
+    results = {}
+    for name, statement in STATEMENTS.items():
+        durations: List[float] = [time_import(statement) for _ in range(repeat)]
+        median = statistics.median(durations)
+        results[f"import:{name}"] = {
+            "size": 1,
+            "operations": 1,
+            "durations": durations,
+            "best": min(durations),
+            "median": median,
+            "throughput": 1 / median if median else 0.0,
+        }
+        print(f"import:{name:<10} median {median * 1000:8.1f}ms", file=sys.stderr)
+    return results
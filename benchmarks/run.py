@@ -0,0 +1,243 @@
+"""Run the benchmarks against the fake services and compare with a baseline
+
+Usage:
+    python -m benchmarks.run --output benchmarks/results/$(git describe).json
+    python -m benchmarks.run --compare benchmarks/results/v0.2.6.json --latency 0.005
+"""
+
+import argparse
+import dataclasses
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from statsuite_lib.transport import Instrumentation, RetryPolicy, create_client
+
+from .imports import measure_imports
+from .scenarios import SCENARIOS, Services, connect
+from .server import FakeStatSuite, ServerProfile
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def library_version() -> str:
+    """Installed version of the library
+
+    Returns:
+        str: The version, "unknown" when the library is not installed
+    """
+    try:
+        return metadata.version("statsuite_lib")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def run_scenario(services: Services, name: str, size: int, repeat: int) -> dict:
+    """Run a scenario ``repeat`` times from a fresh server state
+
+    Args:
+        services: The clients, see ``connect``
+        name: Name of the scenario
+        size: Size of the scenario
+        repeat: Number of runs
+
+    Returns:
+        dict: Durations (secs), operations and throughput of the scenario, the
+        unit of the operations depends on the scenario (files, rows, tokens...)
+    """
+    durations: List[float] = []
+    operations = 0
+    for _ in range(repeat):
+        services.server.reset()
+        started = time.perf_counter()
+        operations = SCENARIOS[name](services, size)
+        durations.append(time.perf_counter() - started)
+    median = statistics.median(durations)
+    return {
+        "size": size,
+        "operations": operations,
+        "durations": durations,
+        "best": min(durations),
+        "median": median,
+        "throughput": operations / median if median else 0.0,
+    }
+
+
+def request_summary(metrics: Instrumentation) -> Dict[str, dict]:
+    """Latency of the requests sent during the scenario
+
+    Args:
+        metrics: Measures of the pooled client
+
+    Returns:
+        dict: Count, errors, retries and latency percentiles of each endpoint
+    """
+    fields = ("count", "errors", "retries", "mean", "p50", "p95", "p99")
+    return {
+        endpoint: {field: stats[field] for field in fields}
+        for endpoint, stats in metrics.snapshot().items()
+    }
+
+
+def run(
+    profile: ServerProfile, names: List[str], size: int, repeat: int
+) -> Dict[str, dict]:
+    """Run the scenarios against a fake server
+
+    Args:
+        profile: Behaviour of the fake services
+        names: Scenarios to run
+        size: Size of each scenario
+        repeat: Number of runs of each scenario
+
+    Returns:
+        dict: Results of each scenario
+    """
+    metrics = Instrumentation()
+    http_client = create_client(
+        retry=RetryPolicy(backoff_factor=0.01, jitter=0), instrumentation=metrics
+    )
+    results = {}
+    with FakeStatSuite(profile) as server, http_client:
+        services = connect(server, http_client)
+        for name in names:
+            metrics.reset()
+            results[name] = run_scenario(services, name, size, repeat)
+            results[name]["requests"] = request_summary(metrics)
+            print(
+                f"{name:<10} median {results[name]['median']:8.3f}s "
+                f"{results[name]['throughput']:10.1f} ops/s",
+                file=sys.stderr,
+            )
+    return results
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> List[str]:
+    """Compare the median durations with a baseline
+
+    Args:
+        report: Report of the current run
+        baseline: Report of a previous run
+        threshold: Relative slowdown reported as a regression
+
+    Returns:
+        list: Scenarios slower than the baseline by more than the threshold
+    """
+    if baseline["profile"] != report["profile"]:
+        print("Warning: the baseline used another server profile", file=sys.stderr)
+    regressions = []
+    for name, result in report["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None or previous["size"] != result["size"]:
+            continue
+        if _is_regression(name, previous["median"], result["median"], threshold):
+            regressions.append(name)
+    return regressions
+
+
+def _is_regression(
+    name: str, previous: float, current: float, threshold: float
+) -> bool:
+    """Print the change of the median duration of a scenario
+
+    Args:
+        name: Name of the scenario
+        previous: Median duration (secs) of the baseline
+        current: Median duration (secs) of the current run
+        threshold: Relative slowdown reported as a regression
+
+    Returns:
+        bool: True if the scenario is slower than the baseline by more than the
+        threshold
+    """
+    ratio = current / previous if previous else 1.0
+    regressed = ratio > 1 + threshold
+    print(
+        f"{name:<10} {previous:8.3f}s -> {current:8.3f}s "
+        f"({ratio - 1:+.1%}){' REGRESSION' if regressed else ''}",
+        file=sys.stderr,
+    )
+    return regressed
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Read the command line
+
+    Args:
+        argv: Arguments, defaults to the process arguments
+
+    Returns:
+        argparse.Namespace: The options
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "scenarios", nargs="*", help=f"Scenarios to run: {', '.join(SCENARIOS)}"
+    )
+    parser.add_argument("--size", type=int, default=20, help="Operations per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per scenario")
+    parser.add_argument("--latency", type=float, default=0.0, help="Server latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of 503")
+    parser.add_argument("--rows", type=int, default=10_000, help="Rows per data query")
+    parser.add_argument("--rules", type=int, default=500, help="Rules on the server")
+    parser.add_argument("--output", type=Path, help="File the results are saved to")
+    parser.add_argument("--compare", type=Path, help="Results of a previous run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative slowdown failing the comparison",
+    )
+    parser.add_argument(
+        "--imports", action="store_true", help="Also time the library imports"
+    )
+    args = parser.parse_args(argv)
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks, save and compare their results
+
+    Args:
+        argv: Arguments, defaults to the process arguments
+
+    Returns:
+        int: Exit status, 1 if a scenario regressed
+    """
+    args = parse_args(argv)
+    profile = ServerProfile(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rows=args.rows,
+        rules=args.rules,
+    )
+    results = run(profile, args.scenarios or list(SCENARIOS), args.size, args.repeat)
+    if args.imports:
+        results.update(measure_imports(max(args.repeat, 5)))
+    report = {
+        "version": library_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "profile": dataclasses.asdict(profile),
+        "results": results,
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        return 1 if compare(report, baseline, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+import io
+from typing import Callable, Dict, NamedTuple
+
+import httpx
+
+from statsuite_lib import (
+    AuthClient,
+    ConfigClient,
+    KeycloakClient,
+    NSIClient,
+    SFSClient,
+    TransferClient,
+)
+from statsuite_lib.polling import PollingSchedule
+
+from .server import (
+    AUTH_ROOT,
+    CONFIG_PATH,
+    NSI_PATH,
+    SFS_PATH,
+    TRANSFER_ROOT,
+    FakeStatSuite,
+)
+
+# Polling fast enough for the status checks to dominate, not the sleeps
+FAST_SCHEDULE = dict(initial_delay=0.01, fast_attempts=10, max_delay=0.05, jitter=0)
+
+
+class Services(NamedTuple):
+    """Clients of the fake services
+
+    Attributes:
+        server: The fake services
+        http_client: Pooled client shared by the clients
+        keycloak: Authentication client
+        transfer: Client of the transfer service
+        nsi: Client of the NSI service
+        auth: Client of the authorization service
+        sfs: Client of the search service
+        config: Client of the configuration service
+    """
+
+    server: FakeStatSuite
+    http_client: httpx.Client
+    keycloak: KeycloakClient
+    transfer: TransferClient
+    nsi: NSIClient
+    auth: AuthClient
+    sfs: SFSClient
+    config: ConfigClient
+
+
+def connect(server: FakeStatSuite, http_client: httpx.Client) -> Services:
+    """Build the clients of the fake services
+
+    Args:
+        server: The running fake services
+        http_client: Pooled client shared by the clients
+
+    Returns:
+        Services: The clients
+    """
+    keycloak = KeycloakClient(server.openid_url, "bench", "bench", http_client)
+    return Services(
+        server=server,
+        http_client=http_client,
+        keycloak=keycloak,
+        transfer=TransferClient(
+            server.url + TRANSFER_ROOT, keycloak, http_client=http_client
+        ),
+        nsi=NSIClient(server.url + NSI_PATH, keycloak, http_client=http_client),
+        auth=AuthClient(server.url + AUTH_ROOT, keycloak, http_client=http_client),
+        sfs=SFSClient(server.url + SFS_PATH, "bench", http_client=http_client),
+        config=ConfigClient(server.url + CONFIG_PATH, http_client=http_client),
+    )
+
+
+def token(services: Services, size: int) -> int:
+    """Renew the access token ``size`` times with the refresh token grant
+
+    Args:
+        services: The clients
+        size: Number of renewals
+
+    Returns:
+        int: Number of tokens granted
+    """
+    keycloak = KeycloakClient(
+        services.server.openid_url,
+        "bench",
+        "bench",
+        services.http_client,
+        refresh_skew=services.server.profile.token_lifetime + 1,
+    )
+    for _ in range(size):
+        keycloak.auth_header()
+    return size + 1
+
+
+def import_files(services: Services, size: int) -> int:
+    """Import ``size`` SDMX-CSV files and wait for their requests
+
+    Args:
+        services: The clients
+        size: Number of files
+
+    Returns:
+        int: Number of files imported
+
+    Raises:
+        RuntimeError: If an import does not complete
+    """
+    jobs = [(services.server.csv, "design") for _ in range(size)]
+    results = list(services.transfer.import_sdmx_files(jobs, backoff=0.05))
+    failed = [result for result in results if not result.is_completed]
+    if failed:
+        raise RuntimeError(f"{len(failed)} imports failed: {failed[0].error}")
+    return size
+
+
+def poll(services: Services, size: int) -> int:
+    """Wait for ``size`` transfer requests on a single polling loop
+
+    Args:
+        services: The clients
+        size: Number of requests
+
+    Returns:
+        int: Number of requests completed
+
+    Raises:
+        RuntimeError: If a request times out
+    """
+    ids = [services.server.state.new_request() for _ in range(size)]
+    schedule = PollingSchedule(timeout=60, **FAST_SCHEDULE)
+    results = list(
+        services.transfer.wait_for_requests("design", ids, schedule=schedule)
+    )
+    if any(result.timed_out for result in results):
+        raise RuntimeError("Polling timed out")
+    return size
+
+
+def export(services: Services, size: int) -> int:
+    """Export ``size`` partitions of a dataflow merged into a single CSV
+
+    Args:
+        services: The clients
+        size: Number of partitions
+
+    Returns:
+        int: Number of rows exported
+    """
+    paths = [f"/data/BENCH,DF,1.0/A{partition}" for partition in range(size)]
+    output = io.BytesIO()
+    services.nsi.export(paths, output)
+    return output.getvalue().count(b"\n") - 1
+
+
+def sync_rules(services: Services, size: int) -> int:
+    """Sync the rules of a user, adding ``size`` rules and deleting the others
+
+    Args:
+        services: The clients
+        size: Number of rules added
+
+    Returns:
+        int: Number of rules added or deleted
+    """
+    desired = [
+        {"userMask": "user0", "artefactId": f"NEW_{rule}", "permission": 3}
+        for rule in range(size)
+    ]
+    changes = services.auth.sync_rules(desired)
+    return len(changes.added) + len(changes.deleted)
+
+
+def tenants(services: Services, size: int) -> int:
+    """Download the tenants configuration ``size`` times, bypassing the cache
+
+    Args:
+        services: The clients
+        size: Number of downloads
+
+    Returns:
+        int: Number of downloads
+    """
+    for _ in range(size):
+        services.config.invalidate()
+        services.config.get_tenants()
+    return size
+
+
+def reindex(services: Services, size: int) -> int:
+    """Start ``size`` loadings of the search service and read their logs
+
+    Args:
+        services: The clients
+        size: Number of loadings
+
+    Returns:
+        int: Number of loadings
+    """
+    for _ in range(size):
+        loading_id = services.sfs.index()
+        services.sfs.get_log("default", loading_id)
+    return size
+
+
+SCENARIOS: Dict[str, Callable[[Services, int], int]] = {
+    "token": token,
+    "import": import_files,
+    "poll": poll,
+    "export": export,
+    "rules": sync_rules,
+    "config": tenants,
+    "reindex": reindex,
+}
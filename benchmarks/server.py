@@ -0,0 +1,526 @@
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+REALM = "/auth/realms/benchmark"
+OPENID_PATH = f"{REALM}/.well-known/openid-configuration"
+TRANSFER_ROOT = "/transfer"
+TRANSFER_PATH = f"{TRANSFER_ROOT}/3"
+AUTH_ROOT = "/authz"
+AUTH_PATH = f"{AUTH_ROOT}/1.1"
+NSI_PATH = "/nsi/rest"
+SFS_PATH = "/sfs"
+CONFIG_PATH = "/config"
+
+CSV_HEADER = "DATAFLOW,REF_AREA,TIME_PERIOD,OBS_VALUE\r\n"
+
+Route = Tuple[str, "re.Pattern[str]", Callable[["_Handler", re.Match], None]]
+
+
+@dataclass
+class ServerProfile:
+    """Behaviour of the fake services
+
+    Attributes:
+        latency: Time (secs) waited before answering each request
+        error_rate: Share of the requests answered with a 503, the token and
+            OpenID endpoints excepted
+        rows: Rows of the SDMX-CSV answered by the data queries
+        rules: Authorization rules defined when the server starts
+        token_lifetime: Lifetime (secs) of the access tokens
+        pending_checks: Status checks answering "InProgress" before a request
+            is "Completed"
+        seed: Seed of the error injection, so runs are reproducible
+    """
+
+    latency: float = 0.0
+    error_rate: float = 0.0
+    rows: int = 10_000
+    rules: int = 500
+    token_lifetime: int = 300
+    pending_checks: int = 1
+    seed: int = 0
+
+
+class _State:
+    """Data held by the fake services, shared by the request threads"""
+
+    def __init__(self, profile: ServerProfile) -> None:
+        """Inits the state
+
+        Args:
+            profile: Behaviour of the fake services
+        """
+        self.lock = threading.Lock()
+        self.random = random.Random(profile.seed)  # noqa: S311
+        self.next_id = 1
+        self.requests: List[str] = []
+        self.status_checks: Dict[str, int] = {}
+        self.rules = {
+            rule_id: _rule(rule_id, f"user{rule_id % 50}")
+            for rule_id in range(1, profile.rules + 1)
+        }
+        self.next_rule = profile.rules + 1
+        self.loadings: List[dict] = []
+
+    def new_id(self) -> int:
+        """Allocate a request or loading id
+
+        Returns:
+            int: The new id
+        """
+        with self.lock:
+            self.next_id += 1
+            return self.next_id
+
+    def new_request(self) -> int:
+        """Allocate the id of a transfer request
+
+        Returns:
+            int: The new id
+        """
+        request_id = self.new_id()
+        with self.lock:
+            self.requests.append(str(request_id))
+        return request_id
+
+    def check(self, request_id: str, pending_checks: int) -> str:
+        """Status of a transfer request, completed after some checks
+
+        Args:
+            request_id: Id of the request
+            pending_checks: Checks answering "InProgress"
+
+        Returns:
+            str: The execution status
+        """
+        with self.lock:
+            checks = self.status_checks.get(request_id, 0) + 1
+            self.status_checks[request_id] = checks
+        return "Completed" if checks > pending_checks else "InProgress"
+
+    def is_injected_error(self, error_rate: float) -> bool:
+        """Draw whether a request gets an injected error
+
+        Args:
+            error_rate: Share of failed requests
+
+        Returns:
+            bool: True to answer a 503
+        """
+        with self.lock:
+            return self.random.random() < error_rate
+
+
+def _rule(rule_id: int, user_mask: str) -> dict:
+    """Authorization rule as answered by the Auth API
+
+    Args:
+        rule_id: Id of the rule
+        user_mask: User of the rule
+
+    Returns:
+        dict: The rule
+    """
+    return {
+        "id": rule_id,
+        "userMask": user_mask,
+        "isGroup": False,
+        "dataSpace": "design",
+        "artefactType": 0,
+        "artefactAgencyId": "*",
+        "artefactId": f"DF_{rule_id}",
+        "artefactVersion": "*",
+        "permission": 3,
+    }
+
+
+def sample_csv(rows: int) -> bytes:
+    """SDMX-CSV answer of a data query
+
+    Args:
+        rows: Number of observations
+
+    Returns:
+        bytes: The CSV, with its header row
+    """
+    lines = (
+        f"BENCH:DF(1.0),A{row % 97},{2000 + row % 24},{row}\r\n" for row in range(rows)
+    )
+    return (CSV_HEADER + "".join(lines)).encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answer the requests of the statsuite clients
+
+    Attributes:
+        protocol_version: Keep the connections alive, like the real services
+        disable_nagle_algorithm: Send small answers without delay
+        server: The fake services
+        body: Body of the current request
+        form: Fields of the current request, if it is an url encoded form
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "FakeStatSuite"
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Answer a GET"""
+        self._dispatch()
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Answer a POST"""
+        self._dispatch()
+
+    def do_DELETE(self) -> None:  # noqa: N802
+        """Answer a DELETE"""
+        self._dispatch()
+
+    def log_message(self, format: str, *args) -> None:  # noqa: VNE003
+        """Silence the access log
+
+        Args:
+            format: Format of the message
+            args: Values of the message
+        """
+
+    def _dispatch(self) -> None:
+        """Route the request after the configured latency and error injection"""
+        path = urlsplit(self.path).path
+        self.body = self._read_body()
+        self.form = self._parse_form()
+        profile = self.server.profile
+        if profile.latency:
+            time.sleep(profile.latency)
+        if not path.startswith(REALM) and self.server.state.is_injected_error(
+            profile.error_rate
+        ):
+            self._send_json({"message": "Injected error"}, 503)
+            return
+        for method, pattern, answer in self.server.routes:
+            match = pattern.fullmatch(path)
+            if method == self.command and match:
+                answer(self, match)
+                return
+        self._send_json({"message": f"No route for {self.command} {path}"}, 404)
+
+    def _read_body(self) -> bytes:
+        """Read the request body
+
+        Returns:
+            bytes: The body, empty if the request has none
+        """
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            return b"".join(iter(self._read_chunk, b""))
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _read_chunk(self) -> bytes:
+        """Read a chunk of a chunked body
+
+        Returns:
+            bytes: The chunk, empty for the last one
+        """
+        size = int(self.rfile.readline().split(b";")[0], 16)
+        chunk = self.rfile.read(size)
+        self.rfile.readline()
+        return chunk
+
+    def _parse_form(self) -> Dict[str, str]:
+        """Parse an url encoded form
+
+        Returns:
+            dict: Fields of the form, empty for other bodies
+        """
+        if not self.headers.get("Content-Type", "").startswith("application/x-www"):
+            return {}
+        return {key: values[0] for key, values in parse_qs(self.body.decode()).items()}
+
+    def _send(self, body: bytes, content_type: str, status: int = 200) -> None:
+        """Send an answer
+
+        Args:
+            body: The body
+            content_type: Its media type
+            status: HTTP status
+        """
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, data, status: int = 200) -> None:
+        """Send a JSON answer
+
+        Args:
+            data: The document
+            status: HTTP status
+        """
+        self._send(json.dumps(data).encode(), "application/json", status)
+
+    def openid_configuration(self, match: re.Match) -> None:
+        """Answer the OpenID discovery document
+
+        Args:
+            match: The matched path
+        """
+        base = f"{self.server.url}{REALM}/protocol/openid-connect"
+        self._send_json(
+            {
+                "authorization_endpoint": f"{base}/auth",
+                "token_endpoint": f"{base}/token",
+            }
+        )
+
+    def token(self, match: re.Match) -> None:
+        """Grant an access token
+
+        Args:
+            match: The matched path
+        """
+        token_id = self.server.state.new_id()
+        self._send_json(
+            {
+                "access_token": f"access-{token_id}",
+                "expires_in": self.server.profile.token_lifetime,
+                "refresh_token": f"refresh-{token_id}",
+                "refresh_expires_in": 1800,
+            }
+        )
+
+    def import_file(self, match: re.Match) -> None:
+        """Accept an import
+
+        Args:
+            match: The matched path
+        """
+        request_id = self.server.state.new_request()
+        self._send_json({"message": f"Import request with ID {request_id} accepted"})
+
+    def transfer(self, match: re.Match) -> None:
+        """Accept a transfer
+
+        Args:
+            match: The matched path
+        """
+        request_id = self.server.state.new_request()
+        self._send_json({"message": f"Transfer request {request_id} accepted"})
+
+    def request_status(self, match: re.Match) -> None:
+        """Answer the status of a request
+
+        Args:
+            match: The matched path
+        """
+        request_id = self.form.get("id", "")
+        status = self.server.state.check(request_id, self.server.profile.pending_checks)
+        self._send_json({"requestId": request_id, "executionStatus": status})
+
+    def requests_status(self, match: re.Match) -> None:
+        """Answer the status of every known request
+
+        Args:
+            match: The matched path
+        """
+        state = self.server.state
+        with state.lock:
+            request_ids = list(state.requests)
+        pending = self.server.profile.pending_checks
+        self._send_json(
+            [
+                {
+                    "requestId": request_id,
+                    "executionStatus": state.check(request_id, pending),
+                }
+                for request_id in request_ids
+            ]
+        )
+
+    def data(self, match: re.Match) -> None:
+        """Answer a data query
+
+        Args:
+            match: The matched path
+        """
+        self._send(self.server.csv, "application/vnd.sdmx.data+csv")
+
+    def get_rules(self, match: re.Match) -> None:
+        """List the authorization rules
+
+        Args:
+            match: The matched path
+        """
+        with self.server.state.lock:
+            rules = list(self.server.state.rules.values())
+        self._send_json({"payload": rules})
+
+    def add_rule(self, match: re.Match) -> None:
+        """Create an authorization rule
+
+        Args:
+            match: The matched path
+        """
+        rule = json.loads(self.body)
+        state = self.server.state
+        with state.lock:
+            rule_id = state.next_rule
+            state.next_rule += 1
+            state.rules[rule_id] = {**rule, "id": rule_id}
+        self._send_json({"id": rule_id})
+
+    def delete_rule(self, match: re.Match) -> None:
+        """Delete an authorization rule
+
+        Args:
+            match: The matched path
+        """
+        with self.server.state.lock:
+            self.server.state.rules.pop(int(match["id"]), None)
+        self._send_json({"status": "success", "message": "Rule deleted"})
+
+    def tenants(self, match: re.Match) -> None:
+        """Answer the tenants configuration
+
+        Args:
+            match: The matched path
+        """
+        spaces = {
+            name: {"label": name, "url": f"{self.server.url}/{name}"}
+            for name in ("design", "staging", "release")
+        }
+        self._send_json({"default": {"id": "default", "spaces": spaces}})
+
+    def index(self, match: re.Match) -> None:
+        """Start a loading of the search service
+
+        Args:
+            match: The matched path
+        """
+        loading_id = self.server.state.new_id()
+        loading = {
+            "id": loading_id,
+            "executionStart": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "executionStatus": "completed",
+        }
+        with self.server.state.lock:
+            self.server.state.loadings.append(loading)
+        self._send_json({"loadingId": loading_id})
+
+    def logs(self, match: re.Match) -> None:
+        """Answer the loading logs
+
+        Args:
+            match: The matched path
+        """
+        query = parse_qs(urlsplit(self.path).query)
+        with self.server.state.lock:
+            loadings = list(self.server.state.loadings)
+        if "id" not in query:
+            self._send_json(loadings)
+            return
+        found = [
+            loading for loading in loadings if str(loading["id"]) == query["id"][0]
+        ]
+        self._send_json(
+            found[0] if found else {"message": "Not found"}, 200 if found else 404
+        )
+
+
+ROUTES: List[Route] = [
+    (method, re.compile(pattern), answer)
+    for method, pattern, answer in [
+        ("GET", OPENID_PATH, _Handler.openid_configuration),
+        ("POST", f"{REALM}/protocol/openid-connect/token", _Handler.token),
+        ("POST", f"{TRANSFER_PATH}/import/sdmxFile", _Handler.import_file),
+        ("POST", f"{TRANSFER_PATH}/transfer/dataflow", _Handler.transfer),
+        ("POST", f"{TRANSFER_PATH}/status/request", _Handler.request_status),
+        ("POST", f"{TRANSFER_PATH}/status/requests", _Handler.requests_status),
+        ("GET", f"{NSI_PATH}/data/.*", _Handler.data),
+        ("GET", f"{AUTH_PATH}/AuthorizationRules", _Handler.get_rules),
+        ("POST", f"{AUTH_PATH}/AuthorizationRules", _Handler.add_rule),
+        (
+            "DELETE",
+            f"{AUTH_PATH}/AuthorizationRules/(?P<id>\\d+)",
+            _Handler.delete_rule,
+        ),
+        ("GET", f"{CONFIG_PATH}/configs/tenants.json", _Handler.tenants),
+        ("POST", f"{SFS_PATH}/admin/dataflows", _Handler.index),
+        ("GET", f"{SFS_PATH}/admin/logs", _Handler.logs),
+    ]
+]
+
+
+class FakeStatSuite(ThreadingHTTPServer):
+    """Local stand-in for the Keycloak, Transfer, NSI, Auth, SFS and Config
+    services, answering just enough of their APIs for the benchmarks
+
+    Attributes:
+        profile: Behaviour of the fake services
+        state: Data held by the services
+        routes: Method, path pattern and answer of each endpoint
+        csv: Answer of the data queries
+        url: Base url of the server
+        daemon_threads: Do not wait for the request threads on exit
+        openid_url: Url of the OpenID discovery document
+
+    Example:
+        with FakeStatSuite(ServerProfile(latency=0.005)) as server:
+            keycloak = KeycloakClient(server.openid_url, "user", "password")
+    """
+
+    daemon_threads = True
+
+    def __init__(self, profile: Optional[ServerProfile] = None, port: int = 0) -> None:
+        """Inits the server, listening on localhost
+
+        Args:
+            profile: Behaviour of the fake services, defaults to ServerProfile()
+            port: Port to listen to, 0 for a free one
+        """
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.profile = profile or ServerProfile()
+        self.state = _State(self.profile)
+        self.routes = ROUTES
+        self.csv = sample_csv(self.profile.rows)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self._thread: Optional[threading.Thread] = None
+
+    def reset(self) -> None:
+        """Restore the data of the services, between two benchmark runs"""
+        self.state = _State(self.profile)
+
+    def __enter__(self) -> "FakeStatSuite":
+        """Serve in a background thread
+
+        Returns:
+            FakeStatSuite: The running server
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop serving
+
+        Args:
+            exc_info: Exception raised in the block, if any
+        """
+        self.shutdown()
+        self.server_close()
+
+    @property
+    def openid_url(self) -> str:
+        """Url of the OpenID discovery document
+
+        Returns:
+            str: The url
+        """
+        return self.url + OPENID_PATH
@@ -1,6 +1,63 @@
-from .auth import AuthClient
-from .config import ConfigClient
-from .keycloak import KeycloakClient
-from .nsi import NSIClient
-from .sfs import SFSClient
-from .transfer import TransferClient
+"""Clients of the .Stat Suite services
+
+The clients are imported on first access (PEP 562), so a script using only
+``SFSClient`` does not pay for the import of the other clients and models.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+# Module of each public client, relative to this package
+_CLIENTS = {
+    "AsyncAuthClient": ".auth",
+    "AuthClient": ".auth",
+    "AsyncConfigClient": ".config",
+    "ConfigClient": ".config",
+    "AsyncKeycloakClient": ".keycloak",
+    "KeycloakClient": ".keycloak",
+    "AsyncNSIClient": ".nsi",
+    "NSIClient": ".nsi",
+    "AsyncSFSClient": ".sfs",
+    "SFSClient": ".sfs",
+    "AsyncTransferClient": ".transfer",
+    "TransferClient": ".transfer",
+}
+
+__all__ = list(_CLIENTS)
+
+if TYPE_CHECKING:
+    from .auth import AsyncAuthClient, AuthClient
+    from .config import AsyncConfigClient, ConfigClient
+    from .keycloak import AsyncKeycloakClient, KeycloakClient
+    from .nsi import AsyncNSIClient, NSIClient
+    from .sfs import AsyncSFSClient, SFSClient
+    from .transfer import AsyncTransferClient, TransferClient
+
+
+def __getattr__(name: str):
+    """Import a client on first access
+
+    Args:
+        name: Name of the attribute
+
+    Returns:
+        The client class, cached in the package namespace
+
+    Raises:
+        AttributeError: If the package has no such attribute
+    """
+    module = _CLIENTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    client = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = client
+    return client
+
+
+def __dir__():
+    """List the attributes, including the clients not imported yet
+
+    Returns:
+        list: The attribute names
+    """
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,25 @@
+import importlib
+from types import ModuleType
+
+
+def import_optional(module: str, package: str, extra: str) -> ModuleType:
+    """Import a module of an optional dependency
+
+    Args:
+        module: Name of the module, such as ``prometheus_client``
+        package: Name of the package providing it on PyPI
+        extra: Extra of statsuite-lib installing the package
+
+    Returns:
+        ModuleType: The module
+
+    Raises:
+        ImportError: If the package is not installed, naming the extra
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"{package} is required, install it with "
+            f"pip install 'statsuite-lib[{extra}]'"
+        ) from e
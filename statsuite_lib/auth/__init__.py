@@ -1 +1,3 @@
-from .auth import AuthClient
+from .auth import AsyncAuthClient, AuthClient
+from .index import RulesIndex
+from .models import AuthorizationRule, RulesSync
@@ -1,8 +1,96 @@
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Iterable, List, Optional, Tuple, Union
 
 import httpx
 
-from ..keycloak.keycloak import KeycloakClient
+from ..keycloak.keycloak import AsyncKeycloakClient, KeycloakClient
+from ..transport import create_async_client, get_default_client
+from .index import RulesIndex
+from .models import AuthorizationRule, RulesSync
+
+RuleSpec = Union[AuthorizationRule, dict]
+
+# First error of the Auth API answers tolerated by the add and delete calls
+DUPLICATE_RULE = "Cannot insert duplicate key"
+MISSING_RULE = "Rule not found"
+
+
+def _to_rule(spec: RuleSpec) -> AuthorizationRule:
+    """Normalize a rule given as a dict
+
+    Args:
+        spec: The rule, or a dict with its Auth API fields
+
+    Returns:
+        AuthorizationRule: The rule
+    """
+    if isinstance(spec, AuthorizationRule):
+        return spec
+    return AuthorizationRule.model_validate(spec)
+
+
+def _parse_rules(response: httpx.Response) -> List[AuthorizationRule]:
+    """Parse the list of rules returned by the Auth API
+
+    Args:
+        response: Response of GET AuthorizationRules
+
+    Returns:
+        list: The rules, unwrapped from the ``payload`` envelope if present
+    """
+    response.raise_for_status()
+    body = response.json()
+    if isinstance(body, dict):
+        body = body.get("payload") or []
+    return [AuthorizationRule.model_validate(rule) for rule in body]
+
+
+def _plan_sync(
+    existing: List[AuthorizationRule], desired: Iterable[RuleSpec]
+) -> Tuple[List[AuthorizationRule], List[AuthorizationRule], int]:
+    """Compute the changes turning the existing rules into the desired ones
+
+    Only the existing rules of the user masks present in ``desired`` are
+    candidates for deletion, the rules of other users are left untouched.
+
+    Args:
+        existing: Rules currently defined
+        desired: Rules that should be defined
+
+    Returns:
+        tuple: Rules to add, rules to delete and number of rules already present
+    """
+    wanted = {rule.key(): rule for rule in map(_to_rule, desired)}
+    masks = {rule.userMask for rule in wanted.values()}
+    present = {rule.key() for rule in existing}
+    to_add = [rule for key, rule in wanted.items() if key not in present]
+    to_delete = [
+        rule for rule in existing if rule.userMask in masks and rule.key() not in wanted
+    ]
+    return to_add, to_delete, len(wanted) - len(to_add)
+
+
+def _raise_for_status(
+    response: httpx.Response, tolerated: str, message: str, log: logging.Logger
+) -> None:
+    """Raise for an error response of the Auth API, unless the error is tolerated
+
+    Args:
+        response: The HTTP response to check for errors
+        tolerated: Start of the first error of the tolerated error responses
+        message: Logged when the error is tolerated
+        log: Logger of the client
+    """
+    if response.status_code < 400:
+        return
+    errors = response.json().get("payload", {}).get("errors", [])
+    if errors and errors[0].startswith(tolerated):
+        log.info(message)
+    else:
+        response.raise_for_status()
 
 
 class AuthClient:
@@ -18,15 +106,20 @@ class AuthClient:
         auth_url (str): Base URL of the authorization service.
         keycloak_client (KeycloakClient): Client for handling Keycloak authentication.
         api_version (str, optional): API version to use. Defaults to "1.1".
+        http_client (httpx.Client, optional): Pooled client used for the requests.
     """
 
     def __init__(
-        self, auth_url: str, keycloak_client: KeycloakClient, api_version: str = "1.1"
+        self,
+        auth_url: str,
+        keycloak_client: KeycloakClient,
+        api_version: str = "1.1",
+        http_client: Optional[httpx.Client] = None,
     ) -> None:
         """Initialize the AuthClient.
 
         Creates a new instance of the AuthClient with the specified configuration.
-        Sets up an HTTP client and configures logging.
+        Uses the given HTTP client, or the shared pooled one, and configures logging.
 
         Args:
             auth_url (str): Base URL of the authorization service endpoint.
@@ -35,6 +128,8 @@ class AuthClient:
                 used for authentication headers.
             api_version (str, optional): API version string to use in URL construction.
                 Defaults to "1.1".
+            http_client (httpx.Client, optional): Pooled client used for the requests.
+                Defaults to the process wide client from ``statsuite_lib.transport``.
 
         Example:
             keycloak_client = KeycloakClient(...)
@@ -44,7 +139,7 @@ class AuthClient:
             )
         """
 
-        self._client = httpx.Client()
+        self._client = http_client or get_default_client()
         self.AUTH_URL = f"{auth_url}/{api_version}"
         self._keycloak_client = keycloak_client
         self._log = logging.getLogger("AuthClient")
@@ -88,36 +183,54 @@ class AuthClient:
             "permission": permission,
         }
 
-        url = f"{self.AUTH_URL}/AuthorizationRules"
-        headers = self._keycloak_client.auth_header()
-        headers["Content-Type"] = "application/json"
+        return self._post_rule(data)
 
-        # Add debugging to help identify the 400 Bad Request issue
+    def _post_rule(self, data: dict) -> dict:
+        """Create a rule.
 
-        response = httpx.post(url=url, headers=headers, json=data)
+        Args:
+            data (dict): The rule fields.
 
-        # Handle error responses
+        Returns:
+            dict: The JSON response from the server.
+        """
+        headers = self._keycloak_client.auth_header()
+        headers["Content-Type"] = "application/json"
+        response = self._client.post(
+            url=f"{self.AUTH_URL}/AuthorizationRules", headers=headers, json=data
+        )
         self._handle_error_response(response)
-
         return response.json()
 
+    def add_rules(self, rules: Iterable[RuleSpec], max_workers: int = 8) -> List[dict]:
+        """Add many authorization rules concurrently.
+
+        Args:
+            rules (Iterable): Rules to create, as AuthorizationRule or dicts with
+                the Auth API fields.
+            max_workers (int, optional): Max concurrent requests. Defaults to 8.
+
+        Returns:
+            list: The JSON response of each rule, in the given order.
+        """
+        data = [_to_rule(rule).to_request() for rule in rules]
+        if not data:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(data))) as pool:
+            return list(pool.map(self._post_rule, data))
+
     def _handle_error_response(self, response: httpx.Response) -> None:
         """Handle error responses from the auth API.
 
         Args:
             response: The HTTP response to check for errors.
         """
-        if response.status_code < 400:
-            return
-
-        resp = response.json()
-        payload = resp.get("payload", {})
-        errors = payload.get("errors", [])
-
-        if errors and errors[0].startswith("Cannot insert duplicate key"):
-            print("Permission already exists")
-        else:
-            response.raise_for_status()
+        _raise_for_status(
+            response,
+            DUPLICATE_RULE,
+            "Permission already exists",
+            self._log,
+        )
 
     def _handle_delete_error_response(self, response: httpx.Response) -> None:
         """Handle error responses from delete operations.
@@ -125,17 +238,7 @@ class AuthClient:
         Args:
             response: The HTTP response to check for errors.
         """
-        if response.status_code < 400:
-            return
-
-        resp = response.json()
-        payload = resp.get("payload", {})
-        errors = payload.get("errors", [])
-
-        if errors and errors[0].startswith("Rule not found"):
-            print("Rule not found")
-        else:
-            response.raise_for_status()
+        _raise_for_status(response, MISSING_RULE, MISSING_RULE, self._log)
 
     def delete_rule(self, rule_id: str):
         """Delete an authorization rule by its ID.
@@ -149,15 +252,309 @@ class AuthClient:
 
         """
         url = f"{self.AUTH_URL}/AuthorizationRules/{rule_id}"
-        headers = self._keycloak_client.auth_header()
+        self._log.debug(f"Deleting rule at: {url}")
+        response = self._client.delete(
+            url=url, headers=self._keycloak_client.auth_header()
+        )
+        self._handle_delete_error_response(response)
+        return response.json()
 
-        # Add debugging to help identify any issues
-        print(f"Deleting rule at: {url}")
-        print(f"Headers: {headers}")
+    def delete_rules(
+        self, rule_ids: Iterable[Union[int, str]], max_workers: int = 8
+    ) -> List[dict]:
+        """Delete many authorization rules concurrently.
 
-        response = httpx.delete(url=url, headers=headers)
+        Args:
+            rule_ids (Iterable): Ids of the rules to delete.
+            max_workers (int, optional): Max concurrent requests. Defaults to 8.
 
-        # Handle error responses
-        self._handle_delete_error_response(response)
+        Returns:
+            list: The JSON response of each deletion, in the given order.
+        """
+        rule_ids = list(rule_ids)
+        if not rule_ids:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(rule_ids))) as pool:
+            return list(pool.map(self.delete_rule, rule_ids))
+
+    def get_rules(self) -> List[AuthorizationRule]:
+        """Fetch every authorization rule.
+
+        Returns:
+            list: The rules defined in the Auth API.
+        """
+        response = self._client.get(
+            url=f"{self.AUTH_URL}/AuthorizationRules",
+            headers=self._keycloak_client.auth_header(),
+        )
+        return _parse_rules(response)
+
+    def get_rules_index(self, refresh_interval: Optional[float] = None) -> RulesIndex:
+        """Fetch every authorization rule into an in-memory index.
+
+        The index answers permission checks locally, without calling the Auth
+        API, and can refresh itself in the background, only updating the rules
+        that changed.
+
+        Args:
+            refresh_interval (float, optional): Seconds between two refreshes of
+                the index. Defaults to None, no automatic refresh.
+
+        Returns:
+            RulesIndex: The index of the rules.
+
+        Example:
+            index = auth_client.get_rules_index(refresh_interval=60)
+            index.has_permission("jane", permission=2, dataspace="design",
+                                 agency_id="OECD", artefact_id="DF_GDP")
+        """
+        index = RulesIndex(self.get_rules(), fetch=self.get_rules)
+        if refresh_interval:
+            index.start_refresh(refresh_interval)
+        return index
+
+    def sync_rules(
+        self, desired: Iterable[RuleSpec], max_workers: int = 8
+    ) -> RulesSync:
+        """Make the rules of some users match a desired set.
+
+        The existing rules are fetched once and compared in memory, only the
+        missing rules are created and only the rules of the user masks present
+        in ``desired`` that are not desired anymore are deleted.
+
+        Args:
+            desired (Iterable): Rules that should be defined, as
+                AuthorizationRule or dicts with the Auth API fields.
+            max_workers (int, optional): Max concurrent requests. Defaults to 8.
+
+        Returns:
+            RulesSync: The rules added and deleted.
+
+        Example:
+            auth_client.sync_rules([
+                {"userMask": "tenant-admins", "isGroup": True, "permission": 2047},
+                {"userMask": "analyst", "dataSpace": "design", "permission": 3},
+            ])
+        """
+        to_add, to_delete, unchanged = _plan_sync(self.get_rules(), desired)
+        self._log.info(
+            f"Syncing rules: {len(to_add)} to add, {len(to_delete)} to delete"
+        )
+        self.add_rules(to_add, max_workers=max_workers)
+        self.delete_rules([rule.id for rule in to_delete], max_workers=max_workers)
+        return RulesSync(added=to_add, deleted=to_delete, unchanged=unchanged)
+
+
+class AsyncAuthClient:
+    """Async counterpart of AuthClient, built on ``httpx.AsyncClient``.
+
+    Args:
+        auth_url (str): Base URL of the authorization service.
+        keycloak_client (AsyncKeycloakClient): Client for handling Keycloak authentication.
+        api_version (str, optional): API version to use. Defaults to "1.1".
+        http_client (httpx.AsyncClient, optional): Pooled client used for the requests.
+    """
+
+    def __init__(
+        self,
+        auth_url: str,
+        keycloak_client: AsyncKeycloakClient,
+        api_version: str = "1.1",
+        http_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        """Initialize the AsyncAuthClient.
+
+        Args:
+            auth_url (str): Base URL of the authorization service endpoint.
+                Should not include the version number.
+            keycloak_client (AsyncKeycloakClient): Keycloak client instance used
+                for authentication headers.
+            api_version (str, optional): API version string to use in URL construction.
+                Defaults to "1.1".
+            http_client (httpx.AsyncClient, optional): Pooled client used for the
+                requests. Defaults to a new client owned by this instance.
+        """
+
+        self._client = http_client or create_async_client()
+        self.AUTH_URL = f"{auth_url}/{api_version}"
+        self._keycloak_client = keycloak_client
+        self._log = logging.getLogger("AuthClient")
+
+    async def add_rule(
+        self,
+        user_mask: str,
+        is_group: bool,
+        permission: int,
+        dataspace: str = "*",
+        artifact_type: int = 0,
+        artefact_agency_id: str = "*",
+        artefact_id: str = "*",
+        artefact_version: str = "*",
+    ):
+        """Add a new authorization rule to the system.
 
+        Args:
+            user_mask (str): The user or group identifier pattern.
+            is_group (bool): Whether the rule applies to a group (True) or user (False).
+            permission (int): The permission level to grant.
+            dataspace (str, optional): Target dataspace. Defaults to "*" (all dataspaces).
+            artifact_type (int, optional): Type of artifact. Defaults to 0.
+            artefact_agency_id (str, optional): Agency ID of the artifact. Defaults to "*".
+            artefact_id (str, optional): ID of the artifact. Defaults to "*".
+            artefact_version (str, optional): Version of the artifact. Defaults to "*".
+
+        Returns:
+            dict: The JSON response from the server containing the created rule.
+        """
+
+        data = {
+            "userMask": user_mask,
+            "isGroup": is_group,
+            "dataSpace": dataspace,
+            "artefactType": artifact_type,
+            "artefactAgencyId": artefact_agency_id,
+            "artefactId": artefact_id,
+            "artefactVersion": artefact_version,
+            "permission": permission,
+        }
+        return await self._post_rule(data)
+
+    async def _post_rule(self, data: dict) -> dict:
+        """Create a rule.
+
+        Args:
+            data (dict): The rule fields.
+
+        Returns:
+            dict: The JSON response from the server.
+        """
+        headers = await self._keycloak_client.auth_header()
+        headers["Content-Type"] = "application/json"
+        response = await self._client.post(
+            url=f"{self.AUTH_URL}/AuthorizationRules", headers=headers, json=data
+        )
+        _raise_for_status(
+            response,
+            DUPLICATE_RULE,
+            "Permission already exists",
+            self._log,
+        )
         return response.json()
+
+    async def _bounded(self, calls: list, max_workers: int) -> list:
+        """Await many coroutines with at most ``max_workers`` running at once.
+
+        Args:
+            calls (list): Coroutine functions without arguments.
+            max_workers (int): Max concurrent requests.
+
+        Returns:
+            list: The results, in the given order.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def run(call) -> dict:
+            """Await a call once a slot is free.
+
+            Args:
+                call: The coroutine function.
+
+            Returns:
+                dict: Its result.
+            """
+            async with semaphore:
+                return await call()
+
+        return list(await asyncio.gather(*map(run, calls)))
+
+    async def add_rules(
+        self, rules: Iterable[RuleSpec], max_workers: int = 8
+    ) -> List[dict]:
+        """Add many authorization rules concurrently.
+
+        Args:
+            rules (Iterable): Rules to create, as AuthorizationRule or dicts with
+                the Auth API fields.
+            max_workers (int, optional): Max concurrent requests. Defaults to 8.
+
+        Returns:
+            list: The JSON response of each rule, in the given order.
+        """
+        calls = [
+            partial(self._post_rule, _to_rule(rule).to_request()) for rule in rules
+        ]
+        return await self._bounded(calls, max_workers)
+
+    async def delete_rule(self, rule_id: str):
+        """Delete an authorization rule by its ID.
+
+        Args:
+            rule_id (str): The unique identifier of the rule to delete.
+
+        Returns:
+            dict: The JSON response from the server confirming the deletion.
+        """
+        response = await self._client.delete(
+            url=f"{self.AUTH_URL}/AuthorizationRules/{rule_id}",
+            headers=await self._keycloak_client.auth_header(),
+        )
+        _raise_for_status(response, MISSING_RULE, MISSING_RULE, self._log)
+        return response.json()
+
+    async def delete_rules(
+        self, rule_ids: Iterable[Union[int, str]], max_workers: int = 8
+    ) -> List[dict]:
+        """Delete many authorization rules concurrently.
+
+        Args:
+            rule_ids (Iterable): Ids of the rules to delete.
+            max_workers (int, optional): Max concurrent requests. Defaults to 8.
+
+        Returns:
+            list: The JSON response of each deletion, in the given order.
+        """
+        calls = [partial(self.delete_rule, rule_id) for rule_id in rule_ids]
+        return await self._bounded(calls, max_workers)
+
+    async def get_rules(self) -> List[AuthorizationRule]:
+        """Fetch every authorization rule.
+
+        Returns:
+            list: The rules defined in the Auth API.
+        """
+        response = await self._client.get(
+            url=f"{self.AUTH_URL}/AuthorizationRules",
+            headers=await self._keycloak_client.auth_header(),
+        )
+        return _parse_rules(response)
+
+    async def get_rules_index(self) -> RulesIndex:
+        """Fetch every authorization rule into an in-memory index.
+
+        Refresh it with ``index.update(await auth_client.get_rules())``.
+
+        Returns:
+            RulesIndex: The index of the rules.
+        """
+        return RulesIndex(await self.get_rules())
+
+    async def sync_rules(
+        self, desired: Iterable[RuleSpec], max_workers: int = 8
+    ) -> RulesSync:
+        """Make the rules of some users match a desired set.
+
+        Args:
+            desired (Iterable): Rules that should be defined, as
+                AuthorizationRule or dicts with the Auth API fields.
+            max_workers (int, optional): Max concurrent requests. Defaults to 8.
+
+        Returns:
+            RulesSync: The rules added and deleted.
+        """
+        to_add, to_delete, unchanged = _plan_sync(await self.get_rules(), desired)
+        self._log.info(
+            f"Syncing rules: {len(to_add)} to add, {len(to_delete)} to delete"
+        )
+        await self.add_rules(to_add, max_workers)
+        await self.delete_rules([rule.id for rule in to_delete], max_workers)
+        return RulesSync(added=to_add, deleted=to_delete, unchanged=unchanged)
@@ -0,0 +1,300 @@
+import itertools
+import logging
+import threading
+from fnmatch import fnmatchcase
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .models import AuthorizationRule
+
+# (isGroup, userMask, dataSpace, artefactType, artefactAgencyId, artefactId,
+#  artefactVersion)
+IndexKey = Tuple[bool, str, str, int, str, str, str]
+
+ANY = "*"
+ANY_TYPE = 0
+
+log = logging.getLogger("RulesIndex")
+
+
+def _index_key(rule: AuthorizationRule) -> IndexKey:
+    """Key of a rule in the index
+
+    Args:
+        rule: The rule
+
+    Returns:
+        tuple: Who the rule applies to and on what, without the permission
+    """
+    return (
+        rule.isGroup,
+        rule.userMask,
+        rule.dataSpace,
+        rule.artefactType,
+        rule.artefactAgencyId,
+        rule.artefactId,
+        rule.artefactVersion,
+    )
+
+
+def _rule_ref(rule: AuthorizationRule) -> Hashable:
+    """Identity of a rule between two refreshes
+
+    Args:
+        rule: The rule
+
+    Returns:
+        The rule id, or its full key for rules without id
+    """
+    return rule.id if rule.id is not None else rule.key()
+
+
+def _is_pattern(rule: AuthorizationRule) -> bool:
+    """Tell if a rule uses partial wildcards such as "OECD.*" or "1.*"
+
+    Args:
+        rule: The rule
+
+    Returns:
+        bool: True if a field mixes a wildcard with other characters
+    """
+    fields = (
+        rule.userMask,
+        rule.dataSpace,
+        rule.artefactAgencyId,
+        rule.artefactId,
+        rule.artefactVersion,
+    )
+    return any(field != ANY and ("*" in field or "?" in field) for field in fields)
+
+
+class RulesIndex:
+    """In memory index of the authorization rules, to check permissions locally
+
+    Rules are indexed by (isGroup, userMask, dataSpace, artefactType,
+    artefactAgencyId, artefactId, artefactVersion). A lookup tries the exact
+    value and the "*" wildcard (0 for the artefact type) of every field, which
+    is a fixed number of dict lookups whatever the number of rules. The few
+    rules using partial wildcards ("OECD.*", "1.*") are matched one by one.
+
+    The permission granted on an artefact is the bitwise OR of the permissions
+    of every rule matching the user, or any of its groups, and the artefact.
+
+    Attributes:
+        fetch: Function returning the current rules, used by refresh
+    """
+
+    def __init__(
+        self,
+        rules: Iterable[AuthorizationRule] = (),
+        fetch: Optional[Callable[[], List[AuthorizationRule]]] = None,
+    ) -> None:
+        """Inits the index
+
+        Args:
+            rules: Initial rules
+            fetch: Function returning the current rules, such as
+                   ``AuthClient.get_rules``
+        """
+        self.fetch = fetch
+        self._lock = threading.Lock()
+        self._rules: Dict[Hashable, AuthorizationRule] = {}
+        self._exact: Dict[IndexKey, Dict[Hashable, int]] = {}
+        self._patterns: Dict[Hashable, AuthorizationRule] = {}
+        self._stop: Optional[threading.Event] = None
+        self.update(rules)
+
+    def __len__(self) -> int:
+        """Number of rules indexed
+
+        Returns:
+            int: The number of rules
+        """
+        return len(self._rules)
+
+    def update(self, rules: Iterable[AuthorizationRule]) -> Tuple[int, int]:
+        """Replace the indexed rules, only touching the entries that changed
+
+        Args:
+            rules: The current rules
+
+        Returns:
+            tuple: Number of rules added and removed
+        """
+        current = {_rule_ref(rule): rule for rule in rules}
+        with self._lock:
+            removed = [
+                ref for ref, rule in self._rules.items() if current.get(ref) != rule
+            ]
+            added = [
+                rule for ref, rule in current.items() if self._rules.get(ref) != rule
+            ]
+            for ref in removed:
+                self._remove(ref)
+            for rule in added:
+                self._add(rule)
+        return len(added), len(removed)
+
+    def refresh(self) -> Tuple[int, int]:
+        """Fetch the rules again and apply the changes to the index
+
+        Returns:
+            tuple: Number of rules added and removed
+        """
+        added, removed = self.update(self.fetch())
+        log.debug(f"Rules index refreshed: {added} added, {removed} removed")
+        return added, removed
+
+    def start_refresh(self, interval: float) -> None:
+        """Refresh the index every ``interval`` seconds in a daemon thread
+
+        Args:
+            interval: Seconds between two refreshes
+        """
+        self.stop_refresh()
+        stop = self._stop = threading.Event()
+
+        def loop() -> None:
+            """Refresh until stopped, logging the failures"""
+            while not stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:  # noqa B902
+                    log.warning(f"Error refreshing the rules index: {e}")
+
+        threading.Thread(target=loop, name="RulesIndexRefresh", daemon=True).start()
+
+    def stop_refresh(self) -> None:
+        """Stop the periodic refresh, if started"""
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+
+    def permissions(
+        self,
+        user: str,
+        dataspace: str = ANY,
+        artefact_type: int = ANY_TYPE,
+        agency_id: str = ANY,
+        artefact_id: str = ANY,
+        version: str = ANY,
+        groups: Iterable[str] = (),
+    ) -> int:
+        """Permissions granted to a user on an artefact
+
+        Args:
+            user: The user id
+            dataspace: The dataspace
+            artefact_type: The artefact type
+            agency_id: Agency of the artefact
+            artefact_id: Id of the artefact
+            version: Version of the artefact
+            groups: Groups of the user
+
+        Returns:
+            int: Bitmask of the permissions granted
+        """
+        principals = [(False, user)] + [(True, group) for group in groups]
+        requested = (dataspace, artefact_type, agency_id, artefact_id, version)
+        scopes = list(
+            itertools.product(
+                {dataspace, ANY},
+                {artefact_type, ANY_TYPE},
+                {agency_id, ANY},
+                {artefact_id, ANY},
+                {version, ANY},
+            )
+        )
+        granted = 0
+        with self._lock:
+            candidates = principals + [(False, ANY), (True, ANY)]
+            for principal, scope in itertools.product(candidates, scopes):
+                for permission in self._exact.get(principal + scope, {}).values():
+                    granted |= permission
+            for rule in self._patterns.values():
+                if self._is_matching(rule, principals, requested):
+                    granted |= rule.permission
+        return granted
+
+    def has_permission(  # noqa FNE005
+        self,
+        user: str,
+        permission: int,
+        dataspace: str = ANY,
+        artefact_type: int = ANY_TYPE,
+        agency_id: str = ANY,
+        artefact_id: str = ANY,
+        version: str = ANY,
+        groups: Iterable[str] = (),
+    ) -> bool:
+        """Tell if a user has every permission of a bitmask on an artefact
+
+        Args:
+            user: The user id
+            permission: Bitmask of the permissions required
+            dataspace: The dataspace
+            artefact_type: The artefact type
+            agency_id: Agency of the artefact
+            artefact_id: Id of the artefact
+            version: Version of the artefact
+            groups: Groups of the user
+
+        Returns:
+            bool: True if all the required permissions are granted
+        """
+        granted = self.permissions(
+            user, dataspace, artefact_type, agency_id, artefact_id, version, groups
+        )
+        return granted & permission == permission
+
+    def _add(self, rule: AuthorizationRule) -> None:
+        """Index a rule, the lock must be held
+
+        Args:
+            rule: The rule
+        """
+        ref = _rule_ref(rule)
+        self._rules[ref] = rule
+        if _is_pattern(rule):
+            self._patterns[ref] = rule
+        else:
+            self._exact.setdefault(_index_key(rule), {})[ref] = rule.permission
+
+    def _remove(self, ref: Hashable) -> None:
+        """Remove a rule from the index, the lock must be held
+
+        Args:
+            ref: Identity of the rule
+        """
+        rule = self._rules.pop(ref)
+        if self._patterns.pop(ref, None) is not None:
+            return
+        key = _index_key(rule)
+        entries = self._exact[key]
+        del entries[ref]
+        if not entries:
+            del self._exact[key]
+
+    @staticmethod
+    def _is_matching(rule: AuthorizationRule, principals: list, scope: tuple) -> bool:
+        """Match a rule with partial wildcards
+
+        Args:
+            rule: The rule
+            principals: (isGroup, name) pairs of the user and its groups
+            scope: dataspace, artefact type, agency, id and version requested
+
+        Returns:
+            bool: True if the rule applies
+        """
+        dataspace, artefact_type, agency_id, artefact_id, version = scope
+        return (
+            any(
+                is_group == rule.isGroup and fnmatchcase(name, rule.userMask)
+                for is_group, name in principals
+            )
+            and rule.artefactType in (ANY_TYPE, artefact_type)  # noqa W503
+            and fnmatchcase(dataspace, rule.dataSpace)  # noqa W503
+            and fnmatchcase(agency_id, rule.artefactAgencyId)  # noqa W503
+            and fnmatchcase(artefact_id, rule.artefactId)  # noqa W503
+            and fnmatchcase(version, rule.artefactVersion)  # noqa W503
+        )
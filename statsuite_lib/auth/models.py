@@ -0,0 +1,74 @@
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict
+
+RuleKey = Tuple[str, bool, str, int, str, str, str, int]
+
+
+class AuthorizationRule(BaseModel):
+    """Authorization rule of the Auth API
+
+    Attributes:
+        model_config: Configuration
+        id: Rule id, None for rules not created yet
+        userMask: User or group identifier pattern
+        isGroup: Whether the rule applies to a group
+        dataSpace: Target dataspace, "*" for all of them
+        artefactType: Type of artefact, 0 for all of them
+        artefactAgencyId: Agency of the artefact, "*" for all of them
+        artefactId: Id of the artefact, "*" for all of them
+        artefactVersion: Version of the artefact, "*" for all of them
+        permission: Permission bitmask granted
+    """
+
+    model_config = ConfigDict(extra="allow", defer_build=True)
+    id: Optional[int] = None  # noqa
+    userMask: str
+    isGroup: bool = False
+    dataSpace: str = "*"
+    artefactType: int = 0
+    artefactAgencyId: str = "*"
+    artefactId: str = "*"
+    artefactVersion: str = "*"
+    permission: int
+
+    def key(self) -> RuleKey:
+        """Identity of the rule, regardless of its id and audit fields
+
+        Returns:
+            tuple: Every field sent when the rule is created
+        """
+        return (
+            self.userMask,
+            self.isGroup,
+            self.dataSpace,
+            self.artefactType,
+            self.artefactAgencyId,
+            self.artefactId,
+            self.artefactVersion,
+            self.permission,
+        )
+
+    def to_request(self) -> dict:
+        """Body of the request creating the rule
+
+        Returns:
+            dict: The rule fields, without id
+        """
+        return self.model_dump(include=set(self.model_fields) - {"id"})
+
+
+class RulesSync(BaseModel):
+    """Changes applied by ``AuthClient.sync_rules``
+
+    Attributes:
+        model_config: Configuration
+        added: Rules created
+        deleted: Rules deleted
+        unchanged: Number of desired rules already present
+    """
+
+    model_config = ConfigDict(defer_build=True)
+    added: List[AuthorizationRule] = []
+    deleted: List[AuthorizationRule] = []
+    unchanged: int = 0
@@ -1 +1 @@
-from .config import ConfigClient
+from .config import AsyncConfigClient, ConfigClient
@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import httpx
+
+from .models import Space, Tenants
+
+log = logging.getLogger("ConfigClient")
+
+
+class TenantsCache:
+    """In process cache of the tenants configuration
+
+    Keeps the validated ``Tenants`` model with its ETag/Last-Modified validators
+    and a (tenant, dataspace) -> Space index. Optionally persisted to a JSON
+    file, so short lived processes can revalidate instead of downloading it.
+
+    Attributes:
+        ttl: Seconds the cached configuration is used without revalidation
+        path: File where the cache is persisted, None to keep it in memory only
+        lock: Serializes the refreshes of the cache
+        tenants: The cached configuration, None if empty
+    """
+
+    def __init__(self, ttl: float, path: Optional[Union[str, os.PathLike]] = None):
+        """Inits the cache, loading the persisted one if present
+
+        Args:
+            ttl: Seconds the cached configuration is used without revalidation
+            path: File where the cache is persisted
+        """
+        self.ttl = ttl
+        self.path = Path(path).expanduser() if path is not None else None
+        self.lock = threading.Lock()
+        self.tenants: Optional[Tenants] = None
+        self._index: Dict[Tuple[str, str], Space] = {}
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._validated_at = float("-inf")
+        self._read_from_disk()
+
+    def is_fresh(self) -> bool:
+        """Tell if the cached configuration can be used without revalidation
+
+        Returns:
+            bool: True if there is a configuration younger than the ttl
+        """
+        return (
+            self.tenants is not None
+            and time.monotonic() - self._validated_at < self.ttl  # noqa W503
+        )
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers to revalidate the cached configuration
+
+        Returns:
+            dict: If-None-Match/If-Modified-Since headers, empty if nothing cached
+        """
+        if self.tenants is None:
+            return {}
+        headers = {}
+        if self._etag:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified:
+            headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    def update(self, response: httpx.Response) -> Optional[Tenants]:
+        """Update the cache with the answer of a (conditional) request
+
+        Args:
+            response: Answer of the config service
+
+        Returns:
+            Tenants: The up to date configuration, the stale one if the request
+                     failed, None if there is none
+        """
+        if response.status_code == 304 and self.tenants is not None:
+            self._validated_at = time.monotonic()
+        elif response.status_code == 200:
+            payload = response.json()
+            self._store(
+                Tenants.model_validate(payload),
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+            self._write_to_disk(payload)
+        elif self.tenants is not None:
+            log.warning(f"Using stale tenants config, got {response.status_code}")
+        return self.tenants
+
+    def get_space(self, tenant: str, dataspace: str) -> Optional[Space]:
+        """Look up a dataspace in the index
+
+        Args:
+            tenant: The tenant id
+            dataspace: The dataspace id
+
+        Returns:
+            Space: The dataspace configuration, None if unknown
+        """
+        return self._index.get((tenant, dataspace))
+
+    def clear(self) -> None:
+        """Drop the cached configuration, in memory and on disk"""
+        self.tenants = None
+        self._index = {}
+        self._etag = self._last_modified = None
+        self._validated_at = float("-inf")
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+    def _store(
+        self, tenants: Tenants, etag: Optional[str], last_modified: Optional[str]
+    ) -> None:
+        """Keep a configuration and index its dataspaces
+
+        Args:
+            tenants: The configuration
+            etag: Its ETag
+            last_modified: Its Last-Modified date
+        """
+        self.tenants = tenants
+        self._index = {
+            (tenant_id, space_id): space
+            for tenant_id, tenant in tenants.root.items()
+            for space_id, space in tenant.spaces.items()
+        }
+        self._etag = etag
+        self._last_modified = last_modified
+        self._validated_at = time.monotonic()
+
+    def _write_to_disk(self, payload: dict) -> None:
+        """Persist the configuration, readable by the owner only
+
+        Args:
+            payload: The raw configuration
+        """
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        with open(
+            os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w"
+        ) as f:
+            json.dump(
+                {
+                    "etag": self._etag,
+                    "last_modified": self._last_modified,
+                    "validated_at": time.time(),
+                    "tenants": payload,
+                },
+                f,
+            )
+        temporary.replace(self.path)
+
+    def _read_from_disk(self) -> None:
+        """Load the persisted configuration, ignoring missing or corrupted files"""
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            saved = json.loads(self.path.read_text())
+            self._store(
+                Tenants.model_validate(saved["tenants"]),
+                saved.get("etag"),
+                saved.get("last_modified"),
+            )
+        except (ValueError, KeyError) as e:
+            log.warning(f"Ignoring unreadable tenants cache {self.path}: {e}")
+            return
+        age = max(0.0, time.time() - saved.get("validated_at", 0))
+        self._validated_at = time.monotonic() - age
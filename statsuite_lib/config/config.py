@@ -1,36 +1,70 @@
+import asyncio
 import logging
-from typing import Iterator
+import os
+from typing import AsyncIterator, Iterator, Optional, Union
 
 import httpx
 
+from ..transport import create_async_client, get_default_client
+from .cache import TenantsCache
 from .models import Space, Tenants
 
+# Tenants configuration is revalidated on every call unless a ttl is given
+DEFAULT_CACHE_TTL = 0.0
+
 
 class ConfigClient:
     """Client for the SDMX Faceted search service"""
 
-    def __init__(self, config_url: str) -> None:
+    def __init__(
+        self,
+        config_url: str,
+        http_client: Optional[httpx.Client] = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_path: Optional[Union[str, os.PathLike]] = None,
+    ) -> None:
         """Inits the client
 
         Args:
             config_url: Endpoint url for Config service.
+            http_client: Pooled client used for the requests, defaults to the
+                         process wide client.
+            cache_ttl: Seconds the tenants configuration is reused before being
+                       revalidated with a conditional request. Defaults to 0,
+                       every call revalidates it.
+            cache_path: File where the tenants configuration is persisted
+                        between processes, defaults to memory only.
         """
 
-        self._client = httpx.Client()
+        self._client = http_client or get_default_client()
         self.CONFIG_URL = config_url
         self.log = logging.getLogger("ConfigClient")
         self.log.level = logging.INFO
+        self.cache = TenantsCache(cache_ttl, cache_path)
 
-    def get_tenants(self) -> str:
+    def get_tenants(self) -> Tenants:
         """Gets tenants config
 
+        The configuration is served from the cache while fresh, then revalidated
+        with If-None-Match/If-Modified-Since so unchanged configs are not
+        downloaded again. A stale copy is returned if the service fails.
+
         Returns:
-            loadingId(str)
+            Tenants configuration, None if it cannot be retrieved
         """
-        resp = httpx.get(f"{self.CONFIG_URL}/configs/tenants.json")
-        if resp.status_code == 200:
-            loading = Tenants.model_validate(resp.json())
-            return loading
+        with self.cache.lock:
+            if self.cache.is_fresh():
+                return self.cache.tenants
+            resp = self._client.get(
+                f"{self.CONFIG_URL}/configs/tenants.json",
+                headers=self.cache.conditional_headers(),
+            )
+            return self.cache.update(resp)
+
+    def invalidate(self) -> None:
+        """Drop the cached tenants config, the next call fetches it again"""
+        with self.cache.lock:
+            self.cache.clear()
 
     def get_dataspaces(self, tenant: str = "default") -> Iterator[Space]:
         """Returns a list of dataspaces configured for a tenant
@@ -56,5 +90,83 @@ class ConfigClient:
         Returns:
             Space: A dataspace configuration object for the given tenant and space.
         """
-        tenants = self.get_tenants()
-        return tenants.root.get(tenant).spaces.get(dataspace)
+        self.get_tenants()
+        return self.cache.get_space(tenant, dataspace)
+
+
+class AsyncConfigClient:
+    """Async counterpart of ConfigClient, built on ``httpx.AsyncClient``"""
+
+    def __init__(
+        self,
+        config_url: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        cache_path: Optional[Union[str, os.PathLike]] = None,
+    ) -> None:
+        """Inits the client
+
+        Args:
+            config_url: Endpoint url for Config service.
+            http_client: Pooled client used for the requests, defaults to a new
+                         client owned by this instance.
+            cache_ttl: Seconds the tenants configuration is reused before being
+                       revalidated with a conditional request. Defaults to 0,
+                       every call revalidates it.
+            cache_path: File where the tenants configuration is persisted
+                        between processes, defaults to memory only.
+        """
+
+        self._client = http_client or create_async_client()
+        self.CONFIG_URL = config_url
+        self.log = logging.getLogger("ConfigClient")
+        self.log.level = logging.INFO
+        self.cache = TenantsCache(cache_ttl, cache_path)
+        self._lock = asyncio.Lock()
+
+    async def get_tenants(self) -> Tenants:
+        """Gets tenants config, cached and revalidated like ConfigClient
+
+        Concurrent calls share a single refresh.
+
+        Returns:
+            Tenants configuration, None if it cannot be retrieved
+        """
+        async with self._lock:
+            if self.cache.is_fresh():
+                return self.cache.tenants
+            resp = await self._client.get(
+                f"{self.CONFIG_URL}/configs/tenants.json",
+                headers=self.cache.conditional_headers(),
+            )
+            return self.cache.update(resp)
+
+    def invalidate(self) -> None:
+        """Drop the cached tenants config, the next call fetches it again"""
+        self.cache.clear()
+
+    async def get_dataspaces(self, tenant: str = "default") -> AsyncIterator[Space]:
+        """Returns the dataspaces configured for a tenant
+
+        Args:
+            tenant: select which tenant
+
+        Yields:
+        Space: A dataspace configuration object for each space in the tenant.
+        """
+        tenants = await self.get_tenants()
+        for space in tenants.root.get(tenant).spaces.values():
+            yield space
+
+    async def get_dataspace(self, dataspace: str, tenant: str = "default") -> Space:
+        """Returns a dataspace configuration object for a given tenant and space
+
+        Args:
+            dataspace: select which dataspace
+            tenant: select which tenant
+
+        Returns:
+            Space: A dataspace configuration object for the given tenant and space.
+        """
+        await self.get_tenants()
+        return self.cache.get_space(tenant, dataspace)
@@ -7,9 +7,11 @@ class Index(RootModel):
     """Model for return json from indexing request on SFS
 
     Attributes:
+        model_config: Configuration
         root: returns a json in the format { "loadingId": ######### }
     """
 
+    model_config = ConfigDict(defer_build=True)
     root: Dict[str, Union[str, Dict]]
 
 
@@ -17,10 +19,12 @@ class Space(BaseModel):
     """Model for spaces inside tenants
 
     Attributes:
+        model_config: Configuration
         label: Space id
         url: space url
     """
 
+    model_config = ConfigDict(defer_build=True)
     label: str  # noqa VNE003
     url: str
 
@@ -33,7 +37,7 @@ class Tenant(BaseModel):
         spaces: Dict of spaces inside tenant
     """
 
-    model_config = ConfigDict(extra="allow")
+    model_config = ConfigDict(extra="allow", defer_build=True)
     # id: str  # noqa VNE003
     spaces: Dict[str, Space]
 
@@ -42,7 +46,9 @@ class Tenants(RootModel):
     """Collection of loading log entries
 
     Attributes:
+        model_config: Configuration
         root: Collection of Loadings without key
     """
 
+    model_config = ConfigDict(defer_build=True)
     root: Dict[str, Tenant]
@@ -1 +1,2 @@
-from .keycloak import KeycloakClient
+from .cache import TokenCache
+from .keycloak import AsyncKeycloakClient, KeycloakClient, clear_openid_endpoints
@@ -0,0 +1,129 @@
+import contextlib
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from .._optional import import_optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover, not available on Windows
+    fcntl = None
+
+log = logging.getLogger("KeycloakClient")
+
+
+class TokenCache:
+    """Tokens and OpenID endpoints of a user, persisted between processes
+
+    Each user of each Keycloak server gets its own file in ``directory``, named
+    after a hash of the OpenID url, client id and username. The files are only
+    readable by their owner and can be encrypted with a Fernet key, which
+    requires the ``cryptography`` package installed by the ``encryption``
+    extra. A lock file serializes the
+    processes renewing the tokens of a user, so the processes started together
+    by a scheduler authenticate once and share the tokens.
+
+    Attributes:
+        path: File where the tokens are persisted
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike],
+        openid_url: str,
+        username: Optional[str],
+        client_id: str,
+        encryption_key: Optional[Union[str, bytes]] = None,
+    ) -> None:
+        """Inits the cache of a user
+
+        Args:
+            directory: Directory holding the cache files, created if needed
+            openid_url: The OpenID configuration URL of the Keycloak server
+            username: The user, None for the client credentials grant
+            client_id: The OpenID client id
+            encryption_key: Fernet key encrypting the file, None to store it in
+                clear text
+        """
+        key = "\n".join([openid_url, client_id, username or ""])
+        name = hashlib.sha256(key.encode()).hexdigest()
+        self._directory = Path(directory).expanduser()
+        self.path = self._directory / f"{name}.json"
+        self._lock_path = self._directory / f"{name}.lock"
+        self._fernet = None
+        if encryption_key is not None:
+            self._crypto = import_optional(
+                "cryptography.fernet", "cryptography", "encryption"
+            )
+            self._fernet = self._crypto.Fernet(encryption_key)
+
+    @contextlib.contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold the lock of the user until exit, blocking the other processes"""
+        self._directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        descriptor = os.open(self._lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            if fcntl is not None:
+                fcntl.flock(descriptor, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(descriptor)
+
+    def read(self) -> Optional[dict]:
+        """Read the persisted tokens, ignoring missing or unreadable files
+
+        Returns:
+            dict: The tokens and endpoints, None if there are none
+        """
+        try:
+            content = self.path.read_bytes()
+            if self._fernet is not None:
+                content = self._decrypt(content)
+            return json.loads(content)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable token cache {self.path}: {e}")
+            return None
+
+    def write(self, state: dict) -> None:
+        """Persist the tokens, readable by the owner only
+
+        Args:
+            state: The tokens and endpoints
+        """
+        content = json.dumps(state).encode()
+        if self._fernet is not None:
+            content = self._fernet.encrypt(content)
+        self._directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        temporary = self.path.with_suffix(".tmp")
+        with open(
+            os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb"
+        ) as f:
+            f.write(content)
+        temporary.replace(self.path)
+
+    def _decrypt(self, content: bytes) -> bytes:
+        """Decrypt the persisted tokens
+
+        Args:
+            content: The encrypted file
+
+        Returns:
+            bytes: The tokens as JSON
+
+        Raises:
+            ValueError: If the file was not encrypted with the key
+        """
+        try:
+            return self._fernet.decrypt(content)
+        except self._crypto.InvalidToken:
+            raise ValueError("not encrypted with the configured key")
+
+    def clear(self) -> None:
+        """Drop the persisted tokens"""
+        self.path.unlink(missing_ok=True)
@@ -1,42 +1,462 @@
+import asyncio
 import datetime
 import logging
+import os
+import threading
+from typing import Dict, Optional, Tuple, Union
 
 import httpx
 
+from ..transport import create_async_client, get_default_client
+from .cache import TokenCache
 
-class KeycloakClient:
+DEFAULT_CLIENT_ID = "stat-suite"
+DEFAULT_REFRESH_SKEW = 30
+
+# A new grant can be requested again safely, unlike a rotated refresh token
+_IDEMPOTENT = {"idempotent": True}
+
+
+class _EndpointCache:
+    """
+    Authorization and token endpoints by OpenID configuration URL, shared by
+    the clients of the process so the discovery document is fetched once.
+    The endpoints of a server are dropped when its token endpoint fails, the
+    next renewal discovers them again.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty cache.
+        """
+        self._endpoints: Dict[str, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, openid_url: str) -> Optional[Tuple[str, str]]:
+        """
+        Get the endpoints of a server.
+
+        Args:
+            openid_url (str): The OpenID configuration URL
+
+        Returns:
+            tuple: The authorization and token endpoints, None if unknown
+        """
+        with self._lock:
+            return self._endpoints.get(openid_url)
+
+    def set(self, openid_url: str, endpoints: Tuple[str, str]) -> None:  # noqa A003
+        """
+        Keep the endpoints of a server.
+
+        Args:
+            openid_url (str): The OpenID configuration URL
+            endpoints (tuple): The authorization and token endpoints
+        """
+        with self._lock:
+            self._endpoints[openid_url] = endpoints
+
+    def clear(self, openid_url: Optional[str] = None) -> None:
+        """
+        Forget the endpoints of a server, or of every server.
+
+        Args:
+            openid_url (str, optional): The OpenID configuration URL, None for
+                every server
+        """
+        with self._lock:
+            if openid_url is None:
+                self._endpoints.clear()
+            else:
+                self._endpoints.pop(openid_url, None)
+
+
+_OPENID_ENDPOINTS = _EndpointCache()
+
+
+def clear_openid_endpoints(openid_url: Optional[str] = None) -> None:
+    """
+    Forget the discovered endpoints, the next clients fetch the discovery
+    document again.
+
+    Args:
+        openid_url (str, optional): The OpenID configuration URL, None for
+            every server
+    """
+    _OPENID_ENDPOINTS.clear(openid_url)
+
+
+def _to_timestamp(moment: Optional[datetime.datetime]) -> Optional[float]:
+    """
+    Convert an expiry time to a POSIX timestamp.
+
+    Args:
+        moment (datetime): The expiry time, None if it never expires
+
+    Returns:
+        float: The timestamp, None if it never expires
+    """
+    return None if moment is None else moment.timestamp()
+
+
+def _to_datetime(timestamp: Optional[float]) -> Optional[datetime.datetime]:
+    """
+    Convert a POSIX timestamp to an expiry time.
+
+    Args:
+        timestamp (float): The timestamp, None if it never expires
+
+    Returns:
+        datetime: The expiry time, None if it never expires
+    """
+    return None if timestamp is None else datetime.datetime.fromtimestamp(timestamp)
+
+
+class _TokenState:
+    """
+    Token bookkeeping shared by the sync and async Keycloak clients.
+
+    Holds the credentials and tokens and decides which grant has to be used to
+    get a valid access token, the subclasses only do the network calls.
+
+    Attributes:
+        identity: The OpenID configuration URL, client id and username
+    """
+
+    def _init_token_state(
+        self,
+        username: Optional[str],
+        password: Optional[str],
+        client_id: str,
+        client_secret: Optional[str],
+        refresh_skew: float,
+    ) -> None:
+        """
+        Initialize credentials and token attributes.
+
+        Args:
+            username (str): Username for the password grant
+            password (str): Password for the password grant
+            client_id (str): OpenID client id
+            client_secret (str): OpenID client secret, enables the client
+                credentials grant when no password is given
+            refresh_skew (float): Seconds before expiry a token is renewed
+        """
+        self._username = username
+        self._password = password
+        self._client_id = client_id
+        self._client_secret = client_secret
+        self._refresh_skew = datetime.timedelta(seconds=refresh_skew)
+        self._access_token_skew = self._refresh_skew
+        self._auth_endpoint = None
+        self._token_endpoint = None
+        self.access_token = None
+        self.access_token_expires = None
+        self.refresh_token = None
+        self.refresh_token_expires = None
+        self._auth_header = None
+
+    @property
+    def identity(self) -> str:
+        """
+        Identity the tokens are issued to.
+
+        Returns:
+            str: The OpenID configuration URL, client id and username
+        """
+        return "\n".join([self.OPENID_URL, self._client_id, self._username or ""])
+
+    def _forget_endpoints(self) -> None:
+        """
+        Drop the endpoints of the server, the next renewal discovers them again.
+        """
+        _OPENID_ENDPOINTS.clear(self.OPENID_URL)
+        self._auth_endpoint = self._token_endpoint = None
+
+    def _store_openid_configuration(self, response: httpx.Response) -> Tuple[str, str]:
+        """
+        Keep the endpoints of a discovery document for the clients of the same
+        Keycloak server.
+
+        Args:
+            response (httpx.Response): Response of the OpenID configuration URL
+
+        Returns:
+            tuple: The authorization and token endpoints
+        """
+        response.raise_for_status()
+        configuration = response.json()
+        endpoints = (
+            configuration["authorization_endpoint"],
+            configuration["token_endpoint"],
+        )
+        _OPENID_ENDPOINTS.set(self.OPENID_URL, endpoints)
+        return endpoints
+
+    def _grant_data(self, grant_type: str, fields: Optional[dict] = None) -> dict:
+        """
+        Build the form of a token endpoint request.
+
+        Args:
+            grant_type (str): OAuth2 grant type
+            fields (dict, optional): Grant specific fields
+
+        Returns:
+            dict: The form data
+        """
+        data = {"grant_type": grant_type, "client_id": self._client_id}
+        data |= fields or {}
+        if self._client_secret is not None:
+            data["client_secret"] = self._client_secret
+        return data
+
+    def _authentication_data(self) -> dict:
+        """
+        Build the form of the initial authentication, a password grant or a client
+        credentials grant when only a client secret is configured.
+
+        Returns:
+            dict: The form data
+        """
+        if self._password is None and self._client_secret is not None:
+            return self._grant_data("client_credentials")
+        return self._grant_data(
+            "password", {"username": self._username, "password": self._password}
+        )
+
+    def _refresh_data(self) -> dict:
+        """
+        Build the form of a refresh token grant.
+
+        Returns:
+            dict: The form data
+        """
+        return self._grant_data("refresh_token", {"refresh_token": self.refresh_token})
+
+    def _store_tokens(self, response: httpx.Response) -> None:
+        """
+        Keep the tokens of a token endpoint response, raising HTTPStatusError if
+        the endpoint rejected the grant.
+
+        Args:
+            response (httpx.Response): Response of the token endpoint
+        """
+        response.raise_for_status()
+        tokens = response.json()
+        now = datetime.datetime.now()
+        self.access_token = tokens["access_token"]
+        self.access_token_expires = now + datetime.timedelta(
+            seconds=tokens["expires_in"]
+        )
+        self._access_token_skew = self._skew_for(self.access_token_expires)
+        self.refresh_token = tokens.get("refresh_token")
+        # refresh_expires_in is 0 for offline tokens, they do not expire
+        refresh_expires_in = tokens.get("refresh_expires_in")
+        self.refresh_token_expires = (
+            now + datetime.timedelta(seconds=refresh_expires_in)
+            if refresh_expires_in
+            else None
+        )
+        self._auth_header = {"Authorization": f"Bearer {self.access_token}"}
+
+    def _skew_for(self, expires: Optional[datetime.datetime]) -> datetime.timedelta:
+        """
+        Margin before expiry at which a new token is renewed.
+
+        The refresh skew is capped at half the remaining lifetime of the token, so
+        tokens living less than the skew are still used before being renewed.
+
+        Args:
+            expires (datetime): Expiry time of the token
+
+        Returns:
+            timedelta: The margin
+        """
+        if expires is None:
+            return self._refresh_skew
+        return min(self._refresh_skew, (expires - datetime.datetime.now()) / 2)
+
+    def _is_token_fresh(self, expires: Optional[datetime.datetime]) -> bool:
+        """
+        Check if a token is still valid, with the refresh skew as margin.
+
+        Args:
+            expires (datetime): Expiry time of the token
+
+        Returns:
+            bool: True if the token does not need to be renewed yet
+        """
+        return (
+            expires is not None
+            and datetime.datetime.now() + self._access_token_skew < expires  # noqa W503
+        )
+
+    def _can_refresh(self) -> bool:
+        """
+        Check if the refresh token can still be used.
+
+        Returns:
+            bool: True if there is a refresh token that has not expired
+        """
+        return self.refresh_token is not None and (
+            self.refresh_token_expires is None
+            or datetime.datetime.now() < self.refresh_token_expires  # noqa W503
+        )
+
+    def _token_snapshot(self) -> dict:
+        """
+        Copy the endpoints and tokens, to persist them in a TokenCache.
+
+        Returns:
+            dict: The endpoints and tokens, expiry times as POSIX timestamps
+        """
+        return {
+            "auth_endpoint": self._auth_endpoint,
+            "token_endpoint": self._token_endpoint,
+            "access_token": self.access_token,
+            "access_token_expires": _to_timestamp(self.access_token_expires),
+            "refresh_token": self.refresh_token,
+            "refresh_token_expires": _to_timestamp(self.refresh_token_expires),
+        }
+
+    def _restore_tokens(self, snapshot: Optional[dict]) -> None:
+        """
+        Use the tokens of a snapshot if they expire after the current ones.
+
+        Args:
+            snapshot (dict): Endpoints and tokens from ``_token_snapshot``, None
+                if there is no snapshot
+        """
+        try:
+            restored = snapshot and {
+                "_auth_endpoint": snapshot["auth_endpoint"],
+                "_token_endpoint": snapshot["token_endpoint"],
+                "access_token": snapshot["access_token"],
+                "access_token_expires": _to_datetime(snapshot["access_token_expires"]),
+                "refresh_token": snapshot["refresh_token"],
+                "refresh_token_expires": _to_datetime(
+                    snapshot["refresh_token_expires"]
+                ),
+            }
+        except (TypeError, KeyError, ValueError) as e:
+            self.log.warning(f"Ignoring invalid cached tokens: {e!r}")
+            restored = None
+        if restored and self._is_newer(restored["access_token_expires"]):
+            for name, value in restored.items():
+                setattr(self, name, value)
+            self._access_token_skew = self._skew_for(self.access_token_expires)
+            self._auth_header = {"Authorization": f"Bearer {self.access_token}"}
+
+    def _is_newer(self, expires: Optional[datetime.datetime]) -> bool:
+        """
+        Check if a token expires after the current access token.
+
+        Args:
+            expires (datetime): Expiry time of the token
+
+        Returns:
+            bool: True if there is no current access token or it expires first
+        """
+        return self.access_token_expires is None or (
+            expires is not None and expires > self.access_token_expires
+        )
+
+    def _cached_auth_header(self) -> dict:
+        """
+        Return a copy of the header built when the access token was stored,
+        callers are free to add their own headers to it.
+
+        Returns:
+            dict: The Authorization header
+        """
+        return dict(self._auth_header)
+
+
+class KeycloakClient(_TokenState):
     """
     A client for handling Keycloak authentication and token management.
 
     This class manages OAuth2/OpenID Connect authentication with Keycloak,
-    including token acquisition, refresh, and management.
+    including token acquisition, refresh, and management. Tokens are renewed
+    ``refresh_skew`` seconds before they expire, concurrent renewals from many
+    threads are coalesced in a single request, and when the refresh token is no
+    longer valid the client authenticates again with its credentials.
+
+    With a ``cache_path`` the endpoints and tokens are persisted, so the next
+    processes reuse them until they expire instead of doing the discovery and
+    the password grant again. The discovery document is fetched once per
+    process and shared by the clients of the same Keycloak server. With
+    ``lazy`` the client does not contact Keycloak until the first token is
+    needed.
 
     Args:
         openid_url (str): The OpenID configuration URL for the Keycloak server
         username (str): Username for authentication
         password (str): Password for authentication
+        http_client (httpx.Client, optional): Pooled client used for the requests
+        client_id (str, optional): OpenID client id
+        client_secret (str, optional): OpenID client secret
+        refresh_skew (float, optional): Seconds before expiry a token is renewed
+        cache_path (str, optional): Directory of the persisted tokens
+        cache_encryption_key (str, optional): Fernet key of the persisted tokens
+        lazy (bool, optional): Authenticate on the first ``auth_header`` call
     """
 
-    def __init__(self, openid_url: str, username: str, password: str) -> None:
+    def __init__(
+        self,
+        openid_url: str,
+        username: Optional[str],
+        password: Optional[str],
+        http_client: Optional[httpx.Client] = None,
+        client_id: str = DEFAULT_CLIENT_ID,
+        client_secret: Optional[str] = None,
+        refresh_skew: float = DEFAULT_REFRESH_SKEW,
+        cache_path: Optional[Union[str, os.PathLike]] = None,
+        cache_encryption_key: Optional[Union[str, bytes]] = None,
+        lazy: bool = False,
+    ) -> None:
         """
         Initialize the KeycloakClient with authentication credentials.
 
         Args:
             openid_url (str): The OpenID configuration URL for the Keycloak server
             username (str): Username for authentication
-            password (str): Password for authentication
+            password (str): Password for authentication, None to use the client
+                credentials grant with ``client_secret``
+            http_client (httpx.Client, optional): Pooled client used for the requests.
+                Defaults to the process wide client from ``statsuite_lib.transport``
+            client_id (str, optional): OpenID client id. Defaults to "stat-suite"
+            client_secret (str, optional): OpenID client secret. Defaults to None
+            refresh_skew (float, optional): Seconds before expiry a token is
+                renewed, at most half its lifetime. Defaults to 30
+            cache_path (str, optional): Directory where the endpoints and tokens
+                are persisted between processes, see ``TokenCache``. Defaults to
+                None, no persistence
+            cache_encryption_key (str, optional): Fernet key encrypting the
+                persisted tokens, requires the ``encryption`` extra. Defaults
+                to None, the file is only protected by its permissions
+            lazy (bool, optional): Defer the discovery and the authentication to
+                the first ``auth_header`` or ``get_access_token`` call, so
+                building the clients does not block on Keycloak. Defaults to
+                False, authenticating now so bad credentials fail early
         """
 
-        self._client = httpx.Client()
+        self._client = http_client or get_default_client()
         self.OPENID_URL = openid_url
         self.log = logging.getLogger("KeycloakClient")
-        self._auth_endpoint = None
-        self._token_endpoint = None
-        self.access_token = None
-        self.access_token_expires = None
-        self.refresh_token = None
-        self._get_openid_configuration()
-        self._authenticate(username=username, password=password)
+        self._lock = threading.Lock()
+        self._init_token_state(
+            username, password, client_id, client_secret, refresh_skew
+        )
+        self.cache = (
+            TokenCache(
+                cache_path, openid_url, username, client_id, cache_encryption_key
+            )
+            if cache_path is not None
+            else None
+        )
+        if not lazy:
+            self._update_tokens()
 
     def _get_openid_configuration(self) -> None:
         """
@@ -48,46 +468,31 @@ class KeycloakClient:
         Raises:
             ConnectError: If connection to the Keycloak server fails.
         """
-        self.log.info(f"Getting openid configuration from {self.OPENID_URL}")
-        try:
-
-            response = self._client.get(self.OPENID_URL)
-            self._auth_endpoint = response.json()["authorization_endpoint"]
-            self._token_endpoint = response.json()["token_endpoint"]
-
-        except httpx.ConnectError as e:
-            raise httpx.ConnectError(f"Failed to get openid configuration: {e}")
-
-    def _authenticate(self, username: str, password: str) -> None:
+        endpoints = _OPENID_ENDPOINTS.get(self.OPENID_URL)
+        if endpoints is None:
+            self.log.info(f"Getting openid configuration from {self.OPENID_URL}")
+            try:
+                response = self._client.get(self.OPENID_URL)
+            except httpx.ConnectError as e:
+                raise httpx.ConnectError(f"Failed to get openid configuration: {e}")
+            endpoints = self._store_openid_configuration(response)
+        self._auth_endpoint, self._token_endpoint = endpoints
+
+    def _authenticate(self) -> None:
         """
-        Perform initial authentication with Keycloak using username and password.
-
-        This method obtains the initial access and refresh tokens using the
-        provided credentials.
-
-        Args:
-            username (str): Username for authentication
-            password (str): Password for authentication
-
+        Perform authentication with Keycloak using the configured credentials.
 
+        This method obtains new access and refresh tokens with a password grant,
+        or a client credentials grant when only a client secret is configured.
         """
 
         self.log.info(f"Authenticating with {self._auth_endpoint}")
         response = self._client.post(
             self._token_endpoint,
-            data={
-                "grant_type": "password",
-                "client_id": "stat-suite",
-                "username": username,
-                "password": password,
-            },
-        )
-
-        self.refresh_token = response.json()["refresh_token"]
-        self.access_token = response.json()["access_token"]
-        self.access_token_expires = datetime.datetime.now() + datetime.timedelta(
-            seconds=response.json()["expires_in"]
+            data=self._authentication_data(),
+            extensions=_IDEMPOTENT,
         )
+        self._store_tokens(response)
 
     def trigger_refresh_token(self) -> None:
         """
@@ -95,42 +500,74 @@ class KeycloakClient:
 
         This method is called when the access token is expired or about to expire.
         It uses the refresh token to obtain a new access token and refresh token pair.
+        """
 
+        self.log.info("Triggering refresh token")
+        response = self._client.post(self._token_endpoint, data=self._refresh_data())
+        self._store_tokens(response)
 
+    def _renew_tokens(self) -> None:
         """
+        Get a new access token, refreshing it while the refresh token is valid
+        and authenticating again otherwise.
+        """
+        if self._can_refresh():
+            try:
+                self.trigger_refresh_token()
+                return
+            except httpx.HTTPStatusError as e:
+                self.log.warning(f"Refresh token rejected, authenticating again: {e}")
+        self._authenticate()
+
+    def _update_tokens(self) -> None:
+        """
+        Get a fresh access token, from the cache when another process already
+        renewed it, otherwise from Keycloak, persisting it for the others.
+        """
+        if self.cache is None:
+            self._fetch_tokens()
+            return
+        with self.cache.lock():
+            self._restore_tokens(self.cache.read())
+            if self._is_token_fresh(self.access_token_expires):
+                self.log.debug(f"Using the cached tokens of {self.cache.path}")
+                return
+            self._fetch_tokens()
+            self.cache.write(self._token_snapshot())
+
+    def _fetch_tokens(self) -> None:
+        """
+        Renew the tokens with Keycloak, getting its endpoints first if unknown.
+        The endpoints are forgotten if the renewal fails, in case they changed.
 
-        self.log.info("Triggering refresh token")
-        response = self._client.post(
-            self._token_endpoint,
-            data={
-                "grant_type": "refresh_token",
-                "client_id": "stat-suite",
-                "refresh_token": self.refresh_token,
-            },
-        )
-        self.access_token = response.json()["access_token"]
-        self.access_token_expires = datetime.datetime.now() + datetime.timedelta(
-            seconds=response.json()["expires_in"]
-        )
-        self.refresh_token = response.json()["refresh_token"]
+        Raises:
+            HTTPError: If Keycloak cannot be reached or rejects the renewal
+        """
+        if self._token_endpoint is None:
+            self._get_openid_configuration()
+        try:
+            self._renew_tokens()
+        except httpx.HTTPError:
+            self._forget_endpoints()
+            raise
 
     def get_access_token(self) -> str:
         """
         Get the current valid access token.
 
-        This method checks if the current access token is valid and not expired.
-        If expired, it automatically triggers a token refresh.
+        This method checks if the current access token is valid and not about to
+        expire. Otherwise it renews it, only one thread does the renewal while
+        the others wait for its result.
 
         Returns:
             Access token string
         """
 
-        self.log.info("Getting access token")
-        if (
-            self.access_token_expires is None
-            or self.access_token_expires < datetime.datetime.now()  # noqa W503
-        ):
-            self.trigger_refresh_token()
+        if not self._is_token_fresh(self.access_token_expires):
+            with self._lock:
+                if not self._is_token_fresh(self.access_token_expires):
+                    self.log.debug("Access token expired or about to expire")
+                    self._update_tokens()
 
         return self.access_token
 
@@ -144,4 +581,153 @@ class KeycloakClient:
 
         """
 
-        return {"Authorization": f"Bearer {self.get_access_token()}"}
+        self.get_access_token()
+        return self._cached_auth_header()
+
+
+class AsyncKeycloakClient(_TokenState):
+    """
+    Async counterpart of KeycloakClient for the async statsuite clients.
+
+    Constructors cannot await, so the OpenID configuration and the initial
+    authentication are done on the first call to ``auth_header``. Concurrent
+    renewals from many tasks are coalesced in a single request.
+
+    Args:
+        openid_url (str): The OpenID configuration URL for the Keycloak server
+        username (str): Username for authentication
+        password (str): Password for authentication
+        http_client (httpx.AsyncClient, optional): Pooled client used for the requests
+        client_id (str, optional): OpenID client id
+        client_secret (str, optional): OpenID client secret
+        refresh_skew (float, optional): Seconds before expiry a token is renewed
+    """
+
+    def __init__(
+        self,
+        openid_url: str,
+        username: Optional[str],
+        password: Optional[str],
+        http_client: Optional[httpx.AsyncClient] = None,
+        client_id: str = DEFAULT_CLIENT_ID,
+        client_secret: Optional[str] = None,
+        refresh_skew: float = DEFAULT_REFRESH_SKEW,
+    ) -> None:
+        """
+        Initialize the AsyncKeycloakClient with authentication credentials.
+
+        Args:
+            openid_url (str): The OpenID configuration URL for the Keycloak server
+            username (str): Username for authentication
+            password (str): Password for authentication, None to use the client
+                credentials grant with ``client_secret``
+            http_client (httpx.AsyncClient, optional): Pooled client used for the
+                requests. Defaults to a new client owned by this instance
+            client_id (str, optional): OpenID client id. Defaults to "stat-suite"
+            client_secret (str, optional): OpenID client secret. Defaults to None
+            refresh_skew (float, optional): Seconds before expiry a token is
+                renewed, at most half its lifetime. Defaults to 30
+        """
+
+        self._client = http_client or create_async_client()
+        self.OPENID_URL = openid_url
+        self.log = logging.getLogger("KeycloakClient")
+        self._lock = asyncio.Lock()
+        self._init_token_state(
+            username, password, client_id, client_secret, refresh_skew
+        )
+
+    async def _get_openid_configuration(self) -> None:
+        """
+        Retrieve OpenID Connect configuration from Keycloak server.
+
+        Raises:
+            ConnectError: If connection to the Keycloak server fails.
+        """
+        endpoints = _OPENID_ENDPOINTS.get(self.OPENID_URL)
+        if endpoints is None:
+            self.log.info(f"Getting openid configuration from {self.OPENID_URL}")
+            try:
+                response = await self._client.get(self.OPENID_URL)
+            except httpx.ConnectError as e:
+                raise httpx.ConnectError(f"Failed to get openid configuration: {e}")
+            endpoints = self._store_openid_configuration(response)
+        self._auth_endpoint, self._token_endpoint = endpoints
+
+    async def _authenticate(self) -> None:
+        """
+        Perform authentication with Keycloak using the configured credentials.
+        """
+        self.log.info(f"Authenticating with {self._auth_endpoint}")
+        response = await self._client.post(
+            self._token_endpoint,
+            data=self._authentication_data(),
+            extensions=_IDEMPOTENT,
+        )
+        self._store_tokens(response)
+
+    async def trigger_refresh_token(self) -> None:
+        """
+        Refresh the access token using the refresh token.
+        """
+        self.log.info("Triggering refresh token")
+        response = await self._client.post(
+            self._token_endpoint, data=self._refresh_data()
+        )
+        self._store_tokens(response)
+
+    async def _fetch_tokens(self) -> None:
+        """
+        Renew the tokens with Keycloak, getting its endpoints first if unknown.
+        The endpoints are forgotten if the renewal fails, in case they changed.
+
+        Raises:
+            HTTPError: If Keycloak cannot be reached or rejects the renewal
+        """
+        if self._token_endpoint is None:
+            await self._get_openid_configuration()
+        try:
+            await self._renew_tokens()
+        except httpx.HTTPError:
+            self._forget_endpoints()
+            raise
+
+    async def _renew_tokens(self) -> None:
+        """
+        Get a new access token, refreshing it while the refresh token is valid
+        and authenticating again otherwise.
+        """
+        if self._can_refresh():
+            try:
+                await self.trigger_refresh_token()
+                return
+            except httpx.HTTPStatusError as e:
+                self.log.warning(f"Refresh token rejected, authenticating again: {e}")
+        await self._authenticate()
+
+    async def get_access_token(self) -> str:
+        """
+        Get the current valid access token, authenticating on first use and
+        renewing it when about to expire.
+
+        Returns:
+            Access token string
+        """
+        if not self._is_token_fresh(self.access_token_expires):
+            async with self._lock:
+                if not self._is_token_fresh(self.access_token_expires):
+                    await self._fetch_tokens()
+
+        return self.access_token
+
+    async def auth_header(self) -> dict:
+        """
+        Create an authorization header using the current access token.
+
+        Returns:
+            dict: A dictionary containing the Authorization header with the Bearer token
+                 in the format {'Authorization': 'Bearer <token>'}
+        """
+
+        await self.get_access_token()
+        return self._cached_auth_header()
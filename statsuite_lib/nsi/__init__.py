@@ -1 +1,4 @@
-from .nsi import NSIClient
+from .cache import StructureCache
+from .export import dimension_partitions, period_partitions, year_periods
+from .models import SubmissionResult, SubmitStructureResponse
+from .nsi import AsyncNSIClient, NSIClient
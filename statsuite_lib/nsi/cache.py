@@ -0,0 +1,537 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import httpx
+
+STRUCTURE_RESOURCES = frozenset(
+    {
+        "structure",
+        "dataflow",
+        "datastructure",
+        "codelist",
+        "conceptscheme",
+        "categoryscheme",
+        "categorisation",
+        "contentconstraint",
+        "actualconstraint",
+        "allowedconstraint",
+        "agencyscheme",
+        "dataproviderscheme",
+        "dataconsumerscheme",
+        "organisationunitscheme",
+        "hierarchicalcodelist",
+        "metadataflow",
+        "metadatastructure",
+        "provisionagreement",
+        "structureset",
+        "process",
+    }
+)
+# Reference components matching any value, SDMX 2.1 and 3.0 flavours
+WILDCARDS = frozenset({"all", "*", "latest", "~", "+"})
+# Headers of the response kept with the cached content
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+log = logging.getLogger("NSIClient")
+
+
+class Artefact(NamedTuple):
+    """Reference of the artefacts targeted by a structure query
+
+    Attributes:
+        resource: Structure type, such as dataflow or codelist
+        agency: Maintenance agency
+        id: Artefact id
+        version: Artefact version
+    """
+
+    resource: str
+    agency: str
+    id: str  # noqa
+    version: str
+
+
+def parse_artefact(path: str) -> Optional[Artefact]:
+    """Find the artefact targeted by a structure query path
+
+    The leading segments before the structure type, such as ``/rest`` or
+    ``/rest/v2``, are skipped.
+
+    Args:
+        path: Structure query, such as ``/dataflow/OECD/DF_GDP/1.0?references=all``
+              or ``/rest/v2/structure/dataflow/OECD/DF_GDP/1.0``
+
+    Returns:
+        Artefact: The reference, missing components being wildcards, None if the
+                  path is not a structure query
+    """
+    parts = [part for part in path.split("?")[0].split("/") if part]
+    start = next(
+        (index for index, part in enumerate(parts) if part in STRUCTURE_RESOURCES),
+        None,
+    )
+    if start is None:
+        return None
+    parts = parts[start:]
+    if len(parts) > 1 and parts[0] == "structure" and parts[1] in STRUCTURE_RESOURCES:
+        parts = parts[1:]
+    components = parts[1:4]
+    components += ["all", "all", "latest"][len(components) :]  # noqa E203
+    return Artefact(parts[0], *components)
+
+
+def _is_matching_component(cached: str, changed: str) -> bool:
+    """Tell if a reference component of a cached query covers a changed one
+
+    Args:
+        cached: Component of the cached query, may be a wildcard or a list
+        changed: Component of the changed artefact
+
+    Returns:
+        bool: True if the cached query may include the changed artefact
+    """
+    if cached in WILDCARDS or changed in WILDCARDS:
+        return True
+    return changed in cached.split(",")
+
+
+def is_affected(cached: Artefact, changed: Artefact) -> bool:
+    """Tell if a cached query may include a changed artefact
+
+    The structure type is not compared, as queries with ``references`` may
+    include artefacts of other types.
+
+    Args:
+        cached: Reference of the cached query
+        changed: Reference of the changed artefact
+
+    Returns:
+        bool: True if the cached result has to be dropped
+    """
+    return all(
+        _is_matching_component(cached_part, changed_part)
+        for cached_part, changed_part in zip(cached[1:], changed[1:])
+    )
+
+
+class CachedResponse(NamedTuple):
+    """Structure query result held in the cache
+
+    Attributes:
+        url: Full url of the structure query
+        accept: Accept header of the query
+        scope: Identity of the caller, see ``StructureCache``
+        status_code: Status of the response
+        headers: Content-Type, ETag and Last-Modified of the response
+        content: Body of the response
+        validated_at: Time (epoch secs) the content was last validated
+    """
+
+    url: str
+    accept: str
+    scope: str
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    validated_at: float
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Headers revalidating the cached content
+
+        Returns:
+            dict: If-None-Match/If-Modified-Since headers
+        """
+        headers = {}
+        if "ETag" in self.headers:
+            headers["If-None-Match"] = self.headers["ETag"]
+        if "Last-Modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        return headers
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        """Build an httpx response from the cached content
+
+        Args:
+            request: Request answered by the cache
+
+        Returns:
+            httpx.Response: The response, with the ``from_cache`` extension set
+        """
+        return httpx.Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=request,
+            extensions={"from_cache": True},
+        )
+
+
+# Full url, Accept header and caller identity of a cached query
+CacheKey = Tuple[str, str, str]
+
+
+def _key_of(request: httpx.Request, scope: str) -> CacheKey:
+    """Cache key of a structure query
+
+    Args:
+        request: The request
+        scope: Identity of the caller
+
+    Returns:
+        tuple: The url, Accept header and scope
+    """
+    return str(request.url), request.headers.get("Accept", ""), scope
+
+
+def _entry_key(entry: CachedResponse) -> CacheKey:
+    """Cache key of a cached result
+
+    Args:
+        entry: The result
+
+    Returns:
+        tuple: The url, Accept header and scope
+    """
+    return entry.url, entry.accept, entry.scope
+
+
+class StructureCache:
+    """Cache of the NSI structure queries, opt-in through ``NSIClient``
+
+    Results are kept in a memory LRU keyed by the full query url, the Accept
+    header and the identity of the caller (its Keycloak server, client id and
+    username), and optionally in a directory shared between processes. A cache
+    can be shared by clients of different NSI services and users, a result is
+    only returned to the user who downloaded it. A cached result is
+    returned as is during ``ttl`` seconds, then revalidated with
+    If-None-Match/If-Modified-Since. Uploads clear the cache and deletions drop
+    the results that may include the deleted artefact.
+
+    Attributes:
+        max_entries: Max number of results kept in memory
+        ttl: Seconds a result is used without revalidation
+        directory: Directory of the disk tier, None to keep the results in memory
+        hits: Number of results served without request
+        revalidations: Number of results confirmed by a 304
+        misses: Number of results downloaded
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: float = 0.0,
+        directory: Optional[Union[str, os.PathLike]] = None,
+    ) -> None:
+        """Inits the cache
+
+        Args:
+            max_entries: Max number of results kept in memory
+            ttl: Seconds a result is used without revalidation, 0 to always
+                 revalidate
+            directory: Directory of the disk tier
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.directory = Path(directory).expanduser() if directory else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = self.revalidations = self.misses = 0
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fetch(
+        self,
+        request: httpx.Request,
+        send: Callable[[Dict[str, str]], httpx.Response],
+        scope: str = "",
+    ) -> httpx.Response:
+        """Answer a structure query from the cache, revalidating it if needed
+
+        Args:
+            request: The request, answered as is by a fresh result
+            send: Function sending the request with additional headers
+            scope: Identity of the caller
+
+        Returns:
+            httpx.Response: The cached or downloaded response
+        """
+        key = _key_of(request, scope)
+        entry = self.lookup(*key)
+        if entry is not None and self.is_fresh(entry):
+            self._count("hits")
+            return entry.to_response(request)
+        response = send(entry.conditional_headers() if entry else {})
+        return self._update(key, entry, response)
+
+    async def afetch(
+        self,
+        request: httpx.Request,
+        send: Callable[[Dict[str, str]], Awaitable[httpx.Response]],
+        scope: str = "",
+    ) -> httpx.Response:
+        """Async counterpart of fetch
+
+        Args:
+            request: The request, answered as is by a fresh result
+            send: Coroutine function sending the request with additional headers
+            scope: Identity of the caller
+
+        Returns:
+            httpx.Response: The cached or downloaded response
+        """
+        key = _key_of(request, scope)
+        entry = self.lookup(*key)
+        if entry is not None and self.is_fresh(entry):
+            self._count("hits")
+            return entry.to_response(request)
+        response = await send(entry.conditional_headers() if entry else {})
+        return self._update(key, entry, response)
+
+    def _update(
+        self,
+        key: CacheKey,
+        entry: Optional[CachedResponse],
+        response: httpx.Response,
+    ) -> httpx.Response:
+        """Update the cache with the response of a (conditional) query
+
+        Args:
+            key: Url, Accept header and scope of the query
+            entry: The cached result revalidated, None if there was none
+            response: The response
+
+        Returns:
+            httpx.Response: The cached response on 304, else the response
+        """
+        if entry is not None and response.status_code == 304:
+            self._count("revalidations")
+            return self.touch(entry).to_response(response.request)
+        if response.status_code == 200:
+            self._count("misses")
+            self.store(*key, response)
+        return response
+
+    def _count(self, counter: str) -> None:
+        """Increment a statistics counter
+
+        Args:
+            counter: Name of the counter
+        """
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def lookup(
+        self, url: str, accept: str, scope: str = ""
+    ) -> Optional[CachedResponse]:
+        """Find the cached result of a query
+
+        Args:
+            url: Full url of the structure query
+            accept: Accept header of the query
+            scope: Identity of the caller
+
+        Returns:
+            CachedResponse: The result, None if not cached
+        """
+        key = (url, accept, scope)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = self._read_from_disk(key)
+        if entry is not None:
+            self._remember(entry)
+        return entry
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Tell if a result can be used without revalidation
+
+        Args:
+            entry: The cached result
+
+        Returns:
+            bool: True if it was validated less than ttl seconds ago
+        """
+        return time.time() - entry.validated_at < self.ttl
+
+    def store(
+        self, url: str, accept: str, scope: str, response: httpx.Response
+    ) -> None:
+        """Cache the successful response of a structure query
+
+        Args:
+            url: Full url of the structure query
+            accept: Accept header of the query
+            scope: Identity of the caller
+            response: The response, already read
+        """
+        headers = {
+            name: response.headers[name]
+            for name in KEPT_HEADERS
+            if name in response.headers
+        }
+        entry = CachedResponse(
+            url,
+            accept,
+            scope,
+            response.status_code,
+            headers,
+            response.content,
+            time.time(),
+        )
+        self._remember(entry)
+        self._write_to_disk(entry)
+
+    def touch(self, entry: CachedResponse) -> CachedResponse:
+        """Mark a result as validated by a 304
+
+        Args:
+            entry: The cached result
+
+        Returns:
+            CachedResponse: The result with its new validation time
+        """
+        entry = entry._replace(validated_at=time.time())
+        self._remember(entry)
+        self._write_to_disk(entry)
+        return entry
+
+    def invalidate(self, path: Optional[str] = None) -> int:
+        """Drop the results that may include the artefact of a query
+
+        The results of every NSI service sharing the cache are checked, only
+        the artefact of the query is compared.
+
+        Args:
+            path: Structure query of the changed artefact, None to clear the
+                  whole cache. Other paths, such as data queries, are ignored.
+
+        Returns:
+            int: Number of results dropped
+        """
+        changed = parse_artefact(path) if path is not None else None
+        if path is not None and changed is None:
+            return 0
+        entries = list(self._entries.values()) + self._disk_entries()
+        dropped = {
+            _entry_key(entry)
+            for entry in entries
+            if changed is None
+            or is_affected(  # noqa W503
+                parse_artefact(httpx.URL(entry.url).path), changed
+            )
+        }
+        with self._lock:
+            for key in dropped:
+                self._entries.pop(key, None)
+        self._drop_from_disk(dropped)
+        log.debug(f"Structure cache: {len(dropped)} results invalidated")
+        return len(dropped)
+
+    def _remember(self, entry: CachedResponse) -> None:
+        """Keep a result in memory, evicting the least recently used ones
+
+        Args:
+            entry: The result
+        """
+        key = _entry_key(entry)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _drop_from_disk(self, keys: Iterable[CacheKey]) -> None:
+        """Delete results from the disk tier, if enabled
+
+        Args:
+            keys: Url, Accept header and scope of the results
+        """
+        if self.directory is None:
+            return
+        for key in keys:
+            self._disk_path(key).unlink(missing_ok=True)
+
+    def _disk_path(self, key: CacheKey) -> Path:
+        """File of a result in the disk tier
+
+        Args:
+            key: Url, Accept header and scope of the query
+
+        Returns:
+            Path: The file, named after the hash of the key
+        """
+        digest = hashlib.sha256("\n".join(key).encode()).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def _write_to_disk(self, entry: CachedResponse) -> None:
+        """Save a result in the disk tier, if enabled
+
+        Args:
+            entry: The result
+        """
+        if self.directory is None:
+            return
+        target = self._disk_path(_entry_key(entry))
+        temporary = target.with_suffix(f".{os.getpid()}.tmp")
+        record = entry._asdict() | {"content": entry.content.decode("latin-1")}
+        temporary.write_text(json.dumps(record))
+        temporary.replace(target)
+
+    def _read_from_disk(self, key: CacheKey) -> Optional[CachedResponse]:
+        """Load a result from the disk tier, if enabled
+
+        Args:
+            key: Url, Accept header and scope of the query
+
+        Returns:
+            CachedResponse: The result, None if not on disk or unreadable
+        """
+        if self.directory is None:
+            return None
+        return self._read_from_file(self._disk_path(key))
+
+    def _disk_entries(self) -> list:
+        """Every result of the disk tier
+
+        Returns:
+            list: The results
+        """
+        if self.directory is None:
+            return []
+        entries = map(self._read_from_file, self.directory.glob("*.json"))
+        return [entry for entry in entries if entry is not None]
+
+    @staticmethod
+    def _read_from_file(record_path: Path) -> Optional[CachedResponse]:
+        """Read a result file of the disk tier
+
+        Args:
+            record_path: The file
+
+        Returns:
+            CachedResponse: The result, None if missing or unreadable
+        """
+        try:
+            record = json.loads(record_path.read_text())
+            record["content"] = record["content"].encode("latin-1")
+            return CachedResponse(**record)
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
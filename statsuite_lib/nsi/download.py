@@ -0,0 +1,411 @@
+import codecs
+import logging
+import os
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, Dict, Iterable, Iterator, Optional, Union
+
+import httpx
+
+# Errors raised while reading a body whose download can be resumed with a Range
+RESUMABLE_ERRORS = (httpx.ReadError, httpx.RemoteProtocolError, httpx.ReadTimeout)
+DEFAULT_MAX_RESUMES = 3
+# Suffix of the file holding the validator of a partial download
+VALIDATOR_SUFFIX = ".validator"
+
+log = logging.getLogger("NSIClient")
+
+
+def _validator_of(response: httpx.Response) -> Optional[str]:
+    """Version of a resource, as sent back in an If-Range header
+
+    Args:
+        response: Response of a download
+
+    Returns:
+        str: The ETag, or the Last-Modified date, None if the server sent none
+    """
+    return response.headers.get("ETag") or response.headers.get("Last-Modified")
+
+
+def _range_size(response: httpx.Response) -> Optional[int]:
+    """Size of the resource given by the Content-Range of a 416 response
+
+    Args:
+        response: Response of a range request
+
+    Returns:
+        int: The size, None if the response does not give it
+    """
+    size = response.headers.get("Content-Range", "").rpartition("/")[2]
+    return int(size) if size.isdigit() else None
+
+
+class DownloadFile:
+    """Destination of a download, resumable by a later download
+
+    While a path is downloaded, the validator of the resource (its ETag or
+    Last-Modified date) is saved next to it and removed once the download
+    completes. A resumed download only continues a partial file whose
+    validator was saved, and asks the missing bytes with an If-Range, so a
+    resource that changed is downloaded again from the start instead of being
+    appended. File objects are written as is and never resumed.
+
+    Attributes:
+        size: Number of bytes in the file
+        validator: Validator of the partial file, None if it is not resumed
+        can_restart: False for file objects, which can not be truncated
+    """
+
+    def __init__(
+        self, destination: Union[str, os.PathLike, BinaryIO], resume: bool = False
+    ) -> None:
+        """Opens the destination
+
+        Args:
+            destination: Path or writable binary file object
+            resume: Continue a previous partial download of the path
+        """
+        self.size = 0
+        self.validator = None
+        self._validator_path = None
+        self.can_restart = isinstance(destination, (str, os.PathLike))
+        if not self.can_restart:
+            self._file = destination
+            return
+        path = Path(destination)
+        self._validator_path = path.with_name(path.name + VALIDATOR_SUFFIX)
+        if resume and path.exists() and self._validator_path.exists():
+            self.validator = self._validator_path.read_text().strip() or None
+            self.size = path.stat().st_size if self.validator else 0
+        self._file = open(path, "ab" if self.size else "wb")  # noqa SIM115
+
+    def __enter__(self) -> "DownloadFile":
+        """Use the destination
+
+        Returns:
+            DownloadFile: The destination
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the file, dropping its validator if the download completed
+
+        Args:
+            exc_type: Type of the error interrupting the download, if any
+            exc_value: The error
+            traceback: Its traceback
+        """
+        if not self.can_restart:
+            return
+        self._file.close()
+        if exc_type is None:
+            self._validator_path.unlink(missing_ok=True)
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk
+
+        Args:
+            chunk: The chunk
+        """
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def restart(self) -> None:
+        """Drop the bytes written, to download the resource again"""
+        self._file.seek(0)
+        self._file.truncate()
+        self.size = 0
+
+    def record_validator(self, validator: str) -> None:
+        """Remember the version of the resource written to the file
+
+        Args:
+            validator: ETag or Last-Modified date of the resource
+        """
+        self.validator = validator
+        if self._validator_path is not None:
+            self._validator_path.write_text(validator)
+
+
+class _DownloadState:
+    """Progress of a download, to resume it where it stopped
+
+    Attributes:
+        url: Url downloaded
+        offset: Number of bytes received
+        validator: Version of the bytes received, sent as If-Range when resuming
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        offset: int,
+        max_resumes: int,
+        validator: Optional[str] = None,
+        target: Optional[DownloadFile] = None,
+    ) -> None:
+        """Inits the state
+
+        Args:
+            url: Url downloaded
+            headers: Headers of the original request
+            offset: Number of bytes already received by a previous download
+            max_resumes: Max number of times the download is resumed
+            validator: Version of the bytes already received, None if unknown
+            target: File receiving the bytes, truncated when the download
+                starts over
+        """
+        self.url = url
+        self.offset = offset
+        self.validator = validator
+        self._headers = headers
+        self._target = target
+        self._resumes_left = max_resumes
+        self._skip = 0
+
+    def request_headers(self) -> Dict[str, str]:
+        """Headers of the next request
+
+        Ranges apply to the encoded body, the resumed part is asked without
+        content encoding so the offset counted on decoded bytes stays valid.
+        The If-Range makes the server send the whole resource if it changed.
+
+        Returns:
+            dict: The headers, with Range, If-Range and Accept-Encoding when
+            resuming
+        """
+        if not self.offset:
+            return self._headers
+        headers = self._headers | {
+            "Range": f"bytes={self.offset}-",
+            "Accept-Encoding": "identity",
+        }
+        if self.validator:
+            headers["If-Range"] = self.validator
+        return headers
+
+    def has_content(self, response: httpx.Response) -> bool:
+        """Check the response of a (resumed) request
+
+        Args:
+            response: The response
+
+        Returns:
+            bool: False if the bytes already received are the whole resource
+        """
+        if response.status_code == 416 and _range_size(response) == self.offset:
+            log.info(f"{self.url} already downloaded")
+            return False
+        response.raise_for_status()
+        self._skip = 0
+        if self.offset and response.status_code != 206:
+            self._start_over(response)
+        if self.validator is None:
+            self._record_validator(response)
+        return True
+
+    def _record_validator(self, response: httpx.Response) -> None:
+        """Remember the version of the resource downloaded
+
+        Args:
+            response: Response with the whole resource
+        """
+        self.validator = _validator_of(response)
+        if self._target is not None and self.validator:
+            self._target.record_validator(self.validator)
+
+    def _start_over(self, response: httpx.Response) -> None:
+        """Handle a whole resource sent instead of the asked range
+
+        The file receiving the bytes is truncated. A stream can not take back
+        the bytes already yielded, they are skipped if the resource did not
+        change.
+
+        Args:
+            response: The response, without partial content
+
+        Raises:
+            RuntimeError: If the resource changed and the bytes already
+                received can not be dropped
+        """
+        if self._target is not None and self._target.can_restart:
+            self._target.restart()
+            log.warning(f"Downloading {self.url} again from the start")
+            self.offset = 0
+            self.validator = None
+            return
+        if self.validator and _validator_of(response) != self.validator:
+            raise RuntimeError(f"{self.url} changed while it was downloaded")
+        log.warning("Range not supported, downloading again from the start")
+        self._skip = self.offset
+
+    def take(self, chunk: bytes) -> bytes:
+        """Account a received chunk
+
+        Args:
+            chunk: The chunk
+
+        Returns:
+            bytes: The part of the chunk not received yet
+        """
+        skip = self._skip
+        self._skip = max(0, skip - len(chunk))
+        self.offset += max(0, len(chunk) - skip)
+        return chunk[skip:]
+
+    def resume_after(self, error: Exception) -> None:
+        """Decide if the download is resumed after an error
+
+        Args:
+            error: Error interrupting the download
+
+        Raises:
+            error: If the download has been resumed too many times
+        """
+        if self._resumes_left <= 0:
+            raise error
+        self._resumes_left -= 1
+        log.warning(f"Download of {self.url} interrupted at {self.offset}: {error}")
+
+
+def iter_download(
+    client: httpx.Client,
+    url: str,
+    headers: Dict[str, str],
+    chunk_size: Optional[int] = None,
+    offset: int = 0,
+    max_resumes: int = DEFAULT_MAX_RESUMES,
+    timeout=httpx.USE_CLIENT_DEFAULT,
+    validator: Optional[str] = None,
+    target: Optional[DownloadFile] = None,
+) -> Iterator[bytes]:
+    """Stream the decoded body of a GET, resuming it when the connection drops
+
+    Args:
+        client: Client sending the requests
+        url: Url to download
+        headers: Headers of the request
+        chunk_size: Size of the chunks, None for the size received
+        offset: Number of bytes to skip, to resume a previous download
+        max_resumes: Max number of times the download is resumed
+        timeout: Timeout of the requests
+        validator: Version of the skipped bytes, sent as If-Range
+        target: File receiving the body, truncated if the download starts over
+
+    Yields:
+        bytes: The next chunk of the body
+    """
+    state = _DownloadState(url, headers, offset, max_resumes, validator, target)
+    while True:
+        try:
+            yield from _read_once(client, state, chunk_size, timeout)
+            return
+        except RESUMABLE_ERRORS as error:
+            state.resume_after(error)
+
+
+def _read_once(
+    client: httpx.Client, state: _DownloadState, chunk_size: Optional[int], timeout
+) -> Iterator[bytes]:
+    """Send one request of a download
+
+    Args:
+        client: Client sending the request
+        state: Progress of the download
+        chunk_size: Size of the chunks
+        timeout: Timeout of the request
+
+    Yields:
+        bytes: The chunks not received yet
+    """
+    headers = state.request_headers()
+    with client.stream("GET", state.url, headers=headers, timeout=timeout) as r:
+        if state.has_content(r):
+            yield from filter(None, map(state.take, r.iter_bytes(chunk_size)))
+
+
+async def aiter_download(
+    client: httpx.AsyncClient,
+    url: str,
+    headers: Dict[str, str],
+    chunk_size: Optional[int] = None,
+    offset: int = 0,
+    max_resumes: int = DEFAULT_MAX_RESUMES,
+    timeout=httpx.USE_CLIENT_DEFAULT,
+    validator: Optional[str] = None,
+    target: Optional[DownloadFile] = None,
+) -> AsyncIterator[bytes]:
+    """Async counterpart of iter_download
+
+    Args:
+        client: Client sending the requests
+        url: Url to download
+        headers: Headers of the request
+        chunk_size: Size of the chunks, None for the size received
+        offset: Number of bytes to skip, to resume a previous download
+        max_resumes: Max number of times the download is resumed
+        timeout: Timeout of the requests
+        validator: Version of the skipped bytes, sent as If-Range
+        target: File receiving the body, truncated if the download starts over
+
+    Yields:
+        bytes: The next chunk of the body
+    """
+    state = _DownloadState(url, headers, offset, max_resumes, validator, target)
+    while True:
+        try:
+            async for chunk in _aread_once(client, state, chunk_size, timeout):
+                yield chunk
+            return
+        except RESUMABLE_ERRORS as error:
+            state.resume_after(error)
+
+
+async def _aread_once(
+    client: httpx.AsyncClient,
+    state: _DownloadState,
+    chunk_size: Optional[int],
+    timeout,
+) -> AsyncIterator[bytes]:
+    """Send one request of a download
+
+    Args:
+        client: Client sending the request
+        state: Progress of the download
+        chunk_size: Size of the chunks
+        timeout: Timeout of the request
+
+    Yields:
+        bytes: The chunks not received yet
+    """
+    headers = state.request_headers()
+    async with client.stream("GET", state.url, headers=headers, timeout=timeout) as r:
+        if not state.has_content(r):
+            return
+        async for chunk in r.aiter_bytes(chunk_size):
+            if chunk := state.take(chunk):
+                yield chunk
+
+
+def iter_lines(chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """Split a stream of bytes in lines, keeping the line endings
+
+    Args:
+        chunks: The stream
+        encoding: Encoding of the text
+
+    Yields:
+        str: The next line
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in chunks:
+        lines = (pending + decoder.decode(chunk)).splitlines(keepends=True)
+        pending = ""
+        if lines and not lines[-1].endswith("\n"):
+            pending = lines.pop()
+        yield from lines
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
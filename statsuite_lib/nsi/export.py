@@ -0,0 +1,109 @@
+import tempfile
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from ..transport.streaming import DEFAULT_CHUNK_SIZE, iter_chunks
+
+# Parts are kept in memory up to this size, then spilled to a temporary file
+SPOOL_SIZE = 8 * 1024 * 1024
+
+Period = Tuple[str, str]
+
+
+def dimension_partitions(path: str, position: int, values: Iterable[str]) -> List[str]:
+    """Split a data query on the values of one dimension
+
+    Args:
+        path: Data query, such as ``/data/OECD,DF_GDP,1.0/A..USD``
+        position: Position of the dimension in the series key, from 0
+        values: Values of the dimension, one sub-query is built for each
+
+    Returns:
+        list: The sub-queries, in the order of the values
+
+    Example:
+        dimension_partitions("/data/OECD,DF_GDP,1.0/A..USD", 1, ["FR", "DE"])
+        # ["/data/OECD,DF_GDP,1.0/A.FR.USD", "/data/OECD,DF_GDP,1.0/A.DE.USD"]
+    """
+    base, _, query = path.partition("?")
+    prefix, _, key = base.rpartition("/")
+    dimensions = key.split(".")
+    paths = []
+    for value in values:
+        dimensions[position] = value
+        paths.append(
+            f"{prefix}/{'.'.join(dimensions)}" + (f"?{query}" if query else "")
+        )
+    return paths
+
+
+def period_partitions(path: str, periods: Iterable[Period]) -> List[str]:
+    """Split a data query on time period ranges
+
+    Args:
+        path: Data query, without startPeriod/endPeriod parameters
+        periods: (startPeriod, endPeriod) of each sub-query
+
+    Returns:
+        list: The sub-queries, in the order of the periods
+    """
+    separator = "&" if "?" in path else "?"
+    return [
+        f"{path}{separator}{urlencode({'startPeriod': start, 'endPeriod': end})}"
+        for start, end in periods
+    ]
+
+
+def year_periods(start: int, end: int, step: int = 1) -> List[Period]:
+    """Split a range of years in consecutive periods
+
+    Args:
+        start: First year
+        end: Last year, included
+        step: Number of years of each period
+
+    Returns:
+        list: (startPeriod, endPeriod) of each period
+    """
+    return [
+        (str(year), str(min(year + step - 1, end)))
+        for year in range(start, end + 1, step)
+    ]
+
+
+def spooled_part() -> IO[bytes]:
+    """Buffer receiving the result of a sub-query
+
+    Returns:
+        A file object kept in memory until it grows over SPOOL_SIZE
+    """
+    return tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE)  # noqa SIM115
+
+
+def merge_csv(
+    parts: Iterable[Optional[IO[bytes]]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    has_header: bool = False,
+) -> Iterator[bytes]:
+    """Concatenate CSV results, keeping only the header of the first one
+
+    Args:
+        parts: Results of the sub-queries in order, None for the empty ones.
+               Each part is closed once read.
+        chunk_size: Size in bytes of the chunks
+        has_header: The header was already written by a previous merge, the
+                    header of every part is dropped
+
+    Yields:
+        bytes: The merged CSV
+    """
+    for part in parts:
+        if part is None:
+            continue
+        with part:
+            part.seek(0)
+            header = part.readline()
+            if not has_header:
+                yield header
+                has_header = bool(header)
+            yield from iter_chunks(part, chunk_size)
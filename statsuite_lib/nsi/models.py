@@ -0,0 +1,71 @@
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+SUCCESS_STATUSES = frozenset({"Success", "Warning"})
+
+
+class SubmissionResult(BaseModel):
+    """Result of an artefact in a SubmitStructureResponse
+
+    Attributes:
+        model_config: Configuration
+        source: Name of the uploaded message
+        urn: URN of the artefact, None if the upload failed before it was read
+        action: Action requested, such as "Append", "Replace" or "Delete"
+        status: Status reported, "Success", "Warning" or "Failure"
+        messages: Texts of the status message
+        is_success: Whether the artefact was accepted
+    """
+
+    model_config = ConfigDict(defer_build=True)
+    source: Optional[str] = None
+    urn: Optional[str] = None
+    action: Optional[str] = None
+    status: Optional[str] = None
+    messages: List[str] = []
+
+    @property
+    def is_success(self) -> bool:
+        """Whether the artefact was accepted
+
+        Returns:
+            True for the Success and Warning statuses
+        """
+        return self.status in SUCCESS_STATUSES
+
+
+class SubmitStructureResponse(BaseModel):
+    """Outcome of a structure message upload
+
+    Attributes:
+        model_config: Configuration
+        source: Name of the uploaded message
+        status_code: HTTP status of the response, None if no response was received
+        results: Result of each artefact of the message
+        failed: Results of the artefacts that were not accepted
+        is_success: Whether every artefact was accepted
+    """
+
+    model_config = ConfigDict(defer_build=True)
+    source: Optional[str] = None
+    status_code: Optional[int] = None
+    results: List[SubmissionResult] = []
+
+    @property
+    def failed(self) -> List[SubmissionResult]:
+        """Results of the artefacts that were not accepted
+
+        Returns:
+            list: The failed results
+        """
+        return [result for result in self.results if not result.is_success]
+
+    @property
+    def is_success(self) -> bool:
+        """Whether every artefact was accepted
+
+        Returns:
+            True if the response has results and none of them failed
+        """
+        return bool(self.results) and not self.failed
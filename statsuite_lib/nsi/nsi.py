@@ -1,8 +1,98 @@
+import asyncio
+import csv
+import itertools
 import logging
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import aclosing, closing
+from functools import partial
+from typing import (
+    IO,
+    AsyncIterator,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
 
 import httpx
+from defusedxml import DefusedXmlException
+from defusedxml.ElementTree import ParseError
 
-from ..keycloak.keycloak import KeycloakClient
+from ..keycloak.keycloak import AsyncKeycloakClient, KeycloakClient
+from ..transport import create_async_client, get_default_client
+from ..transport.streaming import (
+    DEFAULT_CHUNK_SIZE,
+    UploadSource,
+    async_stream,
+    open_upload,
+    upload_content,
+    upload_name,
+)
+from .cache import StructureCache, parse_artefact
+from .download import (
+    DEFAULT_MAX_RESUMES,
+    DownloadFile,
+    aiter_download,
+    iter_download,
+    iter_lines,
+)
+from .export import merge_csv, spooled_part
+from .models import SubmissionResult, SubmitStructureResponse
+from .structures import (
+    SubmitResponseParser,
+    failed_upload,
+    iter_submission_results,
+    order_by_dependency,
+    to_submit_response,
+)
+
+SDMX_CSV = "application/vnd.sdmx.data+csv"
+
+DownloadTarget = Union[str, os.PathLike, BinaryIO]
+
+
+def _download_headers(compressed: bool, headers: Optional[dict]) -> Dict[str, str]:
+    """Headers of a streamed download, before authentication
+
+    Args:
+        compressed: Ask for a gzip encoded body, decoded on the fly
+        headers: Headers given by the caller
+
+    Returns:
+        dict: The headers
+    """
+    encoding = "gzip, deflate" if compressed else "identity"
+    return {"Accept-Encoding": encoding} | (headers or {})
+
+
+def _close_part(future: Union[Future, asyncio.Future]) -> None:
+    """Close the result of a sub-query that will not be merged
+
+    Args:
+        future: The finished sub-query
+    """
+    if future.cancelled() or future.exception() is not None:
+        return
+    if future.result() is not None:
+        future.result().close()
+
+
+def _discard_parts(pending: Iterable[Union[Future, asyncio.Future]]) -> None:
+    """Cancel the sub-queries of an interrupted export, closing their results
+
+    The results of the sub-queries already running are closed once they finish.
+
+    Args:
+        pending: The sub-queries not merged yet
+    """
+    for future in pending:
+        future.cancel()
+        future.add_done_callback(_close_part)
 
 
 class NSIClient:
@@ -18,53 +108,706 @@ class NSIClient:
     Args:
         nsi_url (str): Base URL of the NSI service.
         keycloak_client (KeycloakClient): Client for handling Keycloak authentication.
+        http_client (httpx.Client, optional): Pooled client used for the requests.
     """
 
-    def __init__(self, nsi_url: str, keycloak_client: KeycloakClient) -> None:
+    def __init__(
+        self,
+        nsi_url: str,
+        keycloak_client: KeycloakClient,
+        http_client: Optional[httpx.Client] = None,
+        structure_cache: Optional[StructureCache] = None,
+    ) -> None:
         """Initialize the NSIClient.
 
         Args:
             nsi_url (str): Base URL of the NSI service.
             keycloak_client (KeycloakClient): Initialized Keycloak client for authentication.
+            http_client (httpx.Client, optional): Pooled client used for the requests.
+                Defaults to the process wide client from ``statsuite_lib.transport``.
+            structure_cache (StructureCache, optional): Cache of the structure
+                queries done through ``get``. Defaults to None, no cache.
         """
-        self._client = httpx.Client()
+        self._client = http_client or get_default_client()
         self.NSI_URL = nsi_url
         self._keycloak_client = keycloak_client
+        self.structure_cache = structure_cache
         self.log = logging.getLogger("NSIClient")
 
-    def put(self, file_to_upload, path: str, timeout: int = None) -> int:
+    def put(
+        self,
+        file_to_upload: UploadSource,
+        path: str,
+        timeout: int = None,
+        compress: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
         """Upload a file to the NSI service.
 
+        Raw ``bytes``/``str`` contents are sent in one body, paths
+        (``pathlib.Path``) and file objects are streamed in chunks so the memory
+        used does not depend on the size of the file.
+
         Args:
-            file_to_upload: File content to upload.
+            file_to_upload: File content, path or file object to upload.
             path (str): Target path on the NSI service.
             timeout (int, optional): Request timeout in seconds. Defaults to None.
+            compress (bool, optional): Gzip the upload on the fly and send it with
+                ``Content-Encoding: gzip``. Defaults to False.
+            chunk_size (int, optional): Size in bytes of the streamed chunks.
 
         Returns:
             int: HTTP status code of the upload response.
 
         """
 
+        response = self._post_structure(
+            file_to_upload, path, timeout, compress, chunk_size
+        )
+        if response.status_code != 207:
+            self.log.info(f"NSI response: {response.text}")
+        self.log.info(response.text)
+        response.raise_for_status()
+        return response.status_code
+
+    def _post_structure(
+        self,
+        file_to_upload: UploadSource,
+        path: str,
+        timeout: Optional[int],
+        compress: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Post a structure message, see ``put``.
+
+        Args:
+            file_to_upload: File content, path or file object to upload.
+            path (str): Target path on the NSI service.
+            timeout (int, optional): Request timeout in seconds.
+            compress (bool, optional): Gzip the upload on the fly.
+            chunk_size (int, optional): Size in bytes of the streamed chunks.
+            stream (bool, optional): Return before the response body is read,
+                the caller must close the response.
+
+        Returns:
+            httpx.Response: The response of the NSI service.
+        """
         headers = self._keycloak_client.auth_header() | {
             "Content-Type": "application/x-www-form-urlencoded"
         }
+        if compress:
+            headers["Content-Encoding"] = "gzip"
 
         self.log.info(f"Uploading to NSI: {self.NSI_URL + path}")
 
-        response = httpx.post(
+        with open_upload(file_to_upload) as source:
+            request = self._client.build_request(
+                "POST",
+                self.NSI_URL + path,
+                content=upload_content(source, compress, chunk_size),
+                headers=headers,
+                timeout=timeout,
+            )
+            response = self._client.send(request, stream=stream)
+
+        if self.structure_cache is not None:
+            self.structure_cache.invalidate()
+        return response
+
+    def submit_structure(
+        self,
+        file_to_upload: UploadSource,
+        path: str,
+        timeout: int = None,
+        compress: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> SubmitStructureResponse:
+        """Upload a structure message and read the result of each artefact.
+
+        Unlike ``put``, errors do not raise: the SubmitStructureResponse of the
+        multi-status response is parsed while it is downloaded, and failed
+        requests are reported as a single Failure result.
+
+        Args:
+            file_to_upload: File content, path or file object to upload.
+            path (str): Target path on the NSI service.
+            timeout (int, optional): Request timeout in seconds. Defaults to None.
+            compress (bool, optional): Gzip the upload on the fly. Defaults to False.
+            chunk_size (int, optional): Size in bytes of the streamed chunks.
+
+        Returns:
+            SubmitStructureResponse: The result of each artefact of the message.
+
+        Example:
+            response = nsi.submit_structure(Path("dsd.xml"), "/rest/structure")
+            for result in response.failed:
+                print(result.urn, result.messages)
+        """
+        name = upload_name(file_to_upload)
+        try:
+            response = self._post_structure(
+                file_to_upload, path, timeout, compress, chunk_size, stream=True
+            )
+        except httpx.HTTPError as e:
+            return SubmitStructureResponse(
+                source=name, results=[failed_upload(name, str(e))]
+            )
+        try:
+            results = self._read_submission(name, response)
+        finally:
+            response.close()
+        return to_submit_response(name, response, results)
+
+    @staticmethod
+    def _read_submission(name: str, response: httpx.Response) -> List[SubmissionResult]:
+        """Parse a streamed SubmitStructureResponse.
+
+        Args:
+            name (str): Name of the uploaded message.
+            response (httpx.Response): Streamed response of the upload.
+
+        Returns:
+            list: The parsed results, empty if the body is not a valid message.
+        """
+        if response.is_error:
+            response.read()
+        try:
+            return list(iter_submission_results(response.iter_bytes(), name))
+        except (ParseError, DefusedXmlException, httpx.HTTPError):
+            return []
+
+    def put_structures(
+        self,
+        files: Iterable[UploadSource],
+        path: str,
+        max_workers: int = 4,
+        timeout: int = None,
+    ) -> List[SubmissionResult]:
+        """Upload many structure messages in dependency order.
+
+        The messages are grouped by the structure types they contain: codelists
+        and concept schemes first, then data structures, then dataflows, then
+        the other types. The messages of a group are uploaded concurrently, and
+        a group starts once the previous one is finished. Upload failures do not
+        stop the next groups, they are reported in the results.
+
+        Args:
+            files (Iterable): Contents, paths or file objects of the messages.
+            path (str): Target path on the NSI service.
+            max_workers (int, optional): Max concurrent uploads. Defaults to 4.
+            timeout (int, optional): Request timeout in seconds. Defaults to None.
+
+        Returns:
+            list: The result of each artefact, see ``submit_structure``.
+
+        Example:
+            results = nsi.put_structures(Path("release").glob("*.xml"), "/rest/structure")
+            failed = [result for result in results if not result.is_success]
+        """
+        submit = partial(self.submit_structure, path=path, timeout=timeout)
+        results = []
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for group in order_by_dependency(files):
+                for response in pool.map(submit, group):
+                    results.extend(response.results)
+        return results
+
+    def get(self, path: str, headers: dict = {}, timeout: int = None) -> httpx.Response:
+        """Retrieve a file or resource from the NSI service.
+
+        Args:
+            path (str): Path to the resource on the NSI service.
+            headers (dict, optional): Additional HTTP headers to include. Defaults to {}.
+            timeout (int, optional): Request timeout in seconds. Defaults to None.
+
+        Returns:
+            httpx.Response: Response object containing the requested resource.
+        """
+
+        headers = headers | self._keycloak_client.auth_header()
+        self.log.info(f"Getting from NSI: {self.NSI_URL + path}")
+        if self.structure_cache is None or parse_artefact(path) is None:
+            resp = self._client.get(
+                self.NSI_URL + path, headers=headers, timeout=timeout
+            )
+        else:
+            resp = self.structure_cache.fetch(
+                self._client.build_request("GET", self.NSI_URL + path, headers=headers),
+                lambda extra: self._client.get(
+                    self.NSI_URL + path, headers=headers | extra, timeout=timeout
+                ),
+                scope=self._keycloak_client.identity,
+            )
+        resp.raise_for_status()
+        return resp
+
+    def iter_bytes(
+        self,
+        path: str,
+        headers: Optional[dict] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        compressed: bool = True,
+        offset: int = 0,
+        max_resumes: int = DEFAULT_MAX_RESUMES,
+        timeout: int = None,
+        validator: Optional[str] = None,
+    ) -> Iterator[bytes]:
+        """Stream a resource from the NSI service without holding it in memory.
+
+        The body is asked gzip encoded and decoded on the fly. When the
+        connection drops the download is resumed with a ``Range`` request from
+        the last byte received.
+
+        Args:
+            path (str): Path to the resource on the NSI service.
+            headers (dict, optional): Additional HTTP headers to include.
+            chunk_size (int, optional): Size in bytes of the chunks.
+            compressed (bool, optional): Ask for a gzip encoded body. Defaults to
+                True.
+            offset (int, optional): Number of bytes to skip, to resume a previous
+                download. Defaults to 0.
+            max_resumes (int, optional): Max number of times the download is
+                resumed. Defaults to 3.
+            timeout (int, optional): Request timeout in seconds. Defaults to None.
+            validator (str, optional): ETag or Last-Modified date of the bytes
+                skipped by ``offset``, sent as ``If-Range`` so that a resource
+                that changed since raises a RuntimeError. Defaults to None.
+
+        Yields:
+            bytes: The next chunk of the resource.
+        """
+        headers = _download_headers(compressed, headers)
+        headers |= self._keycloak_client.auth_header()
+        self.log.info(f"Streaming from NSI: {self.NSI_URL + path}")
+        yield from iter_download(
+            self._client,
             self.NSI_URL + path,
-            content=file_to_upload,
-            headers=headers,
+            headers,
+            chunk_size=chunk_size,
+            offset=offset,
+            max_resumes=max_resumes,
             timeout=timeout,
+            validator=validator,
         )
 
-        if response.status_code != 207:
-            self.log.info(f"NSI response: {response.text}")
+    def iter_lines(
+        self, path: str, headers: Optional[dict] = None, encoding: str = "utf-8"
+    ) -> Iterator[str]:
+        """Stream a text resource from the NSI service line by line.
+
+        Args:
+            path (str): Path to the resource on the NSI service.
+            headers (dict, optional): Additional HTTP headers to include.
+            encoding (str, optional): Encoding of the resource. Defaults to utf-8.
+
+        Yields:
+            str: The next line, with its line ending.
+        """
+        yield from iter_lines(self.iter_bytes(path, headers), encoding)
+
+    def iter_rows(
+        self, path: str, headers: Optional[dict] = None
+    ) -> Iterator[List[str]]:
+        """Stream an SDMX-CSV data query from the NSI service row by row.
+
+        Args:
+            path (str): Path of the data query on the NSI service.
+            headers (dict, optional): Additional HTTP headers to include, the
+                Accept header defaults to SDMX-CSV.
+
+        Yields:
+            list: The next CSV row, starting with the header row.
+        """
+        headers = {"Accept": SDMX_CSV} | (headers or {})
+        yield from csv.reader(self.iter_lines(path, headers))
+
+    def download(
+        self,
+        path: str,
+        destination: DownloadTarget,
+        headers: Optional[dict] = None,
+        resume: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        timeout: int = None,
+    ) -> int:
+        """Download a resource from the NSI service to a file or pipe.
+
+        Args:
+            path (str): Path to the resource on the NSI service.
+            destination: Path of the file, or writable binary file object such
+                as ``sys.stdout.buffer``.
+            headers (dict, optional): Additional HTTP headers to include.
+            resume (bool, optional): Continue a previous partial download of the
+                file with a ``Range`` request, if the resource did not change
+                since. Defaults to False, the file is overwritten.
+            chunk_size (int, optional): Size in bytes of the chunks.
+            timeout (int, optional): Request timeout in seconds. Defaults to None.
+
+        Returns:
+            int: Size in bytes of the downloaded resource.
+        """
+        headers = _download_headers(True, headers)
+        headers |= self._keycloak_client.auth_header()
+        self.log.info(f"Downloading from NSI: {self.NSI_URL + path}")
+        with DownloadFile(destination, resume) as target:
+            for chunk in iter_download(
+                self._client,
+                self.NSI_URL + path,
+                headers,
+                chunk_size=chunk_size,
+                offset=target.size,
+                timeout=timeout,
+                validator=target.validator,
+                target=target,
+            ):
+                target.write(chunk)
+        return target.size
+
+    def _fetch_part(self, path: str, headers: dict) -> Optional[IO[bytes]]:
+        """Download the result of a sub-query of an export.
+
+        Args:
+            path (str): The sub-query.
+            headers (dict): HTTP headers of the export.
+
+        Returns:
+            The result, spooled to disk when large, None if there is no data.
+
+        Raises:
+            HTTPStatusError: If the sub-query fails.
+        """
+        part = spooled_part()
+        try:
+            self.download(path, part, headers=headers)
+        except httpx.HTTPStatusError as e:
+            part.close()
+            if e.response.status_code != 404:
+                raise
+            self.log.info(f"No results for {path}")
+            return None
+        return part
+
+    def iter_export(
+        self,
+        paths: Iterable[str],
+        headers: Optional[dict] = None,
+        max_workers: int = 4,
+    ) -> Iterator[bytes]:
+        """Run the sub-queries of a partitioned export and merge their results.
+
+        The sub-queries, built with ``dimension_partitions`` or
+        ``period_partitions``, are downloaded concurrently over the pooled
+        client. The results are merged in the order of the sub-queries into a
+        single SDMX-CSV with one header row. Sub-queries without results (404)
+        are skipped.
+
+        Args:
+            paths (Iterable): Data queries of the partitions, in order.
+            headers (dict, optional): Additional HTTP headers to include, the
+                Accept header defaults to SDMX-CSV.
+            max_workers (int, optional): Max concurrent sub-queries. Defaults to 4.
+
+        Yields:
+            bytes: The merged CSV.
+
+        Example:
+            paths = period_partitions("/data/OECD,DF_GDP,1.0/all",
+                                      year_periods(2000, 2023, step=4))
+            nsi.export(paths, "gdp.csv", max_workers=6)
+        """
+        headers = {"Accept": SDMX_CSV} | (headers or {})
+        with ThreadPoolExecutor(max_workers=max_workers) as pool, closing(
+            self._iter_parts(pool, paths, headers, max_workers)
+        ) as parts:
+            yield from merge_csv(parts)
+
+    def _iter_parts(
+        self,
+        pool: ThreadPoolExecutor,
+        paths: Iterable[str],
+        headers: dict,
+        max_workers: int,
+    ) -> Iterator[Optional[IO[bytes]]]:
+        """Run the sub-queries of an export, at most ``max_workers`` ahead.
+
+        The next sub-query is submitted as a result is taken, so the results
+        waiting to be merged do not grow with the number of partitions.
+
+        Args:
+            pool: Executor running the sub-queries.
+            paths (Iterable): Data queries of the partitions, in order.
+            headers (dict): HTTP headers of the export.
+            max_workers (int): Max sub-queries running or waiting to be merged.
+
+        Yields:
+            The result of each sub-query in order, None if there is no data.
+        """
+        paths = iter(paths)
+        pending = deque()
+        try:
+            while True:
+                for path in itertools.islice(paths, max_workers - len(pending)):
+                    pending.append(pool.submit(self._fetch_part, path, headers))
+                if not pending:
+                    return
+                yield pending.popleft().result()
+        finally:
+            _discard_parts(pending)
+
+    def export(
+        self,
+        paths: Iterable[str],
+        destination: DownloadTarget,
+        headers: Optional[dict] = None,
+        max_workers: int = 4,
+    ) -> int:
+        """Run a partitioned export into a file or pipe, see ``iter_export``.
+
+        Args:
+            paths (Iterable): Data queries of the partitions, in order.
+            destination: Path of the file, or writable binary file object.
+            headers (dict, optional): Additional HTTP headers to include.
+            max_workers (int, optional): Max concurrent sub-queries. Defaults to 4.
+
+        Returns:
+            int: Size in bytes of the merged result.
+        """
+        with DownloadFile(destination) as target:
+            for chunk in self.iter_export(paths, headers, max_workers):
+                target.write(chunk)
+        return target.size
+
+    def delete(self, path: str, timeout: int = None) -> int:
+        """Delete a file or resource from the NSI service.
+
+        Args:
+            path (str): Path to the resource to delete on the NSI service.
+            timeout (int, optional): Request timeout in seconds. Defaults to None.
+
+        Returns:
+            int: HTTP status code of the delete response.
+
+        """
+
+        headers = self._keycloak_client.auth_header()
+        self.log.info(f"Deleting from NSI: {self.NSI_URL + path}")
+        response = self._client.delete(
+            self.NSI_URL + path, headers=headers, timeout=timeout
+        )
+        if self.structure_cache is not None:
+            self.structure_cache.invalidate(path)
+        response.raise_for_status()
+        return response.status_code
+
+
+class AsyncNSIClient:
+    """Async counterpart of NSIClient, built on ``httpx.AsyncClient``.
+
+    Args:
+        nsi_url (str): Base URL of the NSI service.
+        keycloak_client (AsyncKeycloakClient): Client for handling Keycloak authentication.
+        http_client (httpx.AsyncClient, optional): Pooled client used for the requests.
+    """
+
+    def __init__(
+        self,
+        nsi_url: str,
+        keycloak_client: AsyncKeycloakClient,
+        http_client: Optional[httpx.AsyncClient] = None,
+        structure_cache: Optional[StructureCache] = None,
+    ) -> None:
+        """Initialize the AsyncNSIClient.
+
+        Args:
+            nsi_url (str): Base URL of the NSI service.
+            keycloak_client (AsyncKeycloakClient): Keycloak client for authentication.
+            http_client (httpx.AsyncClient, optional): Pooled client used for the
+                requests. Defaults to a new client owned by this instance.
+            structure_cache (StructureCache, optional): Cache of the structure
+                queries done through ``get``. Defaults to None, no cache.
+        """
+        self._client = http_client or create_async_client()
+        self.NSI_URL = nsi_url
+        self._keycloak_client = keycloak_client
+        self.structure_cache = structure_cache
+        self.log = logging.getLogger("NSIClient")
+
+    async def put(
+        self,
+        file_to_upload: UploadSource,
+        path: str,
+        timeout: int = None,
+        compress: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """Upload a file to the NSI service.
+
+        Args:
+            file_to_upload: File content, path or file object to upload.
+            path (str): Target path on the NSI service.
+            timeout (int, optional): Request timeout in seconds. Defaults to None.
+            compress (bool, optional): Gzip the upload on the fly. Defaults to False.
+            chunk_size (int, optional): Size in bytes of the streamed chunks.
+
+        Returns:
+            int: HTTP status code of the upload response.
+        """
+
+        response = await self._post_structure(
+            file_to_upload, path, timeout, compress, chunk_size
+        )
         self.log.info(response.text)
         response.raise_for_status()
         return response.status_code
 
-    def get(self, path: str, headers: dict = {}, timeout: int = None) -> httpx.Response:
+    async def _post_structure(
+        self,
+        file_to_upload: UploadSource,
+        path: str,
+        timeout: Optional[int],
+        compress: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        stream: bool = False,
+    ) -> httpx.Response:
+        """Post a structure message, see ``put``.
+
+        Args:
+            file_to_upload: File content, path or file object to upload.
+            path (str): Target path on the NSI service.
+            timeout (int, optional): Request timeout in seconds.
+            compress (bool, optional): Gzip the upload on the fly.
+            chunk_size (int, optional): Size in bytes of the streamed chunks.
+            stream (bool, optional): Return before the response body is read,
+                the caller must close the response.
+
+        Returns:
+            httpx.Response: The response of the NSI service.
+        """
+        headers = await self._keycloak_client.auth_header() | {
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+        if compress:
+            headers["Content-Encoding"] = "gzip"
+        self.log.info(f"Uploading to NSI: {self.NSI_URL + path}")
+        with open_upload(file_to_upload) as source:
+            content = upload_content(source, compress, chunk_size)
+            if not isinstance(content, (bytes, str)):
+                content = async_stream(content)
+            request = self._client.build_request(
+                "POST",
+                self.NSI_URL + path,
+                content=content,
+                headers=headers,
+                timeout=timeout,
+            )
+            response = await self._client.send(request, stream=stream)
+        if self.structure_cache is not None:
+            self.structure_cache.invalidate()
+        return response
+
+    async def submit_structure(
+        self,
+        file_to_upload: UploadSource,
+        path: str,
+        timeout: int = None,
+        compress: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> SubmitStructureResponse:
+        """Upload a structure message and read the result of each artefact.
+
+        See ``NSIClient.submit_structure``.
+
+        Args:
+            file_to_upload: File content, path or file object to upload.
+            path (str): Target path on the NSI service.
+            timeout (int, optional): Request timeout in seconds. Defaults to None.
+            compress (bool, optional): Gzip the upload on the fly. Defaults to False.
+            chunk_size (int, optional): Size in bytes of the streamed chunks.
+
+        Returns:
+            SubmitStructureResponse: The result of each artefact of the message.
+        """
+        name = upload_name(file_to_upload)
+        try:
+            response = await self._post_structure(
+                file_to_upload, path, timeout, compress, chunk_size, stream=True
+            )
+        except httpx.HTTPError as e:
+            return SubmitStructureResponse(
+                source=name, results=[failed_upload(name, str(e))]
+            )
+        try:
+            results = await self._read_submission(name, response)
+        finally:
+            await response.aclose()
+        return to_submit_response(name, response, results)
+
+    @staticmethod
+    async def _read_submission(
+        name: str, response: httpx.Response
+    ) -> List[SubmissionResult]:
+        """Parse a streamed SubmitStructureResponse.
+
+        Args:
+            name (str): Name of the uploaded message.
+            response (httpx.Response): Streamed response of the upload.
+
+        Returns:
+            list: The parsed results, empty if the body is not a valid message.
+        """
+        parser = SubmitResponseParser(name)
+        results = []
+        try:
+            async for chunk in response.aiter_bytes():
+                results.extend(parser.feed(chunk))
+            return results + parser.close()
+        except (ParseError, DefusedXmlException, httpx.HTTPError):
+            return []
+
+    async def put_structures(
+        self,
+        files: Iterable[UploadSource],
+        path: str,
+        max_workers: int = 4,
+        timeout: int = None,
+    ) -> List[SubmissionResult]:
+        """Upload many structure messages in dependency order.
+
+        See ``NSIClient.put_structures``.
+
+        Args:
+            files (Iterable): Contents, paths or file objects of the messages.
+            path (str): Target path on the NSI service.
+            max_workers (int, optional): Max concurrent uploads. Defaults to 4.
+            timeout (int, optional): Request timeout in seconds. Defaults to None.
+
+        Returns:
+            list: The result of each artefact, see ``submit_structure``.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def submit(file_to_upload: UploadSource) -> SubmitStructureResponse:
+            """Upload a message once a slot is free.
+
+            Args:
+                file_to_upload: The message.
+
+            Returns:
+                SubmitStructureResponse: The result of each artefact of the message.
+            """
+            async with semaphore:
+                return await self.submit_structure(file_to_upload, path, timeout)
+
+        results = []
+        for group in order_by_dependency(files):
+            for response in await asyncio.gather(*map(submit, group)):
+                results.extend(response.results)
+        return results
+
+    async def get(
+        self, path: str, headers: dict = {}, timeout: int = None
+    ) -> httpx.Response:
         """Retrieve a file or resource from the NSI service.
 
         Args:
@@ -76,13 +819,111 @@ class NSIClient:
             httpx.Response: Response object containing the requested resource.
         """
 
-        headers |= self._keycloak_client.auth_header()
+        headers = headers | await self._keycloak_client.auth_header()
         self.log.info(f"Getting from NSI: {self.NSI_URL + path}")
-        resp = httpx.get(self.NSI_URL + path, headers=headers, timeout=timeout)
+        if self.structure_cache is None or parse_artefact(path) is None:
+            resp = await self._client.get(
+                self.NSI_URL + path, headers=headers, timeout=timeout
+            )
+        else:
+            resp = await self.structure_cache.afetch(
+                self._client.build_request("GET", self.NSI_URL + path, headers=headers),
+                lambda extra: self._client.get(
+                    self.NSI_URL + path, headers=headers | extra, timeout=timeout
+                ),
+                scope=self._keycloak_client.identity,
+            )
         resp.raise_for_status()
         return resp
 
-    def delete(self, path: str, timeout: int = None) -> int:
+    async def iter_bytes(
+        self,
+        path: str,
+        headers: Optional[dict] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        compressed: bool = True,
+        offset: int = 0,
+        max_resumes: int = DEFAULT_MAX_RESUMES,
+        timeout: int = None,
+        validator: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream a resource from the NSI service without holding it in memory.
+
+        Args:
+            path (str): Path to the resource on the NSI service.
+            headers (dict, optional): Additional HTTP headers to include.
+            chunk_size (int, optional): Size in bytes of the chunks.
+            compressed (bool, optional): Ask for a gzip encoded body. Defaults to
+                True.
+            offset (int, optional): Number of bytes to skip, to resume a previous
+                download. Defaults to 0.
+            max_resumes (int, optional): Max number of times the download is
+                resumed. Defaults to 3.
+            timeout (int, optional): Request timeout in seconds. Defaults to None.
+            validator (str, optional): ETag or Last-Modified date of the bytes
+                skipped by ``offset``, sent as ``If-Range`` so that a resource
+                that changed since raises a RuntimeError. Defaults to None.
+
+        Yields:
+            bytes: The next chunk of the resource.
+        """
+        headers = _download_headers(compressed, headers)
+        headers |= await self._keycloak_client.auth_header()
+        self.log.info(f"Streaming from NSI: {self.NSI_URL + path}")
+        async for chunk in aiter_download(
+            self._client,
+            self.NSI_URL + path,
+            headers,
+            chunk_size=chunk_size,
+            offset=offset,
+            max_resumes=max_resumes,
+            timeout=timeout,
+            validator=validator,
+        ):
+            yield chunk
+
+    async def download(
+        self,
+        path: str,
+        destination: DownloadTarget,
+        headers: Optional[dict] = None,
+        resume: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        timeout: int = None,
+    ) -> int:
+        """Download a resource from the NSI service to a file or pipe.
+
+        Args:
+            path (str): Path to the resource on the NSI service.
+            destination: Path of the file, or writable binary file object.
+            headers (dict, optional): Additional HTTP headers to include.
+            resume (bool, optional): Continue a previous partial download of the
+                file with a ``Range`` request, if the resource did not change
+                since. Defaults to False, the file is overwritten.
+            chunk_size (int, optional): Size in bytes of the chunks.
+            timeout (int, optional): Request timeout in seconds. Defaults to None.
+
+        Returns:
+            int: Size in bytes of the downloaded resource.
+        """
+        headers = _download_headers(True, headers)
+        headers |= await self._keycloak_client.auth_header()
+        self.log.info(f"Downloading from NSI: {self.NSI_URL + path}")
+        with DownloadFile(destination, resume) as target:
+            async for chunk in aiter_download(
+                self._client,
+                self.NSI_URL + path,
+                headers,
+                chunk_size=chunk_size,
+                offset=target.size,
+                timeout=timeout,
+                validator=target.validator,
+                target=target,
+            ):
+                target.write(chunk)
+        return target.size
+
+    async def delete(self, path: str, timeout: int = None) -> int:
         """Delete a file or resource from the NSI service.
 
         Args:
@@ -91,11 +932,95 @@ class NSIClient:
 
         Returns:
             int: HTTP status code of the delete response.
-
         """
 
-        headers = self._keycloak_client.auth_header()
+        headers = await self._keycloak_client.auth_header()
         self.log.info(f"Deleting from NSI: {self.NSI_URL + path}")
-        response = httpx.delete(self.NSI_URL + path, headers=headers, timeout=timeout)
+        response = await self._client.delete(
+            self.NSI_URL + path, headers=headers, timeout=timeout
+        )
+        if self.structure_cache is not None:
+            self.structure_cache.invalidate(path)
         response.raise_for_status()
         return response.status_code
+
+    async def _fetch_part(self, path: str, headers: dict) -> Optional[IO[bytes]]:
+        """Download the result of a sub-query of an export.
+
+        Args:
+            path (str): The sub-query.
+            headers (dict): HTTP headers of the export.
+
+        Returns:
+            The result, spooled to disk when large, None if there is no data.
+
+        Raises:
+            HTTPStatusError: If the sub-query fails.
+        """
+        part = spooled_part()
+        try:
+            await self.download(path, part, headers=headers)
+        except httpx.HTTPStatusError as e:
+            part.close()
+            if e.response.status_code != 404:
+                raise
+            self.log.info(f"No results for {path}")
+            return None
+        return part
+
+    async def export(
+        self,
+        paths: Iterable[str],
+        destination: DownloadTarget,
+        headers: Optional[dict] = None,
+        max_workers: int = 4,
+    ) -> int:
+        """Run the sub-queries of a partitioned export and merge their results.
+
+        See ``NSIClient.iter_export``.
+
+        Args:
+            paths (Iterable): Data queries of the partitions, in order.
+            destination: Path of the file, or writable binary file object.
+            headers (dict, optional): Additional HTTP headers to include, the
+                Accept header defaults to SDMX-CSV.
+            max_workers (int, optional): Max concurrent sub-queries. Defaults to 4.
+
+        Returns:
+            int: Size in bytes of the merged result.
+        """
+        headers = {"Accept": SDMX_CSV} | (headers or {})
+        parts = self._iter_parts(paths, headers, max_workers)
+        with DownloadFile(destination) as target:
+            async with aclosing(parts):
+                async for part in parts:
+                    for chunk in merge_csv([part], has_header=target.size > 0):
+                        target.write(chunk)
+        return target.size
+
+    async def _iter_parts(
+        self, paths: Iterable[str], headers: dict, max_workers: int
+    ) -> AsyncIterator[Optional[IO[bytes]]]:
+        """Run the sub-queries of an export, at most ``max_workers`` ahead.
+
+        Args:
+            paths (Iterable): Data queries of the partitions, in order.
+            headers (dict): HTTP headers of the export.
+            max_workers (int): Max sub-queries running or waiting to be merged.
+
+        Yields:
+            The result of each sub-query in order, None if there is no data.
+        """
+        paths = iter(paths)
+        pending = deque()
+        try:
+            while True:
+                for path in itertools.islice(paths, max_workers - len(pending)):
+                    pending.append(
+                        asyncio.ensure_future(self._fetch_part(path, headers))
+                    )
+                if not pending:
+                    return
+                yield await pending.popleft()
+        finally:
+            _discard_parts(pending)
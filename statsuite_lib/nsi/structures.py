@@ -0,0 +1,355 @@
+import io
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+# Only the tree types, the XML is parsed by defusedxml
+from xml.etree.ElementTree import Element, TreeBuilder  # noqa S405 # nosec B405
+
+import httpx
+from defusedxml import ElementTree as DefusedET
+
+from ..transport.streaming import UploadSource, open_upload
+from .models import SubmissionResult, SubmitStructureResponse
+
+# Upload order of the structure types, artefacts only depend on lower levels
+STRUCTURE_LEVELS: Dict[str, int] = {
+    "AgencySchemes": 0,
+    "Codelists": 0,
+    "ConceptSchemes": 0,
+    "CategorySchemes": 0,
+    "DataConsumerSchemes": 0,
+    "DataProviderSchemes": 0,
+    "OrganisationUnitSchemes": 0,
+    "ValueLists": 0,
+    "HierarchicalCodelists": 1,
+    "DataStructures": 1,
+    "MetadataStructures": 1,
+    "Dataflows": 2,
+    "Metadataflows": 2,
+}
+# Level of the other types: categorisations, constraints, provision agreements...
+DEFAULT_LEVEL = 3
+NO_RESULTS = "No SubmitStructureResponse in the response body"
+
+
+def _local_name(tag: str) -> str:
+    """Strip the namespace of an ElementTree tag
+
+    Args:
+        tag: Tag in ``{namespace}name`` form
+
+    Returns:
+        str: The name
+    """
+    return tag.rsplit("}", 1)[-1]
+
+
+def _readable(source: Union[bytes, str, BinaryIO]) -> BinaryIO:
+    """Binary file object reading an opened upload source
+
+    Args:
+        source: Raw content or binary file object
+
+    Returns:
+        A binary file object
+    """
+    if isinstance(source, str):
+        source = source.encode()
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    return source
+
+
+def structure_types(source: UploadSource) -> Set[str]:
+    """List the structure types of an SDMX-ML structure message
+
+    The message is parsed incrementally, clearing the elements once read, so
+    the memory used does not depend on its size. File objects are rewound.
+
+    Args:
+        source: Message content, path or file object
+
+    Returns:
+        set: Names of the children of the Structures element, such as
+             "Codelists" or "DataStructures"
+    """
+    types = set()
+    path = []
+    with open_upload(source) as opened:
+        stream = _readable(opened)
+        start = stream.tell()
+        for event, element in DefusedET.iterparse(stream, ("start", "end")):
+            if event == "end":
+                path.pop()
+                element.clear()
+                continue
+            path.append(_local_name(element.tag))
+            if len(path) == 3 and path[1] == "Structures":
+                types.add(path[2])
+        stream.seek(start)
+    return types
+
+
+def dependency_level(source: UploadSource) -> int:
+    """Upload level of a structure message
+
+    A message mixing several types is ranked by its most dependent one, so the
+    artefacts it references in other messages are uploaded before it.
+
+    Args:
+        source: Message content, path or file object
+
+    Returns:
+        int: The level, lower levels are uploaded first
+    """
+    levels = [
+        STRUCTURE_LEVELS.get(name, DEFAULT_LEVEL) for name in structure_types(source)
+    ]
+    return max(levels, default=DEFAULT_LEVEL)
+
+
+def order_by_dependency(
+    sources: Iterable[UploadSource],
+) -> List[List[UploadSource]]:
+    """Group structure messages by upload level
+
+    Args:
+        sources: Message contents, paths or file objects
+
+    Returns:
+        list: Groups of messages, in upload order. The messages of a group do
+              not depend on each other and can be uploaded concurrently.
+    """
+    groups: Dict[int, List[UploadSource]] = {}
+    for source in sources:
+        groups.setdefault(dependency_level(source), []).append(source)
+    return [groups[level] for level in sorted(groups)]
+
+
+class _EventTarget:
+    """Parser target building the tree and recording its start and end events
+
+    It plays the part of ``XMLPullParser`` on top of the defused parser, which
+    rejects the entity declarations of hostile responses.
+    """
+
+    def __init__(self) -> None:
+        """Inits the target"""
+        self._builder = TreeBuilder()
+        self.events: List[Tuple[str, Element]] = []
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        """Open an element
+
+        Args:
+            tag: Tag of the element
+            attrib: Attributes of the element
+        """
+        self.events.append(("start", self._builder.start(tag, attrib)))
+
+    def end(self, tag: str) -> None:
+        """Close an element
+
+        Args:
+            tag: Tag of the element
+        """
+        self.events.append(("end", self._builder.end(tag)))
+
+    def data(self, text: str) -> None:
+        """Add text to the current element
+
+        Args:
+            text: The text
+        """
+        self._builder.data(text)
+
+    def close(self) -> Element:
+        """Finish the tree
+
+        Returns:
+            Element: The root element
+        """
+        return self._builder.close()
+
+    def read_events(self) -> List[Tuple[str, Element]]:
+        """Take the events recorded since the last call
+
+        Returns:
+            list: The (event, element) pairs, in document order
+        """
+        events, self.events = self.events, []
+        return events
+
+
+class SubmitResponseParser:
+    """Incremental parser of SubmitStructureResponse messages
+
+    The response is fed in chunks. Each SubmissionResult is converted once its
+    end tag is read and its element is cleared, so the memory used does not
+    depend on the number of artefacts.
+
+    Attributes:
+        source: Name of the uploaded message, copied in each result
+    """
+
+    def __init__(self, source: Optional[str] = None) -> None:
+        """Inits the parser
+
+        Args:
+            source: Name of the uploaded message
+        """
+        self.source = source
+        self._target = _EventTarget()
+        self._parser = DefusedET.XMLParser(target=self._target)
+        self._depth = 0
+
+    def feed(self, chunk: Union[bytes, str]) -> List[SubmissionResult]:
+        """Parse a chunk of the response
+
+        Args:
+            chunk: Next part of the response body
+
+        Returns:
+            list: The results completed by the chunk
+        """
+        self._parser.feed(chunk)
+        return self._read_events()
+
+    def close(self) -> List[SubmissionResult]:
+        """Finish parsing
+
+        Returns:
+            list: The results completed by the end of the response
+        """
+        self._parser.close()
+        return self._read_events()
+
+    def _read_events(self) -> List[SubmissionResult]:
+        """Convert the SubmissionResult elements completed so far
+
+        Returns:
+            list: The completed results
+        """
+        results = []
+        for event, element in self._target.read_events():
+            is_result = _local_name(element.tag) == "SubmissionResult"
+            if event == "start":
+                self._depth += is_result
+                continue
+            if is_result:
+                self._depth -= 1
+                results.append(self._to_result(element))
+            if not self._depth:
+                element.clear()
+        return results
+
+    def _to_result(self, element: Element) -> SubmissionResult:
+        """Convert a SubmissionResult element
+
+        Args:
+            element: The SubmissionResult element
+
+        Returns:
+            SubmissionResult: The result of the artefact
+        """
+        fields = {"source": self.source, "messages": []}
+        for child in element.iter():
+            _read_result_element(fields, child)
+        return SubmissionResult.model_validate(fields)
+
+
+def iter_submission_results(
+    chunks: Iterable[Union[bytes, str]], source: Optional[str] = None
+) -> Iterator[SubmissionResult]:
+    """Parse a SubmitStructureResponse while it is downloaded
+
+    Args:
+        chunks: Parts of the response body, as returned by ``iter_bytes``
+        source: Name of the uploaded message, copied in each result
+
+    Yields:
+        SubmissionResult: The result of each artefact
+    """
+    parser = SubmitResponseParser(source)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def parse_submit_response(
+    content: Union[bytes, str], source: Optional[str] = None
+) -> List[SubmissionResult]:
+    """Parse the SubmitStructureResponse of a structure upload
+
+    Args:
+        content: Body of the multi-status response
+        source: Name of the uploaded message, copied in each result
+
+    Returns:
+        list: One result per submitted artefact
+    """
+    return list(iter_submission_results([content], source))
+
+
+def _read_result_element(fields: dict, element: Element) -> None:
+    """Copy an element of a SubmissionResult into the result fields
+
+    Args:
+        fields: The fields of the result
+        element: Element of the SubmissionResult
+    """
+    name = _local_name(element.tag)
+    if name == "SubmittedStructure":
+        fields["action"] = element.get("action")
+    elif name == "URN":
+        fields["urn"] = (element.text or "").strip()
+    elif name == "StatusMessage":
+        fields["status"] = element.get("status")
+    elif name == "Text" and element.text:
+        fields["messages"].append(element.text.strip())
+
+
+def failed_upload(source: Optional[str], message: str) -> SubmissionResult:
+    """Result of a message whose upload failed without SubmitStructureResponse
+
+    Args:
+        source: Name of the uploaded message
+        message: Reason of the failure, such as the body of the error response
+
+    Returns:
+        SubmissionResult: A result with a Failure status
+    """
+    return SubmissionResult(source=source, status="Failure", messages=[message])
+
+
+def to_submit_response(
+    source: Optional[str],
+    response: httpx.Response,
+    results: List[SubmissionResult],
+) -> SubmitStructureResponse:
+    """Outcome of a structure upload
+
+    Args:
+        source: Name of the uploaded message
+        response: Response of the upload, read if it is an error
+        results: Results parsed from the response
+
+    Returns:
+        SubmitStructureResponse: The parsed results, or a single failure result
+        if the response has none
+    """
+    if not results:
+        reason = response.text if response.is_error else NO_RESULTS
+        results = [failed_upload(source, reason)]
+    return SubmitStructureResponse(
+        source=source, status_code=response.status_code, results=results
+    )
@@ -0,0 +1,3 @@
+from .models import DataflowRelease, PipelineReport, StageRun, StageTiming
+from .pipeline import Pipeline, Stage
+from .release import release_pipeline
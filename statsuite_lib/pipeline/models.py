@@ -0,0 +1,119 @@
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class StageRun(BaseModel):
+    """Outcome of a stage for an item
+
+    Attributes:
+        model_config: Configuration
+        status: "done", "failed" or "skipped" when a required stage did not succeed
+        result: Value returned by the stage, passed to the next stages
+        error: Reason of the failure or of the skip
+        duration: Time (secs) spent running the stage
+    """
+
+    model_config = ConfigDict(defer_build=True)
+    status: str
+    result: Any = None
+    error: Optional[str] = None
+    duration: float = 0.0
+
+
+class StageTiming(BaseModel):
+    """Timings of a stage over all the items
+
+    Attributes:
+        model_config: Configuration
+        runs: Number of runs, done or failed
+        total: Cumulated duration (secs) of the runs
+        slowest: Duration (secs) of the slowest run
+        mean: Mean duration (secs) of a run
+    """
+
+    model_config = ConfigDict(defer_build=True)
+    runs: int = 0
+    total: float = 0.0
+    slowest: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Mean duration of a run
+
+        Returns:
+            float: The mean duration in seconds, 0 without runs
+        """
+        return self.total / self.runs if self.runs else 0.0
+
+
+class PipelineReport(BaseModel):
+    """Stage runs of a pipeline, also used as its checkpoint
+
+    Attributes:
+        model_config: Configuration
+        items: Runs of each stage, by item key then stage name
+        duration: Wall clock time (secs) of the last run of the pipeline
+    """
+
+    model_config = ConfigDict(defer_build=True)
+    items: Dict[str, Dict[str, StageRun]] = {}
+    duration: float = 0.0
+
+    def failed(self) -> Dict[str, Dict[str, StageRun]]:
+        """Items with a failed or skipped stage
+
+        Returns:
+            dict: The unsuccessful runs, by item key then stage name
+        """
+        failed = {}
+        for key, runs in self.items.items():
+            errors = {name: run for name, run in runs.items() if run.status != DONE}
+            if errors:
+                failed[key] = errors
+        return failed
+
+    def stage_timings(self) -> Dict[str, StageTiming]:
+        """Aggregate the durations of each stage
+
+        Returns:
+            dict: Timings by stage name
+        """
+        timings: Dict[str, StageTiming] = {}
+        for runs in self.items.values():
+            for name, run in runs.items():
+                if run.status == SKIPPED:
+                    continue
+                timing = timings.setdefault(name, StageTiming())
+                timing.runs += 1
+                timing.total += run.duration
+                timing.slowest = max(timing.slowest, run.duration)
+        return timings
+
+
+class DataflowRelease(BaseModel):
+    """A dataflow to release with ``release_pipeline``
+
+    Attributes:
+        model_config: Configuration
+        dataflow: Id of the dataflow
+        file_object: SDMX file imported first, a ``pathlib.Path`` so it is
+            re-read when the pipeline is resumed
+        dataspace: Dataspace the file is imported to
+        destination_dataspace: Dataspace the dataflow is transferred to, None to
+            skip the transfer
+        dsd: Id of the DSD to tune, None to skip the tune
+        index_type: Index type set by the tune, None to skip the tune
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, defer_build=True)
+    dataflow: str
+    file_object: Any
+    dataspace: str
+    destination_dataspace: Optional[str] = None
+    dsd: Optional[str] = None
+    index_type: Optional[int] = None
@@ -0,0 +1,350 @@
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+from .models import DONE, FAILED, SKIPPED, PipelineReport, StageRun
+
+# Key of the runs of the join stages in the report
+JOIN_KEY = "*"
+
+StageResults = Dict[str, Any]
+
+
+def _run_timed(
+    function: Callable[..., Any], *args: Any
+) -> Tuple[Any, Optional[Exception], float]:
+    """Run a stage in its worker and measure it
+
+    The clock starts in the worker, the time spent queued behind the other
+    runs of the stage is not counted.
+
+    Args:
+        function: Function running the stage
+        args: Arguments of the stage
+
+    Returns:
+        The result, the exception raised or None, and the duration in seconds
+    """
+    started = time.monotonic()
+    try:
+        result = function(*args)
+    except Exception as e:
+        return None, e, time.monotonic() - started
+    return result, None, time.monotonic() - started
+
+
+class Stage:
+    """A step of a pipeline
+
+    A stage runs once per item, when the stages it requires are done for that
+    item. A join stage runs once for the whole pipeline, when the stages it
+    requires have finished for every item, with the items that succeeded.
+
+    Attributes:
+        name: Name of the stage, unique in the pipeline
+        run: Called with the item and the results of its previous stages by
+            name. A join stage is called with the items and their results by
+            item key. The return value must be JSON serialisable to be saved in
+            the checkpoint.
+        requires: Names of the stages run before this one, None for the
+            previous stage of the pipeline
+        max_workers: Max concurrent runs of the stage
+        join: Whether the stage runs once for all the items
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[..., Any],
+        requires: Optional[Iterable[str]] = None,
+        max_workers: int = 1,
+        join: bool = False,
+    ) -> None:
+        """Inits the stage
+
+        Args:
+            name: Name of the stage, unique in the pipeline
+            run: Function running the stage
+            requires: Names of the stages run before this one, None for the
+                previous stage of the pipeline
+            max_workers: Max concurrent runs of the stage
+            join: Whether the stage runs once for all the items
+        """
+        self.name = name
+        self.run = run
+        self.requires = None if requires is None else tuple(requires)
+        self.max_workers = max_workers
+        self.join = join
+
+
+class Pipeline:
+    """Runs stages for many items as a DAG
+
+    Every stage has its own pool of ``max_workers`` threads, and the items move
+    through the stages independently: an item is imported while another one is
+    waited for and a third one transferred. A failed stage skips the stages
+    that require it for that item only.
+
+    With a checkpoint file the report is saved after every stage run, and the
+    stages done by a previous run are not run again, so a crashed pipeline is
+    resumed by running it again with the same items.
+
+    Attributes:
+        stages: The stages, in declaration order
+        checkpoint: Path of the checkpoint file, None to disable it
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        checkpoint: Optional[Union[str, Path]] = None,
+    ) -> None:
+        """Inits the pipeline
+
+        Args:
+            stages: The stages, a stage only requires stages declared before it
+                and no stage requires a join stage
+            checkpoint: Path of the checkpoint file, None to disable it
+        """
+        self.stages: List[Stage] = []
+        for stage in stages:
+            self._add(stage)
+        self.checkpoint = Path(checkpoint).expanduser() if checkpoint else None
+        self._log = logging.getLogger("Pipeline")
+
+    def _add(self, stage: Stage) -> None:
+        """Validate and append a stage
+
+        Args:
+            stage: The stage
+
+        Raises:
+            ValueError: If the name is not unique or the stage requires an
+                unknown stage, a later stage, or a join stage
+        """
+        declared = {previous.name: previous for previous in self.stages}
+        if stage.name in declared or stage.name == JOIN_KEY:
+            raise ValueError(f"Invalid stage name {stage.name}")
+        if stage.requires is None:
+            stage.requires = (self.stages[-1].name,) if self.stages else ()
+        invalid = [
+            name
+            for name in stage.requires
+            if name not in declared or declared[name].join
+        ]
+        if invalid:
+            raise ValueError(f"Stage {stage.name} cannot require {invalid}")
+        self.stages.append(stage)
+
+    def run(
+        self, items: Iterable[Any], key: Callable[[Any], Hashable] = str
+    ) -> PipelineReport:
+        """Run the stages for the items
+
+        Args:
+            items: The items, such as ``DataflowRelease`` instances
+            key: Unique and stable identifier of an item, used in the report
+                and the checkpoint. Defaults to ``str``
+
+        Returns:
+            PipelineReport: The runs of every stage, with their timings
+        """
+        by_key = {str(key(item)): item for item in items}
+        report = self._read_checkpoint(by_key)
+        started = time.monotonic()
+        with ExitStack() as stack:
+            executors = {
+                stage.name: stack.enter_context(
+                    ThreadPoolExecutor(stage.max_workers, stage.name)
+                )
+                for stage in self.stages
+            }
+            _PipelineRun(self, by_key, report, executors).execute()
+        report.duration = time.monotonic() - started
+        self._write_checkpoint(report)
+        return report
+
+    def _read_checkpoint(self, items: Dict[str, Any]) -> PipelineReport:
+        """Load the stages done by a previous run
+
+        Args:
+            items: The items of this run by key
+
+        Returns:
+            PipelineReport: The done runs of the items, empty without checkpoint
+        """
+        report = PipelineReport()
+        if self.checkpoint is None or not self.checkpoint.exists():
+            return report
+        saved = PipelineReport.model_validate_json(self.checkpoint.read_bytes())
+        for item_key, runs in saved.items.items():
+            done = {name: run for name, run in runs.items() if run.status == DONE}
+            if item_key in items or item_key == JOIN_KEY:
+                report.items[item_key] = done
+        self._log.info(f"Resuming pipeline from {self.checkpoint}")
+        return report
+
+    def _write_checkpoint(self, report: PipelineReport) -> None:
+        """Save the report atomically
+
+        Args:
+            report: The current report
+        """
+        if self.checkpoint is None:
+            return
+        self.checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.checkpoint.parent)
+        with os.fdopen(fd, "w") as tmp_file:
+            tmp_file.write(report.model_dump_json(indent=2))
+        os.replace(tmp, self.checkpoint)
+
+
+class _PipelineRun:
+    """State of a running pipeline"""
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        items: Dict[str, Any],
+        report: PipelineReport,
+        executors: Dict[str, ThreadPoolExecutor],
+    ) -> None:
+        """Inits the run
+
+        Args:
+            pipeline: The pipeline
+            items: The items by key
+            report: Report updated by the run, with the runs to skip
+            executors: Pool of each stage
+        """
+        self.pipeline = pipeline
+        self.items = items
+        self.report = report
+        self.executors = executors
+        self.running: Dict[Future, Tuple[str, Stage]] = {}
+        self.started = set()
+        joins = [JOIN_KEY] if any(stage.join for stage in pipeline.stages) else []
+        for item_key in [*items, *joins]:
+            report.items.setdefault(item_key, {})
+
+    def execute(self) -> None:
+        """Run the stages until every item is finished"""
+        self._submit_ready()
+        while self.running:
+            done, _ = wait(self.running, return_when=FIRST_COMPLETED)
+            for future in done:
+                self._record(future)
+            self.pipeline._write_checkpoint(self.report)
+            self._submit_ready()
+
+    def _submit_ready(self) -> None:
+        """Start the stages whose requirements are met"""
+        for stage in self.pipeline.stages:
+            item_keys = [JOIN_KEY] if stage.join else list(self.items)
+            for item_key in item_keys:
+                self._start(item_key, stage)
+
+    def _start(self, item_key: str, stage: Stage) -> None:
+        """Submit or skip a stage once its requirements are finished
+
+        Args:
+            item_key: Key of the item, JOIN_KEY for a join stage
+            stage: The stage
+        """
+        if (item_key, stage.name) in self.started:
+            return
+        runs = self.report.items[item_key]
+        if stage.name in runs:
+            self.started.add((item_key, stage.name))
+            return
+        args = (
+            self._join_args(stage) if stage.join else self._item_args(item_key, stage)
+        )
+        if args is None:
+            return
+        self.started.add((item_key, stage.name))
+        if isinstance(args, str):
+            runs[stage.name] = StageRun(status=SKIPPED, error=args)
+            return
+        future = self.executors[stage.name].submit(_run_timed, stage.run, *args)
+        self.running[future] = (item_key, stage)
+
+    def _item_args(self, item_key: str, stage: Stage) -> Union[None, str, tuple]:
+        """Arguments of a stage for an item
+
+        Args:
+            item_key: Key of the item
+            stage: The stage
+
+        Returns:
+            The item and its results, None while a required stage is not
+            finished, or the reason to skip the stage
+        """
+        runs = self.report.items[item_key]
+        required = [runs.get(name) for name in stage.requires]
+        if None in required:
+            return None
+        for name, run in zip(stage.requires, required):
+            if run.status != DONE:
+                return f"Required stage {name} {run.status}"
+        return self.items[item_key], self._results(item_key)
+
+    def _join_args(self, stage: Stage) -> Union[None, str, tuple]:
+        """Arguments of a join stage
+
+        Args:
+            stage: The join stage
+
+        Returns:
+            The succeeded items and their results by key, None while an item
+            has not finished the required stages, or the reason to skip the
+            stage
+        """
+        states = [self._item_args(item_key, stage) for item_key in self.items]
+        if None in states:
+            return None
+        succeeded = {
+            item_key: self.items[item_key]
+            for item_key, state in zip(self.items, states)
+            if isinstance(state, tuple)
+        }
+        if not succeeded:
+            return "No item succeeded the required stages"
+        return succeeded, {item_key: self._results(item_key) for item_key in succeeded}
+
+    def _results(self, item_key: str) -> StageResults:
+        """Results of the done stages of an item
+
+        Args:
+            item_key: Key of the item
+
+        Returns:
+            dict: The results by stage name
+        """
+        return {
+            name: run.result
+            for name, run in self.report.items[item_key].items()
+            if run.status == DONE
+        }
+
+    def _record(self, future: Future) -> None:
+        """Save the outcome of a finished stage
+
+        Args:
+            future: The finished stage run
+        """
+        item_key, stage = self.running.pop(future)
+        result, error, duration = future.result()
+        if error is None:
+            run = StageRun(status=DONE, result=result, duration=duration)
+        else:
+            self.pipeline._log.error(
+                f"Stage {stage.name} failed for {item_key}: {error}"
+            )
+            run = StageRun(status=FAILED, error=str(error), duration=duration)
+        self.report.items[item_key][stage.name] = run
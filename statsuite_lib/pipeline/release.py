@@ -0,0 +1,341 @@
+import threading
+from collections import defaultdict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..polling import Poller, PollingSchedule, PollResult
+from ..sfs import SFSClient
+from ..transfer import TransferClient
+from ..transfer.models import TERMINAL_STATUSES
+from .models import DataflowRelease
+from .pipeline import Pipeline, Stage, StageResults
+
+RequestKey = Tuple[str, str]
+
+
+class _RequestWaiter:
+    """Waits for the transfer requests of every stage run on one polling loop
+
+    The stage workers register their request and block until it reaches a final
+    status, while a single thread polls the registered requests, the requests
+    due at the same time being checked with one query per dataspace. The thread
+    stops when nothing is waited for and is started again by the next request.
+    """
+
+    def __init__(self, transfer: TransferClient, timeout: int) -> None:
+        """Inits the waiter
+
+        Args:
+            transfer: Client of the transfer service
+            timeout: Max time (secs) waited for each request
+        """
+        self._transfer = transfer
+        self._timeout = timeout
+        self._condition = threading.Condition()
+        self._waiting: Dict[RequestKey, Future] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._poller = self._new_poller()
+
+    def _new_poller(self) -> Poller:
+        """Create the poller of the requests
+
+        Returns:
+            Poller: A poller without request
+        """
+        return Poller(
+            check_many=self._check,
+            is_done=TERMINAL_STATUSES.__contains__,
+            schedule=PollingSchedule(timeout=self._timeout),
+        )
+
+    def wait(self, dataspace: str, request_id: str) -> PollResult:
+        """Wait for a request to reach a final status
+
+        Args:
+            dataspace: Dataspace of the request
+            request_id: Id of the request
+
+        Returns:
+            PollResult: Last status of the request and whether it timed out
+        """
+        key = (dataspace, request_id)
+        with self._condition:
+            future = self._waiting.setdefault(key, Future())
+            self._poller.add(key)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="wait", daemon=True
+                )
+                self._thread.start()
+            self._condition.notify()
+        return future.result()
+
+    def _run(self) -> None:
+        """Poll the waited requests until there is none left"""
+        with self._condition:
+            while self._waiting:
+                self._condition.wait(self._poller.next_due_in())
+                self._poll()
+            self._thread = None
+
+    def _poll(self) -> None:
+        """Check the requests due and release the finished ones
+
+        A failed check fails every waited request, so no worker is left
+        blocked.
+        """
+        try:
+            results = self._poller.poll_due()
+        except Exception as e:
+            for future in self._waiting.values():
+                future.set_exception(e)
+            self._waiting.clear()
+            self._poller = self._new_poller()
+            return
+        for result in results:
+            self._waiting.pop(result.key).set_result(result)
+
+    def _check(self, keys: List[RequestKey]) -> Dict[RequestKey, str]:
+        """Check the status of the requests, with one query per dataspace
+
+        Args:
+            keys: (dataspace, request id) of the requests
+
+        Returns:
+            dict: Status of each request
+        """
+        by_dataspace = defaultdict(list)
+        for dataspace, request_id in keys:
+            by_dataspace[dataspace].append(request_id)
+        return {
+            (dataspace, request_id): status
+            for dataspace, request_ids in by_dataspace.items()
+            for request_id, status in self._transfer.check_requests_status(
+                dataspace, request_ids
+            ).items()
+        }
+
+
+class ReleaseStages:
+    """Stages of a dataflow release, run by ``release_pipeline``
+
+    Attributes:
+        transfer: Client of the transfer service
+        sfs: Client of the search service, None to skip the reindex
+        tenant: Tenant reindexed in the search service
+        timeout: Max time (secs) waited for each request
+        waiter: Shared polling loop of the waited requests
+    """
+
+    def __init__(
+        self,
+        transfer: TransferClient,
+        sfs: Optional[SFSClient] = None,
+        tenant: str = "default",
+        timeout: int = 3600,
+    ) -> None:
+        """Inits the stages
+
+        Args:
+            transfer: Client of the transfer service
+            sfs: Client of the search service, None to skip the reindex
+            tenant: Tenant reindexed in the search service
+            timeout: Max time (secs) waited for each request
+        """
+        self.transfer = transfer
+        self.sfs = sfs
+        self.tenant = tenant
+        self.timeout = timeout
+        self.waiter = _RequestWaiter(transfer, timeout)
+
+    def import_file(self, release: DataflowRelease, results: StageResults) -> str:
+        """Submit the import of the file
+
+        Args:
+            release: The dataflow release
+            results: Results of the previous stages
+
+        Returns:
+            str: Id of the import request
+
+        Raises:
+            RuntimeError: If the import is not accepted
+        """
+        request_id = self.transfer.import_sdmx_file(
+            release.file_object, release.dataspace
+        )
+        if request_id is None:
+            raise RuntimeError(f"Import of {release.file_object} was not accepted")
+        return request_id
+
+    def wait_import(self, release: DataflowRelease, results: StageResults) -> None:
+        """Wait for the import request
+
+        A failed import fails the stage, so the next stages of the dataflow are
+        skipped.
+
+        Args:
+            release: The dataflow release
+            results: Results of the previous stages
+        """
+        self._wait(release.dataspace, results["import"])
+
+    def tune(self, release: DataflowRelease, results: StageResults) -> Optional[dict]:
+        """Set the index type of the DSD
+
+        Args:
+            release: The dataflow release
+            results: Results of the previous stages
+
+        Returns:
+            dict: Response of the tune, None if the release has no tune
+        """
+        if release.dsd is None or release.index_type is None:
+            return None
+        return self.transfer.set_tune(
+            release.dataspace, release.dsd, release.index_type
+        )
+
+    def activate(self, release: DataflowRelease, results: StageResults) -> dict:
+        """Initialise the DB objects of the dataflow
+
+        Args:
+            release: The dataflow release
+            results: Results of the previous stages
+
+        Returns:
+            dict: Response of the activation
+        """
+        return self.transfer.activate_dataflow(release.dataspace, release.dataflow)
+
+    def transfer_dataflow(
+        self, release: DataflowRelease, results: StageResults
+    ) -> Optional[str]:
+        """Transfer the dataflow and wait for the transfer request
+
+        Args:
+            release: The dataflow release
+            results: Results of the previous stages
+
+        Returns:
+            str: Id of the transfer request, None if the release has no transfer
+        """
+        if release.destination_dataspace is None:
+            return None
+        request_id = self.transfer.transfer_dataflow(
+            release.dataspace, release.destination_dataspace, release.dataflow
+        )
+        self._wait(release.destination_dataspace, request_id)
+        return request_id
+
+    def reindex(
+        self,
+        releases: Dict[str, DataflowRelease],
+        results: Dict[str, StageResults],
+    ) -> str:
+        """Reindex the tenant once every dataflow is released
+
+        Args:
+            releases: The released dataflows by key
+            results: Results of their previous stages by key
+
+        Returns:
+            str: Id of the loading
+
+        Raises:
+            RuntimeError: If the loading is not started or not finished in time
+        """
+        loading_id = self.sfs.index(self.tenant)
+        if loading_id is None:
+            raise RuntimeError(f"Reindex of tenant {self.tenant} was not started")
+        if not self.sfs.wait_for_index_to_finish(
+            self.tenant, loading_id, timeout=self.timeout
+        ):
+            raise RuntimeError(f"Reindex {loading_id} did not finish in time")
+        return loading_id
+
+    def _wait(self, dataspace: str, request_id: str) -> None:
+        """Wait for a transfer service request
+
+        The request is polled with the others on the shared loop of the waiter,
+        and fails as soon as it reaches a final status other than Completed.
+
+        Args:
+            dataspace: Dataspace of the request
+            request_id: Id of the request
+
+        Raises:
+            RuntimeError: If the request does not complete in time, or does not
+                complete successfully
+        """
+        result = self.waiter.wait(dataspace, request_id)
+        if result.timed_out:
+            raise RuntimeError(f"Request {request_id} did not complete in time")
+        if result.status != "Completed":
+            raise RuntimeError(
+                f"Request {request_id} ended with status {result.status}"
+            )
+        status = self.transfer.get_request_status(dataspace, request_id)
+        execution_status = status.get("executionStatus")
+        outcome = status.get("executionOutcome")
+        if execution_status != "Completed" or outcome == "Error":
+            raise RuntimeError(
+                f"Request {request_id} ended with status {execution_status}"
+                f" and outcome {outcome}"
+            )
+
+
+def release_pipeline(
+    transfer: TransferClient,
+    sfs: Optional[SFSClient] = None,
+    tenant: str = "default",
+    checkpoint: Optional[Union[str, Path]] = None,
+    max_imports: int = 4,
+    max_waits: int = 16,
+    max_tunes: int = 2,
+    max_transfers: int = 4,
+    timeout: int = 3600,
+) -> Pipeline:
+    """Pipeline importing, tuning, activating and transferring dataflows
+
+    Each ``DataflowRelease`` is imported, waited for, tuned, activated and
+    transferred, the dataflows moving through the stages independently. The
+    search service is reindexed once, after the last dataflow.
+
+    Args:
+        transfer: Client of the transfer service
+        sfs: Client of the search service, None to skip the reindex
+        tenant: Tenant reindexed in the search service
+        checkpoint: Path of the checkpoint file, None to disable it
+        max_imports: Max concurrent imports
+        max_waits: Max import requests waited for concurrently, they are all
+            polled on one shared loop
+        max_tunes: Max concurrent tunes and activations
+        max_transfers: Max concurrent transfers
+        timeout: Max time (secs) waited for each request
+
+    Returns:
+        Pipeline: The pipeline, run it with ``pipeline.run(releases, key)``
+
+    Example:
+        releases = [
+            DataflowRelease(dataflow=path.stem, file_object=path, dataspace="design",
+                            destination_dataspace="release")
+            for path in Path("release").glob("*.csv")
+        ]
+        pipeline = release_pipeline(transfer, sfs, checkpoint="release.json")
+        report = pipeline.run(releases, key=lambda release: release.dataflow)
+        print(report.failed(), report.stage_timings())
+    """
+    stages = ReleaseStages(transfer, sfs, tenant, timeout)
+    steps = [
+        Stage("import", stages.import_file, max_workers=max_imports),
+        Stage("wait", stages.wait_import, max_workers=max_waits),
+        Stage("tune", stages.tune, max_workers=max_tunes),
+        Stage("activate", stages.activate, max_workers=max_tunes),
+        Stage("transfer", stages.transfer_dataflow, max_workers=max_transfers),
+    ]
+    if sfs is not None:
+        steps.append(Stage("reindex", stages.reindex, join=True))
+    return Pipeline(steps, checkpoint)
@@ -0,0 +1 @@
+from .polling import AsyncPoller, Poller, PollingSchedule, PollResult, check_each
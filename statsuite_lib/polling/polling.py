@@ -0,0 +1,331 @@
+import asyncio
+import random
+import time
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    TypeVar,
+)
+
+Key = TypeVar("Key", bound=Hashable)
+Status = TypeVar("Status")
+
+
+class PollingSchedule:
+    """Delays between the status checks of a long running task.
+
+    The first ``fast_attempts`` checks are done every ``initial_delay`` seconds,
+    so short tasks are noticed quickly, then the delay grows exponentially up to
+    ``max_delay``. Every delay gets a random jitter so many pollers started at the
+    same time do not hit the service together.
+
+    Attributes:
+        initial_delay: Delay (secs) of the fast phase
+        fast_attempts: Number of checks done in the fast phase
+        multiplier: Growth factor of the delay after the fast phase
+        max_delay: Upper bound (secs) of the delay
+        jitter: Max relative random variation of each delay
+        timeout: Max time (secs) a task is polled, None to poll forever
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = 1.0,
+        fast_attempts: int = 3,
+        multiplier: float = 2.0,
+        max_delay: float = 30.0,
+        jitter: float = 0.1,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Inits the schedule
+
+        Args:
+            initial_delay: Delay (secs) of the fast phase
+            fast_attempts: Number of checks done in the fast phase
+            multiplier: Growth factor of the delay after the fast phase
+            max_delay: Upper bound (secs) of the delay
+            jitter: Max relative random variation of each delay
+            timeout: Max time (secs) a task is polled, None to poll forever
+        """
+        self.initial_delay = min(initial_delay, max_delay)
+        self.fast_attempts = fast_attempts
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.timeout = timeout
+
+    def delays(self) -> Iterator[float]:
+        """Delays to wait before each check, after the first immediate one
+
+        Yields:
+            float: The next delay in seconds
+        """
+        delay = self.initial_delay
+        attempt = 0
+        while True:
+            attempt += 1
+            if attempt > self.fast_attempts:
+                delay = min(delay * self.multiplier, self.max_delay)
+            jitter = random.uniform(-self.jitter, self.jitter)  # noqa S311 # nosec B311
+            yield delay * (1 + jitter)
+
+
+class PollResult(NamedTuple):
+    """Final state of a polled task
+
+    Attributes:
+        key: Identifier of the task
+        status: Last status returned by the check, None if never checked
+        timed_out: True if the task did not finish before the schedule timeout
+    """
+
+    key: Hashable
+    status: Optional[object]
+    timed_out: bool
+
+
+class _Tracked(Generic[Status]):
+    """Polling state of one task"""
+
+    def __init__(self, schedule: PollingSchedule, now: float) -> None:
+        """Starts tracking a task, its first check is due now
+
+        Args:
+            schedule: Schedule of the task
+            now: Current monotonic time
+        """
+        self.delays = schedule.delays()
+        self.due = now
+        self.deadline = None if schedule.timeout is None else now + schedule.timeout
+        self.status: Optional[Status] = None
+
+
+class _BasePoller(Generic[Key, Status]):
+    """Bookkeeping shared by the sync and async pollers"""
+
+    def __init__(
+        self,
+        is_done: Callable[[Status], bool],
+        schedule: Optional[PollingSchedule] = None,
+        coalesce: float = 0.5,
+    ) -> None:
+        """Inits the poller
+
+        Args:
+            is_done: Tells if a status is final
+            schedule: Schedule of every task, defaults to PollingSchedule()
+            coalesce: Tasks due within this many seconds are checked together
+        """
+        self._is_done = is_done
+        self._schedule = schedule or PollingSchedule()
+        self._coalesce = coalesce
+        self._tracked: Dict[Key, _Tracked[Status]] = {}
+
+    def __len__(self) -> int:
+        """Number of tasks still being polled
+
+        Returns:
+            int: The number of tasks
+        """
+        return len(self._tracked)
+
+    def add(self, key: Key) -> None:
+        """Start polling a task, its first check is due immediately
+
+        Args:
+            key: Identifier of the task
+        """
+        self._tracked[key] = _Tracked(self._schedule, time.monotonic())
+
+    def next_due_in(self) -> Optional[float]:
+        """Time until the next check is due
+
+        Returns:
+            float: Seconds to wait, None if no task is being polled
+        """
+        if not self._tracked:
+            return None
+        due = min(tracked.due for tracked in self._tracked.values())
+        return max(0.0, due - time.monotonic())
+
+    def _due_keys(self) -> List[Key]:
+        """Tasks whose check is due, or will be within the coalesce window
+
+        Returns:
+            list: The keys to check
+        """
+        limit = time.monotonic() + self._coalesce
+        return [key for key, tracked in self._tracked.items() if tracked.due <= limit]
+
+    def _record(
+        self, key: Key, statuses: Dict[Key, Status], now: float
+    ) -> Optional[PollResult]:
+        """Record the status of a task, rescheduling it if still unfinished
+
+        A task missing from the statuses has no new status, it is rescheduled
+        and times out like the others.
+
+        Args:
+            key: Identifier of the task
+            statuses: Status of each checked task
+            now: Current monotonic time
+
+        Returns:
+            PollResult if the task finished or timed out, None otherwise
+        """
+        tracked = self._tracked[key]
+        if key in statuses:
+            tracked.status = statuses[key]
+            if self._is_done(tracked.status):
+                return PollResult(key, tracked.status, False)
+        if tracked.deadline is not None and now >= tracked.deadline:
+            return PollResult(key, tracked.status, True)
+        tracked.due = now + next(tracked.delays)
+        if tracked.deadline is not None:
+            tracked.due = min(tracked.due, tracked.deadline)
+        return None
+
+    def _update(self, keys: List[Key], statuses: Dict[Key, Status]) -> List[PollResult]:
+        """Record the checked statuses and reschedule the unfinished tasks
+
+        Args:
+            keys: The checked tasks
+            statuses: Status of each checked task
+
+        Returns:
+            list: Results of the tasks that finished or timed out
+        """
+        now = time.monotonic()
+        finished = [
+            result
+            for key in keys
+            if key in self._tracked and (result := self._record(key, statuses, now))
+        ]
+        for result in finished:
+            del self._tracked[result.key]
+        return finished
+
+
+class Poller(_BasePoller[Key, Status]):
+    """Polls the status of many tasks on a single loop
+
+    Every task follows its own ``PollingSchedule``, the tasks due at the same time
+    are checked with a single call to ``check_many``, and each result is returned
+    as soon as its task finishes.
+
+    Example:
+        poller = Poller(
+            check_many=lambda ids: {id: transfer.check_request_status("design", id)
+                                    for id in ids},
+            is_done=lambda status: status == "Completed",
+            schedule=PollingSchedule(max_delay=30, timeout=600),
+        )
+        for request_id in request_ids:
+            poller.add(request_id)
+        for result in poller.run():
+            print(result.key, result.status, result.timed_out)
+    """
+
+    def __init__(
+        self,
+        check_many: Callable[[List[Key]], Dict[Key, Status]],
+        is_done: Callable[[Status], bool],
+        schedule: Optional[PollingSchedule] = None,
+        coalesce: float = 0.5,
+    ) -> None:
+        """Inits the poller
+
+        Args:
+            check_many: Returns the status of each of the given task keys
+            is_done: Tells if a status is final
+            schedule: Schedule of every task, defaults to PollingSchedule()
+            coalesce: Tasks due within this many seconds are checked together
+        """
+        super().__init__(is_done, schedule, coalesce)
+        self._check_many = check_many
+
+    def poll_due(self) -> List[PollResult]:
+        """Check the tasks that are due, without waiting
+
+        Returns:
+            list: Results of the tasks that finished or timed out
+        """
+        keys = self._due_keys()
+        if not keys:
+            return []
+        return self._update(keys, self._check_many(keys))
+
+    def run(self) -> Iterator[PollResult]:
+        """Poll until every task finished or timed out
+
+        Yields:
+            PollResult: The result of each task, in completion order
+        """
+        while self._tracked:
+            time.sleep(self.next_due_in())
+            yield from self.poll_due()
+
+
+class AsyncPoller(_BasePoller[Key, Status]):
+    """Async counterpart of Poller, checks are awaited and waits use asyncio.sleep"""
+
+    def __init__(
+        self,
+        check_many: Callable[[List[Key]], Awaitable[Dict[Key, Status]]],
+        is_done: Callable[[Status], bool],
+        schedule: Optional[PollingSchedule] = None,
+        coalesce: float = 0.5,
+    ) -> None:
+        """Inits the poller
+
+        Args:
+            check_many: Coroutine returning the status of each of the given keys
+            is_done: Tells if a status is final
+            schedule: Schedule of every task, defaults to PollingSchedule()
+            coalesce: Tasks due within this many seconds are checked together
+        """
+        super().__init__(is_done, schedule, coalesce)
+        self._check_many = check_many
+
+    async def poll_due(self) -> List[PollResult]:
+        """Check the tasks that are due, without waiting
+
+        Returns:
+            list: Results of the tasks that finished or timed out
+        """
+        keys = self._due_keys()
+        if not keys:
+            return []
+        return self._update(keys, await self._check_many(keys))
+
+    async def run(self) -> AsyncIterator[PollResult]:
+        """Poll until every task finished or timed out
+
+        Yields:
+            PollResult: The result of each task, in completion order
+        """
+        while self._tracked:
+            await asyncio.sleep(self.next_due_in())
+            for result in await self.poll_due():
+                yield result
+
+
+def check_each(check: Callable[[Key], Status]) -> Callable[[Iterable[Key]], Dict]:
+    """Adapt a single task check to the ``check_many`` interface of the pollers
+
+    Args:
+        check: Returns the status of one task
+
+    Returns:
+        Callable returning the status of each of the given keys
+    """
+    return lambda keys: {key: check(key) for key in keys}
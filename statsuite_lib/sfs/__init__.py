@@ -1 +1,3 @@
-from .sfs import SFSClient
+from .models import DataflowRef
+from .scheduler import ReindexScheduler
+from .sfs import AsyncSFSClient, SFSClient
@@ -7,9 +7,11 @@ class Index(RootModel):
     """Model for return json from indexing request on SFS
 
     Attributes:
+        model_config: Configuration
         root: returns a json in the format { "loadingId": ######### }
     """
 
+    model_config = ConfigDict(defer_build=True)
     root: Dict[str, int]
 
 
@@ -23,7 +25,7 @@ class LoadingLog(BaseModel):
         id: Loadingid
     """
 
-    model_config = ConfigDict(extra="allow")
+    model_config = ConfigDict(extra="allow", defer_build=True)
     executionStart: str
     executionStatus: Optional[str] = None
     id: int  # noqa
@@ -33,7 +35,27 @@ class LoadingLogs(RootModel):
     """Collection of loading log entries
 
     Attributes:
+        model_config: Configuration
         root: Collection of Loadings without key
     """
 
+    model_config = ConfigDict(defer_build=True)
     root: List[LoadingLog]
+
+
+class DataflowRef(BaseModel):
+    """Dataflow indexed by ``SFSClient.index_dataflow``
+
+    Attributes:
+        model_config: Configuration
+        spaceId: Id of the data space of the dataflow
+        agencyId: Agency of the dataflow
+        id: Id of the dataflow
+        version: Version of the dataflow
+    """
+
+    model_config = ConfigDict(frozen=True, defer_build=True)
+    spaceId: str
+    agencyId: str
+    id: str  # noqa
+    version: str = "latest"
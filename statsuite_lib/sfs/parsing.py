@@ -0,0 +1,262 @@
+import json
+import re
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+_WHITESPACE = " \t\n\r"
+
+# Characters that change the state of the scanner, in a string, inside an
+# object or array, and in a top level scalar (which ends at a delimiter)
+_IN_STRING = re.compile(r'["\\]')
+_IN_CONTAINER = re.compile(r'["\[\]{}]')
+_IN_SCALAR = re.compile(r'["\[\]{},\s]')
+
+
+class JSONArrayDecoder:
+    """Incremental decoder for a top level JSON array
+
+    Text is fed chunk by chunk as it is downloaded and each element of the
+    array is returned as soon as it is complete, so the caller can stop reading
+    a long response once it found what it was looking for.
+
+    Every character is scanned once: the end of the current element is found
+    by tracking the string and nesting state across chunks, and the element is
+    decoded once complete, so a malformed element fails as soon as it ends.
+
+    Attributes:
+        done: True once the closing bracket of the array has been read
+    """
+
+    def __init__(self) -> None:
+        """Inits the decoder"""
+        self._started = False
+        self._parts: List[str] = []
+        self._in_element = False
+        self._in_string = False
+        self._escape = False
+        self._depth = 0
+        self.done = False
+
+    def feed(self, text: str) -> List[Any]:
+        """Add a chunk of text
+
+        A ValueError is raised as soon as the document turns out not to be an
+        array or one of its elements is invalid.
+
+        Args:
+            text: Next chunk of the JSON document
+
+        Returns:
+            list: Elements completed by this chunk, in document order
+        """
+        elements = []
+        position = 0
+        while not self.done:
+            position = self._next_element(text, position)
+            if position is None:
+                break
+            end = self._scan(text, position)
+            if end is None:
+                self._parts.append(text[position:])
+                break
+            self._parts.append(text[position:end])
+            elements.append(self._decode())
+            position = end
+        return elements
+
+    def close(self) -> None:
+        """Check that the whole array was read
+
+        Raises:
+            ValueError: If the document ended before the array was closed
+        """
+        if not self.done:
+            raise ValueError("Truncated JSON array")
+
+    def _next_element(self, text: str, position: int) -> Optional[int]:
+        """Find the start of the next element, consuming the array brackets
+
+        Args:
+            text: The chunk
+            position: Where to start looking
+
+        Returns:
+            int: Start of the element, or of the rest of the current one, None
+                if the chunk has no more element or the array is closed
+
+        Raises:
+            ValueError: If the document is not an array
+        """
+        if self._in_element:
+            return position
+        position = _skip(text, position)
+        if position >= len(text):
+            return None
+        if not self._started:
+            if text[position] != "[":
+                raise ValueError("Expected a JSON array")
+            self._started = True
+            return self._next_element(text, position + 1)
+        if text[position] == "]":
+            self.done = True
+            return None
+        self._in_element = True
+        return position
+
+    def _scan(self, text: str, position: int) -> Optional[int]:
+        """Scan the current element up to its end
+
+        A top level number or literal only ends at the following delimiter, so
+        one split between two chunks is not truncated.
+
+        Args:
+            text: The chunk
+            position: Where the scan resumes
+
+        Returns:
+            int: End of the element in the chunk, None if it continues in the
+                next chunk
+        """
+        position = self._after_escape(text, position)
+        while position is not None:
+            match = self._special().search(text, position)
+            if match is None:
+                return None
+            end = self._step(match.group(), match.end())
+            if end is not None:
+                return end
+            position = self._after_escape(text, match.end())
+        return None
+
+    def _after_escape(self, text: str, position: int) -> Optional[int]:
+        """Skip the character escaped by a backslash, even from the previous chunk
+
+        Args:
+            text: The chunk
+            position: Where the scan resumes
+
+        Returns:
+            int: Where the scan continues, None if the chunk ended
+        """
+        if not self._escape:
+            return position
+        if position >= len(text):
+            return None
+        self._escape = False
+        return position + 1
+
+    def _special(self) -> "re.Pattern[str]":
+        """Characters changing the state of the scanner
+
+        Returns:
+            re.Pattern: The pattern of the current state
+        """
+        if self._in_string:
+            return _IN_STRING
+        return _IN_CONTAINER if self._depth else _IN_SCALAR
+
+    def _step(self, char: str, after: int) -> Optional[int]:
+        """Update the scanner state with a special character
+
+        Args:
+            char: The character
+            after: Position following it
+
+        Returns:
+            int: End of the element if the character completes it, else None
+        """
+        if self._in_string:
+            return self._string_step(char, after)
+        if char == '"':
+            self._in_string = True
+            return None
+        if char in "[{":
+            self._depth += 1
+            return None
+        if self._depth and char in "]}":
+            self._depth -= 1
+            return None if self._depth else after
+        return after - 1
+
+    def _string_step(self, char: str, after: int) -> Optional[int]:
+        """Update the scanner state with a quote or backslash inside a string
+
+        Args:
+            char: The character
+            after: Position following it
+
+        Returns:
+            int: End of the element if it is a string and it ended, else None
+        """
+        if char == "\\":
+            self._escape = True
+            return None
+        self._in_string = False
+        return None if self._depth else after
+
+    def _decode(self) -> Any:
+        """Decode the scanned element and get ready for the next one
+
+        Returns:
+            The element
+
+        Raises:
+            ValueError: If the element is not valid JSON
+        """
+        text = "".join(self._parts)
+        self._parts = []
+        self._in_element = False
+        self._depth = 0
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON array element {text[:50]!r}") from e
+
+
+def _skip(text: str, position: int) -> int:
+    """Skip whitespace and element separators
+
+    Args:
+        text: The chunk
+        position: Where to start skipping
+
+    Returns:
+        int: Position of the next significant character
+    """
+    while position < len(text) and text[position] in _WHITESPACE + ",":
+        position += 1
+    return position
+
+
+def iter_json_array(chunks: Iterator[str]) -> Iterator[Any]:
+    """Yield the elements of a JSON array streamed as text chunks
+
+    Args:
+        chunks: The text of the document
+
+    Yields:
+        Any: Each element of the array, as soon as it is complete
+    """
+    decoder = JSONArrayDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+        if decoder.done:
+            return
+    decoder.close()
+
+
+async def aiter_json_array(chunks: AsyncIterator[str]) -> AsyncIterator[Any]:
+    """Async counterpart of ``iter_json_array``
+
+    Args:
+        chunks: The text of the document
+
+    Yields:
+        Any: Each element of the array, as soon as it is complete
+    """
+    decoder = JSONArrayDecoder()
+    async for chunk in chunks:
+        for element in decoder.feed(chunk):
+            yield element
+        if decoder.done:
+            return
+    decoder.close()
@@ -0,0 +1,300 @@
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import DataflowRef
+from .sfs import SFSClient
+
+DEFAULT_WINDOW = 60.0
+DEFAULT_MAX_TARGETED = 10
+
+
+class _Pending:
+    """Reindex requests of a tenant waiting for the end of their window"""
+
+    def __init__(self, now: float) -> None:
+        """Inits the requests
+
+        Args:
+            now: Time of the first request
+        """
+        self.first = now
+        self.due = now
+        self.full = False
+        self.dataflows: Dict[DataflowRef, None] = {}
+
+    def add(self, dataflows: Iterable[DataflowRef]) -> None:
+        """Merge a request
+
+        Args:
+            dataflows: Dataflows to index, empty for a full reindex
+        """
+        dataflows = list(dataflows)
+        self.full = self.full or not dataflows
+        self.dataflows.update(dict.fromkeys(dataflows))
+
+    def merge(self, other: "_Pending") -> None:
+        """Merge the requests of another window
+
+        Args:
+            other: The other requests
+        """
+        self.first = min(self.first, other.first)
+        self.full = self.full or other.full
+        self.dataflows.update(other.dataflows)
+
+
+def _join(thread: Optional[threading.Thread]) -> None:
+    """Wait for the background thread to stop
+
+    Args:
+        thread: The thread, None if it was not started
+    """
+    if thread is not None:
+        thread.join()
+
+
+class ReindexScheduler:
+    """Coalesce the reindex requests of each tenant
+
+    A request opens a window of ``window`` seconds, the next requests of the
+    same tenant are merged and extend the window, up to ``max_delay`` seconds
+    after the first one. When the window ends, a background thread checks the
+    latest loading log of the tenant: if a loading is still queued or in
+    progress, or the reindex fails, it is postponed by another window, so
+    reindexes never overlap.
+    Otherwise the requested dataflows are indexed one by one, or the whole
+    tenant if a request named no dataflow or too many dataflows are pending.
+
+    Attributes:
+        client: Client of the search service
+        window: Time (secs) waited for more requests
+        max_delay: Max time (secs) between a request and its reindex, unless a
+            loading is running
+        max_targeted: Max dataflows indexed one by one, a full reindex is
+            triggered above
+        stats: Copy of the number of requests, full and targeted reindexes
+            triggered, and reindexes postponed because a loading was running or
+            they failed
+    """
+
+    def __init__(
+        self,
+        client: SFSClient,
+        window: float = DEFAULT_WINDOW,
+        max_delay: Optional[float] = None,
+        max_targeted: int = DEFAULT_MAX_TARGETED,
+    ) -> None:
+        """Inits the scheduler
+
+        Args:
+            client: Client of the search service
+            window: Time (secs) waited for more requests
+            max_delay: Max time (secs) between a request and its reindex.
+                Defaults to 5 windows
+            max_targeted: Max dataflows indexed one by one
+        """
+        self.client = client
+        self.window = window
+        self.max_delay = 5 * window if max_delay is None else max_delay
+        self.max_targeted = max_targeted
+        self._stats = {"requests": 0, "full": 0, "targeted": 0, "postponed": 0}
+        self._pending: Dict[str, _Pending] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._log = logging.getLogger("ReindexScheduler")
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters of the scheduler, read under its lock
+
+        Returns:
+            dict: A copy of the number of requests, full and targeted reindexes
+                and postponed reindexes
+        """
+        with self._condition:
+            return dict(self._stats)
+
+    def _count(self, name: str, increment: int = 1) -> None:
+        """Update a counter, from the caller or the background thread
+
+        Args:
+            name: Name of the counter
+            increment: Value added to the counter
+        """
+        with self._condition:
+            self._stats[name] += increment
+
+    def __enter__(self) -> "ReindexScheduler":
+        """Use the scheduler as a context manager
+
+        Returns:
+            ReindexScheduler: The scheduler, closed on exit
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Trigger the pending reindexes and stop the scheduler
+
+        Args:
+            exc_info: Exception raised in the block, if any
+        """
+        self.close()
+
+    def request(
+        self, tenant: str = "default", dataflows: Iterable[DataflowRef] = ()
+    ) -> None:
+        """Ask for a reindex, triggered at the end of the window
+
+        Args:
+            tenant: Tenant to reindex
+            dataflows: Dataflows that changed, empty to reindex the whole tenant
+
+        Raises:
+            RuntimeError: If the scheduler is closed
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The reindex scheduler is closed")
+            now = time.monotonic()
+            pending = self._pending.setdefault(tenant, _Pending(now))
+            pending.add(dataflows)
+            pending.due = min(now + self.window, pending.first + self.max_delay)
+            self._stats["requests"] += 1
+            self._start_thread()
+            self._condition.notify()
+
+    def flush(self, tenant: Optional[str] = None) -> Dict[str, List[int]]:
+        """Trigger the pending reindexes now, even if a loading is running
+
+        Args:
+            tenant: Tenant to reindex, None for all the tenants
+
+        Returns:
+            dict: Loading ids of the reindexes by tenant
+        """
+        with self._condition:
+            tenants = list(self._pending) if tenant is None else [tenant]
+            pending = {
+                name: self._pending.pop(name)
+                for name in tenants
+                if name in self._pending
+            }
+        return {name: self._index(name, requests) for name, requests in pending.items()}
+
+    def close(self, flush: bool = True) -> None:
+        """Stop the scheduler
+
+        The background thread is stopped even if triggering the pending
+        reindexes fails.
+
+        Args:
+            flush: Trigger the pending reindexes, otherwise they are dropped
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            thread = self._thread
+        try:
+            if flush:
+                # a running reindex may postpone its requests, flush them too
+                _join(thread)
+                self.flush()
+        finally:
+            _join(thread)
+
+    def _start_thread(self) -> None:
+        """Start the background thread on the first request"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="ReindexScheduler", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Trigger the reindexes at the end of their window until closed"""
+        try:
+            while True:
+                due = self._next_due()
+                if due is None:
+                    return
+                self._trigger(*due)
+        finally:
+            with self._condition:
+                self._thread = None
+
+    def _trigger(self, tenant: str, pending: _Pending) -> None:
+        """Reindex a tenant, unless a loading is running
+
+        Args:
+            tenant: The tenant
+            pending: Its requests
+        """
+        try:
+            if self.client.is_indexing(tenant):
+                self._log.info(
+                    f"A loading is running for tenant {tenant}, reindex postponed"
+                )
+                self._postpone(tenant, pending)
+            else:
+                self._index(tenant, pending)
+        except Exception as e:
+            self._log.error(f"Error reindexing tenant {tenant}, postponed: {e}")
+            self._postpone(tenant, pending)
+
+    def _next_due(self) -> Optional[Tuple[str, _Pending]]:
+        """Wait for the end of the next window
+
+        Returns:
+            The tenant and its requests, None once the scheduler is closed
+        """
+        with self._condition:
+            while not self._closed:
+                now = time.monotonic()
+                tenant = min(
+                    self._pending,
+                    key=lambda name: self._pending[name].due,
+                    default=None,
+                )
+                if tenant is not None and self._pending[tenant].due <= now:
+                    return tenant, self._pending.pop(tenant)
+                timeout = None if tenant is None else self._pending[tenant].due - now
+                self._condition.wait(timeout)
+
+    def _postpone(self, tenant: str, pending: _Pending) -> None:
+        """Retry the requests of a tenant after another window
+
+        Args:
+            tenant: The tenant
+            pending: Its requests
+        """
+        with self._condition:
+            current = self._pending.get(tenant)
+            if current is not None:
+                pending.merge(current)
+            pending.due = time.monotonic() + self.window
+            self._pending[tenant] = pending
+            self._stats["postponed"] += 1
+            self._condition.notify()
+
+    def _index(self, tenant: str, pending: _Pending) -> List[int]:
+        """Trigger the reindex of merged requests
+
+        Args:
+            tenant: The tenant
+            pending: Its requests
+
+        Returns:
+            list: Loading ids of the reindexes
+        """
+        if pending.full or len(pending.dataflows) > self.max_targeted:
+            self._count("full")
+            self._log.info(f"Reindexing tenant {tenant}")
+            return [self.client.index(tenant)]
+        self._count("targeted", len(pending.dataflows))
+        return [
+            self.client.index_dataflow(dataflow, tenant)
+            for dataflow in pending.dataflows
+        ]
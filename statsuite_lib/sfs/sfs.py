@@ -1,25 +1,97 @@
+import asyncio
 import logging
 import time
 from enum import IntEnum
-from typing import Optional
+from typing import AsyncIterator, Dict, Iterable, List, Optional
 
 import httpx
 
-from .models import LoadingLog, LoadingLogs
+from ..polling import AsyncPoller, Poller, PollingSchedule, check_each
+from ..transport import create_async_client, get_default_client
+from .models import DataflowRef, Index, LoadingLog
+from .parsing import aiter_json_array, iter_json_array
+
+# The 502 of a lookup by id is a known SFS bug handled by the fallback, retrying
+# it would only delay the fallback
+_BY_ID_RETRY = {"retry_statuses": frozenset({429, 503, 504})}
+
+# Statuses of a loading that is not finished
+RUNNING_STATUSES = frozenset({"queued", "inProgress"})
+
+
+def _latest_loading(entries: Iterable[dict]) -> Optional[LoadingLog]:
+    """Find the most recently started loading in raw log entries
+
+    Args:
+        entries: Raw loading log entries
+
+    Returns:
+        LoadingLog or None if there is no entry
+    """
+    latest = max(entries, key=_execution_start, default=None)
+    return None if latest is None else LoadingLog.model_validate(latest)
+
+
+async def _alatest_loading(entries: AsyncIterator[dict]) -> Optional[LoadingLog]:
+    """Async counterpart of ``_latest_loading``, keeping only the latest entry
+
+    Args:
+        entries: Raw loading log entries
+
+    Returns:
+        LoadingLog or None if there is no entry
+    """
+    latest = None
+    async for entry in entries:
+        if latest is None or _execution_start(entry) > _execution_start(latest):
+            latest = entry
+    return None if latest is None else LoadingLog.model_validate(latest)
+
+
+def _execution_start(entry: dict) -> str:
+    """Start time of a raw loading log entry
+
+    Args:
+        entry: Raw loading log entry
+
+    Returns:
+        str: The ISO start time, empty if the loading did not start
+    """
+    return entry.get("executionStart") or ""
+
+
+def _is_running(loading: Optional[LoadingLog]) -> bool:
+    """Check if a loading is still running
+
+    Args:
+        loading: The loading, None if unknown
+
+    Returns:
+        boolean stating if the loading is queued or in progress, a failed or
+        unknown status is not running
+    """
+    return loading is not None and loading.executionStatus in RUNNING_STATUSES
 
 
 class SFSClient:
     """Client for the SDMX Faceted search service"""
 
-    def __init__(self, sfs_url: str, sfs_api_key: str) -> None:
+    def __init__(
+        self,
+        sfs_url: str,
+        sfs_api_key: str,
+        http_client: Optional[httpx.Client] = None,
+    ) -> None:
         """Inits the client
 
         Args:
             sfs_url: Endpoint url for SFS service.
             sfs_api_key: API key for the SFS service
+            http_client: Pooled client used for the requests, defaults to the
+                         process wide client.
         """
 
-        self._client = httpx.Client()
+        self._client = http_client or get_default_client()
         self.SFS_URL = sfs_url
         self._sfs_api_key = sfs_api_key
         self.log = logging.getLogger("SFSClient")
@@ -34,14 +106,63 @@ class SFSClient:
         Returns:
             loadingId(str)
         """
-        resp = httpx.post(
+        resp = self._client.post(
             f"{self.SFS_URL}/admin/dataflows?api-key={self._sfs_api_key}&tenant={tenant}"  # noqa
         )
         if resp.status_code == 200:
-            from .models import Index
+            loading = Index.model_validate(resp.json())
+            return loading.root.get("loadingId")
+
+    def index_dataflow(
+        self, dataflow: DataflowRef, tenant: str = "default"
+    ) -> Optional[int]:
+        """Triggers the indexing of a single dataflow, instead of all of them
 
+        Args:
+            dataflow: (DataflowRef) the dataflow to index
+            tenant: (str) tenant of the dataflow
+
+        Returns:
+            loadingId(int) or None if the indexing was not started
+        """
+        resp = self._client.post(
+            f"{self.SFS_URL}/admin/dataflow?api-key={self._sfs_api_key}&tenant={tenant}",  # noqa
+            json=dataflow.model_dump(),
+        )
+        if resp.status_code == 200:
             loading = Index.model_validate(resp.json())
             return loading.root.get("loadingId")
+        self.log.error(f"Error indexing dataflow {dataflow.id}: {resp.text}")
+
+    def get_latest_log(self, tenant: str) -> Optional[LoadingLog]:
+        """Get the most recently started loading of a tenant
+
+        The list of logs is parsed while it is downloaded and only the latest
+        entry is validated.
+
+        Arguments:
+            tenant: (str) .stat tenant
+
+        Returns:
+            LoadingLog or None if there is no loading or the logs cannot be read
+        """
+        url = f"{self.SFS_URL}/admin/logs?api-key={self._sfs_api_key}&tenant={tenant}"
+        with self._client.stream("GET", url) as resp:
+            if resp.status_code == 200:
+                return _latest_loading(iter_json_array(resp.iter_text()))
+            resp.read()
+        self.log.error(f"Error gathering logs {resp.text}")
+
+    def is_indexing(self, tenant: str) -> bool:
+        """Check if the latest loading of a tenant is still running
+
+        Arguments:
+            tenant: (str) .stat tenant
+
+        Returns:
+            boolean stating if a loading is queued or in progress
+        """
+        return _is_running(self.get_latest_log(tenant))
 
     class LoadingStatus(IntEnum):
         """Enum class to represent status of the loading tasks
@@ -63,7 +184,8 @@ class SFSClient:
     def get_log(self, tenant: str, loading_id: str) -> Optional[LoadingLog]:
         """Get log and status from by loading_id, if retrieving a log by id
         fails with a 502 it will fallback to retrieve all available logs and
-        filter them
+        filter them. The fallback list is parsed while it is downloaded and the
+        download stops at the matching entry.
 
         Arguments:
             tenant: (str) .stat tenant
@@ -73,22 +195,35 @@ class SFSClient:
             LoadingLog or None if the loading_id cannot be found
         """
 
-        resp = httpx.get(
-            url=f"{self.SFS_URL}/admin/logs?api-key={self._sfs_api_key}&tenant={tenant}"
-        )
+        url = f"{self.SFS_URL}/admin/logs?api-key={self._sfs_api_key}&tenant={tenant}"
+        resp = self._client.get(f"{url}&id={loading_id}", extensions=_BY_ID_RETRY)
         if resp.status_code == 200:
             return LoadingLog.model_validate(resp.json())
         if resp.status_code == 502:
             self.log.error("Error 502 getting loading log, using expensive query")
-            resp = httpx.get(
-                f"{self.SFS_URL}/admin/logs?api-key={self._sfs_api_key}&tenant={tenant}"
-            )  # noqa
-            loadings = LoadingLogs.model_validate(resp.json())
-            for loading in loadings.root:
-                if str(loading.id) == loading_id:
-                    return loading
+            with self._client.stream("GET", url) as resp:
+                if resp.status_code == 200:
+                    return self._find_loading(
+                        iter_json_array(resp.iter_text()), loading_id
+                    )
+                resp.read()
         self.log.error(f"Error gathering logs {resp.text}")
 
+    @staticmethod
+    def _find_loading(entries: Iterable[dict], loading_id: str) -> Optional[LoadingLog]:
+        """Find a loading in the raw log entries, validating only the match
+
+        Args:
+            entries: Raw loading log entries
+            loading_id: (str) id of the loading
+
+        Returns:
+            LoadingLog or None if the loading_id cannot be found
+        """
+        for entry in entries:
+            if str(entry.get("id")) == str(loading_id):
+                return LoadingLog.model_validate(entry)
+
     def check_status_loading(self, tenant: str, loading_id: str) -> LoadingStatus:
         """Check the status of a loading taks
 
@@ -113,6 +248,7 @@ class SFSClient:
         startup_sleep: int = 0,
         timeout: int = 600,
         backoff: int = 30,
+        schedule: Optional[PollingSchedule] = None,
     ) -> bool:
         """This method will periodically check the status of a loading task and
         until it finishes, error or expires the timeout
@@ -123,26 +259,247 @@ class SFSClient:
             startup_sleep: (int) grace period (secs) before start fetching the
                            loading state
             timeout: (int) max time (secs) the loop will be running
-            backoff: (int) time between iterations fetching the data
+            backoff: (int) max time between iterations fetching the data, the
+                     first checks are done every second and the delay grows
+                     exponentially up to this value
+            schedule: (PollingSchedule) custom polling schedule, replaces
+                      timeout and backoff
 
         Returns:
             boolean stating if the loading task finished correctly
         """
-        start = time.time()
         time.sleep(startup_sleep)
+        schedule = schedule or PollingSchedule(
+            max_delay=backoff, timeout=timeout - startup_sleep
+        )
+        poller = Poller(
+            check_many=check_each(
+                lambda key: self.check_status_loading(tenant=tenant, loading_id=key)
+            ),
+            is_done=self.LoadingStatus.COMPLETED.__eq__,
+            schedule=schedule,
+        )
+        poller.add(loading_id)
+        result = next(poller.run())
+        if result.timed_out:
+            self.log.error(
+                f"Timeout waiting for dataflows to be indexed {timeout} seconds passed"  # noqa
+            )
+        return not result.timed_out
+
+
+class AsyncSFSClient:
+    """Async counterpart of SFSClient, built on ``httpx.AsyncClient``
+
+    Attributes:
+        LoadingStatus: Same enumeration of loading status as SFSClient
+    """
+
+    LoadingStatus = SFSClient.LoadingStatus
+
+    def __init__(
+        self,
+        sfs_url: str,
+        sfs_api_key: str,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        """Inits the client
+
+        Args:
+            sfs_url: Endpoint url for SFS service.
+            sfs_api_key: API key for the SFS service
+            http_client: Pooled client used for the requests, defaults to a new
+                         client owned by this instance.
+        """
+
+        self._client = http_client or create_async_client()
+        self.SFS_URL = sfs_url
+        self._sfs_api_key = sfs_api_key
+        self.log = logging.getLogger("SFSClient")
+        self.log.level = logging.INFO
+
+    async def index(self, tenant: str = "default") -> str:
+        """Triggers a new indexing task
+
+        Args:
+            tenant: (str) tenant to trigger the index for
+
+        Returns:
+            loadingId(str)
+        """
+        resp = await self._client.post(
+            f"{self.SFS_URL}/admin/dataflows?api-key={self._sfs_api_key}&tenant={tenant}"  # noqa
+        )
+        if resp.status_code == 200:
+            loading = Index.model_validate(resp.json())
+            return loading.root.get("loadingId")
 
-        self.log.info("STARTING")
-        while True:
-            status = self.check_status_loading(tenant=tenant, loading_id=loading_id)
-            if status == self.LoadingStatus.COMPLETED:
-                return True
-
-            if time.time() - start > timeout:
-                self.log.error(
-                    f"Timeout waiting for dataflows to be indexed {timeout} seconds passed"  # noqa
-                )
-                return False
+    async def index_dataflow(
+        self, dataflow: DataflowRef, tenant: str = "default"
+    ) -> Optional[int]:
+        """Triggers the indexing of a single dataflow, instead of all of them
+
+        Args:
+            dataflow: (DataflowRef) the dataflow to index
+            tenant: (str) tenant of the dataflow
+
+        Returns:
+            loadingId(int) or None if the indexing was not started
+        """
+        resp = await self._client.post(
+            f"{self.SFS_URL}/admin/dataflow?api-key={self._sfs_api_key}&tenant={tenant}",  # noqa
+            json=dataflow.model_dump(),
+        )
+        if resp.status_code == 200:
+            loading = Index.model_validate(resp.json())
+            return loading.root.get("loadingId")
+        self.log.error(f"Error indexing dataflow {dataflow.id}: {resp.text}")
+
+    async def get_latest_log(self, tenant: str) -> Optional[LoadingLog]:
+        """Get the most recently started loading of a tenant
+
+        The list of logs is parsed while it is downloaded, keeping only the
+        latest entry, which is the only one validated.
+
+        Arguments:
+            tenant: (str) .stat tenant
+
+        Returns:
+            LoadingLog or None if there is no loading or the logs cannot be read
+        """
+        url = f"{self.SFS_URL}/admin/logs?api-key={self._sfs_api_key}&tenant={tenant}"
+        async with self._client.stream("GET", url) as resp:
+            if resp.status_code == 200:
+                return await _alatest_loading(aiter_json_array(resp.aiter_text()))
+            await resp.aread()
+        self.log.error(f"Error gathering logs {resp.text}")
+
+    async def is_indexing(self, tenant: str) -> bool:
+        """Check if the latest loading of a tenant is still running
+
+        Arguments:
+            tenant: (str) .stat tenant
+
+        Returns:
+            boolean stating if a loading is queued or in progress
+        """
+        return _is_running(await self.get_latest_log(tenant))
+
+    async def get_log(self, tenant: str, loading_id: str) -> Optional[LoadingLog]:
+        """Get log and status from by loading_id, if retrieving a log by id
+        fails with a 502 it will fallback to retrieve all available logs and
+        filter them. The fallback list is parsed while it is downloaded and the
+        download stops at the matching entry.
+
+        Arguments:
+            tenant: (str) .stat tenant
+            loading_id: (str) id of the loading
+
+        Returns:
+            LoadingLog or None if the loading_id cannot be found
+        """
+        url = f"{self.SFS_URL}/admin/logs?api-key={self._sfs_api_key}&tenant={tenant}"
+        resp = await self._client.get(f"{url}&id={loading_id}", extensions=_BY_ID_RETRY)
+        if resp.status_code == 200:
+            return LoadingLog.model_validate(resp.json())
+        if resp.status_code == 502:
+            self.log.error("Error 502 getting loading log, using expensive query")
+            async with self._client.stream("GET", url) as resp:
+                if resp.status_code == 200:
+                    return await self._find_streamed_loading(resp, loading_id)
+                await resp.aread()
+        self.log.error(f"Error gathering logs {resp.text}")
+
+    @staticmethod
+    async def _find_streamed_loading(
+        resp: httpx.Response, loading_id: str
+    ) -> Optional[LoadingLog]:
+        """Find a loading in a streamed list of logs, stopping at the match
+
+        Args:
+            resp: Streamed response with the list of loading logs
+            loading_id: (str) id of the loading
+
+        Returns:
+            LoadingLog or None if the loading_id cannot be found
+        """
+        async for entry in aiter_json_array(resp.aiter_text()):
+            if str(entry.get("id")) == str(loading_id):
+                return LoadingLog.model_validate(entry)
+
+    async def check_status_loading(
+        self, tenant: str, loading_id: str
+    ) -> SFSClient.LoadingStatus:
+        """Check the status of a loading taks
+
+        Arguments:
+            tenant: (str) .stat tenant
+            loading_id: (str) id of the loading
+
+        Returns:
+            LoadingStatus enumeration
+        """
+        loading = await self.get_log(tenant=tenant, loading_id=loading_id)
+        if loading.executionStatus == "completed":
+            return self.LoadingStatus.COMPLETED
+        self.log.error(f"Mapping outcome of {loading.executionStatus} to RETRY")
+        return self.LoadingStatus.RETRY
+
+    async def wait_for_index_to_finish(  # noqa FNE005
+        self,
+        tenant: str,
+        loading_id: str,
+        startup_sleep: int = 0,
+        timeout: int = 600,
+        backoff: int = 30,
+        schedule: Optional[PollingSchedule] = None,
+    ) -> bool:
+        """This method will periodically check the status of a loading task and
+        until it finishes, error or expires the timeout
+
+        Arguments:
+            tenant: (str) .stat tenant
+            loading_id: (str) id of the loading
+            startup_sleep: (int) grace period (secs) before start fetching the
+                           loading state
+            timeout: (int) max time (secs) the loop will be running
+            backoff: (int) max time between iterations fetching the data, the
+                     first checks are done every second and the delay grows
+                     exponentially up to this value
+            schedule: (PollingSchedule) custom polling schedule, replaces
+                      timeout and backoff
+
+        Returns:
+            boolean stating if the loading task finished correctly
+        """
+        await asyncio.sleep(startup_sleep)
+        schedule = schedule or PollingSchedule(
+            max_delay=backoff, timeout=timeout - startup_sleep
+        )
+
+        async def check_many(keys: List[str]) -> Dict[str, SFSClient.LoadingStatus]:
+            """Check the status of the loading
+
+            Args:
+                keys: The loading ids to check
+
+            Returns:
+                dict: Status of each loading
+            """
+            return {
+                key: await self.check_status_loading(tenant=tenant, loading_id=key)
+                for key in keys
+            }
+
+        poller = AsyncPoller(
+            check_many=check_many,
+            is_done=self.LoadingStatus.COMPLETED.__eq__,
+            schedule=schedule,
+        )
+        poller.add(loading_id)
+        result = await anext(poller.run())
+        if result.timed_out:
             self.log.error(
-                "Still not information retrieved about the loading, waiting..."
+                f"Timeout waiting for dataflows to be indexed {timeout} seconds passed"  # noqa
             )
-            time.sleep(backoff)
+        return not result.timed_out
@@ -1 +1,2 @@
-from .transfer import TransferClient
+from .models import ImportJob, ImportResult, TransferJob, TransferResult
+from .transfer import AsyncTransferClient, TransferClient
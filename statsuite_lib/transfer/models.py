@@ -0,0 +1,116 @@
+import datetime
+from typing import Any, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+TERMINAL_STATUSES = frozenset({"Completed", "TimedOut", "Canceled"})
+
+
+class ImportJob(BaseModel):
+    """A file to be imported by a bulk import
+
+    Attributes:
+        model_config: Configuration
+        file_object: The SDMX file to import
+        dataspace: Target dataspace name
+        target_version: Version number for the import
+        restoration_option_required: Whether restoration is required
+        validation_type: Type of validation to perform
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True, defer_build=True)
+    file_object: Any
+    dataspace: str
+    target_version: int = 0
+    restoration_option_required: bool = False
+    validation_type: int = 1
+
+
+class ImportResult(BaseModel):
+    """Outcome of an import job
+
+    Attributes:
+        model_config: Configuration
+        job: The submitted job
+        request_id: Id of the transfer request, None if the submission failed
+        execution_status: Last execution status reported by the transfer service
+        error: Reason why the job did not complete
+        is_completed: Whether the request reached the Completed status
+    """
+
+    model_config = ConfigDict(defer_build=True)
+    job: ImportJob
+    request_id: Optional[str] = None
+    execution_status: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def is_completed(self) -> bool:
+        """Whether the import request completed
+
+        Returns:
+            True if the request reached the Completed status
+        """
+        return self.execution_status == "Completed"
+
+
+class TransferJob(BaseModel):
+    """A dataflow to be transferred by a bulk transfer
+
+    Attributes:
+        model_config: Configuration
+        source_dataspace: Dataspace the dataflow is read from
+        destination_dataspace: Dataspace the dataflow is written to
+        dataflow: The dataflow to transfer
+        destination_dataflow: Target dataflow, None for the same dataflow
+        transfer_content: What is transferred, 0 for data and metadata, 1 for
+            data only, 2 for metadata only
+        source_version: Version read, 0 for live, 1 for point in time
+        target_version: Version written, 0 for live, 1 for point in time
+        pit_release_date: Release date of a point in time target version
+        restoration_option_required: Whether restoration is required
+        validation_type: Type of validation to perform
+    """
+
+    model_config = ConfigDict(defer_build=True)
+    source_dataspace: str
+    destination_dataspace: str
+    dataflow: str
+    destination_dataflow: Optional[str] = None
+    transfer_content: int = 0
+    source_version: int = 0
+    target_version: int = 0
+    pit_release_date: Optional[datetime.datetime] = None
+    restoration_option_required: bool = False
+    validation_type: int = 0
+
+    def to_form(self) -> dict:
+        """Form data of the ``/transfer/dataflow`` request
+
+        Returns:
+            dict: The form fields
+        """
+        data = {
+            "sourceDataspace": self.source_dataspace,
+            "destinationDataspace": self.destination_dataspace,
+            "sourceDataflow": self.dataflow,
+            "destinationDataflow": self.destination_dataflow or self.dataflow,
+            "transferContent": self.transfer_content,
+            "sourceVersion": self.source_version,
+            "targetVersion": self.target_version,
+            "restorationOptionRequired": self.restoration_option_required,
+            "validationType": self.validation_type,
+        }
+        if self.pit_release_date is not None:
+            data["PITReleaseDate"] = self.pit_release_date.strftime("%d-%m-%Y %H:%M:%S")
+        return data
+
+
+class TransferResult(ImportResult):
+    """Outcome of a transfer job
+
+    Attributes:
+        job: The submitted job
+    """
+
+    job: TransferJob
@@ -1,9 +1,297 @@
+import asyncio
+import datetime
+import itertools
 import logging
 import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import httpx
 
-from statsuite_lib import KeycloakClient
+from ..keycloak.keycloak import AsyncKeycloakClient, KeycloakClient
+from ..polling import AsyncPoller, Poller, PollingSchedule, PollResult
+from ..transport import create_async_client, get_default_client
+from ..transport.streaming import UploadSource, open_upload, upload_name
+from .models import (
+    TERMINAL_STATUSES,
+    ImportJob,
+    ImportResult,
+    TransferJob,
+    TransferResult,
+)
+
+ImportJobSpec = Union[ImportJob, Tuple]
+TransferJobSpec = Union[TransferJob, Tuple]
+BulkJob = Union[ImportJob, TransferJob]
+RequestId = Union[int, str]
+RequestKey = Tuple[str, str]
+
+# POSTs that can be repeated without side effects, retried like GETs
+# by transport.RetryPolicy
+_IDEMPOTENT = {"idempotent": True}
+
+
+def _requests_filter(
+    dataspace: str, submitted_after: Optional[datetime.datetime]
+) -> dict:
+    """Build the form of a ``/status/requests`` query.
+
+    Args:
+        dataspace: The dataspace name
+        submitted_after: Only list the requests submitted after this time, sent
+            in UTC. Naive times are taken as UTC already
+
+    Returns:
+        dict: The form data
+    """
+    data = {"dataspace": dataspace}
+    if submitted_after is not None:
+        if submitted_after.tzinfo is not None:
+            submitted_after = submitted_after.astimezone(datetime.timezone.utc)
+        data["submissionStart"] = submitted_after.strftime("%d-%m-%Y %H:%M:%S")
+    return data
+
+
+def _submission_start() -> datetime.datetime:
+    """Lower bound of the submission time of the requests a bulk job will send.
+
+    Returns:
+        datetime: A minute ago in UTC, the margin covers a clock skew with the
+            transfer service
+    """
+    return datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=1)
+
+
+def _select_statuses(
+    listed: Dict[str, str], ids: List[RequestId]
+) -> Dict[RequestId, str]:
+    """Pick the statuses of some requests from a dataspace listing.
+
+    Args:
+        listed: Execution status keyed by request ID as string
+        ids: The wanted request IDs
+
+    Returns:
+        dict: Execution status of the listed wanted requests, keyed by the given IDs
+    """
+    return {
+        request_id: listed[str(request_id)]
+        for request_id in ids
+        if str(request_id) in listed
+    }
+
+
+def _parse_requests_status(resp: httpx.Response) -> Optional[Dict[str, str]]:
+    """Read a ``/status/requests`` answer.
+
+    Args:
+        resp: The answer of the service
+
+    Returns:
+        dict: Execution status keyed by request ID as string, empty if the
+        listing failed and None if the service does not provide the endpoint
+    """
+    if resp.status_code in (404, 405):
+        return None
+    if resp.status_code != 200:
+        return {}
+    return {
+        str(request.get("requestId", request.get("id"))): request.get("executionStatus")
+        for request in resp.json()
+    }
+
+
+def _submit_next(
+    start: Callable[[BulkJob], Future],
+    jobs: Iterator[BulkJob],
+    submissions: Dict[Future, BulkJob],
+    max_workers: int,
+) -> None:
+    """Submit the next jobs, keeping at most ``max_workers`` submissions pending.
+
+    Args:
+        start: Start the submission of a job, returns its future (or asyncio task)
+        jobs: The jobs not submitted yet
+        submissions: Pending submissions, the new ones are added
+        max_workers: Max pending submissions
+    """
+    for job in itertools.islice(jobs, max(0, max_workers - len(submissions))):
+        submissions[start(job)] = job
+
+
+def _to_import_job(spec: ImportJobSpec) -> ImportJob:
+    """Normalize a bulk import job specification.
+
+    Args:
+        spec: An ImportJob or a (file_object, dataspace[, options]) tuple, options
+              being a dict of ImportJob fields.
+
+    Returns:
+        ImportJob: The job
+    """
+    if isinstance(spec, ImportJob):
+        return spec
+    file_object, dataspace, *options = spec
+    return ImportJob(
+        file_object=file_object, dataspace=dataspace, **(options[0] if options else {})
+    )
+
+
+def _to_transfer_job(spec: TransferJobSpec) -> TransferJob:
+    """Normalize a bulk transfer job specification.
+
+    Args:
+        spec: A TransferJob or a (source_dataspace, destination_dataspace,
+              dataflow[, options]) tuple, options being a dict of TransferJob
+              fields.
+
+    Returns:
+        TransferJob: The job
+    """
+    if isinstance(spec, TransferJob):
+        return spec
+    source, destination, dataflow, *options = spec
+    return TransferJob(
+        source_dataspace=source,
+        destination_dataspace=destination,
+        dataflow=dataflow,
+        **(options[0] if options else {}),
+    )
+
+
+def _transfer_request_id(resp: httpx.Response) -> str:
+    """Read the request ID of a ``/transfer/dataflow`` answer.
+
+    Args:
+        resp (httpx.Response): The answer of the service
+
+    Returns:
+        str: The ID of the transfer request
+    """
+    return resp.json().get("message").split(" ")[2]
+
+
+def _wait_time(poller: Union[Poller, AsyncPoller], deadline: float) -> float:
+    """Time to wait for the submissions before polling or giving up.
+
+    Args:
+        poller: Poller of the in flight requests
+        deadline: Monotonic time at which the bulk operation times out
+
+    Returns:
+        float: Seconds until the next status poll, at most until the deadline
+    """
+    remaining = max(0.0, deadline - time.monotonic())
+    due_in = poller.next_due_in()
+    return remaining if due_in is None else min(due_in, remaining)
+
+
+def _start_task(
+    submit: Callable[[BulkJob], Awaitable[Optional[str]]], job: BulkJob
+) -> asyncio.Task:
+    """Start the async submission of a job in its own task.
+
+    Args:
+        submit: Submit a job
+        job: The job to submit
+
+    Returns:
+        asyncio.Task: The running submission
+    """
+    return asyncio.ensure_future(submit(job))
+
+
+def _collect_submissions(
+    done: Iterable[Future],
+    submissions: Dict[Future, BulkJob],
+    in_flight: Dict[RequestKey, BulkJob],
+    poller: Union[Poller, AsyncPoller],
+    kind: "_BulkKind",
+) -> Iterator[ImportResult]:
+    """Start polling the requests of the finished submissions.
+
+    Args:
+        done: Finished submission futures (or asyncio tasks)
+        submissions: Pending submissions, finished ones are removed
+        in_flight: Jobs waiting for their request to finish, keyed by
+                   (dataspace, request id)
+        poller: Poller of the in flight requests
+        kind: How to report the outcome of the jobs
+
+    Yields:
+        ImportResult: Result of the jobs whose submission failed
+    """
+    for future in done:
+        job = submissions.pop(future)
+        error = future.exception()
+        request_id = None if error else future.result()
+        if request_id is None:
+            yield kind.result_type(job=job, error=str(error or kind.rejection))
+        else:
+            key = (kind.dataspace_of(job), request_id)
+            in_flight[key] = job
+            poller.add(key)
+
+
+def _expire_requests(
+    submissions: Dict[Future, BulkJob],
+    jobs: Iterator[BulkJob],
+    in_flight: Dict[RequestKey, BulkJob],
+    timeout: int,
+    kind: "_BulkKind",
+) -> Iterator[ImportResult]:
+    """Give up on the unfinished jobs once the timeout passed.
+
+    Args:
+        submissions: Pending submissions, they are cancelled
+        jobs: The jobs not submitted yet
+        in_flight: Jobs waiting for their request to finish
+        timeout: The expired timeout
+        kind: How to report the outcome of the jobs
+
+    Yields:
+        ImportResult: Result of every unfinished job
+    """
+    error = f"Timeout after {timeout} seconds"
+    for future, job in submissions.items():
+        future.cancel()
+        yield kind.result_type(job=job, error=error)
+    for job in jobs:
+        yield kind.result_type(job=job, error=error)
+    for (_, request_id), job in in_flight.items():
+        yield kind.result_type(job=job, request_id=request_id, error=error)
+
+
+class _BulkKind(NamedTuple):
+    """How the jobs of a bulk operation are submitted and reported.
+
+    Attributes:
+        submit: Submit a job, returns its request ID or None if rejected
+        dataspace_of: Dataspace where the request of a job is polled
+        result_type: Model of the outcome of a job
+        rejection: Error of a job whose submission returned None
+    """
+
+    submit: Callable[[BulkJob], Optional[str]]
+    dataspace_of: Callable[[BulkJob], str]
+    result_type: Type[ImportResult]
+    rejection: str
 
 
 class TransferClient:
@@ -14,10 +302,15 @@ class TransferClient:
         transfer_url (str): Base URL for the transfer service
         keycloak_client (KeycloakClient): Authentication client instance
         api_version (str, optional): API version to use. Defaults to '3'
+        http_client (httpx.Client, optional): Pooled client used for the requests
     """
 
     def __init__(
-        self, transfer_url: str, keycloak_client: KeycloakClient, api_version: str = "3"
+        self,
+        transfer_url: str,
+        keycloak_client: KeycloakClient,
+        api_version: str = "3",
+        http_client: Optional[httpx.Client] = None,
     ) -> None:
         """
         Initialize the TransferClient.
@@ -26,15 +319,18 @@ class TransferClient:
             transfer_url (str): Base URL for the transfer service
             keycloak_client (KeycloakClient): Authentication client instance
             api_version (str, optional): API version to use. Defaults to '3'
+            http_client (httpx.Client, optional): Pooled client used for the requests.
+                Defaults to the process wide client from ``statsuite_lib.transport``
         """
-        self._client = httpx.Client()
+        self._client = http_client or get_default_client()
         self.TRANSFER_URL = f"{transfer_url}/{api_version}"
         self._keycloak_client = keycloak_client
         self._log = logging.getLogger("TransferClient")
+        self._batch_status_supported = True
 
     def import_sdmx_file(
         self,
-        file_object,
+        file_object: UploadSource,
         dataspace: str,
         target_version: int = 0,
         restoration_option_required: bool = False,
@@ -44,8 +340,11 @@ class TransferClient:
         """
         Import an SDMX file into the specified dataspace.
 
+        The file is sent as a multipart upload, paths (``pathlib.Path``) and file
+        objects are streamed from disk in chunks instead of being loaded in memory.
+
         Args:
-            file_object: The SDMX file to import
+            file_object: The SDMX file to import: raw content, path or file object
             dataspace (str): Target dataspace name
             target_version (int, optional): Version number for the import. Defaults to 0
             restoration_option_required (bool, optional): Whether restoration is required. Defaults to False # noqa E501
@@ -68,21 +367,181 @@ class TransferClient:
             "targetVersion": target_version,
             "restorationOptionRequired": restoration_option_required,
             "validationType": validation_type,
-            "file": file_object,
         }
         url = f"{self.TRANSFER_URL}/import/sdmxFile"
-        resp = httpx.post(
-            url=url,
-            headers=self._keycloak_client.auth_header(),
-            data=data,
-            timeout=timeout,
-        )
-        print(resp.json())
+        with open_upload(file_object) as source:
+            resp = self._client.post(
+                url=url,
+                headers=self._keycloak_client.auth_header(),
+                data=data,
+                files={"file": (upload_name(source), source)},
+                timeout=timeout,
+            )
+        self._log.debug(f"Import response: {resp.text}")
         if resp.status_code != 200:
             self._log.error(f"Error importing SDMX file: {resp.json()}")
             return None
         return resp.json().get("message").split(" ")[4]
 
+    def import_sdmx_files(
+        self,
+        jobs: Iterable[ImportJobSpec],
+        max_workers: int = 4,
+        timeout: int = 3600,
+        backoff: int = 5,
+    ) -> Iterator[ImportResult]:
+        """
+        Import many SDMX files with bounded concurrency.
+
+        Files are submitted by a pool of ``max_workers`` threads, the returned
+        request ids are tracked and polled on a single loop, the requests due at
+        the same time being checked together, yielding a result for each job as
+        soon as it finishes.
+
+        Args:
+            jobs: ImportJob instances or (file_object, dataspace[, options]) tuples
+            max_workers (int, optional): Max concurrent requests. Defaults to 4
+            timeout (int, optional): Max time (secs) to wait for all the jobs.
+                Defaults to 3600
+            backoff (int, optional): Max time (secs) between the status checks of
+                a request. Defaults to 5
+
+        Returns:
+            Iterator of ImportResult, the outcome of each job in completion order
+
+        Example:
+            jobs = [(path, "design") for path in sample_data_dir.glob("*.csv")]
+            for result in transfer.import_sdmx_files(jobs, max_workers=8):
+                if not result.is_completed:
+                    print(result.job.file_object.name, result.error)
+        """
+        kind = _BulkKind(
+            submit=self._submit_import,
+            dataspace_of=lambda job: job.dataspace,
+            result_type=ImportResult,
+            rejection="Import rejected",
+        )
+        return self._run_requests(
+            map(_to_import_job, jobs), kind, max_workers, timeout, backoff
+        )
+
+    def _run_requests(
+        self,
+        jobs: Iterable[BulkJob],
+        kind: "_BulkKind",
+        max_workers: int,
+        timeout: int,
+        backoff: int,
+    ) -> Iterator[ImportResult]:
+        """
+        Submit jobs with bounded concurrency and poll their requests together.
+
+        Args:
+            jobs: The jobs to submit
+            kind: How to submit the jobs and report their outcome
+            max_workers (int): Max concurrent submissions
+            timeout (int): Max time (secs) to wait for all the jobs
+            backoff (int): Max time (secs) between the status checks of a request
+
+        Yields:
+            ImportResult: The outcome of each job, of ``kind.result_type``, in
+                completion order
+        """
+        deadline = time.monotonic() + timeout
+        started = _submission_start()
+        jobs = iter(jobs)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            start = partial(executor.submit, kind.submit)
+            submissions: Dict[Future, BulkJob] = {}
+            _submit_next(start, jobs, submissions, max_workers)
+            in_flight: Dict[RequestKey, BulkJob] = {}
+            poller = Poller(
+                check_many=lambda keys: self._check_requests(keys, started),
+                is_done=TERMINAL_STATUSES.__contains__,
+                schedule=PollingSchedule(max_delay=backoff),
+            )
+            while submissions or in_flight:
+                done = self._wait_submissions(submissions, _wait_time(poller, deadline))
+                yield from _collect_submissions(
+                    done, submissions, in_flight, poller, kind
+                )
+                _submit_next(start, jobs, submissions, max_workers)
+                for result in poller.poll_due():
+                    yield kind.result_type(
+                        job=in_flight.pop(result.key),
+                        request_id=result.key[1],
+                        execution_status=result.status,
+                    )
+                if time.monotonic() > deadline:
+                    self._log.error(
+                        f"Timeout waiting for requests to be completed {timeout} seconds passed"  # noqa E501
+                    )
+                    yield from _expire_requests(
+                        submissions, jobs, in_flight, timeout, kind
+                    )
+                    return
+
+    def _wait_submissions(
+        self, submissions: Dict[Future, BulkJob], wait_time: Optional[float]
+    ) -> Set[Future]:
+        """
+        Wait until a submission finishes or the next status poll is due.
+
+        Args:
+            submissions: Pending submissions
+            wait_time: Seconds until the next status poll, None if nothing to poll
+
+        Returns:
+            set: The finished submissions
+        """
+        if not submissions:
+            time.sleep(wait_time)
+            return set()
+        done, _ = wait(submissions, wait_time, return_when=FIRST_COMPLETED)
+        return done
+
+    def _submit_import(self, job: ImportJob) -> Optional[str]:
+        """
+        Submit one bulk import job.
+
+        Args:
+            job (ImportJob): The job to submit
+
+        Returns:
+            str: The ID of the import request, None if it was rejected
+        """
+        return self.import_sdmx_file(
+            file_object=job.file_object,
+            dataspace=job.dataspace,
+            target_version=job.target_version,
+            restoration_option_required=job.restoration_option_required,
+            validation_type=job.validation_type,
+        )
+
+    def _check_requests(
+        self, keys: List[RequestKey], submitted_after: datetime.datetime
+    ) -> Dict[RequestKey, str]:
+        """
+        Check the status of many requests, with one batched query per dataspace.
+
+        Args:
+            keys: (dataspace, request id) of the requests
+            submitted_after: Submission time of the first request
+
+        Returns:
+            dict: Status of each request
+        """
+        by_dataspace = defaultdict(list)
+        for dataspace, request_id in keys:
+            by_dataspace[dataspace].append(request_id)
+        return {
+            (dataspace, request_id): status
+            for dataspace, request_ids in by_dataspace.items()
+            for request_id, status in self.check_requests_status(
+                dataspace, request_ids, submitted_after
+            ).items()
+        }
+
     def check_request_status(self, dataspace: str, id: int) -> str:  # noqa VNE003
         """
         Check the status of a request for a given dataspace and ID.
@@ -95,52 +554,185 @@ class TransferClient:
             str: The execution status of the request
 
         """
+        return self.get_request_status(dataspace, id).get("executionStatus")
+
+    def get_request_status(self, dataspace: str, id: int) -> dict:  # noqa VNE003
+        """
+        Get the status of a request for a given dataspace and ID.
+
+        Args:
+            dataspace (str): The dataspace name
+            id (int): The request ID to check
+
+        Returns:
+            dict: The status of the request, with its ``executionStatus``,
+            ``executionOutcome`` and ``logs``
+        """
         self._log.info(f"Checking request status for dataspace {dataspace} and id {id}")
         data = {"dataspace": dataspace, "id": id}
-        resp = httpx.post(
+        resp = self._client.post(
             url=f"{self.TRANSFER_URL}/status/request",
             headers=self._keycloak_client.auth_header(),
             data=data,
+            extensions=_IDEMPOTENT,
+        )
+        return resp.json()
+
+    def check_requests_status(
+        self,
+        dataspace: str,
+        ids: Iterable[RequestId],
+        submitted_after: Optional[datetime.datetime] = None,
+        max_workers: int = 8,
+    ) -> Dict[RequestId, str]:
+        """
+        Check the status of many requests of a dataspace at once.
+
+        The statuses are read from a single ``/status/requests`` query, requests
+        missing from it (or every request, if the service does not support that
+        endpoint) are checked one by one concurrently.
+
+        Args:
+            dataspace (str): The dataspace name
+            ids: The request IDs to check
+            submitted_after (datetime, optional): Only list the requests submitted
+                after this time, reduces the size of the ``/status/requests``
+                answer. Naive times are taken as UTC
+            max_workers (int, optional): Max concurrent requests of the fallback.
+                Defaults to 8
+
+        Returns:
+            dict: The execution status of each request, keyed by the given IDs
+        """
+        ids = list(ids)
+        statuses = {}
+        if len(ids) > 1 and self._batch_status_supported:
+            listed = self._list_requests_status(dataspace, submitted_after)
+            statuses = _select_statuses(listed, ids)
+        missing = [request_id for request_id in ids if request_id not in statuses]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as pool:
+                check = partial(self.check_request_status, dataspace)
+                statuses.update(zip(missing, pool.map(check, missing)))
+        return statuses
+
+    def _list_requests_status(
+        self, dataspace: str, submitted_after: Optional[datetime.datetime]
+    ) -> Dict[str, str]:
+        """
+        List the status of the requests of a dataspace.
+
+        Args:
+            dataspace (str): The dataspace name
+            submitted_after (datetime, optional): Only list the requests submitted
+                after this time
+
+        Returns:
+            dict: Execution status keyed by request ID as string, empty if the
+                  listing failed
+        """
+        self._log.info(f"Listing requests status for dataspace {dataspace}")
+        resp = self._client.post(
+            url=f"{self.TRANSFER_URL}/status/requests",
+            headers=self._keycloak_client.auth_header(),
+            data=_requests_filter(dataspace, submitted_after),
+            extensions=_IDEMPOTENT,
         )
-        return resp.json().get("executionStatus")
+        listed = _parse_requests_status(resp)
+        if listed is None:
+            self._log.warning("/status/requests not supported, checking one by one")
+            self._batch_status_supported = False
+        return listed or {}
 
-    def wait_for_request(
+    def wait_for_request(  # noqa FNE005
         self,
         dataspace: str,
         id: int,  # noqa VNE003
         timeout: int = 300,
         backoff: int = 30,  # noqa VNE003
-    ) -> None:
+        schedule: Optional[PollingSchedule] = None,
+    ) -> bool:
         """
         Wait for a request to complete with timeout and backoff mechanism.
 
+        The status is checked every second at first, so short requests return
+        quickly, then with an exponential backoff up to ``backoff`` seconds.
+
         Args:
             dataspace (str): The dataspace name
             id (int): The request ID to wait for
             timeout (int, optional): Maximum time to wait in seconds. Defaults to 300
-            backoff (int, optional): Time between status checks in seconds. Defaults to 30
+            backoff (int, optional): Max time between status checks in seconds.
+                Defaults to 30
+            schedule (PollingSchedule, optional): Custom polling schedule, replaces
+                ``timeout`` and ``backoff``
 
         Returns:
-            bool: True if timeout occurred, False if request completed successfully
+            bool: True if timeout occurred, False once the request reached a final
+                status (Completed, TimedOut or Canceled)
+
 
+        """
+        result = next(
+            self.wait_for_requests(dataspace, [id], timeout, backoff, schedule)
+        )
+        return result.timed_out
 
+    def wait_for_requests(
+        self,
+        dataspace: str,
+        ids: Iterable[int],
+        timeout: int = 300,
+        backoff: int = 30,
+        schedule: Optional[PollingSchedule] = None,
+    ) -> Iterator[PollResult]:
         """
-        start = time.time()
-        while True:
-            status = self.check_request_status(dataspace=dataspace, id=id)
-            if status == "Completed":
-                return False
+        Wait for many requests of a dataspace on a single polling loop.
+
+        A request is done as soon as it reaches a final status, Completed,
+        TimedOut or Canceled, the failed ones are not polled until the timeout.
+
+        Args:
+            dataspace (str): The dataspace name
+            ids: The request IDs to wait for
+            timeout (int, optional): Maximum time to wait in seconds. Defaults to 300
+            backoff (int, optional): Max time between status checks in seconds.
+                Defaults to 30
+            schedule (PollingSchedule, optional): Custom polling schedule, replaces
+                ``timeout`` and ``backoff``
 
-            if time.time() - start > timeout:
+        Yields:
+            PollResult: Request id, last status and whether it timed out, as soon
+                as each request completes
+        """
+        poller = Poller(
+            check_many=lambda request_ids: self.check_requests_status(
+                dataspace, request_ids
+            ),
+            is_done=TERMINAL_STATUSES.__contains__,
+            schedule=schedule or PollingSchedule(max_delay=backoff, timeout=timeout),
+        )
+        for request_id in ids:
+            poller.add(request_id)
+        for result in poller.run():
+            if result.timed_out:
                 self._log.error(
-                    f"Timeout waiting for request to be completed {timeout} seconds passed"
+                    f"Timeout waiting for request {result.key} to be completed"
                 )
-                return True
-            time.sleep(backoff)
+            elif result.status != "Completed":
+                self._log.error(
+                    f"Request {result.key} ended with status {result.status}"
+                )
+            yield result
 
     def transfer_dataflow(
-        self, source_dataspace: str, destination_dataspace: str, dataflow: str
-    ):
+        self,
+        source_dataspace: str,
+        destination_dataspace: str,
+        dataflow: str,
+        timeout=httpx.USE_CLIENT_DEFAULT,
+        **options,
+    ) -> str:
         """
         Transfer a dataflow from source dataspace to destination dataspace.
 
@@ -148,33 +740,88 @@ class TransferClient:
             source_dataspace (str): Source dataspace name
             destination_dataspace (str): Destination dataspace name
             dataflow (str): Name of the dataflow to transfer
+            timeout: Request timeout in seconds. Defaults to the client timeout
+            options: Other TransferJob fields, such as ``transfer_content``,
+                ``source_version``, ``target_version``, ``pit_release_date`` or
+                ``validation_type``
 
         Returns:
             str: The ID of the transfer request
+        """
+        job = TransferJob(
+            source_dataspace=source_dataspace,
+            destination_dataspace=destination_dataspace,
+            dataflow=dataflow,
+            **options,
+        )
+        return self._submit_transfer(job, timeout)
+
+    def _submit_transfer(
+        self, job: TransferJob, timeout=httpx.USE_CLIENT_DEFAULT
+    ) -> str:
+        """
+        Submit one transfer job.
 
+        Args:
+            job (TransferJob): The job to submit
+            timeout: Request timeout in seconds. Defaults to the client timeout
 
+        Returns:
+            str: The ID of the transfer request
         """
         self._log.info(
-            f"Transferring dataflow {dataflow} from {source_dataspace} to {destination_dataspace}"  # noqa E501
+            f"Transferring dataflow {job.dataflow} from {job.source_dataspace} to {job.destination_dataspace}"  # noqa E501
         )
-        data = {
-            "sourceDataspace": source_dataspace,
-            "destinationDataspace": destination_dataspace,
-            "sourceDataflow": dataflow,
-            "destinationDataflow": dataflow,
-            "transferContent": 0,
-            "sourceVersion": 0,
-            "targetVersion": 0,
-            "restorationOptionRequired": False,
-            "validationType": 0,
-        }
-
-        resp = httpx.post(
+        resp = self._client.post(
             url=f"{self.TRANSFER_URL}/transfer/dataflow",
             headers=self._keycloak_client.auth_header(),
-            data=data,
+            data=job.to_form(),
+            timeout=timeout,
+        )
+        return _transfer_request_id(resp)
+
+    def transfer_dataflows(
+        self,
+        jobs: Iterable[TransferJobSpec],
+        max_workers: int = 4,
+        timeout: int = 3600,
+        backoff: int = 5,
+    ) -> Iterator[TransferResult]:
+        """
+        Transfer many dataflows with bounded concurrency.
+
+        Transfers are submitted by a pool of ``max_workers`` threads, the returned
+        request ids are polled in their destination dataspace on a single loop,
+        like ``import_sdmx_files``, yielding a result for each job as soon as it
+        finishes.
+
+        Args:
+            jobs: TransferJob instances or (source_dataspace, destination_dataspace,
+                dataflow[, options]) tuples
+            max_workers (int, optional): Max concurrent requests. Defaults to 4
+            timeout (int, optional): Max time (secs) to wait for all the jobs.
+                Defaults to 3600
+            backoff (int, optional): Max time (secs) between the status checks of
+                a request. Defaults to 5
+
+        Returns:
+            Iterator of TransferResult, the outcome of each job in completion order
+
+        Example:
+            jobs = [("staging", "release", dataflow) for dataflow in dataflows]
+            for result in transfer.transfer_dataflows(jobs, max_workers=8):
+                if not result.is_completed:
+                    print(result.job.dataflow, result.error)
+        """
+        kind = _BulkKind(
+            submit=self._submit_transfer,
+            dataspace_of=lambda job: job.destination_dataspace,
+            result_type=TransferResult,
+            rejection="Transfer rejected",
+        )
+        return self._run_requests(
+            map(_to_transfer_job, jobs), kind, max_workers, timeout, backoff
         )
-        return resp.json().get("message").split(" ")[2]
 
     def get_tune(self, dataspace: str, dsd_id: str):
         """
@@ -190,10 +837,11 @@ class TransferClient:
         """
         self._log.info(f"Getting DSD {dsd_id} tune information in ds {dataspace}")
         data = {"dataspace": dataspace, "dsd": dsd_id}
-        resp = httpx.post(
+        resp = self._client.post(
             url=f"{self.TRANSFER_URL}/tune/info",
             headers=self._keycloak_client.auth_header(),
             data=data,
+            extensions=_IDEMPOTENT,
         )
         return resp.json()
 
@@ -213,10 +861,11 @@ class TransferClient:
         """
         self._log.info(f"Getting DSD {dsd_id} tune information in ds {dataspace}")
         data = {"dataspace": dataspace, "dsd": dsd_id, "indexType": index_type}
-        resp = httpx.post(
+        resp = self._client.post(
             url=f"{self.TRANSFER_URL}/tune/dsd",
             headers=self._keycloak_client.auth_header(),
             data=data,
+            extensions=_IDEMPOTENT,
         )
         return resp.json()
 
@@ -233,7 +882,7 @@ class TransferClient:
         """
         self._log.info(f"Activating dataflow {df_id} in ds {dataspace}")
         data = {"dataspace": dataspace, "dataflow": df_id}
-        resp = httpx.post(
+        resp = self._client.post(
             url=f"{self.TRANSFER_URL}/init/dataflow",
             headers=self._keycloak_client.auth_header(),
             data=data,
@@ -248,6 +897,702 @@ class TransferClient:
             dict: Health information of the transfer service
         """
         health_url = self.TRANSFER_URL.replace("/3", "/health")
-        resp = httpx.get(url=f"{health_url}")
+        resp = self._client.get(url=f"{health_url}")
+        resp.raise_for_status()
+        return resp.json()
+
+
+class AsyncTransferClient:
+    """
+    Async counterpart of TransferClient, built on ``httpx.AsyncClient``.
+
+    Args:
+        transfer_url (str): Base URL for the transfer service
+        keycloak_client (AsyncKeycloakClient): Authentication client instance
+        api_version (str, optional): API version to use. Defaults to '3'
+        http_client (httpx.AsyncClient, optional): Pooled client used for the requests
+    """
+
+    def __init__(
+        self,
+        transfer_url: str,
+        keycloak_client: AsyncKeycloakClient,
+        api_version: str = "3",
+        http_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        """
+        Initialize the AsyncTransferClient.
+
+        Args:
+            transfer_url (str): Base URL for the transfer service
+            keycloak_client (AsyncKeycloakClient): Authentication client instance
+            api_version (str, optional): API version to use. Defaults to '3'
+            http_client (httpx.AsyncClient, optional): Pooled client used for the
+                requests. Defaults to a new client owned by this instance
+        """
+        self._client = http_client or create_async_client()
+        self.TRANSFER_URL = f"{transfer_url}/{api_version}"
+        self._keycloak_client = keycloak_client
+        self._log = logging.getLogger("TransferClient")
+        self._batch_status_supported = True
+
+    async def _post(
+        self,
+        endpoint: str,
+        data: dict,
+        files: Optional[dict] = None,
+        timeout=httpx.USE_CLIENT_DEFAULT,
+        extensions: Optional[dict] = None,
+    ):
+        """
+        Post an authenticated form to a transfer endpoint.
+
+        Args:
+            endpoint (str): Path of the endpoint, relative to the versioned url
+            data (dict): Form fields
+            files (dict, optional): Files of a multipart upload
+            timeout: Request timeout in seconds. Defaults to the client timeout
+            extensions (dict, optional): httpx request extensions, such as the
+                retry flags
+
+        Returns:
+            httpx.Response: The response of the service
+        """
+        return await self._client.post(
+            url=f"{self.TRANSFER_URL}{endpoint}",
+            headers=await self._keycloak_client.auth_header(),
+            data=data,
+            files=files,
+            timeout=timeout,
+            extensions=extensions,
+        )
+
+    async def import_sdmx_file(
+        self,
+        file_object: UploadSource,
+        dataspace: str,
+        target_version: int = 0,
+        restoration_option_required: bool = False,
+        validation_type: int = 1,
+        timeout: int = None,
+    ) -> int:
+        """
+        Import an SDMX file into the specified dataspace.
+
+        The file is sent as a multipart upload, paths (``pathlib.Path``) and file
+        objects are streamed from disk in chunks instead of being loaded in memory.
+
+        Args:
+            file_object: The SDMX file to import: raw content, path or file object
+            dataspace (str): Target dataspace name
+            target_version (int, optional): Version number for the import. Defaults to 0
+            restoration_option_required (bool, optional): Whether restoration is required. Defaults to False # noqa E501
+            validation_type (int, optional): Type of validation to perform. Defaults to 1
+            timeout (int, optional): Request timeout in seconds. Defaults to None
+
+        Returns:
+            int: The ID of the import request
+        """
+        data = {
+            "dataspace": dataspace,
+            "targetVersion": target_version,
+            "restorationOptionRequired": restoration_option_required,
+            "validationType": validation_type,
+        }
+        with open_upload(file_object) as source:
+            resp = await self._post(
+                "/import/sdmxFile",
+                data=data,
+                files={"file": (upload_name(source), source)},
+                timeout=timeout,
+            )
+        if resp.status_code != 200:
+            self._log.error(f"Error importing SDMX file: {resp.json()}")
+            return None
+        return resp.json().get("message").split(" ")[4]
+
+    def import_sdmx_files(
+        self,
+        jobs: Iterable[ImportJobSpec],
+        max_workers: int = 4,
+        timeout: int = 3600,
+        backoff: int = 5,
+    ) -> AsyncIterator[ImportResult]:
+        """
+        Import many SDMX files with bounded concurrency.
+
+        At most ``max_workers`` files are uploaded at once, the returned request
+        ids are tracked and polled on a single loop, the requests due at the same
+        time being checked together, yielding a result for each job as soon as
+        it finishes.
+
+        Args:
+            jobs: ImportJob instances or (file_object, dataspace[, options]) tuples
+            max_workers (int, optional): Max concurrent requests. Defaults to 4
+            timeout (int, optional): Max time (secs) to wait for all the jobs.
+                Defaults to 3600
+            backoff (int, optional): Max time (secs) between the status checks of
+                a request. Defaults to 5
+
+        Returns:
+            Async iterator of ImportResult, the outcome of each job in completion
+            order
+
+        Example:
+            jobs = [(path, "design") for path in sample_data_dir.glob("*.csv")]
+            async for result in transfer.import_sdmx_files(jobs, max_workers=8):
+                if not result.is_completed:
+                    print(result.job.file_object.name, result.error)
+        """
+        kind = _BulkKind(
+            submit=self._submit_import,
+            dataspace_of=lambda job: job.dataspace,
+            result_type=ImportResult,
+            rejection="Import rejected",
+        )
+        return self._run_requests(
+            map(_to_import_job, jobs), kind, max_workers, timeout, backoff
+        )
+
+    async def _run_requests(
+        self,
+        jobs: Iterable[BulkJob],
+        kind: "_BulkKind",
+        max_workers: int,
+        timeout: int,
+        backoff: int,
+    ) -> AsyncIterator[ImportResult]:
+        """
+        Submit jobs with bounded concurrency and poll their requests together.
+
+        The pending submissions are cancelled if the iteration stops early.
+
+        Args:
+            jobs: The jobs to submit
+            kind: How to submit the jobs and report their outcome
+            max_workers (int): Max concurrent submissions
+            timeout (int): Max time (secs) to wait for all the jobs
+            backoff (int): Max time (secs) between the status checks of a request
+
+        Yields:
+            ImportResult: The outcome of each job, of ``kind.result_type``, in
+                completion order
+        """
+        submissions: Dict[asyncio.Task, BulkJob] = {}
+        try:
+            async for result in self._poll_submissions(
+                iter(jobs), submissions, kind, max_workers, timeout, backoff
+            ):
+                yield result
+        finally:
+            for task in submissions:
+                task.cancel()
+
+    async def _poll_submissions(
+        self,
+        jobs: Iterator[BulkJob],
+        submissions: Dict[asyncio.Task, BulkJob],
+        kind: "_BulkKind",
+        max_workers: int,
+        timeout: int,
+        backoff: int,
+    ) -> AsyncIterator[ImportResult]:
+        """
+        Run the submissions and the polling loop of ``_run_requests``.
+
+        Args:
+            jobs: The jobs not submitted yet
+            submissions: Pending submissions, updated as they start and finish
+            kind: How to submit the jobs and report their outcome
+            max_workers (int): Max concurrent submissions
+            timeout (int): Max time (secs) to wait for all the jobs
+            backoff (int): Max time (secs) between the status checks of a request
+
+        Yields:
+            ImportResult: The outcome of each job, in completion order
+        """
+        deadline = time.monotonic() + timeout
+        started = _submission_start()
+        in_flight: Dict[RequestKey, BulkJob] = {}
+        poller = AsyncPoller(
+            check_many=lambda keys: self._check_requests(keys, started),
+            is_done=TERMINAL_STATUSES.__contains__,
+            schedule=PollingSchedule(max_delay=backoff),
+        )
+        start = partial(_start_task, kind.submit)
+        _submit_next(start, jobs, submissions, max_workers)
+        while (submissions or in_flight) and time.monotonic() <= deadline:
+            for result in await self._next_results(
+                submissions, in_flight, poller, kind, deadline
+            ):
+                yield result
+            _submit_next(start, jobs, submissions, max_workers)
+        for result in self._expire_pending(submissions, jobs, in_flight, timeout, kind):
+            yield result
+
+    def _expire_pending(
+        self,
+        submissions: Dict[asyncio.Task, BulkJob],
+        jobs: Iterator[BulkJob],
+        in_flight: Dict[RequestKey, BulkJob],
+        timeout: int,
+        kind: "_BulkKind",
+    ) -> List[ImportResult]:
+        """
+        Give up on the jobs still pending when the polling loop stopped.
+
+        Args:
+            submissions: Pending submissions, they are cancelled
+            jobs: The jobs not submitted yet
+            in_flight: Jobs waiting for their request to finish
+            timeout: The expired timeout
+            kind: How to report the outcome of the jobs
+
+        Returns:
+            list: Result of every unfinished job, empty if none was left
+        """
+        if not (submissions or in_flight):
+            return []
+        self._log.error(
+            f"Timeout waiting for requests to be completed {timeout} seconds passed"
+        )
+        return list(_expire_requests(submissions, jobs, in_flight, timeout, kind))
+
+    async def _next_results(
+        self,
+        submissions: Dict[asyncio.Task, BulkJob],
+        in_flight: Dict[RequestKey, BulkJob],
+        poller: AsyncPoller,
+        kind: "_BulkKind",
+        deadline: float,
+    ) -> List[ImportResult]:
+        """
+        Wait for the next finished submissions and poll the requests due.
+
+        Args:
+            submissions: Pending submissions, finished ones are removed
+            in_flight: Jobs waiting for their request to finish, keyed by
+                       (dataspace, request id)
+            poller: Poller of the in flight requests
+            kind: How to report the outcome of the jobs
+            deadline (float): Monotonic time at which the jobs time out
+
+        Returns:
+            list: Result of the jobs that finished meanwhile
+        """
+        done = await self._wait_submissions(submissions, _wait_time(poller, deadline))
+        finished = list(
+            _collect_submissions(done, submissions, in_flight, poller, kind)
+        )
+        return finished + [
+            kind.result_type(
+                job=in_flight.pop(result.key),
+                request_id=result.key[1],
+                execution_status=result.status,
+            )
+            for result in await poller.poll_due()
+        ]
+
+    async def _wait_submissions(
+        self, submissions: Dict[asyncio.Task, BulkJob], wait_time: Optional[float]
+    ) -> Set[asyncio.Task]:
+        """
+        Wait until a submission finishes or the next status poll is due.
+
+        Args:
+            submissions: Pending submissions
+            wait_time: Seconds until the next status poll, None if nothing to poll
+
+        Returns:
+            set: The finished submissions
+        """
+        if not submissions:
+            await asyncio.sleep(wait_time)
+            return set()
+        done, _ = await asyncio.wait(
+            submissions, timeout=wait_time, return_when=asyncio.FIRST_COMPLETED
+        )
+        return done
+
+    async def _submit_import(self, job: ImportJob) -> Optional[str]:
+        """
+        Submit one bulk import job.
+
+        Args:
+            job (ImportJob): The job to submit
+
+        Returns:
+            str: The ID of the import request, None if it was rejected
+        """
+        return await self.import_sdmx_file(
+            file_object=job.file_object,
+            dataspace=job.dataspace,
+            target_version=job.target_version,
+            restoration_option_required=job.restoration_option_required,
+            validation_type=job.validation_type,
+        )
+
+    async def _check_requests(
+        self, keys: List[RequestKey], submitted_after: datetime.datetime
+    ) -> Dict[RequestKey, str]:
+        """
+        Check the status of many requests, with one batched query per dataspace.
+
+        Args:
+            keys: (dataspace, request id) of the requests
+            submitted_after: Submission time of the first request
+
+        Returns:
+            dict: Status of each request
+        """
+        by_dataspace = defaultdict(list)
+        for dataspace, request_id in keys:
+            by_dataspace[dataspace].append(request_id)
+        checked = await asyncio.gather(
+            *(
+                self.check_requests_status(dataspace, request_ids, submitted_after)
+                for dataspace, request_ids in by_dataspace.items()
+            )
+        )
+        return {
+            (dataspace, request_id): status
+            for dataspace, statuses in zip(by_dataspace, checked)
+            for request_id, status in statuses.items()
+        }
+
+    async def check_request_status(self, dataspace: str, id: int) -> str:  # noqa VNE003
+        """
+        Check the status of a request for a given dataspace and ID.
+
+        Args:
+            dataspace (str): The dataspace name
+            id (int): The request ID to check
+
+        Returns:
+            str: The execution status of the request
+        """
+        return (await self.get_request_status(dataspace, id)).get("executionStatus")
+
+    async def get_request_status(self, dataspace: str, id: int) -> dict:  # noqa VNE003
+        """
+        Get the status of a request for a given dataspace and ID.
+
+        Args:
+            dataspace (str): The dataspace name
+            id (int): The request ID to check
+
+        Returns:
+            dict: The status of the request, with its ``executionStatus``,
+            ``executionOutcome`` and ``logs``
+        """
+        self._log.info(f"Checking request status for dataspace {dataspace} and id {id}")
+        data = {"dataspace": dataspace, "id": id}
+        resp = await self._post("/status/request", data=data, extensions=_IDEMPOTENT)
+        return resp.json()
+
+    async def check_requests_status(
+        self,
+        dataspace: str,
+        ids: Iterable[RequestId],
+        submitted_after: Optional[datetime.datetime] = None,
+        max_workers: int = 8,
+    ) -> Dict[RequestId, str]:
+        """
+        Check the status of many requests of a dataspace at once.
+
+        Args:
+            dataspace (str): The dataspace name
+            ids: The request IDs to check
+            submitted_after (datetime, optional): Only list the requests submitted
+                after this time. Naive times are taken as UTC
+            max_workers (int, optional): Max concurrent requests of the fallback.
+                Defaults to 8
+
+        Returns:
+            dict: The execution status of each request, keyed by the given IDs
+        """
+        ids = list(ids)
+        statuses = {}
+        if len(ids) > 1 and self._batch_status_supported:
+            listed = await self._list_requests_status(dataspace, submitted_after)
+            statuses = _select_statuses(listed, ids)
+        missing = [request_id for request_id in ids if request_id not in statuses]
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def check(request_id: RequestId) -> str:
+            """
+            Check one request, bounded by the semaphore.
+
+            Args:
+                request_id: The request ID to check
+
+            Returns:
+                str: The execution status of the request
+            """
+            async with semaphore:
+                return await self.check_request_status(dataspace, id=request_id)
+
+        statuses.update(zip(missing, await asyncio.gather(*map(check, missing))))
+        return statuses
+
+    async def _list_requests_status(
+        self, dataspace: str, submitted_after: Optional[datetime.datetime]
+    ) -> Dict[str, str]:
+        """
+        List the status of the requests of a dataspace.
+
+        Args:
+            dataspace (str): The dataspace name
+            submitted_after (datetime, optional): Only list the requests submitted
+                after this time
+
+        Returns:
+            dict: Execution status keyed by request ID as string, empty if the
+                  listing failed
+        """
+        self._log.info(f"Listing requests status for dataspace {dataspace}")
+        resp = await self._post(
+            "/status/requests",
+            data=_requests_filter(dataspace, submitted_after),
+            extensions=_IDEMPOTENT,
+        )
+        listed = _parse_requests_status(resp)
+        if listed is None:
+            self._log.warning("/status/requests not supported, checking one by one")
+            self._batch_status_supported = False
+        return listed or {}
+
+    async def wait_for_request(  # noqa FNE005
+        self,
+        dataspace: str,
+        id: int,  # noqa VNE003
+        timeout: int = 300,
+        backoff: int = 30,  # noqa VNE003
+        schedule: Optional[PollingSchedule] = None,
+    ) -> bool:
+        """
+        Wait for a request to complete with timeout and backoff mechanism.
+
+        Args:
+            dataspace (str): The dataspace name
+            id (int): The request ID to wait for
+            timeout (int, optional): Maximum time to wait in seconds. Defaults to 300
+            backoff (int, optional): Max time between status checks in seconds.
+                Defaults to 30
+            schedule (PollingSchedule, optional): Custom polling schedule, replaces
+                ``timeout`` and ``backoff``
+
+        Returns:
+            bool: True if timeout occurred, False once the request reached a final
+                status (Completed, TimedOut or Canceled)
+        """
+        result = await anext(
+            self.wait_for_requests(dataspace, [id], timeout, backoff, schedule)
+        )
+        return result.timed_out
+
+    async def wait_for_requests(
+        self,
+        dataspace: str,
+        ids: Iterable[int],
+        timeout: int = 300,
+        backoff: int = 30,
+        schedule: Optional[PollingSchedule] = None,
+    ) -> AsyncIterator[PollResult]:
+        """
+        Wait for many requests of a dataspace on a single polling loop.
+
+        A request is done as soon as it reaches a final status, Completed,
+        TimedOut or Canceled, the failed ones are not polled until the timeout.
+
+        Args:
+            dataspace (str): The dataspace name
+            ids: The request IDs to wait for
+            timeout (int, optional): Maximum time to wait in seconds. Defaults to 300
+            backoff (int, optional): Max time between status checks in seconds.
+                Defaults to 30
+            schedule (PollingSchedule, optional): Custom polling schedule, replaces
+                ``timeout`` and ``backoff``
+
+        Yields:
+            PollResult: Request id, last status and whether it timed out, as soon
+                as each request completes
+
+        Example:
+            async for result in transfer.wait_for_requests("design", ids):
+                print(result.key, result.status, result.timed_out)
+        """
+        poller = AsyncPoller(
+            check_many=lambda request_ids: self.check_requests_status(
+                dataspace, request_ids
+            ),
+            is_done=TERMINAL_STATUSES.__contains__,
+            schedule=schedule or PollingSchedule(max_delay=backoff, timeout=timeout),
+        )
+        for request_id in ids:
+            poller.add(request_id)
+        async for result in poller.run():
+            if result.timed_out:
+                self._log.error(
+                    f"Timeout waiting for request {result.key} to be completed"
+                )
+            elif result.status != "Completed":
+                self._log.error(
+                    f"Request {result.key} ended with status {result.status}"
+                )
+            yield result
+
+    async def transfer_dataflow(
+        self,
+        source_dataspace: str,
+        destination_dataspace: str,
+        dataflow: str,
+        timeout=httpx.USE_CLIENT_DEFAULT,
+        **options,
+    ) -> str:
+        """
+        Transfer a dataflow from source dataspace to destination dataspace.
+
+        Args:
+            source_dataspace (str): Source dataspace name
+            destination_dataspace (str): Destination dataspace name
+            dataflow (str): Name of the dataflow to transfer
+            timeout: Request timeout in seconds. Defaults to the client timeout
+            options: Other TransferJob fields, see ``TransferClient.transfer_dataflow``
+
+        Returns:
+            str: The ID of the transfer request
+        """
+        job = TransferJob(
+            source_dataspace=source_dataspace,
+            destination_dataspace=destination_dataspace,
+            dataflow=dataflow,
+            **options,
+        )
+        return await self._submit_transfer(job, timeout)
+
+    async def _submit_transfer(
+        self, job: TransferJob, timeout=httpx.USE_CLIENT_DEFAULT
+    ) -> str:
+        """
+        Submit one transfer job.
+
+        Args:
+            job (TransferJob): The job to submit
+            timeout: Request timeout in seconds. Defaults to the client timeout
+
+        Returns:
+            str: The ID of the transfer request
+        """
+        self._log.info(
+            f"Transferring dataflow {job.dataflow} from {job.source_dataspace} to {job.destination_dataspace}"  # noqa E501
+        )
+        resp = await self._post(
+            "/transfer/dataflow", data=job.to_form(), timeout=timeout
+        )
+        return _transfer_request_id(resp)
+
+    def transfer_dataflows(
+        self,
+        jobs: Iterable[TransferJobSpec],
+        max_workers: int = 4,
+        timeout: int = 3600,
+        backoff: int = 5,
+    ) -> AsyncIterator[TransferResult]:
+        """
+        Transfer many dataflows with bounded concurrency.
+
+        At most ``max_workers`` transfers are submitted at once, the returned
+        request ids are polled in their destination dataspace on a single loop,
+        like ``import_sdmx_files``, yielding a result for each job as soon as it
+        finishes.
+
+        Args:
+            jobs: TransferJob instances or (source_dataspace, destination_dataspace,
+                dataflow[, options]) tuples
+            max_workers (int, optional): Max concurrent requests. Defaults to 4
+            timeout (int, optional): Max time (secs) to wait for all the jobs.
+                Defaults to 3600
+            backoff (int, optional): Max time (secs) between the status checks of
+                a request. Defaults to 5
+
+        Returns:
+            Async iterator of TransferResult, the outcome of each job in completion
+            order
+
+        Example:
+            jobs = [("staging", "release", dataflow) for dataflow in dataflows]
+            async for result in transfer.transfer_dataflows(jobs, max_workers=8):
+                if not result.is_completed:
+                    print(result.job.dataflow, result.error)
+        """
+        kind = _BulkKind(
+            submit=self._submit_transfer,
+            dataspace_of=lambda job: job.destination_dataspace,
+            result_type=TransferResult,
+            rejection="Transfer rejected",
+        )
+        return self._run_requests(
+            map(_to_transfer_job, jobs), kind, max_workers, timeout, backoff
+        )
+
+    async def get_tune(self, dataspace: str, dsd_id: str):
+        """
+        Retrieve tune information for a specific DSD in a dataspace.
+
+        Args:
+            dataspace (str): The dataspace name
+            dsd_id (str): The ID of the Data Structure Definition
+
+        Returns:
+            dict: Tune information for the specified DSD
+        """
+        self._log.info(f"Getting DSD {dsd_id} tune information in ds {dataspace}")
+        data = {"dataspace": dataspace, "dsd": dsd_id}
+        resp = await self._post("/tune/info", data=data, extensions=_IDEMPOTENT)
+        return resp.json()
+
+    async def set_tune(self, dataspace: str, dsd_id: str, index_type: int):
+        """
+        Set tune parameters for a specific DSD in a dataspace.
+
+        Args:
+            dataspace (str): The dataspace name
+            dsd_id (str): The ID of the Data Structure Definition
+            index_type (int): The type of index to set
+
+        Returns:
+            dict: Response containing the result of the tune operation
+        """
+        self._log.info(f"Setting DSD {dsd_id} tune information in ds {dataspace}")
+        data = {"dataspace": dataspace, "dsd": dsd_id, "indexType": index_type}
+        resp = await self._post("/tune/dsd", data=data, extensions=_IDEMPOTENT)
+        return resp.json()
+
+    async def activate_dataflow(self, dataspace: str, df_id: str):
+        """
+        Initialise or repair DB objects of a dataflow in a dataspace.
+
+        Args:
+            dataspace (str): The dataspace name
+            df_id (str): The ID of the dataflow
+
+        Returns:
+            dict: Response containing the result of the activate operation
+        """
+        self._log.info(f"Activating dataflow {df_id} in ds {dataspace}")
+        data = {"dataspace": dataspace, "dataflow": df_id}
+        resp = await self._post("/init/dataflow", data=data)
+        return resp.json()
+
+    async def health(self) -> dict:
+        """
+        Check the health of the transfer service.
+
+        Returns:
+            dict: Health information of the transfer service
+        """
+        health_url = self.TRANSFER_URL.replace("/3", "/health")
+        resp = await self._client.get(url=health_url)
         resp.raise_for_status()
         return resp.json()
@@ -0,0 +1,14 @@
+from .metrics import (
+    EndpointStats,
+    Instrumentation,
+    OpenTelemetryExporter,
+    PrometheusExporter,
+    RequestRecord,
+)
+from .retry import AsyncRetryTransport, RetryPolicy, RetryStats, RetryTransport
+from .transport import (
+    create_async_client,
+    create_client,
+    get_default_client,
+    set_default_client,
+)
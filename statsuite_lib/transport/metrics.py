@@ -0,0 +1,512 @@
+import bisect
+import re
+import threading
+import time
+from collections import Counter
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
+
+import httpx
+
+from .._optional import import_optional
+
+# Upper bounds (secs) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Request extension holding the time the request was sent
+_STARTED = "statsuite.started"
+_ID_SEGMENT = re.compile(r"^\d+$")
+
+Client = TypeVar("Client", httpx.Client, httpx.AsyncClient)
+
+
+class RequestRecord(NamedTuple):
+    """Measures of a request, from the time it is sent to the end of its body
+
+    Attributes:
+        method: HTTP method
+        host: Host of the service
+        endpoint: Normalised path, see ``endpoint_of``
+        status_code: Status of the response
+        duration: Time (secs) until the response body was read
+        request_bytes: Size of the request body
+        response_bytes: Size of the response body, as received
+        retries: Number of retries done by a ``RetryTransport``
+    """
+
+    method: str
+    host: str
+    endpoint: str
+    status_code: int
+    duration: float
+    request_bytes: int
+    response_bytes: int
+    retries: int
+
+
+def endpoint_of(url: httpx.URL, depth: int = 3) -> str:
+    """Normalise a path so the requests of an endpoint are aggregated together
+
+    Args:
+        url: The request url
+        depth: Number of path segments kept, the next ones are dropped so the
+            artefact ids of NSI queries do not create an entry each
+
+    Returns:
+        str: The first segments of the path, numeric ids replaced by ``{id}``,
+        except in the first segment which holds the API version of some services
+    """
+    segments = [segment for segment in url.path.split("/") if segment][:depth]
+    return "/" + "/".join(
+        "{id}" if position and _ID_SEGMENT.match(segment) else segment
+        for position, segment in enumerate(segments)
+    )
+
+
+class EndpointStats:
+    """Aggregated measures of an endpoint
+
+    Attributes:
+        buckets: Upper bounds (secs) of the latency histogram buckets
+        count: Number of requests
+        errors: Number of 4xx and 5xx responses
+        statuses: Number of responses by status code
+        total_duration: Cumulated duration (secs) of the requests
+        histogram: Number of requests by bucket, the last one for the slower
+            requests
+        request_bytes: Cumulated size of the request bodies
+        response_bytes: Cumulated size of the response bodies
+        retries: Number of retries
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Inits the counters
+
+        Args:
+            buckets: Upper bounds (secs) of the latency histogram buckets
+        """
+        self.buckets = tuple(buckets)
+        self.count = 0
+        self.errors = 0
+        self.statuses: Counter = Counter()
+        self.total_duration = 0.0
+        self.histogram = [0] * (len(self.buckets) + 1)
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.retries = 0
+
+    def add(self, record: RequestRecord) -> None:
+        """Aggregate a request
+
+        Args:
+            record: Measures of the request
+        """
+        self.count += 1
+        self.errors += record.status_code >= 400
+        self.statuses[record.status_code] += 1
+        self.total_duration += record.duration
+        self.histogram[bisect.bisect_left(self.buckets, record.duration)] += 1
+        self.request_bytes += record.request_bytes
+        self.response_bytes += record.response_bytes
+        self.retries += record.retries
+
+    def quantile(self, fraction: float) -> float:
+        """Estimate a latency quantile from the histogram
+
+        Args:
+            fraction: The quantile, between 0 and 1
+
+        Returns:
+            float: Upper bound of the bucket holding the quantile, the last
+            bound if it is in the overflow bucket, 0 without requests
+        """
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.histogram):
+            seen += count
+            if count and seen >= rank:
+                return bound
+        return self.buckets[-1] if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        """Copy of the measures
+
+        Returns:
+            dict: The counters, with the mean and the p50, p95 and p99 latencies
+        """
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "statuses": dict(self.statuses),
+            "mean": self.total_duration / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "histogram": dict(zip([*self.buckets, float("inf")], self.histogram)),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "retries": self.retries,
+        }
+
+
+class _CountingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """Byte stream counting the bytes read from a wrapped stream"""
+
+    def __init__(
+        self,
+        stream: Union[httpx.SyncByteStream, httpx.AsyncByteStream],
+        on_close: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        """Inits the stream
+
+        Args:
+            stream: The wrapped stream
+            on_close: Called once with the number of bytes read when closed
+        """
+        self._stream = stream
+        self._on_close = on_close
+        self.count = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Read the wrapped stream
+
+        Yields:
+            bytes: The chunks of the stream
+        """
+        for chunk in self._stream:
+            self.count += len(chunk)
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """Read the wrapped stream
+
+        Yields:
+            bytes: The chunks of the stream
+        """
+        async for chunk in self._stream:
+            self.count += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        """Close the wrapped stream and report its size"""
+        self._stream.close()
+        self._closed()
+
+    async def aclose(self) -> None:
+        """Close the wrapped stream and report its size"""
+        await self._stream.aclose()
+        self._closed()
+
+    def _closed(self) -> None:
+        """Report the size once"""
+        on_close, self._on_close = self._on_close, None
+        if on_close is not None:
+            on_close(self.count)
+
+
+class Instrumentation:
+    """In memory metrics of the requests of instrumented clients
+
+    The measures are taken by httpx event hooks, so any client can be
+    instrumented, including the process wide default client. The duration of a
+    request covers its retries and ends when its body is read, which for
+    streamed downloads is when the stream is closed. Requests failing without
+    a response are not recorded, their retries are counted by ``RetryStats``.
+
+    Attributes:
+        buckets: Upper bounds (secs) of the latency histogram buckets
+        exporters: Called with every ``RequestRecord``, such as a
+            ``PrometheusExporter`` or an ``OpenTelemetryExporter``
+        endpoint: Normalises the url of a request, see ``endpoint_of``
+    """
+
+    def __init__(
+        self,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        exporters: Iterable[Callable[[RequestRecord], None]] = (),
+        endpoint: Callable[[httpx.URL], str] = endpoint_of,
+    ) -> None:
+        """Inits the aggregator
+
+        Args:
+            buckets: Upper bounds (secs) of the latency histogram buckets
+            exporters: Called with every ``RequestRecord``
+            endpoint: Normalises the url of a request
+        """
+        self.buckets = tuple(buckets)
+        self.exporters: List[Callable[[RequestRecord], None]] = list(exporters)
+        self.endpoint = endpoint
+        self._lock = threading.Lock()
+        self._stats: Dict[str, EndpointStats] = {}
+
+    def instrument(self, client: Client) -> Client:
+        """Add the hooks to an existing client
+
+        Args:
+            client: A sync or async httpx client
+
+        Returns:
+            The same client
+        """
+        hooks = (
+            self.async_event_hooks()
+            if isinstance(client, httpx.AsyncClient)
+            else self.event_hooks()
+        )
+        for event, event_hooks in hooks.items():
+            client.event_hooks[event] = [*client.event_hooks[event], *event_hooks]
+        return client
+
+    def event_hooks(self) -> Dict[str, list]:
+        """Event hooks of a sync client
+
+        Returns:
+            dict: The ``event_hooks`` argument of ``httpx.Client``
+        """
+        return {"request": [self._start], "response": [self._measure]}
+
+    def async_event_hooks(self) -> Dict[str, list]:
+        """Event hooks of an async client
+
+        Returns:
+            dict: The ``event_hooks`` argument of ``httpx.AsyncClient``
+        """
+
+        async def start(request: httpx.Request) -> None:
+            """Start measuring a request
+
+            Args:
+                request: The request
+            """
+            self._start(request)
+
+        async def measure(response: httpx.Response) -> None:
+            """Measure the response body
+
+            Args:
+                response: The response
+            """
+            self._measure(response)
+
+        return {"request": [start], "response": [measure]}
+
+    def record(self, record: RequestRecord) -> None:
+        """Aggregate a request and send it to the exporters
+
+        Args:
+            record: Measures of the request
+        """
+        key = f"{record.method} {record.host}{record.endpoint}"
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats(self.buckets)
+            stats.add(record)
+        for exporter in self.exporters:
+            exporter(record)
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Copy of the aggregated measures
+
+        Returns:
+            dict: Measures of each endpoint, keyed by "METHOD host/endpoint"
+        """
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        """Drop the aggregated measures"""
+        with self._lock:
+            self._stats.clear()
+
+    def _start(self, request: httpx.Request) -> None:
+        """Start measuring a request
+
+        Streamed bodies are wrapped to count their size, replayable bodies are
+        left as is so they can still be retried.
+
+        Args:
+            request: The request
+        """
+        request.extensions[_STARTED] = time.perf_counter()
+        if not isinstance(request.stream, httpx.ByteStream):
+            request.stream = _CountingStream(request.stream)
+
+    def _measure(self, response: httpx.Response) -> None:
+        """Measure the response once its body is read
+
+        Args:
+            response: The response
+        """
+        response.stream = _CountingStream(
+            response.stream, lambda size: self._finish(response, size)
+        )
+
+    def _finish(self, response: httpx.Response, response_bytes: int) -> None:
+        """Record a request whose response body is read
+
+        Args:
+            response: The response
+            response_bytes: Size of the response body
+        """
+        request = response.request
+        started = request.extensions.get(_STARTED, time.perf_counter())
+        self.record(
+            RequestRecord(
+                method=request.method,
+                host=request.url.host,
+                endpoint=self.endpoint(request.url),
+                status_code=response.status_code,
+                duration=time.perf_counter() - started,
+                request_bytes=_request_size(request),
+                response_bytes=response_bytes,
+                retries=response.extensions.get("retries", 0),
+            )
+        )
+
+
+def _request_size(request: httpx.Request) -> int:
+    """Size of a request body
+
+    Args:
+        request: The request
+
+    Returns:
+        int: Bytes read from a streamed body, or the Content-Length
+    """
+    if isinstance(request.stream, _CountingStream):
+        return request.stream.count
+    return int(request.headers.get("Content-Length", 0))
+
+
+class PrometheusExporter:
+    """Export the request measures to Prometheus
+
+    Requires the ``prometheus-client`` package, installed by the
+    ``prometheus`` extra.
+
+    Attributes:
+        duration: Histogram of the request durations
+        request_bytes: Counter of the request body sizes
+        response_bytes: Counter of the response body sizes
+        retries: Counter of the retries
+    """
+
+    def __init__(
+        self,
+        registry=None,
+        namespace: str = "statsuite",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Inits the metrics
+
+        Args:
+            registry: Prometheus registry, defaults to the global one
+            namespace: Prefix of the metric names
+            buckets: Upper bounds (secs) of the histogram buckets
+        """
+        prometheus = import_optional(
+            "prometheus_client", "prometheus-client", "prometheus"
+        )
+        labels = ("method", "host", "endpoint", "status")
+        registry = prometheus.REGISTRY if registry is None else registry
+        self.duration = prometheus.Histogram(
+            "http_client_request_duration_seconds",
+            "Duration of the requests to the .Stat Suite services",
+            labels,
+            namespace=namespace,
+            buckets=buckets,
+            registry=registry,
+        )
+        self.request_bytes = prometheus.Counter(
+            "http_client_request_bytes",
+            "Size of the request bodies",
+            labels,
+            namespace=namespace,
+            registry=registry,
+        )
+        self.response_bytes = prometheus.Counter(
+            "http_client_response_bytes",
+            "Size of the response bodies",
+            labels,
+            namespace=namespace,
+            registry=registry,
+        )
+        self.retries = prometheus.Counter(
+            "http_client_retries",
+            "Retries of the requests",
+            labels,
+            namespace=namespace,
+            registry=registry,
+        )
+
+    def __call__(self, record: RequestRecord) -> None:
+        """Export a request
+
+        Args:
+            record: Measures of the request
+        """
+        labels = (record.method, record.host, record.endpoint, record.status_code)
+        self.duration.labels(*labels).observe(record.duration)
+        self.request_bytes.labels(*labels).inc(record.request_bytes)
+        self.response_bytes.labels(*labels).inc(record.response_bytes)
+        self.retries.labels(*labels).inc(record.retries)
+
+
+class OpenTelemetryExporter:
+    """Export the request measures to OpenTelemetry
+
+    Requires the ``opentelemetry-api`` package, installed by the ``otel`` extra.
+
+    Attributes:
+        duration: Histogram of the request durations
+        request_bytes: Counter of the request body sizes
+        response_bytes: Counter of the response body sizes
+        retries: Counter of the retries
+    """
+
+    def __init__(self, meter=None) -> None:
+        """Inits the instruments
+
+        Args:
+            meter: OpenTelemetry meter, defaults to the ``statsuite_lib`` meter
+                of the global meter provider
+        """
+        metrics = import_optional("opentelemetry.metrics", "opentelemetry-api", "otel")
+        meter = meter or metrics.get_meter("statsuite_lib")
+        self.duration = meter.create_histogram("http.client.request.duration", unit="s")
+        self.request_bytes = meter.create_counter(
+            "http.client.request.body.size", unit="By"
+        )
+        self.response_bytes = meter.create_counter(
+            "http.client.response.body.size", unit="By"
+        )
+        self.retries = meter.create_counter("http.client.retries")
+
+    def __call__(self, record: RequestRecord) -> None:
+        """Export a request
+
+        Args:
+            record: Measures of the request
+        """
+        attributes = {
+            "http.request.method": record.method,
+            "server.address": record.host,
+            "url.template": record.endpoint,
+            "http.response.status_code": record.status_code,
+        }
+        self.duration.record(record.duration, attributes)
+        self.request_bytes.add(record.request_bytes, attributes)
+        self.response_bytes.add(record.response_bytes, attributes)
+        self.retries.add(record.retries, attributes)
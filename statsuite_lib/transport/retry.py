@@ -0,0 +1,435 @@
+import asyncio
+import email.utils
+import itertools
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from typing import Collection, Dict, Optional, Tuple, Union
+
+import httpx
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Failures where the request never reached the server, safe to retry any method
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+# Failures after the request was sent, only safe to retry idempotent requests
+_DROPPED_ERRORS = (httpx.RemoteProtocolError, httpx.ReadError)
+
+log = logging.getLogger("statsuite_lib.retry")
+
+
+class RetryStats:
+    """Thread safe counters of the retries done under a policy
+
+    Attributes:
+        requests: Number of requests handled
+        retries: Number of retries, by reason (exception name or status code)
+        exhausted: Number of requests that failed after the last retry
+    """
+
+    def __init__(self) -> None:
+        """Inits the counters"""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries: Counter = Counter()
+        self.exhausted = 0
+
+    def record(self, attempt: int, reason: Optional[str], exhausted: bool) -> None:
+        """Record the outcome of an attempt
+
+        Args:
+            attempt: Number of the attempt, 0 for the first one
+            reason: Why the attempt is retried, None if it is not
+            exhausted: The attempt should be retried but there are none left
+        """
+        with self._lock:
+            if attempt == 0:
+                self.requests += 1
+            if exhausted:
+                self.exhausted += 1
+            elif reason is not None:
+                self.retries[reason] += 1
+
+    def snapshot(self) -> Dict[str, Union[int, Dict[str, int]]]:
+        """Copy of the counters
+
+        Returns:
+            dict: requests, retries (total), retries_by_reason and exhausted
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries": sum(self.retries.values()),
+                "retries_by_reason": dict(self.retries),
+                "exhausted": self.exhausted,
+            }
+
+
+class RetryPolicy:
+    """When and how long to wait before retrying a failed request.
+
+    Connection errors are retried for every method, as the request never reached
+    the server. Retryable status codes and dropped connections are only retried
+    for idempotent requests: GET/HEAD/OPTIONS/PUT/DELETE, or any request sent
+    with ``extensions={"idempotent": True}`` such as the transfer status checks.
+    A 429 is retried for every method as the server did not process it. The
+    delay grows exponentially, unless the server sends a ``Retry-After`` header.
+
+    Requests can override the policy through their extensions: ``retry`` with a
+    RetryPolicy (or None to disable retries) and ``retry_statuses`` with the
+    status codes to retry.
+
+    Attributes:
+        max_retries: Max number of retries of a request
+        backoff_factor: Delay (secs) before the first retry, doubled on each retry
+        max_backoff: Upper bound (secs) of the computed delay
+        jitter: Max relative random variation of each delay
+        retry_statuses: Status codes retried
+        idempotent_methods: Methods considered idempotent
+        max_retry_after: Longest Retry-After (secs) honoured, longer ones are not
+                         retried
+        stats: Counters of the retries done
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: float = 0.1,
+        retry_statuses: Collection[int] = DEFAULT_RETRY_STATUSES,
+        idempotent_methods: Collection[str] = IDEMPOTENT_METHODS,
+        max_retry_after: float = 120.0,
+    ) -> None:
+        """Inits the policy
+
+        Args:
+            max_retries: Max number of retries of a request
+            backoff_factor: Delay (secs) before the first retry
+            max_backoff: Upper bound (secs) of the computed delay
+            jitter: Max relative random variation of each delay
+            retry_statuses: Status codes retried
+            idempotent_methods: Methods considered idempotent
+            max_retry_after: Longest Retry-After (secs) honoured
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(idempotent_methods)
+        self.max_retry_after = max_retry_after
+        self.stats = RetryStats()
+
+    def is_idempotent(self, request: httpx.Request) -> bool:
+        """Tell if a request can be sent twice without side effects
+
+        Args:
+            request: The request
+
+        Returns:
+            bool: The ``idempotent`` extension if set, else based on the method
+        """
+        idempotent = request.extensions.get("idempotent")
+        if idempotent is None:
+            return request.method in self.idempotent_methods
+        return bool(idempotent)
+
+    def next_delay(
+        self,
+        request: httpx.Request,
+        attempt: int,
+        response: Optional[httpx.Response] = None,
+        error: Optional[Exception] = None,
+    ) -> Optional[float]:
+        """Delay before retrying a request, recording the attempt in the stats
+
+        Args:
+            request: The request
+            attempt: Number of the attempt that failed, 0 for the first one
+            response: Response of the attempt, None if it raised
+            error: Exception raised by the attempt
+
+        Returns:
+            float: Seconds to wait before the retry, None if it is not retried
+        """
+        reason = self._retry_reason(request, response, error)
+        delay = None
+        if reason is not None and attempt < self.max_retries:
+            delay = self._backoff(attempt, response)
+        self.stats.record(attempt, reason, reason is not None and delay is None)
+        return delay
+
+    def _retry_reason(
+        self,
+        request: httpx.Request,
+        response: Optional[httpx.Response],
+        error: Optional[Exception],
+    ) -> Optional[str]:
+        """Tell why an attempt should be retried
+
+        Args:
+            request: The request
+            response: Response of the attempt, None if it raised
+            error: Exception raised by the attempt
+
+        Returns:
+            str: Exception name or status code, None if it should not be retried
+        """
+        if error is not None:
+            return self._error_reason(request, error)
+        return self._status_reason(request, response)
+
+    def _error_reason(self, request: httpx.Request, error: Exception) -> Optional[str]:
+        """Tell if an exception raised while sending a request can be retried
+
+        Args:
+            request: The request
+            error: Exception raised by the attempt
+
+        Returns:
+            str: Exception name, None if it should not be retried
+        """
+        if isinstance(error, _CONNECT_ERRORS):
+            return type(error).__name__
+        replayable = self._is_replayable(request) and self.is_idempotent(request)
+        if isinstance(error, _DROPPED_ERRORS) and replayable:
+            return type(error).__name__
+
+    def _status_reason(
+        self, request: httpx.Request, response: httpx.Response
+    ) -> Optional[str]:
+        """Tell if the status of a response can be retried
+
+        Args:
+            request: The request
+            response: Response of the attempt
+
+        Returns:
+            str: Status code, None if it should not be retried
+        """
+        statuses = request.extensions.get("retry_statuses", self.retry_statuses)
+        if response.status_code not in statuses or not self._is_replayable(request):
+            return None
+        if response.status_code == 429 or self.is_idempotent(request):
+            return str(response.status_code)
+
+    @staticmethod
+    def _is_replayable(request: httpx.Request) -> bool:
+        """Tell if the body of a request can be sent again
+
+        Streamed uploads are consumed by the first attempt.
+
+        Args:
+            request: The request
+
+        Returns:
+            bool: True if the body is held in memory
+        """
+        return isinstance(request.stream, httpx.ByteStream)
+
+    def _backoff(
+        self, attempt: int, response: Optional[httpx.Response]
+    ) -> Optional[float]:
+        """Compute the delay before a retry
+
+        Args:
+            attempt: Number of the attempt that failed
+            response: Response of the attempt, None if it raised
+
+        Returns:
+            float: Seconds to wait, None if Retry-After is longer than allowed
+        """
+        retry_after = _parse_retry_after(response)
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_retry_after else None
+        delay = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        jitter = random.uniform(-self.jitter, self.jitter)  # noqa S311 # nosec B311
+        return delay * (1 + jitter)
+
+
+def _parse_retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    """Read the Retry-After header of a response
+
+    Args:
+        response: The response
+
+    Returns:
+        float: Seconds to wait, None if the header is missing or invalid
+    """
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+def _policy_for(
+    request: httpx.Request, default: Optional[RetryPolicy]
+) -> Optional[RetryPolicy]:
+    """Select the policy of a request
+
+    Args:
+        request: The request
+        default: Policy of the transport
+
+    Returns:
+        RetryPolicy: The ``retry`` extension of the request if set, else default
+    """
+    return request.extensions.get("retry", default)
+
+
+def _result(
+    response: Optional[httpx.Response], error: Optional[Exception], attempt: int
+) -> httpx.Response:
+    """Return the response of the last attempt, or raise its error
+
+    Args:
+        response: Response of the last attempt
+        error: Exception raised by the last attempt
+        attempt: Number of retries done
+
+    Returns:
+        httpx.Response: The response, with the retries in its ``retries`` extension
+
+    Raises:
+        error: The exception raised by the last attempt
+    """
+    if error is not None:
+        raise error
+    response.extensions["retries"] = attempt
+    return response
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Transport retrying the requests of a wrapped transport
+
+    Attributes:
+        policy: Default retry policy, None to only retry requests carrying one
+    """
+
+    def __init__(
+        self, transport: httpx.BaseTransport, policy: Optional[RetryPolicy] = None
+    ) -> None:
+        """Inits the transport
+
+        Args:
+            transport: Transport sending the requests
+            policy: Default retry policy
+        """
+        self._transport = transport
+        self.policy = policy
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request, retrying it according to its policy
+
+        Args:
+            request: The request
+
+        Returns:
+            httpx.Response: Response of the last attempt
+        """
+        policy = _policy_for(request, self.policy)
+        if policy is None:
+            return self._transport.handle_request(request)
+        for attempt in itertools.count():
+            response, error = self._send(request)
+            delay = policy.next_delay(request, attempt, response, error)
+            if delay is None:
+                return _result(response, error, attempt)
+            if response is not None:
+                response.close()
+            log.warning(f"Retrying {request.method} {request.url} in {delay:.1f}s")
+            time.sleep(delay)
+
+    def _send(
+        self, request: httpx.Request
+    ) -> Tuple[Optional[httpx.Response], Optional[Exception]]:
+        """Send a request once
+
+        Args:
+            request: The request
+
+        Returns:
+            tuple: The response, or the transport error raised
+        """
+        try:
+            return self._transport.handle_request(request), None
+        except httpx.TransportError as error:
+            return None, error
+
+    def close(self) -> None:
+        """Close the wrapped transport"""
+        self._transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of RetryTransport
+
+    Attributes:
+        policy: Default retry policy, None to only retry requests carrying one
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        policy: Optional[RetryPolicy] = None,
+    ) -> None:
+        """Inits the transport
+
+        Args:
+            transport: Transport sending the requests
+            policy: Default retry policy
+        """
+        self._transport = transport
+        self.policy = policy
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send a request, retrying it according to its policy
+
+        Args:
+            request: The request
+
+        Returns:
+            httpx.Response: Response of the last attempt
+        """
+        policy = _policy_for(request, self.policy)
+        if policy is None:
+            return await self._transport.handle_async_request(request)
+        for attempt in itertools.count():
+            response, error = await self._send(request)
+            delay = policy.next_delay(request, attempt, response, error)
+            if delay is None:
+                return _result(response, error, attempt)
+            if response is not None:
+                await response.aclose()
+            log.warning(f"Retrying {request.method} {request.url} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _send(
+        self, request: httpx.Request
+    ) -> Tuple[Optional[httpx.Response], Optional[Exception]]:
+        """Send a request once
+
+        Args:
+            request: The request
+
+        Returns:
+            tuple: The response, or the transport error raised
+        """
+        try:
+            return await self._transport.handle_async_request(request), None
+        except httpx.TransportError as error:
+            return None, error
+
+    async def aclose(self) -> None:
+        """Close the wrapped transport"""
+        await self._transport.aclose()
@@ -0,0 +1,121 @@
+import os
+import zlib
+from contextlib import contextmanager
+from typing import AsyncIterator, BinaryIO, Iterable, Iterator, Union
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+UploadSource = Union[bytes, str, os.PathLike, BinaryIO]
+
+
+@contextmanager
+def open_upload(source: UploadSource) -> Iterator[Union[bytes, str, BinaryIO]]:
+    """Open an upload source without reading it in memory.
+
+    Paths (``os.PathLike``) are opened in binary mode and closed on exit, raw
+    ``bytes``/``str`` contents and already opened file objects (including
+    memory-mapped files) are passed through untouched.
+
+    Args:
+        source: Path to a file, file object or raw content to upload.
+
+    Yields:
+        The raw content or an open binary file object.
+    """
+    if isinstance(source, os.PathLike):
+        with open(source, "rb") as file_object:
+            yield file_object
+    else:
+        yield source
+
+
+def upload_name(source: Union[bytes, str, BinaryIO], default: str = "file") -> str:
+    """Return the file name to announce in a multipart upload.
+
+    Args:
+        source: Opened upload source, see ``open_upload``.
+        default: Name used when the source has no name.
+
+    Returns:
+        str: Base name of the file.
+    """
+    name = getattr(source, "name", None)
+    if isinstance(name, str):
+        return os.path.basename(name)
+    return default
+
+
+def iter_chunks(
+    source: Union[bytes, str, BinaryIO], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Read an opened upload source in fixed size chunks.
+
+    Args:
+        source: Opened upload source, see ``open_upload``.
+        chunk_size: Max size of each chunk in bytes.
+
+    Yields:
+        bytes: The next chunk of the content.
+    """
+    if isinstance(source, str):
+        source = source.encode()
+    if isinstance(source, bytes):
+        for start in range(0, len(source), chunk_size):
+            yield source[start : start + chunk_size]  # noqa E203
+        return
+    while chunk := source.read(chunk_size):
+        yield chunk
+
+
+def gzip_stream(chunks: Iterable[bytes], compresslevel: int = 6) -> Iterator[bytes]:
+    """Compress a stream of chunks on the fly in gzip format.
+
+    Args:
+        chunks: Uncompressed chunks.
+        compresslevel: zlib compression level, from 1 (fast) to 9 (small).
+
+    Yields:
+        bytes: Compressed chunks, empty ones are skipped.
+    """
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+async def async_stream(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    """Expose a chunk iterator as the async stream required by httpx.AsyncClient.
+
+    Args:
+        chunks: Chunks to send.
+
+    Yields:
+        bytes: The same chunks.
+    """
+    for chunk in chunks:
+        yield chunk
+
+
+def upload_content(
+    source: Union[bytes, str, BinaryIO],
+    compress: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Union[bytes, str, Iterator[bytes]]:
+    """Build the request content of an upload.
+
+    Raw contents are sent as they are, file objects are streamed in chunks
+    (chunked transfer encoding) so they are never fully loaded in memory.
+
+    Args:
+        source: Opened upload source, see ``open_upload``.
+        compress: Gzip the content on the fly.
+        chunk_size: Size of the chunks read from file objects.
+
+    Returns:
+        The raw content or an iterator of chunks.
+    """
+    if isinstance(source, (bytes, str)) and not compress:
+        return source
+    chunks = iter_chunks(source, chunk_size)
+    return gzip_stream(chunks) if compress else chunks
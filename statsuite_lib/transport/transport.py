@@ -0,0 +1,216 @@
+import threading
+from typing import Dict, Optional
+
+import httpx
+
+from .metrics import Instrumentation
+from .retry import AsyncRetryTransport, RetryPolicy, RetryTransport
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+_default_client: Optional[httpx.Client] = None
+_default_client_lock = threading.Lock()
+
+
+def _mount_pattern(host: str) -> str:
+    """Build an httpx mount pattern for a host.
+
+    Args:
+        host: Either a bare host name ("nsi.example.com") or a full httpx mount
+              pattern ("https://nsi.example.com").
+
+    Returns:
+        str: The mount pattern, matching every scheme when none is given.
+    """
+    if "://" in host:
+        return host
+    return f"all://{host}"
+
+
+def _pool_settings(
+    transport_class: type,
+    max_connections: Optional[int],
+    max_keepalive_connections: Optional[int],
+    keepalive_expiry: Optional[float],
+    http2: bool,
+    host_limits: Optional[Dict[str, httpx.Limits]],
+    retry: Optional[RetryPolicy] = None,
+    retry_class: type = RetryTransport,
+) -> dict:
+    """Build the pool related keyword arguments of an httpx client.
+
+    Args:
+        transport_class: httpx transport class used for the per host pools.
+        max_connections: Max number of concurrent connections of the pool.
+        max_keepalive_connections: Max number of idle connections kept alive.
+        keepalive_expiry: Time (secs) an idle connection is kept alive.
+        http2: Enable HTTP/2.
+        host_limits: Pool limits for specific hosts.
+        retry: Retry policy, wraps every transport in ``retry_class`` when given.
+        retry_class: Retry transport matching ``transport_class``.
+
+    Returns:
+        dict: limits, http2, mounts and transport arguments for the client
+              constructor.
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+
+    def build(pool_limits: httpx.Limits):
+        """Build the transport of a pool
+
+        Args:
+            pool_limits: Limits of the pool
+
+        Returns:
+            The transport, wrapped in the retry transport if there is a policy
+        """
+        pool = transport_class(limits=pool_limits, http2=http2)
+        return pool if retry is None else retry_class(pool, retry)
+
+    mounts = {
+        _mount_pattern(host): build(host_limit)
+        for host, host_limit in (host_limits or {}).items()
+    }
+    settings = {"limits": limits, "http2": http2, "mounts": mounts}
+    if retry is not None:
+        settings["transport"] = build(limits)
+    return settings
+
+
+def create_client(
+    max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+    http2: bool = False,
+    host_limits: Optional[Dict[str, httpx.Limits]] = None,
+    timeout: httpx.Timeout = httpx.Timeout(5.0),
+    retry: Optional[RetryPolicy] = None,
+    instrumentation: Optional[Instrumentation] = None,
+) -> httpx.Client:
+    """Create a connection pooled httpx client to be shared between clients.
+
+    Every statsuite client accepts an ``http_client`` argument, passing the same
+    instance to all of them lets the requests reuse the open connections instead
+    of doing a new TCP+TLS handshake per call.
+
+    Args:
+        max_connections: Max number of concurrent connections of the pool.
+        max_keepalive_connections: Max number of idle connections kept alive.
+        keepalive_expiry: Time (secs) an idle connection is kept alive.
+        http2: Enable HTTP/2, requires the ``h2`` package (``httpx[http2]``).
+        host_limits: Pool limits for specific hosts, keyed by host name or httpx
+                     mount pattern, each host gets its own connection pool.
+        timeout: Default timeout of the requests.
+        retry: Retry policy of the requests, None to not retry. Requests can
+               override it with their ``retry`` extension.
+        instrumentation: Metrics aggregator recording the requests, None to
+               not measure them.
+
+    Returns:
+        httpx.Client: The configured client.
+
+    Example:
+        metrics = Instrumentation()
+        client = create_client(
+            max_connections=50,
+            host_limits={"nsi.example.com": httpx.Limits(max_connections=10)},
+            retry=RetryPolicy(max_retries=5),
+            instrumentation=metrics,
+        )
+        transfer = TransferClient(..., http_client=client)
+        nsi = NSIClient(..., http_client=client)
+        print(metrics.snapshot())
+    """
+    settings = _pool_settings(
+        httpx.HTTPTransport,
+        max_connections,
+        max_keepalive_connections,
+        keepalive_expiry,
+        http2,
+        host_limits,
+        retry,
+    )
+    client = httpx.Client(timeout=timeout, **settings)
+    return client if instrumentation is None else instrumentation.instrument(client)
+
+
+def create_async_client(
+    max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+    max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+    http2: bool = False,
+    host_limits: Optional[Dict[str, httpx.Limits]] = None,
+    timeout: httpx.Timeout = httpx.Timeout(5.0),
+    retry: Optional[RetryPolicy] = None,
+    instrumentation: Optional[Instrumentation] = None,
+) -> httpx.AsyncClient:
+    """Create a connection pooled httpx async client to be shared between clients.
+
+    Async clients are bound to the event loop they are used in, so there is no
+    process wide default: each async statsuite client builds its own unless one
+    is given through its ``http_client`` argument.
+
+    Args:
+        max_connections: Max number of concurrent connections of the pool.
+        max_keepalive_connections: Max number of idle connections kept alive.
+        keepalive_expiry: Time (secs) an idle connection is kept alive.
+        http2: Enable HTTP/2, requires the ``h2`` package (``httpx[http2]``).
+        host_limits: Pool limits for specific hosts, keyed by host name or httpx
+                     mount pattern, each host gets its own connection pool.
+        timeout: Default timeout of the requests.
+        retry: Retry policy of the requests, None to not retry. Requests can
+               override it with their ``retry`` extension.
+        instrumentation: Metrics aggregator recording the requests, None to
+               not measure them.
+
+    Returns:
+        httpx.AsyncClient: The configured client.
+    """
+    settings = _pool_settings(
+        httpx.AsyncHTTPTransport,
+        max_connections,
+        max_keepalive_connections,
+        keepalive_expiry,
+        http2,
+        host_limits,
+        retry,
+        AsyncRetryTransport,
+    )
+    client = httpx.AsyncClient(timeout=timeout, **settings)
+    return client if instrumentation is None else instrumentation.instrument(client)
+
+
+def get_default_client() -> httpx.Client:
+    """Return the process wide client used when no ``http_client`` is given.
+
+    The client is created on first use with the default pool configuration.
+
+    Returns:
+        httpx.Client: The shared client.
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = create_client()
+    return _default_client
+
+
+def set_default_client(http_client: Optional[httpx.Client]) -> None:
+    """Replace the process wide client used when no ``http_client`` is given.
+
+    The previous client is not closed, it may still be referenced by already
+    created statsuite clients.
+
+    Args:
+        http_client: The new shared client, None to rebuild a default one on next use.
+    """
+    global _default_client
+    with _default_client_lock:
+        _default_client = http_client
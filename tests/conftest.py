@@ -0,0 +1,10 @@
+import pytest
+
+from statsuite_lib.keycloak import clear_openid_endpoints
+
+
+@pytest.fixture(autouse=True)
+def forget_openid_endpoints():
+    clear_openid_endpoints()
+    yield
+    clear_openid_endpoints()
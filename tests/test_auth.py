@@ -1,9 +1,14 @@
+import asyncio
+import threading
+import time
 from unittest.mock import Mock
 
+import httpx
 import pytest
 
-from statsuite_lib import KeycloakClient
-from statsuite_lib.auth.auth import AuthClient
+from statsuite_lib import AsyncKeycloakClient, KeycloakClient
+from statsuite_lib.auth import AuthorizationRule, RulesIndex
+from statsuite_lib.auth.auth import AsyncAuthClient, AuthClient
 
 
 @pytest.fixture
@@ -161,3 +166,260 @@ def test_handle_delete_error_response_success_status(auth_client):
     # Should return without doing anything
     result = auth_client._handle_delete_error_response(mock_response)
     assert result is None
+
+
+@pytest.fixture
+def async_auth_client(mocker):
+    mock_keycloak = mocker.AsyncMock(spec=AsyncKeycloakClient)
+    mock_keycloak.auth_header.return_value = {"Authorization": "Bearer fake-token"}
+    return AsyncAuthClient(auth_url="http://test-auth", keycloak_client=mock_keycloak)
+
+
+def test_async_add_rule_duplicate_key_error(async_auth_client, httpx_mock):
+    error_response = {"payload": {"errors": ["Cannot insert duplicate key row"]}}
+    httpx_mock.add_response(
+        method="POST",
+        url="http://test-auth/1.1/AuthorizationRules",
+        json=error_response,
+        status_code=400,
+    )
+
+    result = asyncio.run(
+        async_auth_client.add_rule(user_mask="test_user", is_group=False, permission=1)
+    )
+    assert result == error_response
+
+
+def test_async_delete_rule_general_error(async_auth_client, httpx_mock):
+    httpx_mock.add_response(
+        method="DELETE",
+        url="http://test-auth/1.1/AuthorizationRules/123",
+        json={"payload": {"errors": ["Some other delete error"]}},
+        status_code=500,
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(async_auth_client.delete_rule("123"))
+
+
+@pytest.fixture
+def existing_rules():
+    return {
+        "payload": [
+            {
+                "id": 1,
+                "userMask": "analyst",
+                "isGroup": False,
+                "dataSpace": "design",
+                "artefactType": 0,
+                "artefactAgencyId": "*",
+                "artefactId": "*",
+                "artefactVersion": "*",
+                "permission": 3,
+                "editedBy": "admin",
+            },
+            {"id": 2, "userMask": "analyst", "dataSpace": "release", "permission": 3},
+            {"id": 3, "userMask": "other", "permission": 1},
+        ]
+    }
+
+
+def test_get_rules(auth_client, httpx_mock, existing_rules):
+    httpx_mock.add_response(
+        method="GET", url="http://test-auth/1.1/AuthorizationRules", json=existing_rules
+    )
+
+    rules = auth_client.get_rules()
+
+    assert [rule.id for rule in rules] == [1, 2, 3]
+    assert rules[0].to_request()["dataSpace"] == "design"
+    assert "id" not in rules[0].to_request()
+
+
+def test_add_rules(auth_client, httpx_mock):
+    httpx_mock.add_response(
+        method="POST",
+        url="http://test-auth/1.1/AuthorizationRules",
+        json={"status": "success"},
+        is_reusable=True,
+    )
+
+    results = auth_client.add_rules(
+        [{"userMask": f"user{i}", "permission": 1} for i in range(5)], max_workers=2
+    )
+
+    assert results == [{"status": "success"}] * 5
+    assert len(httpx_mock.get_requests(method="POST")) == 5
+
+
+def test_sync_rules(auth_client, httpx_mock, existing_rules):
+    httpx_mock.add_response(
+        method="GET", url="http://test-auth/1.1/AuthorizationRules", json=existing_rules
+    )
+    httpx_mock.add_response(
+        method="DELETE", url="http://test-auth/1.1/AuthorizationRules/2", json={}
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="http://test-auth/1.1/AuthorizationRules",
+        match_json={
+            "userMask": "analyst",
+            "isGroup": False,
+            "dataSpace": "staging",
+            "artefactType": 0,
+            "artefactAgencyId": "*",
+            "artefactId": "*",
+            "artefactVersion": "*",
+            "permission": 3,
+        },
+        json={},
+    )
+
+    result = auth_client.sync_rules(
+        [
+            {"userMask": "analyst", "dataSpace": "design", "permission": 3},
+            {"userMask": "analyst", "dataSpace": "staging", "permission": 3},
+        ]
+    )
+
+    assert [rule.id for rule in result.deleted] == [2]
+    assert [rule.dataSpace for rule in result.added] == ["staging"]
+    assert result.unchanged == 1
+    methods = [request.method for request in httpx_mock.get_requests()]
+    assert methods == ["GET", "POST", "DELETE"]
+
+
+def test_sync_rules_keeps_the_rules_when_an_add_fails(
+    auth_client, httpx_mock, existing_rules
+):
+    httpx_mock.add_response(
+        method="GET", url="http://test-auth/1.1/AuthorizationRules", json=existing_rules
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="http://test-auth/1.1/AuthorizationRules",
+        json={"payload": {"errors": ["Server error"]}},
+        status_code=500,
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        auth_client.sync_rules([{"userMask": "other", "permission": 7}])
+
+    assert not httpx_mock.get_requests(method="DELETE")
+
+
+def test_async_sync_rules(async_auth_client, httpx_mock, existing_rules):
+    httpx_mock.add_response(
+        method="GET", url="http://test-auth/1.1/AuthorizationRules", json=existing_rules
+    )
+    httpx_mock.add_response(
+        method="DELETE", url="http://test-auth/1.1/AuthorizationRules/3", json={}
+    )
+    httpx_mock.add_response(
+        method="POST", url="http://test-auth/1.1/AuthorizationRules", json={}
+    )
+
+    result = asyncio.run(
+        async_auth_client.sync_rules([{"userMask": "other", "permission": 7}])
+    )
+
+    assert [rule.id for rule in result.deleted] == [3]
+    methods = [request.method for request in httpx_mock.get_requests()]
+    assert methods == ["GET", "POST", "DELETE"]
+
+
+def rule(**fields):
+    """Build a rule with defaults.
+
+    Args:
+        fields: Rule fields.
+
+    Returns:
+        The rule.
+    """
+    return AuthorizationRule.model_validate({"permission": 1} | fields)
+
+
+def test_rules_index_wildcards():
+    index = RulesIndex(
+        [
+            rule(id=1, userMask="jane", dataSpace="design", permission=1),
+            rule(id=2, userMask="*", artefactAgencyId="OECD", permission=2),
+            rule(
+                id=3, userMask="editors", isGroup=True, artefactId="DF_*", permission=4
+            ),
+            rule(id=4, userMask="jane", dataSpace="release", permission=8),
+        ]
+    )
+
+    granted = index.permissions(
+        "jane", "design", 1, "OECD", "DF_GDP", "1.0", groups=["editors"]
+    )
+    assert granted == 1 | 2 | 4
+    assert index.permissions("bob", "design", agency_id="ECB") == 0
+    assert index.has_permission("bob", 2, "release", agency_id="OECD")
+    assert not index.has_permission("jane", 4, "design", artefact_id="DF_GDP")
+
+
+def test_rules_index_incremental_update():
+    index = RulesIndex([rule(id=1, userMask="jane"), rule(id=2, userMask="bob")])
+
+    changes = index.update(
+        [rule(id=1, userMask="jane", permission=3), rule(id=5, userMask="ann")]
+    )
+
+    assert changes == (2, 2)
+    assert len(index) == 2
+    assert index.permissions("jane") == 3
+    assert index.permissions("bob") == 0
+    assert index.update(
+        [rule(id=1, userMask="jane", permission=3), rule(id=5, userMask="ann")]
+    ) == (0, 0)
+
+
+def test_get_rules_index(auth_client, httpx_mock, existing_rules):
+    httpx_mock.add_response(
+        method="GET",
+        url="http://test-auth/1.1/AuthorizationRules",
+        json=existing_rules,
+        is_reusable=True,
+    )
+
+    index = auth_client.get_rules_index()
+
+    assert index.has_permission("analyst", 3, dataspace="design")
+    assert index.permissions("analyst", dataspace="staging") == 0
+    assert index.refresh() == (0, 0)
+
+
+def test_rules_index_periodic_refresh():
+    refreshed = threading.Event()
+    calls = []
+
+    def fetch():
+        """Fail once, then return the rules.
+
+        Returns:
+            The rules.
+
+        Raises:
+            ConnectError: On the first call.
+        """
+        calls.append(len(calls))
+        if len(calls) == 1:
+            raise httpx.ConnectError("auth down")
+        refreshed.set()
+        return [rule(id=1, userMask="jane", permission=3)]
+
+    index = RulesIndex(fetch=fetch)
+    index.start_refresh(0.01)
+
+    assert refreshed.wait(1)
+    index.stop_refresh()
+    time.sleep(0.05)
+    count = len(calls)
+    time.sleep(0.05)
+
+    assert index.permissions("jane") == 3
+    assert len(calls) == count
+    index.stop_refresh()
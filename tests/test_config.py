@@ -1,8 +1,9 @@
+import asyncio
 import logging
 
 import pytest
 
-from statsuite_lib import ConfigClient
+from statsuite_lib import AsyncConfigClient, ConfigClient
 from statsuite_lib.config.models import Space, Tenants
 
 
@@ -109,3 +110,130 @@ def test_get_dataspaces_with_error(config_client, httpx_mock):
 
     with pytest.raises(AttributeError):
         list(config_client.get_dataspaces())
+
+
+def test_async_get_dataspaces(httpx_mock, tenants_response):
+    httpx_mock.add_response(
+        method="GET",
+        url="https://config.example.com/configs/tenants.json",
+        json=tenants_response,
+        is_reusable=True,
+    )
+    client = AsyncConfigClient(config_url="https://config.example.com")
+
+    async def run():
+        """Run all the calls in the same event loop.
+
+        Returns:
+            The results of the calls.
+        """
+        spaces = [space async for space in client.get_dataspaces(tenant="tenant2")]
+        return spaces, await client.get_dataspace("space1")
+
+    spaces, space = asyncio.run(run())
+    assert [space.label for space in spaces] == ["space3"]
+    assert space.url == "https://space1.example.com"
+
+
+def test_async_get_tenants_error_response(httpx_mock):
+    httpx_mock.add_response(
+        url="https://config.example.com/configs/tenants.json", status_code=404
+    )
+    client = AsyncConfigClient(config_url="https://config.example.com")
+    assert asyncio.run(client.get_tenants()) is None
+
+
+def test_get_tenants_cached_within_ttl(httpx_mock, tenants_response):
+    client = ConfigClient(config_url="https://config.example.com", cache_ttl=60)
+    httpx_mock.add_response(
+        url="https://config.example.com/configs/tenants.json", json=tenants_response
+    )
+
+    first = client.get_tenants()
+    assert client.get_tenants() is first
+    assert client.get_dataspace("space3", "tenant2").label == "space3"
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_get_tenants_revalidated_by_default(
+    config_client, httpx_mock, tenants_response
+):
+    httpx_mock.add_response(
+        url="https://config.example.com/configs/tenants.json",
+        json=tenants_response,
+        is_reusable=True,
+    )
+
+    config_client.get_tenants()
+    config_client.get_tenants()
+
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_async_get_tenants_refreshed_once(httpx_mock, tenants_response):
+    client = AsyncConfigClient(config_url="https://config.example.com", cache_ttl=60)
+    httpx_mock.add_response(
+        url="https://config.example.com/configs/tenants.json", json=tenants_response
+    )
+
+    async def get_concurrently():
+        """Get the tenants from concurrent tasks.
+
+        Returns:
+            The tenants of each task.
+        """
+        return await asyncio.gather(*(client.get_tenants() for _ in range(5)))
+
+    first, *others = asyncio.run(get_concurrently())
+
+    assert all(tenants is first for tenants in others)
+    assert len(httpx_mock.get_requests()) == 1
+
+
+def test_get_tenants_revalidates_with_etag(httpx_mock, tenants_response):
+    client = ConfigClient(config_url="https://config.example.com", cache_ttl=0)
+    httpx_mock.add_response(
+        url="https://config.example.com/configs/tenants.json",
+        json=tenants_response,
+        headers={"ETag": '"v1"'},
+    )
+    httpx_mock.add_response(
+        url="https://config.example.com/configs/tenants.json",
+        match_headers={"If-None-Match": '"v1"'},
+        status_code=304,
+    )
+
+    first = client.get_tenants()
+    assert client.get_tenants() is first
+
+
+def test_get_tenants_stale_on_error(httpx_mock, tenants_response):
+    client = ConfigClient(config_url="https://config.example.com", cache_ttl=0)
+    httpx_mock.add_response(
+        url="https://config.example.com/configs/tenants.json", json=tenants_response
+    )
+    httpx_mock.add_response(
+        url="https://config.example.com/configs/tenants.json", status_code=500
+    )
+
+    first = client.get_tenants()
+    assert client.get_tenants() is first
+    client.invalidate()
+    assert client.cache.tenants is None
+
+
+def test_get_tenants_persisted_cache(tmp_path, httpx_mock, tenants_response):
+    cache_path = tmp_path / "tenants.json"
+    httpx_mock.add_response(
+        url="https://config.example.com/configs/tenants.json",
+        json=tenants_response,
+        headers={"ETag": '"v1"'},
+    )
+    ConfigClient("https://config.example.com", cache_path=cache_path).get_tenants()
+    assert cache_path.stat().st_mode & 0o777 == 0o600
+
+    client = ConfigClient(
+        "https://config.example.com", cache_ttl=60, cache_path=cache_path
+    )
+    assert client.get_dataspace("space1").url == "https://space1.example.com"
+    assert len(httpx_mock.get_requests()) == 1
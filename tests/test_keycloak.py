@@ -1,25 +1,43 @@
+import asyncio
 import datetime
+import os
+import stat
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
 
 import httpx
 import pytest
+from cryptography import fernet
 from freezegun import freeze_time
 
-from statsuite_lib import KeycloakClient
+from statsuite_lib import AsyncKeycloakClient, KeycloakClient
+from statsuite_lib.keycloak import TokenCache, clear_openid_endpoints, keycloak
+
+# Fake credentials of the tests
+TOKEN_URL = "https://auth.example.com/token"  # noqa S105
+ACCESS_TOKEN = "fake-access-token"  # noqa S105
+REFRESH_TOKEN = "fake-refresh-token"  # noqa S105
+NEW_ACCESS_TOKEN = "new-access-token"  # noqa S105
+SERVICE_TOKEN = "service-token"  # noqa S105
+PASSWORD = "test-password"  # noqa S105
+CLIENT_SECRET = "secret"  # noqa S105
 
 
 @pytest.fixture
 def openid_config_response():
     return {
         "authorization_endpoint": "https://auth.example.com/auth",
-        "token_endpoint": "https://auth.example.com/token",
+        "token_endpoint": TOKEN_URL,
     }
 
 
 @pytest.fixture
 def token_response():
     return {
-        "access_token": "fake-access-token",
-        "refresh_token": "fake-refresh-token",
+        "access_token": ACCESS_TOKEN,
+        "refresh_token": REFRESH_TOKEN,
         "expires_in": 300,
     }
 
@@ -34,14 +52,12 @@ def keycloak_client(httpx_mock, openid_config_response, token_response):
     )
 
     # Mock initial authentication request
-    httpx_mock.add_response(
-        method="POST", url="https://auth.example.com/token", json=token_response
-    )
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, json=token_response)
 
     return KeycloakClient(  # noqa S106
         openid_url="https://keycloak.example.com/.well-known/openid-configuration",
         username="test-user",
-        password="test-password",
+        password=PASSWORD,
     )
 
 
@@ -51,11 +67,9 @@ def test_initialization(keycloak_client):
     assert (
         keycloak_client._auth_endpoint == "https://auth.example.com/auth"
     )  # noqa S105
-    assert (
-        keycloak_client._token_endpoint == "https://auth.example.com/token"  # noqa S105
-    )
-    assert keycloak_client.access_token == "fake-access-token"  # noqa S105
-    assert keycloak_client.refresh_token == "fake-refresh-token"  # noqa S105
+    assert keycloak_client._token_endpoint == TOKEN_URL  # noqa S105
+    assert keycloak_client.access_token == ACCESS_TOKEN  # noqa S105
+    assert keycloak_client.refresh_token == REFRESH_TOKEN  # noqa S105
     assert isinstance(keycloak_client.access_token_expires, datetime.datetime)
 
 
@@ -66,19 +80,17 @@ def test_get_openid_configuration_error(httpx_mock):
         KeycloakClient(  # noqa S105
             openid_url="https://keycloak.example.com/.well-known/openid-configuration",
             username="test-user",
-            password="test-password",
+            password=PASSWORD,
         )
 
 
 def test_trigger_refresh_token(keycloak_client, httpx_mock, token_response):
     # Mock refresh token request
-    httpx_mock.add_response(
-        method="POST", url="https://auth.example.com/token", json=token_response
-    )
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, json=token_response)
 
     keycloak_client.trigger_refresh_token()
-    assert keycloak_client.access_token == "fake-access-token"  # noqa S105
-    assert keycloak_client.refresh_token == "fake-refresh-token"  # noqa S105
+    assert keycloak_client.access_token == ACCESS_TOKEN  # noqa S105
+    assert keycloak_client.refresh_token == REFRESH_TOKEN  # noqa S105
     assert isinstance(keycloak_client.access_token_expires, datetime.datetime)
 
 
@@ -88,7 +100,7 @@ def test_get_access_token_valid(keycloak_client):
     keycloak_client.access_token_expires = datetime.datetime.now() + datetime.timedelta(
         minutes=5
     )
-    assert keycloak_client.get_access_token() == "fake-access-token"
+    assert keycloak_client.get_access_token() == ACCESS_TOKEN
 
 
 @freeze_time("2025-01-01 00:00:00")
@@ -99,11 +111,9 @@ def test_get_access_token_expired(keycloak_client, httpx_mock, token_response):
     )
 
     # Mock refresh token request
-    httpx_mock.add_response(
-        method="POST", url="https://auth.example.com/token", json=token_response
-    )
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, json=token_response)
 
-    assert keycloak_client.get_access_token() == "fake-access-token"
+    assert keycloak_client.get_access_token() == ACCESS_TOKEN
 
 
 def test_get_access_token_no_expiration(keycloak_client, httpx_mock, token_response):
@@ -111,14 +121,537 @@ def test_get_access_token_no_expiration(keycloak_client, httpx_mock, token_respo
     keycloak_client.access_token_expires = None
 
     # Mock refresh token request
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, json=token_response)
+
+    assert keycloak_client.get_access_token() == ACCESS_TOKEN
+
+
+def test_auth_header(keycloak_client):
+    assert keycloak_client.auth_header() == {
+        "Authorization": "Bearer fake-access-token"
+    }
+
+
+def test_async_client_authenticates_lazily(
+    httpx_mock, openid_config_response, token_response
+):
+    client = AsyncKeycloakClient(  # noqa S106
+        openid_url="https://keycloak.example.com/.well-known/openid-configuration",
+        username="test-user",
+        password=PASSWORD,
+    )
+    assert client.access_token is None
+    assert httpx_mock.get_requests() == []
+
     httpx_mock.add_response(
-        method="POST", url="https://auth.example.com/token", json=token_response
+        method="GET",
+        url="https://keycloak.example.com/.well-known/openid-configuration",
+        json=openid_config_response,
     )
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, json=token_response)
 
-    assert keycloak_client.get_access_token() == "fake-access-token"
+    header = asyncio.run(client.auth_header())
+    assert header == {"Authorization": "Bearer fake-access-token"}
+    assert client._token_endpoint == TOKEN_URL  # noqa S105
 
 
-def test_auth_header(keycloak_client):
+@freeze_time("2025-01-01 00:00:00")
+def test_async_client_refreshes_expired_token(httpx_mock, token_response):
+    client = AsyncKeycloakClient(  # noqa S106
+        openid_url="https://keycloak.example.com/.well-known/openid-configuration",
+        username="test-user",
+        password=PASSWORD,
+    )
+    client._token_endpoint = TOKEN_URL  # noqa S105
+    client.refresh_token = "old-refresh-token"  # noqa S105
+    client.access_token_expires = datetime.datetime.now() - datetime.timedelta(
+        minutes=5
+    )
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, json=token_response)
+
+    assert asyncio.run(client.get_access_token()) == ACCESS_TOKEN
+    assert b"grant_type=refresh_token" in httpx_mock.get_requests()[0].content
+
+
+def test_async_client_openid_configuration_error(httpx_mock):
+    httpx_mock.add_exception(httpx.ConnectError("Connection failed"))
+    client = AsyncKeycloakClient(  # noqa S106
+        openid_url="https://keycloak.example.com/.well-known/openid-configuration",
+        username="test-user",
+        password=PASSWORD,
+    )
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(client.auth_header())
+
+
+@freeze_time("2025-01-01 00:00:00")
+def test_get_access_token_refreshes_ahead_of_expiry(
+    keycloak_client, httpx_mock, token_response
+):
+    keycloak_client.access_token_expires = datetime.datetime.now() + datetime.timedelta(
+        seconds=10
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url=TOKEN_URL,
+        json=token_response | {"access_token": NEW_ACCESS_TOKEN},
+    )
+
+    assert keycloak_client.get_access_token() == NEW_ACCESS_TOKEN  # noqa S105
+
+
+def test_short_lived_token_is_used_before_renewal(
+    httpx_mock, openid_config_response, token_response
+):
+    httpx_mock.add_response(
+        url="https://keycloak.example.com/.well-known/openid-configuration",
+        json=openid_config_response,
+    )
+    httpx_mock.add_response(
+        method="POST", url=TOKEN_URL, json=token_response | {"expires_in": 20}
+    )
+    with freeze_time("2025-01-01 00:00:00") as frozen:
+        client = KeycloakClient(  # noqa S106
+            openid_url="https://keycloak.example.com/.well-known/openid-configuration",
+            username="test-user",
+            password=PASSWORD,
+            refresh_skew=60,
+        )
+        frozen.tick(5)
+        assert client.get_access_token() == ACCESS_TOKEN
+        assert len(httpx_mock.get_requests()) == 2
+
+        httpx_mock.add_response(
+            method="POST",
+            url=TOKEN_URL,
+            json=token_response | {"access_token": NEW_ACCESS_TOKEN},
+        )
+        frozen.tick(6)
+        assert client.get_access_token() == NEW_ACCESS_TOKEN
+
+
+def test_concurrent_refreshes_are_coalesced(
+    keycloak_client, httpx_mock, token_response
+):
+    keycloak_client.access_token_expires = None
+
+    def slow_token(request):
+        """Answer the token request slowly so the threads overlap.
+
+        Args:
+            request: The token request.
+
+        Returns:
+            The token response.
+        """
+        time.sleep(0.1)
+        return httpx.Response(200, json=token_response)
+
+    httpx_mock.add_callback(slow_token, method="POST", url=TOKEN_URL)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        tokens = list(
+            executor.map(lambda _: keycloak_client.get_access_token(), range(8))
+        )
+
+    assert tokens == [ACCESS_TOKEN] * 8
+    assert len(httpx_mock.get_requests(method="POST")) == 2  # initial auth + refresh
+
+
+def test_rejected_refresh_token_authenticates_again(
+    keycloak_client, httpx_mock, token_response
+):
+    keycloak_client.access_token_expires = None
+    httpx_mock.add_response(
+        method="POST",
+        url=TOKEN_URL,
+        status_code=400,
+        json={"error": "invalid_grant"},
+    )
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, json=token_response)
+
+    assert keycloak_client.get_access_token() == ACCESS_TOKEN  # noqa S105
+    refresh, password = httpx_mock.get_requests(method="POST")[1:]
+    assert b"grant_type=refresh_token" in refresh.content
+    assert b"grant_type=password" in password.content
+
+
+@freeze_time("2025-01-01 00:00:00")
+def test_expired_refresh_token_authenticates_again(
+    keycloak_client, httpx_mock, token_response
+):
+    keycloak_client.access_token_expires = None
+    keycloak_client.refresh_token_expires = datetime.datetime.now()
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, json=token_response)
+
+    keycloak_client.get_access_token()
+
+    assert b"grant_type=password" in httpx_mock.get_requests(method="POST")[-1].content
+
+
+def test_client_credentials_grant(httpx_mock, openid_config_response, token_response):
+    httpx_mock.add_response(
+        method="GET",
+        url="https://keycloak.example.com/.well-known/openid-configuration",
+        json=openid_config_response,
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url=TOKEN_URL,
+        json={"access_token": SERVICE_TOKEN, "expires_in": 300},
+    )
+
+    client = KeycloakClient(  # noqa S106
+        openid_url="https://keycloak.example.com/.well-known/openid-configuration",
+        username=None,
+        password=None,
+        client_id="statsuite-cli",
+        client_secret=CLIENT_SECRET,
+    )
+
+    assert client.access_token == SERVICE_TOKEN  # noqa S105
+    assert client.refresh_token is None
+    form = httpx_mock.get_request(method="POST").content
+    assert b"grant_type=client_credentials" in form
+    assert b"client_id=statsuite-cli" in form
+    assert b"client_secret=secret" in form
+
+
+def test_auth_header_returns_a_copy(keycloak_client):
+    header = keycloak_client.auth_header()
+    header["Content-Type"] = "application/json"
     assert keycloak_client.auth_header() == {
         "Authorization": "Bearer fake-access-token"
     }
+
+
+def test_async_concurrent_authentications_are_coalesced(
+    httpx_mock, openid_config_response, token_response
+):
+    httpx_mock.add_response(
+        method="GET",
+        url="https://keycloak.example.com/.well-known/openid-configuration",
+        json=openid_config_response,
+    )
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, json=token_response)
+    client = AsyncKeycloakClient(  # noqa S106
+        openid_url="https://keycloak.example.com/.well-known/openid-configuration",
+        username="test-user",
+        password=PASSWORD,
+    )
+
+    async def headers():
+        """Build many headers concurrently.
+
+        Returns:
+            The headers.
+        """
+        return await asyncio.gather(*(client.auth_header() for _ in range(8)))
+
+    assert asyncio.run(headers()) == [{"Authorization": "Bearer fake-access-token"}] * 8
+    assert len(httpx_mock.get_requests(method="POST")) == 1
+
+
+def cached_client(cache_path, **kwargs):
+    """Build a client persisting its tokens.
+
+    Args:
+        cache_path: Directory of the cache.
+        kwargs: Other arguments of the client.
+
+    Returns:
+        The client.
+    """
+    return KeycloakClient(  # noqa S106
+        openid_url="https://keycloak.example.com/.well-known/openid-configuration",
+        username="test-user",
+        password=PASSWORD,
+        cache_path=cache_path,
+        **kwargs,
+    )
+
+
+def test_token_cache_shared_between_clients(
+    tmp_path, httpx_mock, openid_config_response, token_response
+):
+    httpx_mock.add_response(
+        method="GET",
+        url="https://keycloak.example.com/.well-known/openid-configuration",
+        json=openid_config_response,
+    )
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, json=token_response)
+
+    first = cached_client(tmp_path / "tokens")
+    second = cached_client(tmp_path / "tokens")
+
+    assert len(httpx_mock.get_requests()) == 2
+    assert second.auth_header() == {"Authorization": "Bearer fake-access-token"}
+    assert second.access_token_expires == first.access_token_expires
+    assert stat.S_IMODE(os.stat(first.cache.path).st_mode) == 0o600
+    assert b"fake-access-token" in first.cache.path.read_bytes()
+
+
+def test_token_cache_refreshes_expired_token(
+    tmp_path, httpx_mock, openid_config_response, token_response
+):
+    httpx_mock.add_response(
+        method="GET",
+        url="https://keycloak.example.com/.well-known/openid-configuration",
+        json=openid_config_response,
+    )
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, json=token_response)
+    cached_client(tmp_path)
+    httpx_mock.add_response(
+        method="POST",
+        url=TOKEN_URL,
+        json=token_response | {"access_token": NEW_ACCESS_TOKEN},
+    )
+
+    with freeze_time(datetime.datetime.now() + datetime.timedelta(minutes=10)):
+        client = cached_client(tmp_path)
+        assert client.cache.read()["access_token"] == NEW_ACCESS_TOKEN
+
+    refresh = httpx_mock.get_requests()[-1]
+    assert b"grant_type=refresh_token" in refresh.content
+    assert client.access_token == NEW_ACCESS_TOKEN  # noqa S105
+
+
+def test_token_cache_ignores_unreadable_file(
+    tmp_path, httpx_mock, openid_config_response, token_response
+):
+    httpx_mock.add_response(
+        method="GET",
+        url="https://keycloak.example.com/.well-known/openid-configuration",
+        json=openid_config_response,
+        is_reusable=True,
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url=TOKEN_URL,
+        json=token_response,
+        is_reusable=True,
+    )
+    client = cached_client(tmp_path)
+    client.cache.path.write_text("{not json")
+
+    cached_client(tmp_path)
+    other_user = KeycloakClient(  # noqa S106
+        openid_url="https://keycloak.example.com/.well-known/openid-configuration",
+        username="other-user",
+        password=PASSWORD,
+        cache_path=tmp_path,
+    )
+
+    assert len(httpx_mock.get_requests(method="POST")) == 3
+    assert other_user.cache.path != client.cache.path
+    assert other_user.identity.endswith("\nother-user")
+    assert other_user.identity != client.identity
+
+
+def test_encrypted_token_cache(
+    tmp_path, httpx_mock, openid_config_response, token_response
+):
+    httpx_mock.add_response(
+        method="GET",
+        url="https://keycloak.example.com/.well-known/openid-configuration",
+        json=openid_config_response,
+        is_reusable=True,
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url=TOKEN_URL,
+        json=token_response,
+        is_reusable=True,
+    )
+    key = fernet.Fernet.generate_key()
+
+    client = cached_client(tmp_path, cache_encryption_key=key)
+    cached_client(tmp_path, cache_encryption_key=key)
+    assert len(httpx_mock.get_requests()) == 2
+    assert b"fake-access-token" not in client.cache.path.read_bytes()
+
+    cached_client(tmp_path, cache_encryption_key=fernet.Fernet.generate_key())
+    assert len(httpx_mock.get_requests(method="POST")) == 2
+
+
+class FakeFernet:
+    """Reversible stand-in of ``cryptography.fernet.Fernet``.
+
+    Attributes:
+        key: The encryption key.
+    """
+
+    def __init__(self, key):
+        """Init the cipher.
+
+        Args:
+            key: The encryption key.
+        """
+        self.key = key if isinstance(key, bytes) else key.encode()
+
+    def encrypt(self, content):
+        """Encrypt a message.
+
+        Args:
+            content: The message.
+
+        Returns:
+            The key followed by the reversed message.
+        """
+        return self.key + b":" + content[::-1]
+
+    def decrypt(self, content):
+        """Decrypt a message.
+
+        Args:
+            content: The encrypted message.
+
+        Returns:
+            The message.
+
+        Raises:
+            FakeInvalidToken: If the message was encrypted with another key.
+        """
+        key, _, encrypted = content.partition(b":")
+        if key != self.key:
+            raise FakeInvalidToken()
+        return encrypted[::-1]
+
+
+class FakeInvalidToken(Exception):
+    """Stand-in of ``cryptography.fernet.InvalidToken``."""
+
+
+@pytest.fixture
+def fake_fernet(monkeypatch):
+    package = types.ModuleType("cryptography")
+    package.fernet = types.ModuleType("cryptography.fernet")
+    package.fernet.Fernet = FakeFernet
+    package.fernet.InvalidToken = FakeInvalidToken
+    monkeypatch.setitem(sys.modules, "cryptography", package)
+    monkeypatch.setitem(sys.modules, "cryptography.fernet", package.fernet)
+
+
+def token_cache(directory, **kwargs):
+    """Build the token cache of a user.
+
+    Args:
+        directory: Directory of the cache.
+        kwargs: Other arguments of the cache.
+
+    Returns:
+        The cache.
+    """
+    return TokenCache(
+        directory, "https://keycloak.example.com", "test-user", "app", **kwargs
+    )
+
+
+def test_token_cache_file(tmp_path):
+    cache = token_cache(tmp_path / "tokens")
+    assert cache.read() is None
+
+    with cache.lock():
+        cache.write({"access_token": ACCESS_TOKEN})
+
+    assert cache.read() == {"access_token": ACCESS_TOKEN}
+    assert stat.S_IMODE(os.stat(cache.path.parent).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o600
+    assert not cache.path.with_suffix(".tmp").exists()
+    cache.clear()
+    cache.clear()
+    assert cache.read() is None
+
+
+def test_token_cache_encryption(tmp_path, fake_fernet):
+    cache = token_cache(tmp_path, encryption_key="key")
+    cache.write({"access_token": ACCESS_TOKEN})
+
+    assert ACCESS_TOKEN.encode() not in cache.path.read_bytes()
+    assert cache.read() == {"access_token": ACCESS_TOKEN}
+    assert token_cache(tmp_path, encryption_key="other").read() is None
+    assert token_cache(tmp_path).read() is None
+
+
+def test_token_cache_encryption_names_its_extra(tmp_path, monkeypatch):
+    monkeypatch.setitem(sys.modules, "cryptography.fernet", None)
+
+    with pytest.raises(ImportError, match=r"statsuite-lib\[encryption\]"):
+        token_cache(tmp_path, encryption_key="key")
+
+
+def test_lazy_client_authenticates_on_first_use(
+    httpx_mock, openid_config_response, token_response
+):
+    client = KeycloakClient(  # noqa S106
+        openid_url="https://keycloak.example.com/.well-known/openid-configuration",
+        username="test-user",
+        password=PASSWORD,
+        lazy=True,
+    )
+    assert not httpx_mock.get_requests()
+
+    httpx_mock.add_response(
+        method="GET",
+        url="https://keycloak.example.com/.well-known/openid-configuration",
+        json=openid_config_response,
+    )
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, json=token_response)
+    assert client.auth_header() == {"Authorization": "Bearer fake-access-token"}
+
+
+def test_openid_configuration_fetched_once(keycloak_client, httpx_mock, token_response):
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, json=token_response)
+
+    other = KeycloakClient(  # noqa S106
+        openid_url="https://keycloak.example.com/.well-known/openid-configuration",
+        username="other-user",
+        password=PASSWORD,
+    )
+
+    assert len(httpx_mock.get_requests(method="GET")) == 1
+    assert other._token_endpoint == TOKEN_URL  # noqa S105
+
+
+def test_openid_configuration_http_error(httpx_mock):
+    httpx_mock.add_response(
+        url="https://keycloak.example.com/.well-known/openid-configuration",
+        status_code=404,
+    )
+
+    with pytest.raises(httpx.HTTPStatusError):
+        cached_client(None)
+    assert (
+        keycloak._OPENID_ENDPOINTS.get(
+            "https://keycloak.example.com/.well-known/openid-configuration"
+        )
+        is None
+    )
+
+
+def test_failed_renewal_discovers_the_endpoints_again(
+    keycloak_client, httpx_mock, openid_config_response, token_response
+):
+    keycloak_client.access_token_expires = None
+    keycloak_client.refresh_token = None
+    httpx_mock.add_response(method="POST", url=TOKEN_URL, status_code=404)
+    new_token_url = "https://auth.example.com/v2/token"  # noqa S105
+    httpx_mock.add_response(
+        url="https://keycloak.example.com/.well-known/openid-configuration",
+        json=openid_config_response | {"token_endpoint": new_token_url},
+    )
+    httpx_mock.add_response(method="POST", url=new_token_url, json=token_response)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        keycloak_client.get_access_token()
+    assert keycloak_client.get_access_token() == ACCESS_TOKEN
+    assert keycloak_client._token_endpoint == new_token_url
+
+
+def test_clear_openid_endpoints(keycloak_client):
+    assert keycloak._OPENID_ENDPOINTS.get(keycloak_client.OPENID_URL) is not None
+
+    clear_openid_endpoints(keycloak_client.OPENID_URL)
+
+    assert keycloak._OPENID_ENDPOINTS.get(keycloak_client.OPENID_URL) is None
@@ -1,12 +1,19 @@
+import asyncio
+import gzip
+import io
+
+import httpx
 import pytest
 
-from statsuite_lib import KeycloakClient, NSIClient
+from statsuite_lib import AsyncKeycloakClient, AsyncNSIClient, KeycloakClient, NSIClient
+from statsuite_lib.nsi import cache, download, export, structures
 
 
 @pytest.fixture
 def keycloak_mock(mocker):
     mock_keycloak = mocker.Mock(spec=KeycloakClient)
     mock_keycloak.auth_header.return_value = {"Authorization": "Bearer fake-token"}
+    mock_keycloak.identity = "https://keycloak.example.com\nstat-suite\njane"
     return mock_keycloak
 
 
@@ -106,3 +113,671 @@ def test_delete_with_timeout(nsi_client, httpx_mock):
 
     response = nsi_client.delete(path="/test/path", timeout=30)
     assert response == 204
+
+
+@pytest.fixture
+def async_nsi_client(mocker):
+    mock_keycloak = mocker.AsyncMock(spec=AsyncKeycloakClient)
+    mock_keycloak.auth_header.return_value = {"Authorization": "Bearer fake-token"}
+    return AsyncNSIClient(
+        nsi_url="https://nsi.example.com", keycloak_client=mock_keycloak
+    )
+
+
+def test_async_put_get_delete(async_nsi_client, httpx_mock):
+    httpx_mock.add_response(
+        method="POST", url="https://nsi.example.com/test/path", status_code=207
+    )
+    httpx_mock.add_response(
+        method="GET", url="https://nsi.example.com/test/path", text="Success"
+    )
+    httpx_mock.add_response(
+        method="DELETE", url="https://nsi.example.com/test/path", status_code=204
+    )
+
+    async def run():
+        """Run all the calls in the same event loop.
+
+        Returns:
+            The results of the calls.
+        """
+        put = await async_nsi_client.put(file_to_upload=b"test", path="/test/path")
+        get = await async_nsi_client.get(
+            path="/test/path", headers={"Accept": "text/csv"}
+        )
+        delete = await async_nsi_client.delete(path="/test/path")
+        return put, get, delete
+
+    put, get, delete = asyncio.run(run())
+    assert put == 207
+    assert get.text == "Success"
+    assert delete == 204
+    assert httpx_mock.get_requests()[1].headers["Accept"] == "text/csv"
+
+
+def test_put_streams_path(nsi_client, httpx_mock, tmp_path):
+    structure = tmp_path / "structure.xml"
+    structure.write_bytes(b"<xml/>" * 10)
+    httpx_mock.add_response(
+        method="POST", url="https://nsi.example.com/test/path", status_code=207
+    )
+
+    response = nsi_client.put(file_to_upload=structure, path="/test/path", chunk_size=8)
+
+    request = httpx_mock.get_request()
+    assert response == 207
+    assert request.headers["Transfer-Encoding"] == "chunked"
+    assert request.content == b"<xml/>" * 10
+
+
+def test_put_compressed(nsi_client, httpx_mock):
+    httpx_mock.add_response(
+        method="POST", url="https://nsi.example.com/test/path", status_code=207
+    )
+
+    nsi_client.put(file_to_upload=b"<xml/>", path="/test/path", compress=True)
+
+    request = httpx_mock.get_request()
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(request.content) == b"<xml/>"
+
+
+def test_async_put_streams_file_object(async_nsi_client, httpx_mock):
+    httpx_mock.add_response(
+        method="POST", url="https://nsi.example.com/test/path", status_code=207
+    )
+
+    response = asyncio.run(
+        async_nsi_client.put(file_to_upload=io.BytesIO(b"<xml/>"), path="/test/path")
+    )
+
+    assert response == 207
+    assert httpx_mock.get_request().content == b"<xml/>"
+
+
+def test_iter_lines_split_chunks():
+    chunks = [b"a,\xc3", b"\xa9\r", b"\nb\n", b"c"]
+    assert list(download.iter_lines(chunks)) == ["a,é\r\n", "b\n", "c"]
+
+
+class StreamBody(httpx.SyncByteStream):
+    """Response body read from a generator."""
+
+    def __init__(self, chunks):
+        """Wrap the generator.
+
+        Args:
+            chunks: The body chunks.
+        """
+        self.chunks = chunks
+
+    def __iter__(self):
+        """Read the body.
+
+        Yields:
+            The body chunks.
+        """
+        yield from self.chunks
+
+
+def test_iter_rows(nsi_client, httpx_mock):
+    body = gzip.compress(b'DIM,OBS_VALUE\r\nA,"1\r\n2"\r\nB,3\r\n')
+    httpx_mock.add_callback(
+        lambda request: httpx.Response(
+            200,
+            headers={"Content-Encoding": "gzip"},
+            stream=StreamBody([body[:10], body[10:]]),
+        ),
+        url="https://nsi.example.com/data/DF",
+    )
+
+    rows = list(nsi_client.iter_rows("/data/DF"))
+
+    assert rows == [["DIM", "OBS_VALUE"], ["A", "1\r\n2"], ["B", "3"]]
+    request = httpx_mock.get_request()
+    assert request.headers["Accept"] == "application/vnd.sdmx.data+csv"
+    assert request.headers["Accept-Encoding"] == "gzip, deflate"
+
+
+def test_iter_bytes_resumes_after_drop(nsi_client, httpx_mock):
+    def dropped(request):
+        """Send part of the body then drop the connection.
+
+        Args:
+            request: The request.
+
+        Returns:
+            The response.
+        """
+
+        def body():
+            """Partial body.
+
+            Yields:
+                The first bytes.
+
+            Raises:
+                ReadError: The connection drops.
+            """
+            yield b"0123"
+            raise httpx.ReadError("dropped")
+
+        return httpx.Response(200, stream=StreamBody(body()))
+
+    httpx_mock.add_callback(dropped, url="https://nsi.example.com/data/DF")
+    httpx_mock.add_response(
+        url="https://nsi.example.com/data/DF",
+        match_headers={"Range": "bytes=4-", "Accept-Encoding": "identity"},
+        status_code=206,
+        content=b"456789",
+    )
+
+    assert b"".join(nsi_client.iter_bytes("/data/DF", chunk_size=2)) == b"0123456789"
+
+
+def test_download_overwrites_file(nsi_client, httpx_mock, tmp_path):
+    target = tmp_path / "data.csv"
+    target.write_bytes(b"stale")
+    httpx_mock.add_response(
+        url="https://nsi.example.com/data/DF", headers={"ETag": '"v1"'}, content=b"01"
+    )
+
+    assert nsi_client.download("/data/DF", target) == 2
+    assert target.read_bytes() == b"01"
+    assert "Range" not in httpx_mock.get_request().headers
+    assert not (tmp_path / "data.csv.validator").exists()
+
+
+def test_download_resumes_file(nsi_client, httpx_mock, tmp_path):
+    target = tmp_path / "data.csv"
+    target.write_bytes(b"0123")
+    (tmp_path / "data.csv.validator").write_text('"v1"')
+    httpx_mock.add_response(
+        url="https://nsi.example.com/data/DF",
+        match_headers={"Range": "bytes=4-", "If-Range": '"v1"'},
+        status_code=206,
+        content=b"456789",
+    )
+
+    assert nsi_client.download("/data/DF", target, resume=True) == 10
+    assert target.read_bytes() == b"0123456789"
+    assert not (tmp_path / "data.csv.validator").exists()
+
+
+def test_download_resume_starts_over_if_changed(nsi_client, httpx_mock, tmp_path):
+    target = tmp_path / "data.csv"
+    target.write_bytes(b"0123")
+    (tmp_path / "data.csv.validator").write_text('"v1"')
+    httpx_mock.add_response(
+        url="https://nsi.example.com/data/DF",
+        match_headers={"If-Range": '"v1"'},
+        headers={"ETag": '"v2"'},
+        content=b"abcdefgh",
+    )
+
+    assert nsi_client.download("/data/DF", target, resume=True) == 8
+    assert target.read_bytes() == b"abcdefgh"
+
+
+def test_download_resume_of_complete_file(nsi_client, httpx_mock, tmp_path):
+    target = tmp_path / "data.csv"
+    target.write_bytes(b"0123")
+    (tmp_path / "data.csv.validator").write_text('"v1"')
+    httpx_mock.add_response(
+        url="https://nsi.example.com/data/DF",
+        status_code=416,
+        headers={"Content-Range": "bytes */4"},
+    )
+
+    assert nsi_client.download("/data/DF", target, resume=True) == 4
+    assert target.read_bytes() == b"0123"
+
+
+def test_download_keeps_validator_of_partial_file(nsi_client, httpx_mock, tmp_path):
+    def dropped(request):
+        """Send part of the body then drop the connection.
+
+        Args:
+            request: The request.
+
+        Returns:
+            The response.
+        """
+
+        def body():
+            """Partial body.
+
+            Yields:
+                The first bytes.
+
+            Raises:
+                ReadError: The connection drops.
+            """
+            yield b"0123"
+            raise httpx.ReadError("dropped")
+
+        return httpx.Response(200, headers={"ETag": '"v1"'}, stream=StreamBody(body()))
+
+    httpx_mock.add_callback(
+        dropped, url="https://nsi.example.com/data/DF", is_reusable=True
+    )
+    target = tmp_path / "data.csv"
+
+    with pytest.raises(httpx.ReadError):
+        nsi_client.download("/data/DF", target)
+
+    assert (tmp_path / "data.csv.validator").read_text() == '"v1"'
+
+
+def test_iter_bytes_fails_if_changed_while_resuming(nsi_client, httpx_mock):
+    httpx_mock.add_response(
+        url="https://nsi.example.com/data/DF",
+        match_headers={"If-Range": '"v1"'},
+        headers={"ETag": '"v2"'},
+        content=b"abcdefgh",
+    )
+
+    with pytest.raises(RuntimeError):
+        list(nsi_client.iter_bytes("/data/DF", offset=4, validator='"v1"'))
+
+
+def test_async_download_to_file_object(async_nsi_client, httpx_mock):
+    httpx_mock.add_response(url="https://nsi.example.com/data/DF", content=b"abc")
+    target = io.BytesIO()
+
+    size = asyncio.run(async_nsi_client.download("/data/DF", target))
+
+    assert size == 3
+    assert target.getvalue() == b"abc"
+
+
+def test_partitions():
+    assert export.dimension_partitions("/data/DF/A..USD?x=1", 1, ["FR", "DE"]) == [
+        "/data/DF/A.FR.USD?x=1",
+        "/data/DF/A.DE.USD?x=1",
+    ]
+    assert export.year_periods(2000, 2004, step=2) == [
+        ("2000", "2001"),
+        ("2002", "2003"),
+        ("2004", "2004"),
+    ]
+    assert export.period_partitions("/data/DF/all", [("2000", "2001")]) == [
+        "/data/DF/all?startPeriod=2000&endPeriod=2001"
+    ]
+
+
+def test_export_merges_in_order(nsi_client, httpx_mock, tmp_path):
+    httpx_mock.add_response(
+        url="https://nsi.example.com/data/DF/FR", content=b"H\nfr\n"
+    )
+    httpx_mock.add_response(url="https://nsi.example.com/data/DF/IT", status_code=404)
+    httpx_mock.add_response(
+        url="https://nsi.example.com/data/DF/DE", content=b"H\nde1\nde2\n"
+    )
+    target = tmp_path / "export.csv"
+
+    paths = export.dimension_partitions("/data/DF/all", 0, ["FR", "IT", "DE"])
+    size = nsi_client.export(paths, target, max_workers=3)
+
+    assert target.read_bytes() == b"H\nfr\nde1\nde2\n"
+    assert size == 13
+
+
+def test_iter_export_fetches_a_bounded_window(nsi_client, mocker):
+    parts = []
+
+    def fetch(path, headers):
+        """Return the result of a sub-query.
+
+        Args:
+            path: The sub-query.
+            headers: The headers.
+
+        Returns:
+            The result.
+        """
+        parts.append(io.BytesIO(b"H\n" + path.encode() + b"\n"))
+        return parts[-1]
+
+    mocker.patch.object(nsi_client, "_fetch_part", side_effect=fetch)
+    paths = (f"/data/DF/{partition}" for partition in range(10))
+
+    chunks = nsi_client.iter_export(paths, max_workers=2)
+
+    assert next(chunks) == b"H\n"
+    assert len(parts) <= 2
+    chunks.close()
+    assert all(part.closed for part in parts)
+
+
+def test_async_export_many_parts(async_nsi_client, httpx_mock):
+    for partition in range(6):
+        httpx_mock.add_response(
+            url=f"https://nsi.example.com/data/DF/{partition}",
+            content=f"H\n{partition}\n".encode(),
+        )
+    target = io.BytesIO()
+    paths = [f"/data/DF/{partition}" for partition in range(6)]
+
+    asyncio.run(async_nsi_client.export(paths, target, max_workers=2))
+
+    assert target.getvalue() == b"H\n0\n1\n2\n3\n4\n5\n"
+
+
+def test_async_export(async_nsi_client, httpx_mock):
+    httpx_mock.add_response(url="https://nsi.example.com/data/DF/A", content=b"H\na\n")
+    httpx_mock.add_response(url="https://nsi.example.com/data/DF/B", content=b"H\nb\n")
+    target = io.BytesIO()
+
+    asyncio.run(async_nsi_client.export(["/data/DF/A", "/data/DF/B"], target))
+
+    assert target.getvalue() == b"H\na\nb\n"
+
+
+def test_parse_artefact():
+    assert cache.parse_artefact("/dataflow/OECD/DF/1.0?references=all") == (
+        "dataflow",
+        "OECD",
+        "DF",
+        "1.0",
+    )
+    assert cache.parse_artefact("/codelist/OECD") == (
+        "codelist",
+        "OECD",
+        "all",
+        "latest",
+    )
+    assert cache.parse_artefact("/data/OECD,DF,1.0/all") is None
+    assert cache.parse_artefact("/rest/data/OECD,DF,1.0/all") is None
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/rest/dataflow/OECD/DF/1.0",
+        "/rest/structure/dataflow/OECD/DF/1.0",
+        "/rest/v2/structure/dataflow/OECD/DF/1.0?references=all",
+    ],
+)
+def test_parse_artefact_with_prefix(path):
+    assert cache.parse_artefact(path) == ("dataflow", "OECD", "DF", "1.0")
+
+
+def test_structure_cache_revalidates(keycloak_mock, httpx_mock):
+    structure_cache = cache.StructureCache()
+    client = NSIClient(
+        nsi_url="https://nsi.example.com",
+        keycloak_client=keycloak_mock,
+        structure_cache=structure_cache,
+    )
+    httpx_mock.add_response(
+        url="https://nsi.example.com/dataflow/OECD/DF/1.0",
+        content=b"<structure/>",
+        headers={"ETag": '"1"'},
+    )
+    httpx_mock.add_response(
+        url="https://nsi.example.com/dataflow/OECD/DF/1.0",
+        match_headers={"If-None-Match": '"1"'},
+        status_code=304,
+    )
+
+    assert client.get("/dataflow/OECD/DF/1.0").content == b"<structure/>"
+    cached = client.get("/dataflow/OECD/DF/1.0")
+
+    assert cached.content == b"<structure/>"
+    assert cached.extensions["from_cache"] is True
+    assert structure_cache.revalidations == 1
+
+
+def test_structure_cache_invalidation(keycloak_mock, httpx_mock, tmp_path):
+    client = NSIClient(
+        nsi_url="https://nsi.example.com",
+        keycloak_client=keycloak_mock,
+        structure_cache=cache.StructureCache(ttl=60, directory=tmp_path),
+    )
+    for resource in ("dataflow/OECD/all/latest", "codelist/ECB/CL_AREA/1.0"):
+        httpx_mock.add_response(
+            url=f"https://nsi.example.com/{resource}", content=resource.encode()
+        )
+    httpx_mock.add_response(method="DELETE", status_code=204)
+
+    client.get("/dataflow/OECD/all/latest")
+    client.get("/codelist/ECB/CL_AREA/1.0")
+    disk_cache = cache.StructureCache(ttl=60, directory=tmp_path)
+    assert disk_cache.lookup(
+        "https://nsi.example.com/codelist/ECB/CL_AREA/1.0",
+        "*/*",
+        keycloak_mock.identity,
+    ).content == (b"codelist/ECB/CL_AREA/1.0")
+    client.get("/codelist/ECB/CL_AREA/1.0")
+    client.delete("/dataflow/OECD/DF/1.0")
+
+    assert client.structure_cache.hits == 1
+    keys = {
+        (entry.url, entry.accept, entry.scope)
+        for entry in client.structure_cache._entries.values()
+    }
+    assert keys == {
+        (
+            "https://nsi.example.com/codelist/ECB/CL_AREA/1.0",
+            "*/*",
+            keycloak_mock.identity,
+        )
+    }
+
+
+def test_structure_cache_with_rest_paths(keycloak_mock, httpx_mock):
+    client = NSIClient(
+        nsi_url="https://nsi.example.com",
+        keycloak_client=keycloak_mock,
+        structure_cache=cache.StructureCache(ttl=60),
+    )
+    httpx_mock.add_response(
+        url="https://nsi.example.com/rest/v2/structure/dataflow/OECD/DF/1.0",
+        content=b"<structure/>",
+        is_reusable=True,
+    )
+    httpx_mock.add_response(method="DELETE", status_code=204)
+
+    client.get("/rest/v2/structure/dataflow/OECD/DF/1.0")
+    client.get("/rest/v2/structure/dataflow/OECD/DF/1.0")
+    client.delete("/rest/dataflow/OECD/DF/1.0")
+    client.get("/rest/v2/structure/dataflow/OECD/DF/1.0")
+
+    assert client.structure_cache.hits == 1
+    assert len(httpx_mock.get_requests(method="GET")) == 2
+
+
+def test_structure_cache_shared_by_clients(keycloak_mock, httpx_mock, mocker, tmp_path):
+    structure_cache = cache.StructureCache(ttl=60, directory=tmp_path)
+    other_user = mocker.Mock(spec=KeycloakClient)
+    other_user.auth_header.return_value = {"Authorization": "Bearer other-token"}
+    other_user.identity = "https://keycloak.example.com\nstat-suite\nbob"
+    clients = [
+        NSIClient(nsi_url=url, keycloak_client=keycloak, structure_cache=cache_)
+        for url, keycloak, cache_ in [
+            ("https://nsi.example.com/design", keycloak_mock, structure_cache),
+            ("https://nsi.example.com/release", keycloak_mock, structure_cache),
+            ("https://nsi.example.com/design", other_user, structure_cache),
+            (
+                "https://nsi.example.com/design",
+                keycloak_mock,
+                cache.StructureCache(ttl=60, directory=tmp_path),
+            ),
+        ]
+    ]
+    for dataspace in ("design", "release"):
+        httpx_mock.add_response(
+            url=f"https://nsi.example.com/{dataspace}/dataflow/OECD/DF/1.0",
+            content=dataspace.encode(),
+            is_reusable=True,
+        )
+
+    bodies = [client.get("/dataflow/OECD/DF/1.0").content for client in clients]
+
+    assert bodies == [b"design", b"release", b"design", b"design"]
+    assert structure_cache.misses == 3
+    assert clients[3].structure_cache.hits == 1
+
+
+def structure_message(*types):
+    """Build a structure message with empty artefact lists.
+
+    Args:
+        types: Names of the children of the Structures element.
+
+    Returns:
+        The message content.
+    """
+    children = "".join(f"<str:{name}/>" for name in types)
+    return (
+        '<mes:Structure xmlns:mes="urn:message" xmlns:str="urn:structure">'
+        f"<mes:Header/><mes:Structures>{children}</mes:Structures>"
+        "</mes:Structure>"
+    ).encode()
+
+
+SUBMIT_RESPONSE = b"""<mes:RegistryInterface xmlns:mes="urn:message" xmlns:reg="urn:reg"
+    xmlns:com="urn:common">
+  <mes:SubmitStructureResponse>
+    <reg:SubmissionResult>
+      <reg:SubmittedStructure action="Append">
+        <reg:MaintainableObject><URN>urn:sdmx:CL_AREA(1.0)</URN></reg:MaintainableObject>
+      </reg:SubmittedStructure>
+      <reg:StatusMessage status="Success"/>
+    </reg:SubmissionResult>
+    <reg:SubmissionResult>
+      <reg:SubmittedStructure action="Replace">
+        <reg:MaintainableObject><URN>urn:sdmx:DSD(1.0)</URN></reg:MaintainableObject>
+      </reg:SubmittedStructure>
+      <reg:StatusMessage status="Failure">
+        <com:Text>Codelist missing</com:Text>
+      </reg:StatusMessage>
+    </reg:SubmissionResult>
+  </mes:SubmitStructureResponse>
+</mes:RegistryInterface>"""
+
+
+def test_order_by_dependency():
+    codelists = structure_message("Codelists", "ConceptSchemes")
+    dsd = structure_message("DataStructures")
+    dataflow = structure_message("Dataflows")
+    mixed = structure_message("Codelists", "Dataflows")
+
+    groups = structures.order_by_dependency([dataflow, mixed, dsd, codelists])
+
+    assert groups == [[codelists], [dsd], [dataflow, mixed]]
+
+
+def test_parse_submit_response():
+    results = structures.parse_submit_response(SUBMIT_RESPONSE, "dsd.xml")
+
+    assert [result.model_dump() for result in results] == [
+        {
+            "source": "dsd.xml",
+            "urn": "urn:sdmx:CL_AREA(1.0)",
+            "action": "Append",
+            "status": "Success",
+            "messages": [],
+        },
+        {
+            "source": "dsd.xml",
+            "urn": "urn:sdmx:DSD(1.0)",
+            "action": "Replace",
+            "status": "Failure",
+            "messages": ["Codelist missing"],
+        },
+    ]
+
+
+def test_put_structures_in_order(nsi_client, httpx_mock, tmp_path):
+    codelists = tmp_path / "codelists.xml"
+    codelists.write_bytes(structure_message("Codelists"))
+    dataflows = tmp_path / "dataflows.xml"
+    dataflows.write_bytes(structure_message("Dataflows"))
+    httpx_mock.add_response(
+        method="POST",
+        url="https://nsi.example.com/rest/structure",
+        status_code=207,
+        content=SUBMIT_RESPONSE,
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="https://nsi.example.com/rest/structure",
+        status_code=500,
+        text="Server error",
+    )
+
+    rows = nsi_client.put_structures([dataflows, codelists], "/rest/structure")
+
+    assert [(row.source, row.status) for row in rows] == [
+        ("codelists.xml", "Success"),
+        ("codelists.xml", "Failure"),
+        ("dataflows.xml", "Failure"),
+    ]
+    assert rows[-1].messages == ["Server error"]
+
+
+def test_async_put_structures(async_nsi_client, httpx_mock):
+    httpx_mock.add_response(method="POST", status_code=207, content=SUBMIT_RESPONSE)
+
+    rows = asyncio.run(
+        async_nsi_client.put_structures(
+            [structure_message("DataStructures")], "/rest/structure"
+        )
+    )
+
+    assert [row.urn for row in rows] == [
+        "urn:sdmx:CL_AREA(1.0)",
+        "urn:sdmx:DSD(1.0)",
+    ]
+
+
+def test_parse_submit_response_in_chunks():
+    parser = structures.SubmitResponseParser("dsd.xml")
+    body = io.BytesIO(SUBMIT_RESPONSE)
+    chunks = iter(lambda: body.read(7), b"")
+
+    streamed = [result for chunk in chunks for result in parser.feed(chunk)]
+
+    assert streamed + parser.close() == structures.parse_submit_response(
+        SUBMIT_RESPONSE, "dsd.xml"
+    )
+
+
+def test_submit_structure_rejects_entities(nsi_client, httpx_mock):
+    doctype = b'<?xml version="1.0"?><!DOCTYPE lol [<!ENTITY lol "lol">]>'
+    body = doctype + SUBMIT_RESPONSE.replace(b"Codelist missing", b"&lol;")
+    httpx_mock.add_response(method="POST", status_code=207, content=body)
+
+    response = nsi_client.submit_structure(b"<structure/>", "/rest/structure")
+
+    assert response.results[0].status == "Failure"
+    assert response.results[0].messages == [structures.NO_RESULTS]
+
+
+def test_submit_structure(nsi_client, httpx_mock):
+    httpx_mock.add_callback(
+        lambda request: httpx.Response(
+            207, stream=StreamBody([SUBMIT_RESPONSE[:300], SUBMIT_RESPONSE[300:]])
+        ),
+        method="POST",
+    )
+
+    response = nsi_client.submit_structure(
+        io.BytesIO(b"<structure/>"), "/rest/structure"
+    )
+
+    assert response.status_code == 207
+    assert not response.is_success
+    assert [result.urn for result in response.failed] == ["urn:sdmx:DSD(1.0)"]
+    assert response.failed[0].messages == ["Codelist missing"]
+
+
+def test_submit_structure_invalid_body(nsi_client, httpx_mock):
+    httpx_mock.add_response(method="POST", status_code=207, text="<html>")
+
+    response = nsi_client.submit_structure(b"<structure/>", "/rest/structure")
+
+    assert response.results[0].status == "Failure"
+    assert response.results[0].messages == [structures.NO_RESULTS]
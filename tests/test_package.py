@@ -0,0 +1,42 @@
+import subprocess  # noqa S404
+import sys
+
+import pytest
+
+import statsuite_lib
+
+
+def run_python(code):
+    """Run code in a fresh interpreter.
+
+    Args:
+        code: The code.
+
+    Returns:
+        The standard output.
+    """
+    return subprocess.run(  # noqa S603
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+
+
+def test_clients_are_imported_on_first_access():
+    loaded = "import sys; print(*sorted(m for m in sys.modules if m.startswith('{}')))"
+    imports = run_python(f"import statsuite_lib; {loaded.format('statsuite_lib.')}")
+    assert imports == []
+
+    imports = run_python(
+        f"from statsuite_lib import SFSClient; {loaded.format('statsuite_lib.')}"
+    )
+    assert "statsuite_lib.sfs" in imports
+    assert "statsuite_lib.auth" not in imports
+    assert "statsuite_lib.transfer" not in imports
+
+
+def test_lazy_attributes():
+    from statsuite_lib.transfer import TransferClient
+
+    assert statsuite_lib.TransferClient is TransferClient
+    assert set(statsuite_lib.__all__) <= set(dir(statsuite_lib))
+    with pytest.raises(AttributeError):
+        statsuite_lib.UnknownClient
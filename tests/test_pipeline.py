@@ -0,0 +1,251 @@
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from statsuite_lib import SFSClient, TransferClient
+from statsuite_lib.pipeline import DataflowRelease, Pipeline, Stage, release_pipeline
+
+
+class Concurrency:
+    """Track the max number of concurrent calls of a stage."""
+
+    def __init__(self):
+        """Init the counters."""
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def __call__(self, item, results):
+        """Run a slow stage.
+
+        Args:
+            item: The item.
+            results: Results of the previous stages.
+
+        Returns:
+            The item doubled.
+        """
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        time.sleep(0.02)
+        with self.lock:
+            self.current -= 1
+        return item * 2
+
+
+def check(item, results):
+    """Fail for the item 3.
+
+    Args:
+        item: The item.
+        results: Results of the previous stages.
+
+    Returns:
+        The result of the first stage.
+
+    Raises:
+        ValueError: For the item 3.
+    """
+    if item == 3:
+        raise ValueError("bad item")
+    return results["double"]
+
+
+def test_pipeline_runs_stages_per_item():
+    double = Concurrency()
+    joined = Mock(return_value="joined")
+    pipeline = Pipeline(
+        [
+            Stage("double", double, max_workers=2),
+            Stage("check", check, max_workers=4),
+            Stage("publish", Mock(return_value=None), requires=["check"]),
+            Stage("join", joined, requires=["check"], join=True),
+        ]
+    )
+
+    report = pipeline.run(range(5))
+
+    assert double.peak == 2
+    assert report.items["4"]["check"].result == 8
+    assert report.items["3"]["check"].error == "bad item"
+    assert report.items["3"]["publish"].status == "skipped"
+    assert set(report.failed()) == {"3"}
+    items, results = joined.call_args.args
+    assert sorted(items.values()) == [0, 1, 2, 4]
+    assert results["1"] == {"double": 2, "check": 2, "publish": None}
+    assert report.items["*"]["join"].result == "joined"
+    timings = report.stage_timings()
+    assert timings["double"].runs == 5
+    assert timings["double"].slowest >= 0.02
+    assert "publish" in timings and timings["publish"].runs == 4
+
+
+def test_pipeline_resumes_from_checkpoint(tmp_path):
+    checkpoint = tmp_path / "state" / "pipeline.json"
+    first = Mock(side_effect=lambda item, results: item)
+    second = Mock(side_effect=check)
+
+    Pipeline([Stage("double", first), Stage("check", second)], checkpoint).run([1, 3])
+    report = Pipeline(
+        [Stage("double", first), Stage("check", lambda item, results: "fixed")],
+        checkpoint,
+    ).run([1, 3, 5])
+
+    assert first.call_count == 3
+    assert report.items["1"]["check"].result == 1
+    assert report.items["3"]["check"].result == "fixed"
+    assert not report.failed()
+
+
+def test_pipeline_invalid_stages():
+    with pytest.raises(ValueError):
+        Pipeline([Stage("a", print, requires=["b"]), Stage("b", print)])
+    with pytest.raises(ValueError):
+        Pipeline([Stage("a", print, join=True), Stage("b", print)])
+
+
+def completed(dataspace, ids):
+    """Report every request as completed.
+
+    Args:
+        dataspace: The dataspace name.
+        ids: The request IDs.
+
+    Returns:
+        The status of each request.
+    """
+    return {request_id: "Completed" for request_id in ids}
+
+
+def test_release_pipeline():
+    transfer = Mock(spec=TransferClient)
+    transfer.import_sdmx_file.side_effect = ["1", None]
+    transfer.check_requests_status.side_effect = completed
+    transfer.get_request_status.return_value = {
+        "executionStatus": "Completed",
+        "executionOutcome": "Success",
+    }
+    transfer.transfer_dataflow.return_value = "2"
+    sfs = Mock(spec=SFSClient)
+    sfs.index.return_value = "10"
+    sfs.wait_for_index_to_finish.return_value = True
+    releases = [
+        DataflowRelease(
+            dataflow=name,
+            file_object=f"{name}.csv",
+            dataspace="design",
+            destination_dataspace="release",
+            dsd="DSD",
+            index_type=1,
+        )
+        for name in ("DF_A", "DF_B")
+    ]
+
+    report = release_pipeline(transfer, sfs, max_imports=1).run(
+        releases, key=lambda release: release.dataflow
+    )
+
+    assert report.items["DF_A"]["transfer"].result == "2"
+    assert report.items["DF_B"]["import"].status == "failed"
+    transfer.set_tune.assert_called_once_with("design", "DSD", 1)
+    transfer.activate_dataflow.assert_called_once_with("design", "DF_A")
+    transfer.check_requests_status.assert_any_call("release", ["2"])
+    transfer.wait_for_request.assert_not_called()
+    assert report.items["*"]["reindex"].result == "10"
+
+
+def test_pipeline_times_the_stage_runs_not_their_queue():
+    slow = Concurrency()
+
+    report = Pipeline([Stage("double", slow, max_workers=1)]).run(range(4))
+
+    assert all(run["double"].duration < 0.06 for run in report.items.values())
+
+
+@pytest.mark.parametrize(
+    "status",
+    [
+        {"executionStatus": "Completed", "executionOutcome": "Error"},
+        {"executionStatus": "Canceled", "executionOutcome": "None"},
+        {"executionStatus": "TimedOut", "executionOutcome": "None"},
+    ],
+)
+def test_release_pipeline_skips_failed_imports(status):
+    transfer = Mock(spec=TransferClient)
+    transfer.import_sdmx_file.return_value = "1"
+    transfer.check_requests_status.side_effect = lambda dataspace, ids: {
+        request_id: status["executionStatus"] for request_id in ids
+    }
+    transfer.get_request_status.return_value = status
+    release = DataflowRelease(
+        dataflow="DF_A",
+        file_object="DF_A.csv",
+        dataspace="design",
+        destination_dataspace="release",
+        dsd="DSD",
+        index_type=1,
+    )
+
+    report = release_pipeline(transfer).run([release], key=lambda r: r.dataflow)
+
+    assert report.items["DF_A"]["wait"].status == "failed"
+    assert "Request 1 ended with status" in report.items["DF_A"]["wait"].error
+    assert report.items["DF_A"]["tune"].status == "skipped"
+    transfer.set_tune.assert_not_called()
+    transfer.activate_dataflow.assert_not_called()
+    transfer.transfer_dataflow.assert_not_called()
+
+
+def test_release_pipeline_polls_the_waits_together():
+    transfer = Mock(spec=TransferClient)
+    transfer.import_sdmx_file.side_effect = lambda file_object, dataspace: file_object
+    checked = []
+    seen = set()
+
+    def check(dataspace, ids):
+        """Record the polling thread, complete the requests on their second check.
+
+        Args:
+            dataspace: The dataspace name.
+            ids: The request IDs.
+
+        Returns:
+            The status of each request.
+        """
+        checked.append((threading.current_thread(), sorted(ids)))
+        statuses = {
+            request_id: "Completed" if request_id in seen else "InProcess"
+            for request_id in ids
+        }
+        seen.update(ids)
+        return statuses
+
+    transfer.check_requests_status.side_effect = check
+    transfer.get_request_status.return_value = {"executionStatus": "Completed"}
+    releases = [
+        DataflowRelease(dataflow=name, file_object=name, dataspace="design")
+        for name in ("A", "B", "C")
+    ]
+
+    report = release_pipeline(transfer, max_imports=3).run(
+        releases, key=lambda release: release.dataflow
+    )
+
+    assert not report.failed()
+    assert len({thread for thread, _ in checked}) == 1
+    assert max(len(ids) for _, ids in checked) > 1
+    transfer.wait_for_request.assert_not_called()
+
+
+def test_release_pipeline_wait_check_error():
+    transfer = Mock(spec=TransferClient)
+    transfer.import_sdmx_file.return_value = "1"
+    transfer.check_requests_status.side_effect = RuntimeError("service down")
+    release = DataflowRelease(dataflow="DF_A", file_object="A", dataspace="design")
+
+    report = release_pipeline(transfer).run([release], key=lambda r: r.dataflow)
+
+    assert report.items["DF_A"]["wait"].error == "service down"
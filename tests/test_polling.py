@@ -0,0 +1,137 @@
+import asyncio
+import itertools
+
+import pytest
+
+from statsuite_lib.polling import AsyncPoller, Poller, PollingSchedule, check_each
+
+
+def test_schedule_fast_phase_then_exponential_backoff():
+    schedule = PollingSchedule(
+        initial_delay=1, fast_attempts=2, multiplier=2, max_delay=10, jitter=0
+    )
+    delays = list(itertools.islice(schedule.delays(), 7))
+    assert delays == [1, 1, 2, 4, 8, 10, 10]
+
+
+def test_schedule_jitter():
+    schedule = PollingSchedule(initial_delay=1, fast_attempts=100, jitter=0.5)
+    for delay in itertools.islice(schedule.delays(), 100):
+        assert 0.5 <= delay <= 1.5
+
+
+def test_schedule_initial_delay_capped_by_max_delay():
+    schedule = PollingSchedule(initial_delay=5, max_delay=0.1, jitter=0)
+    assert next(schedule.delays()) == 0.1
+
+
+def test_poller_returns_each_task_as_soon_as_it_finishes():
+    pending = {"a": 1, "b": 3}
+    calls = []
+
+    def check_many(keys):
+        """Count down the checks left of each task.
+
+        Args:
+            keys: Tasks to check.
+
+        Returns:
+            Status of each task.
+        """
+        calls.append(sorted(keys))
+        for key in keys:
+            pending[key] -= 1
+        return {key: pending[key] for key in keys}
+
+    poller = Poller(
+        check_many=check_many,
+        is_done=lambda status: status == 0,
+        schedule=PollingSchedule(initial_delay=0.01, jitter=0),
+    )
+    poller.add("a")
+    poller.add("b")
+    assert len(poller) == 2
+
+    results = list(poller.run())
+
+    assert [(result.key, result.timed_out) for result in results] == [
+        ("a", False),
+        ("b", False),
+    ]
+    assert calls == [["a", "b"], ["b"], ["b"]]
+    assert len(poller) == 0
+    assert poller.next_due_in() is None
+
+
+def test_poller_timeout():
+    poller = Poller(
+        check_many=check_each(lambda key: "InProcess"),
+        is_done=lambda status: status == "Completed",
+        schedule=PollingSchedule(initial_delay=0.01, timeout=0.05),
+    )
+    poller.add(1)
+
+    results = list(poller.run())
+
+    assert results[0].key == 1
+    assert results[0].status == "InProcess"
+    assert results[0].timed_out is True
+
+
+def test_poller_times_out_tasks_missing_from_the_statuses():
+    checks = []
+    poller = Poller(
+        check_many=lambda keys: checks.append(keys) or {},
+        is_done=lambda status: status == "Completed",
+        schedule=PollingSchedule(initial_delay=0.01, jitter=0, timeout=0.05),
+    )
+    poller.add(1)
+
+    results = list(poller.run())
+
+    assert results == [(1, None, True)]
+    assert 2 <= len(checks) <= 10
+
+
+def test_poll_due_without_due_tasks():
+    poller = Poller(
+        check_many=pytest.fail,
+        is_done=bool,
+        schedule=PollingSchedule(initial_delay=10),
+    )
+    assert poller.poll_due() == []
+
+
+def test_async_poller():
+    statuses = iter(["Queued", "Completed"])
+
+    async def check_many(keys):
+        """Return the next status.
+
+        Args:
+            keys: Tasks to check.
+
+        Returns:
+            Status of each task.
+        """
+        return {key: next(statuses) for key in keys}
+
+    poller = AsyncPoller(
+        check_many=check_many,
+        is_done=lambda status: status == "Completed",
+        schedule=PollingSchedule(initial_delay=0.01),
+    )
+    poller.add("id")
+
+    async def collect():
+        """Poll until the task finished.
+
+        Returns:
+            The poll results.
+        """
+        return [result async for result in poller.run()]
+
+    results = asyncio.run(collect())
+
+    assert results[0].status == "Completed"
+    assert results[0].timed_out is False
@@ -1,6 +1,13 @@
+import asyncio
+import json
+import time
+from unittest.mock import Mock
+
 import pytest
 
-from statsuite_lib import SFSClient
+from statsuite_lib import AsyncSFSClient, SFSClient
+from statsuite_lib.sfs import DataflowRef, ReindexScheduler, parsing
+from statsuite_lib.sfs.parsing import JSONArrayDecoder, iter_json_array
 
 
 @pytest.fixture
@@ -133,3 +140,237 @@ def test_wait_for_reindex_expire(loading_inprogress, mocker):
         tenant="default", loading_id="172355625862", backoff=0.1, timeout=0.2
     )
     assert finished is False
+
+
+def test_async_get_log(httpx_mock, loading):
+    httpx_mock.add_response(status_code=200, content=loading)
+
+    client = AsyncSFSClient(sfs_url="https://foo", sfs_api_key="bar")
+    log = asyncio.run(client.get_log(tenant="foo", loading_id="bar"))
+    assert log.id == 1723556258625
+
+
+def test_async_get_log_502_error(httpx_mock, loadings):
+    httpx_mock.add_response(status_code=502, content="{}")
+    httpx_mock.add_response(status_code=200, content=loadings)
+    client = AsyncSFSClient(sfs_url="https://foo", sfs_api_key="bar")
+    log = asyncio.run(client.get_log(tenant="foo", loading_id="1723556258625"))
+    assert log.id == 1723556258625
+
+
+def test_async_index(httpx_mock):
+    httpx_mock.add_response(
+        method="POST", status_code=200, content='{"loadingId": 1734967844099}'
+    )
+    client = AsyncSFSClient(sfs_url="https://foo", sfs_api_key="bar")
+    assert asyncio.run(client.index()) == 1734967844099
+
+
+def test_async_wait_for_reindex(httpx_mock, loading_inprogress, loading):
+    httpx_mock.add_response(status_code=200, content=loading_inprogress)
+    httpx_mock.add_response(status_code=200, content=loading)
+    client = AsyncSFSClient(sfs_url="https://foo", sfs_api_key="bar")
+    finished = asyncio.run(
+        client.wait_for_index_to_finish(
+            tenant="default", loading_id="1723556258625", backoff=0.01
+        )
+    )
+    assert finished is True
+
+
+def test_async_wait_for_reindex_expire(mocker):
+    mocker.patch.object(
+        AsyncSFSClient,
+        "check_status_loading",
+        return_value=AsyncSFSClient.LoadingStatus.RETRY,
+    )
+    client = AsyncSFSClient(sfs_url="https://foo", sfs_api_key="bar")
+    finished = asyncio.run(
+        client.wait_for_index_to_finish(
+            tenant="default", loading_id="172355625862", backoff=0.1, timeout=0.2
+        )
+    )
+    assert finished is False
+
+
+def test_get_log_passes_loading_id(httpx_mock, loading):
+    httpx_mock.add_response(
+        url="https://foo/admin/logs?api-key=bar&tenant=foo&id=1723556258625",
+        content=loading,
+    )
+    client = SFSClient(sfs_url="https://foo", sfs_api_key="bar")
+    assert client.get_log(tenant="foo", loading_id="1723556258625").id == 1723556258625
+
+
+def test_json_array_decoder_split_chunks(loadings):
+    text = f'[{{"id": 1}}, 22, "x", {loadings}]'
+    chunks = [text[i:][:3] for i in range(0, len(text), 3)]
+    elements = list(iter_json_array(chunks))
+    assert elements[:3] == [{"id": 1}, 22, "x"]
+    assert elements[3][0]["id"] == 1723556258625
+
+
+def test_json_array_decoder_stops_at_match():
+    decoder = JSONArrayDecoder()
+    assert decoder.feed('[{"id": 1}, {"id"') == [{"id": 1}]
+    assert decoder.feed(": 2}]") == [{"id": 2}]
+    assert decoder.done
+    with pytest.raises(ValueError):
+        list(iter_json_array(['[{"id": 1}, ']))
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5])
+def test_json_array_decoder_escapes_split_chunks(size):
+    elements = ['a"b\\', {"x": ["]}", 1.5e3, None]}, [], True, "\u00e9"]
+    text = json.dumps(elements)
+    chunks = [text[i:][:size] for i in range(0, len(text), size)]
+    assert list(iter_json_array(chunks)) == elements
+
+
+def test_json_array_decoder_decodes_each_element_once(mocker):
+    loads = mocker.spy(parsing.json, "loads")
+    text = json.dumps([{"logs": ["x" * 100] * 1000}, 1])
+    decoder = JSONArrayDecoder()
+
+    elements = [
+        element
+        for i in range(0, len(text), 64)
+        for element in decoder.feed(text[i:][:64])
+    ]
+
+    assert len(elements) == 2
+    assert loads.call_count == 2
+
+
+def test_json_array_decoder_fails_on_invalid_element():
+    decoder = JSONArrayDecoder()
+    with pytest.raises(ValueError, match="Invalid JSON array element"):
+        decoder.feed('[{"id" 1}, ')
+    with pytest.raises(ValueError, match="Expected a JSON array"):
+        JSONArrayDecoder().feed('{"id": 1}')
+
+
+def test_index_dataflow(httpx_mock):
+    httpx_mock.add_response(
+        method="POST",
+        url="https://foo/admin/dataflow?api-key=bar&tenant=oecd",
+        match_json={
+            "spaceId": "release",
+            "agencyId": "OECD",
+            "id": "DF",
+            "version": "1.0",
+        },
+        json={"loadingId": 12},
+    )
+    client = SFSClient(sfs_url="https://foo", sfs_api_key="bar")
+    dataflow = DataflowRef(spaceId="release", agencyId="OECD", id="DF", version="1.0")
+    assert client.index_dataflow(dataflow, tenant="oecd") == 12
+
+
+def test_get_latest_log(httpx_mock):
+    logs = [
+        {
+            "id": 1,
+            "executionStart": "2024-08-13T10:00:00Z",
+            "executionStatus": "completed",
+        },
+        {
+            "id": 2,
+            "executionStart": "2024-08-13T12:00:00Z",
+            "executionStatus": "inProgress",
+        },
+        {
+            "id": 3,
+            "executionStart": "2024-08-13T11:00:00Z",
+            "executionStatus": "completed",
+        },
+    ]
+    httpx_mock.add_response(content=json.dumps(logs), is_reusable=True)
+    client = SFSClient(sfs_url="https://foo", sfs_api_key="bar")
+    assert client.get_latest_log("default").id == 2
+    assert client.is_indexing("default")
+    assert asyncio.run(AsyncSFSClient("https://foo", "bar").is_indexing("default"))
+    latest = asyncio.run(AsyncSFSClient("https://foo", "bar").get_latest_log("x"))
+    assert latest.id == 2
+
+
+def test_reindex_scheduler_coalesces_requests():
+    client = Mock(spec=SFSClient)
+    client.is_indexing.return_value = False
+    dataflows = [
+        DataflowRef(spaceId="release", agencyId="OECD", id=f"DF_{i}") for i in range(3)
+    ]
+
+    with ReindexScheduler(client, window=0.05, max_targeted=2) as scheduler:
+        scheduler.request("oecd", dataflows[:1])
+        scheduler.request("oecd", dataflows[:2])
+        scheduler.request("ecb", dataflows)
+        time.sleep(0.3)
+
+    assert client.index_dataflow.call_count == 2
+    client.index.assert_called_once_with("ecb")
+    assert scheduler.stats == {"requests": 3, "full": 1, "targeted": 2, "postponed": 0}
+
+
+def test_reindex_scheduler_postpones_while_indexing():
+    client = Mock(spec=SFSClient)
+    client.is_indexing.side_effect = [True, False]
+
+    scheduler = ReindexScheduler(client, window=0.05)
+    scheduler.request("oecd")
+    time.sleep(0.3)
+
+    client.index.assert_called_once_with("oecd")
+    assert scheduler.stats["postponed"] == 1
+    scheduler.close()
+    with pytest.raises(RuntimeError):
+        scheduler.request("oecd")
+
+
+def test_reindex_scheduler_postpones_on_errors():
+    client = Mock(spec=SFSClient)
+    client.is_indexing.side_effect = [ValueError("bad log"), False]
+
+    with ReindexScheduler(client, window=0.05) as scheduler:
+        scheduler.request("oecd")
+        time.sleep(0.3)
+        client.index.assert_called_once_with("oecd")
+        assert scheduler.stats["postponed"] == 1
+        assert scheduler._thread is not None and scheduler._thread.is_alive()
+
+
+def test_reindex_scheduler_stats_are_a_copy():
+    scheduler = ReindexScheduler(Mock(spec=SFSClient), window=10)
+    scheduler.request("oecd")
+
+    stats = scheduler.stats
+    stats["requests"] = 10
+
+    assert scheduler.stats["requests"] == 1
+    scheduler.close(flush=False)
+
+
+def test_reindex_scheduler_close_stops_the_thread_if_flush_fails():
+    client = Mock(spec=SFSClient)
+    client.index.side_effect = RuntimeError("service down")
+    scheduler = ReindexScheduler(client, window=10)
+    scheduler.request("oecd")
+    thread = scheduler._thread
+
+    with pytest.raises(RuntimeError, match="service down"):
+        scheduler.close()
+
+    assert not thread.is_alive()
+    assert scheduler.stats["full"] == 1
+
+
+@pytest.mark.parametrize(
+    "status, running",
+    [("queued", True), ("inProgress", True), ("failed", False), (None, False)],
+)
+def test_is_indexing_only_for_running_loadings(httpx_mock, status, running):
+    logs = [{"id": 1, "executionStart": "2024-08-13T10:00:00Z"}]
+    logs[0]["executionStatus"] = status
+    httpx_mock.add_response(content=json.dumps(logs))
+    client = SFSClient(sfs_url="https://foo", sfs_api_key="bar")
+    assert client.is_indexing("default") is running
@@ -1,9 +1,19 @@
+import asyncio
+import datetime
+import urllib.parse
 from unittest.mock import patch
 
 import httpx
 import pytest
 
-from statsuite_lib import KeycloakClient, TransferClient
+from statsuite_lib import (
+    AsyncKeycloakClient,
+    AsyncTransferClient,
+    KeycloakClient,
+    TransferClient,
+)
+from statsuite_lib.polling import PollingSchedule
+from statsuite_lib.transfer import ImportJob, TransferJob
 
 
 @pytest.fixture
@@ -53,6 +63,17 @@ def test_check_request_status_success(transfer_client, httpx_mock):
     assert status == "Completed"
 
 
+def test_get_request_status(transfer_client, httpx_mock):
+    status = {"executionStatus": "Completed", "executionOutcome": "Error"}
+    httpx_mock.add_response(
+        method="POST",
+        url="https://transfer.example.com/3/status/request",
+        json=status,
+    )
+
+    assert transfer_client.get_request_status("test-space", 12345) == status
+
+
 def test_check_request_status_error(transfer_client, httpx_mock):
     httpx_mock.add_exception(httpx.ConnectError("Connection failed"))
 
@@ -141,3 +162,632 @@ def test_set_tune_success(transfer_client, httpx_mock):
 def test_initialization(transfer_client):
     assert transfer_client.TRANSFER_URL == "https://transfer.example.com/3"
     assert isinstance(transfer_client._client, httpx.Client)
+
+
+@pytest.fixture
+def async_keycloak_mock(mocker):
+    mock_keycloak = mocker.AsyncMock(spec=AsyncKeycloakClient)
+    mock_keycloak.auth_header.return_value = {"Authorization": "Bearer fake-token"}
+    return mock_keycloak
+
+
+@pytest.fixture
+def async_transfer_client(async_keycloak_mock):
+    return AsyncTransferClient(
+        transfer_url="https://transfer.example.com",
+        keycloak_client=async_keycloak_mock,
+    )
+
+
+def test_async_import_sdmx_file_success(async_transfer_client, httpx_mock):
+    httpx_mock.add_response(
+        method="POST",
+        url="https://transfer.example.com/3/import/sdmxFile",
+        json={"message": "File import completed for 12345"},
+        status_code=200,
+    )
+
+    result = asyncio.run(
+        async_transfer_client.import_sdmx_file(
+            file_object=b"test content", dataspace="test-space"
+        )
+    )
+
+    assert result == "12345"
+    request = httpx_mock.get_request()
+    assert request.headers["Authorization"] == "Bearer fake-token"
+
+
+def test_async_wait_for_request(async_transfer_client, httpx_mock):
+    httpx_mock.add_response(
+        method="POST",
+        url="https://transfer.example.com/3/status/request",
+        json={"executionStatus": "InProcess"},
+    )
+    httpx_mock.add_response(
+        method="POST",
+        url="https://transfer.example.com/3/status/request",
+        json={"executionStatus": "Completed"},
+    )
+
+    result = asyncio.run(
+        async_transfer_client.wait_for_request(
+            dataspace="test-space", id=12345, timeout=5, backoff=0.01
+        )
+    )
+
+    assert result is False
+
+
+def test_async_wait_for_request_timeout(async_transfer_client, mocker):
+    mocker.patch.object(
+        async_transfer_client, "check_request_status", return_value="InProgress"
+    )
+
+    result = asyncio.run(
+        async_transfer_client.wait_for_request(
+            dataspace="test-space", id=12345, timeout=0.2, backoff=0.1
+        )
+    )
+
+    assert result is True
+
+
+def test_async_transfer_tune_activate_health(async_transfer_client, httpx_mock):
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/transfer/dataflow",
+        json={"message": "Request ID: 12345"},
+    )
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/tune/info", json={"tune": "data"}
+    )
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/tune/dsd", json={"status": "success"}
+    )
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/init/dataflow", json={"status": "ok"}
+    )
+    httpx_mock.add_response(
+        url="https://transfer.example.com/health", json={"service": "ok"}
+    )
+
+    async def run():
+        """Run all the calls in the same event loop.
+
+        Returns:
+            The results of the calls.
+        """
+        return (
+            await async_transfer_client.transfer_dataflow(
+                source_dataspace="source-space",
+                destination_dataspace="dest-space",
+                dataflow="test-flow",
+            ),
+            await async_transfer_client.get_tune(dataspace="ds", dsd_id="dsd"),
+            await async_transfer_client.set_tune(
+                dataspace="ds", dsd_id="dsd", index_type=1
+            ),
+            await async_transfer_client.activate_dataflow(dataspace="ds", df_id="df"),
+            await async_transfer_client.health(),
+        )
+
+    assert asyncio.run(run()) == (
+        "12345",
+        {"tune": "data"},
+        {"status": "success"},
+        {"status": "ok"},
+        {"service": "ok"},
+    )
+
+
+async def collect(results):
+    """Read an async iterator of results.
+
+    Args:
+        results: The async iterator.
+
+    Returns:
+        The results, in order.
+    """
+    return [result async for result in results]
+
+
+def test_async_wait_for_requests_yields_as_completed(async_transfer_client, mocker):
+    async_transfer_client._batch_status_supported = False
+    polls = {1: iter(["InProcess", "Completed"]), 2: iter(["Completed"])}
+
+    async def check(dataspace, id):
+        """Return the next status of the request.
+
+        Args:
+            dataspace: The dataspace name.
+            id: The request ID.
+
+        Returns:
+            The status.
+        """
+        return next(polls[id])
+
+    mocker.patch.object(async_transfer_client, "check_request_status", check)
+
+    results = asyncio.run(
+        collect(
+            async_transfer_client.wait_for_requests(
+                "test-space",
+                [1, 2],
+                schedule=PollingSchedule(initial_delay=0.01, timeout=5),
+            )
+        )
+    )
+
+    assert [result.key for result in results] == [2, 1]
+    assert not any(result.timed_out for result in results)
+
+
+def test_async_import_sdmx_files(async_transfer_client, mocker):
+    async_transfer_client._batch_status_supported = False
+    import_mock = mocker.patch.object(
+        async_transfer_client, "import_sdmx_file", side_effect=["1", "2", None]
+    )
+    polls = {"1": iter(["Queued", "Completed"]), "2": iter(["Completed"])}
+
+    async def check(dataspace, id):
+        """Return the next status of the request.
+
+        Args:
+            dataspace: The dataspace name.
+            id: The request ID.
+
+        Returns:
+            The status.
+        """
+        return next(polls[id])
+
+    mocker.patch.object(async_transfer_client, "check_request_status", check)
+
+    results = asyncio.run(
+        collect(
+            async_transfer_client.import_sdmx_files(
+                [
+                    (b"a", "design"),
+                    ImportJob(file_object=b"b", dataspace="design"),
+                    (b"c", "design", {"validation_type": 0}),
+                ],
+                max_workers=1,
+                backoff=0.01,
+            )
+        )
+    )
+
+    by_file = {result.job.file_object: result for result in results}
+    assert by_file[b"a"].is_completed
+    assert by_file[b"a"].request_id == "1"
+    assert by_file[b"b"].is_completed
+    assert by_file[b"c"].error == "Import rejected"
+    assert import_mock.call_args.kwargs["validation_type"] == 0
+
+
+def test_async_import_sdmx_files_failures(async_transfer_client, mocker):
+    mocker.patch.object(
+        async_transfer_client,
+        "import_sdmx_file",
+        side_effect=[httpx.ConnectError("Connection failed"), "2"],
+    )
+    mocker.patch.object(async_transfer_client, "check_requests_status", return_value={})
+
+    results = asyncio.run(
+        collect(
+            async_transfer_client.import_sdmx_files(
+                [(b"a", "design"), (b"b", "design")], timeout=0.1, backoff=0.02
+            )
+        )
+    )
+
+    assert [(result.request_id, result.error) for result in results] == [
+        (None, "Connection failed"),
+        ("2", "Timeout after 0.1 seconds"),
+    ]
+
+
+def test_async_import_sdmx_files_cancels_submissions_when_closed(
+    async_transfer_client, mocker
+):
+    cancelled = []
+
+    async def submit(file_object, **kwargs):
+        """Reject the first file, block on the others until cancelled.
+
+        Args:
+            file_object: The file to import.
+            kwargs: The other import options.
+
+        Returns:
+            None, the import is rejected.
+
+        Raises:
+            CancelledError: When the submission is cancelled.
+        """
+        if file_object == b"a":
+            return None
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(file_object)
+            raise
+
+    mocker.patch.object(async_transfer_client, "import_sdmx_file", submit)
+
+    async def run():
+        """Stop reading the results after the first one.
+
+        Returns:
+            The first result.
+        """
+        results = async_transfer_client.import_sdmx_files(
+            [(b"a", "design"), (b"b", "design")], max_workers=2
+        )
+        first = await anext(results)
+        await results.aclose()
+        await asyncio.sleep(0)
+        return first
+
+    assert asyncio.run(run()).error == "Import rejected"
+    assert cancelled == [b"b"]
+
+
+def test_async_transfer_dataflows(async_transfer_client, httpx_mock):
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/transfer/dataflow",
+        json={"message": "Request ID: 1"},
+    )
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/status/request",
+        json={"executionStatus": "Completed"},
+    )
+
+    results = asyncio.run(
+        collect(
+            async_transfer_client.transfer_dataflows(
+                [("staging", "release", "DF_A", {"source_version": 1})], backoff=0.01
+            )
+        )
+    )
+
+    assert len(results) == 1
+    assert results[0].is_completed
+    assert results[0].request_id == "1"
+    transfer, status = httpx_mock.get_requests()
+    form = dict(urllib.parse.parse_qsl(transfer.content.decode()))
+    assert form["sourceDataflow"] == "DF_A"
+    assert form["sourceVersion"] == "1"
+    assert dict(urllib.parse.parse_qsl(status.content.decode())) == {
+        "dataspace": "release",
+        "id": "1",
+    }
+
+
+def test_import_sdmx_files(transfer_client, mocker):
+    transfer_client._batch_status_supported = False
+    import_mock = mocker.patch.object(
+        transfer_client, "import_sdmx_file", side_effect=["1", "2", None]
+    )
+    polls = {"1": iter(["Queued", "Completed"]), "2": iter(["Completed"])}
+    mocker.patch.object(
+        transfer_client,
+        "check_request_status",
+        side_effect=lambda dataspace, id: next(polls[id]),
+    )
+
+    results = list(
+        transfer_client.import_sdmx_files(
+            [
+                (b"a", "design"),
+                ImportJob(file_object=b"b", dataspace="design"),
+                (b"c", "design", {"validation_type": 0}),
+            ],
+            max_workers=1,
+            backoff=0.01,
+        )
+    )
+
+    by_file = {result.job.file_object: result for result in results}
+    assert by_file[b"a"].is_completed
+    assert by_file[b"a"].request_id == "1"
+    assert by_file[b"b"].is_completed
+    assert not by_file[b"c"].is_completed
+    assert by_file[b"c"].error == "Import rejected"
+    assert import_mock.call_args.kwargs["validation_type"] == 0
+
+
+def test_import_sdmx_files_pulls_the_jobs_as_submissions_finish(
+    transfer_client, mocker
+):
+    pulled = []
+    started = []
+
+    def jobs():
+        """Record how many jobs were read.
+
+        Yields:
+            The import jobs.
+        """
+        for name in "abcdef":
+            pulled.append(name)
+            yield (name.encode(), "design")
+
+    def submit(**kwargs):
+        """Record how many jobs were read when a submission starts.
+
+        Args:
+            kwargs: The import options.
+        """
+        started.append(len(pulled))
+
+    mocker.patch.object(transfer_client, "import_sdmx_file", side_effect=submit)
+
+    results = list(transfer_client.import_sdmx_files(jobs(), max_workers=2))
+
+    assert len(results) == 6
+    assert all(pulled <= index + 2 for index, pulled in enumerate(started))
+
+
+def test_import_sdmx_files_submission_error(transfer_client, mocker):
+    mocker.patch.object(
+        transfer_client,
+        "import_sdmx_file",
+        side_effect=httpx.ConnectError("Connection failed"),
+    )
+
+    results = list(transfer_client.import_sdmx_files([(b"a", "design")]))
+
+    assert len(results) == 1
+    assert results[0].request_id is None
+    assert results[0].error == "Connection failed"
+
+
+def test_import_sdmx_files_timeout(transfer_client, mocker):
+    mocker.patch.object(transfer_client, "import_sdmx_file", return_value="1")
+    mocker.patch.object(
+        transfer_client, "check_request_status", return_value="InProcess"
+    )
+
+    results = list(
+        transfer_client.import_sdmx_files([(b"a", "design")], timeout=0.1, backoff=0.02)
+    )
+
+    assert len(results) == 1
+    assert results[0].request_id == "1"
+    assert results[0].execution_status is None
+    assert results[0].error == "Timeout after 0.1 seconds"
+
+
+def test_import_sdmx_file_streams_path(transfer_client, httpx_mock, tmp_path):
+    data_file = tmp_path / "data.csv"
+    data_file.write_bytes(b"DATAFLOW,OBS_VALUE\n")
+    httpx_mock.add_response(
+        method="POST",
+        url="https://transfer.example.com/3/import/sdmxFile",
+        json={"message": "File import completed for 12345"},
+    )
+
+    assert transfer_client.import_sdmx_file(data_file, dataspace="design") == "12345"
+
+    body = httpx_mock.get_request().content
+    assert b'name="dataspace"\r\n\r\ndesign' in body
+    assert b'filename="data.csv"' in body
+    assert b"DATAFLOW,OBS_VALUE\n" in body
+
+
+def test_wait_for_requests(transfer_client, httpx_mock):
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/status/requests",
+        json=[
+            {"requestId": 1, "executionStatus": "Completed"},
+            {"requestId": 2, "executionStatus": "InProcess"},
+        ],
+    )
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/status/request",
+        json={"executionStatus": "Completed"},
+    )
+
+    results = list(
+        transfer_client.wait_for_requests(
+            dataspace="test-space", ids=[1, 2], timeout=5, backoff=0.01
+        )
+    )
+
+    assert [result.key for result in results] == [1, 2]
+    assert not any(result.timed_out for result in results)
+
+
+@pytest.mark.parametrize("status", ["Canceled", "TimedOut"])
+def test_wait_for_requests_stops_on_failed_requests(transfer_client, mocker, status):
+    check = mocker.patch.object(
+        transfer_client, "check_request_status", return_value=status
+    )
+
+    results = list(
+        transfer_client.wait_for_requests(dataspace="test-space", ids=[1], timeout=60)
+    )
+
+    assert results[0].status == status
+    assert results[0].timed_out is False
+    check.assert_called_once()
+
+
+def test_wait_for_request_custom_schedule(transfer_client, mocker):
+    mocker.patch.object(
+        transfer_client, "check_request_status", return_value="InProcess"
+    )
+
+    timed_out = transfer_client.wait_for_request(
+        dataspace="test-space",
+        id=1,
+        schedule=PollingSchedule(initial_delay=0.01, timeout=0.05),
+    )
+
+    assert timed_out is True
+
+
+def test_check_requests_status_batched(transfer_client, httpx_mock):
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/status/requests",
+        json=[
+            {"requestId": 1, "executionStatus": "Completed"},
+            {"requestId": 2, "executionStatus": "InProcess"},
+            {"requestId": 3, "executionStatus": "Queued"},
+        ],
+    )
+
+    statuses = transfer_client.check_requests_status(
+        dataspace="design",
+        ids=["1", "2"],
+        submitted_after=datetime.datetime(2025, 1, 2, 3, 4, 5),
+    )
+
+    assert statuses == {"1": "Completed", "2": "InProcess"}
+    form = httpx_mock.get_request().content
+    assert b"dataspace=design" in form
+    assert b"submissionStart=02-01-2025+03%3A04%3A05" in form
+
+
+def test_check_requests_status_sends_utc(transfer_client, httpx_mock):
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/status/requests", json=[]
+    )
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/status/request",
+        json={"executionStatus": "Completed"},
+        is_reusable=True,
+    )
+    paris = datetime.timezone(datetime.timedelta(hours=2))
+
+    transfer_client.check_requests_status(
+        dataspace="design",
+        ids=["1", "2"],
+        submitted_after=datetime.datetime(2025, 6, 2, 3, 4, 5, tzinfo=paris),
+    )
+
+    form = httpx_mock.get_requests()[0].content
+    assert b"submissionStart=02-06-2025+01%3A04%3A05" in form
+
+
+def test_import_sdmx_files_lists_requests_submitted_since_start_in_utc(
+    transfer_client, mocker
+):
+    mocker.patch.object(transfer_client, "import_sdmx_file", side_effect=["1", "2"])
+    check = mocker.patch.object(
+        transfer_client,
+        "check_requests_status",
+        side_effect=lambda dataspace, ids, submitted_after: dict.fromkeys(
+            ids, "Completed"
+        ),
+    )
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    list(transfer_client.import_sdmx_files([(b"a", "design"), (b"b", "design")]))
+
+    submitted_after = check.call_args.args[2]
+    assert submitted_after.tzinfo == datetime.timezone.utc
+    assert now - submitted_after < datetime.timedelta(minutes=2)
+
+
+def test_check_requests_status_fallback(transfer_client, httpx_mock):
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/status/requests", status_code=404
+    )
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/status/request",
+        json={"executionStatus": "Completed"},
+        is_reusable=True,
+    )
+
+    assert transfer_client.check_requests_status("design", [1, 2]) == {
+        1: "Completed",
+        2: "Completed",
+    }
+    assert transfer_client.check_requests_status("design", [1, 2]) == {
+        1: "Completed",
+        2: "Completed",
+    }
+    listings = httpx_mock.get_requests(
+        url="https://transfer.example.com/3/status/requests"
+    )
+    assert len(listings) == 1
+
+
+def test_async_check_requests_status(async_transfer_client, httpx_mock):
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/status/requests",
+        json=[{"id": 1, "executionStatus": "Completed"}],
+    )
+    httpx_mock.add_response(
+        url="https://transfer.example.com/3/status/request",
+        json={"executionStatus": "Queued"},
+    )
+
+    statuses = asyncio.run(async_transfer_client.check_requests_status("ds", [1, 2]))
+
+    assert statuses == {1: "Completed", 2: "Queued"}
+
+
+def test_transfer_dataflow_options(transfer_client, httpx_mock):
+    httpx_mock.add_response(
+        method="POST",
+        url="https://transfer.example.com/3/transfer/dataflow",
+        json={"message": "Request ID: 7"},
+    )
+
+    request_id = transfer_client.transfer_dataflow(
+        "staging",
+        "release",
+        "DF",
+        transfer_content=1,
+        target_version=1,
+        pit_release_date=datetime.datetime(2025, 1, 31, 8, 0),
+        validation_type=1,
+    )
+
+    assert request_id == "7"
+    form = dict(urllib.parse.parse_qsl(httpx_mock.get_request().content.decode()))
+    assert form["transferContent"] == "1"
+    assert form["targetVersion"] == "1"
+    assert form["PITReleaseDate"] == "31-01-2025 08:00:00"
+    assert form["destinationDataflow"] == "DF"
+
+
+def test_transfer_dataflows(transfer_client, mocker):
+    transfer_client._batch_status_supported = False
+    submit = mocker.patch.object(
+        transfer_client, "_submit_transfer", side_effect=["1", "2", None]
+    )
+    check = mocker.patch.object(
+        transfer_client, "check_request_status", return_value="Completed"
+    )
+
+    results = list(
+        transfer_client.transfer_dataflows(
+            [
+                ("staging", "release", "DF_A"),
+                TransferJob(
+                    source_dataspace="staging",
+                    destination_dataspace="release",
+                    dataflow="DF_B",
+                ),
+                ("staging", "release", "DF_C", {"source_version": 1}),
+            ],
+            max_workers=1,
+            backoff=0.01,
+        )
+    )
+
+    by_dataflow = {result.job.dataflow: result for result in results}
+    assert by_dataflow["DF_A"].is_completed
+    assert by_dataflow["DF_B"].request_id == "2"
+    assert by_dataflow["DF_C"].error == "Transfer rejected"
+    assert submit.call_args.args[0].source_version == 1
+    assert {call.args for call in check.call_args_list} == {
+        ("release", "1"),
+        ("release", "2"),
+    }
@@ -0,0 +1,522 @@
+import asyncio
+import gzip
+import io
+import sys
+import types
+
+import httpx
+import pytest
+
+from statsuite_lib import AuthClient, KeycloakClient, NSIClient, SFSClient
+from statsuite_lib.config import ConfigClient
+from statsuite_lib.transfer import TransferClient
+from statsuite_lib.transport import (
+    Instrumentation,
+    OpenTelemetryExporter,
+    PrometheusExporter,
+    retry,
+    streaming,
+    transport,
+)
+from statsuite_lib.transport.metrics import RequestRecord
+
+
+@pytest.fixture
+def keycloak_mock(mocker):
+    mock_keycloak = mocker.Mock(spec=KeycloakClient)
+    mock_keycloak.auth_header.return_value = {"Authorization": "Bearer fake-token"}
+    return mock_keycloak
+
+
+RECORD = RequestRecord(
+    method="GET",
+    host="nsi",
+    endpoint="/rest/data/OECD,DF_A",
+    status_code=200,
+    duration=0.25,
+    request_bytes=0,
+    response_bytes=3,
+    retries=1,
+)
+
+
+class FakeInstrument:
+    """Prometheus metric or OpenTelemetry instrument recording its calls.
+
+    Attributes:
+        name: Name of the instrument.
+        kwargs: Keyword arguments of the instrument.
+        calls: Calls of the instrument, in order.
+    """
+
+    def __init__(self, name, *args, **kwargs):
+        """Init the instrument.
+
+        Args:
+            name: Name of the instrument.
+            args: Other positional arguments.
+            kwargs: Keyword arguments, such as the registry.
+        """
+        self.name = name
+        self.kwargs = kwargs
+        self.calls = []
+        registry = kwargs.get("registry")
+        if registry is not None:
+            registry[name] = self
+
+    def labels(self, *labels):
+        """Select the labels of the next measure.
+
+        Args:
+            labels: Values of the labels.
+
+        Returns:
+            The instrument.
+        """
+        self.calls.append(("labels", labels))
+        return self
+
+    def observe(self, value):
+        """Record a histogram value.
+
+        Args:
+            value: The value.
+        """
+        self.calls.append(("observe", value))
+
+    def inc(self, value):
+        """Increment a counter.
+
+        Args:
+            value: The increment.
+        """
+        self.calls.append(("inc", value))
+
+    def record(self, value, attributes):
+        """Record a histogram value.
+
+        Args:
+            value: The value.
+            attributes: Attributes of the measure.
+        """
+        self.calls.append(("record", value, attributes))
+
+    def add(self, value, attributes):
+        """Increment a counter.
+
+        Args:
+            value: The increment.
+            attributes: Attributes of the measure.
+        """
+        self.calls.append(("add", value, attributes))
+
+
+class FakeMeter:
+    """OpenTelemetry meter keeping its instruments by name.
+
+    Attributes:
+        instruments: The instruments by name.
+    """
+
+    def __init__(self):
+        """Init the instruments."""
+        self.instruments = {}
+
+    def create_histogram(self, name, **kwargs):
+        """Create a histogram.
+
+        Args:
+            name: Name of the histogram.
+            kwargs: Options, such as the unit.
+
+        Returns:
+            The histogram.
+        """
+        self.instruments[name] = FakeInstrument(name, **kwargs)
+        return self.instruments[name]
+
+    def create_counter(self, name, **kwargs):
+        """Create a counter.
+
+        Args:
+            name: Name of the counter.
+            kwargs: Options, such as the unit.
+
+        Returns:
+            The counter.
+        """
+        return self.create_histogram(name, **kwargs)
+
+
+@pytest.fixture
+def fake_prometheus(monkeypatch):
+    module = types.ModuleType("prometheus_client")
+    module.REGISTRY = {}
+    module.Counter = FakeInstrument
+    module.Histogram = FakeInstrument
+    monkeypatch.setitem(sys.modules, "prometheus_client", module)
+    return module
+
+
+@pytest.fixture
+def fake_opentelemetry(monkeypatch):
+    meter = FakeMeter()
+    package = types.ModuleType("opentelemetry")
+    package.metrics = types.ModuleType("opentelemetry.metrics")
+    package.metrics.get_meter = lambda name: meter
+    monkeypatch.setitem(sys.modules, "opentelemetry", package)
+    monkeypatch.setitem(sys.modules, "opentelemetry.metrics", package.metrics)
+    return meter
+
+
+@pytest.fixture
+def restore_default_client():
+    previous = transport.get_default_client()
+    yield
+    transport.set_default_client(previous)
+
+
+def test_create_client_limits():
+    client = transport.create_client(max_connections=7, max_keepalive_connections=3)
+    pool = client._transport._pool
+    assert pool._max_connections == 7
+    assert pool._max_keepalive_connections == 3
+
+
+def test_create_client_host_limits():
+    client = transport.create_client(
+        host_limits={
+            "nsi.example.com": httpx.Limits(max_connections=2),
+            "https://transfer.example.com": httpx.Limits(max_connections=4),
+        }
+    )
+    nsi_transport = client._transport_for_url(httpx.URL("https://nsi.example.com/x"))
+    transfer_transport = client._transport_for_url(
+        httpx.URL("https://transfer.example.com/3")
+    )
+    assert nsi_transport._pool._max_connections == 2
+    assert transfer_transport._pool._max_connections == 4
+    assert client._transport_for_url(httpx.URL("https://other")) is client._transport
+
+
+def test_default_client_is_shared(keycloak_mock):
+    sfs = SFSClient(sfs_url="https://foo", sfs_api_key="bar")
+    config = ConfigClient(config_url="https://foo")
+    transfer = TransferClient(transfer_url="https://foo", keycloak_client=keycloak_mock)
+    assert sfs._client is transport.get_default_client()
+    assert config._client is sfs._client
+    assert transfer._client is sfs._client
+
+
+def test_set_default_client(restore_default_client):
+    client = transport.create_client()
+    transport.set_default_client(client)
+    assert transport.get_default_client() is client
+    transport.set_default_client(None)
+    assert transport.get_default_client() is not client
+
+
+def test_injected_client_is_used(keycloak_mock, httpx_mock):
+    client = transport.create_client()
+    httpx_mock.add_response(method="DELETE", url="https://nsi/x", status_code=204)
+
+    nsi = NSIClient(
+        nsi_url="https://nsi", keycloak_client=keycloak_mock, http_client=client
+    )
+    auth = AuthClient(
+        auth_url="https://auth", keycloak_client=keycloak_mock, http_client=client
+    )
+
+    assert nsi._client is client
+    assert auth._client is client
+    assert nsi.delete(path="/x") == 204
+
+
+def test_create_async_client_host_limits():
+    client = transport.create_async_client(
+        max_connections=5,
+        host_limits={"nsi.example.com": httpx.Limits(max_connections=2)},
+    )
+    nsi_transport = client._transport_for_url(httpx.URL("https://nsi.example.com/x"))
+    assert isinstance(client, httpx.AsyncClient)
+    assert client._transport._pool._max_connections == 5
+    assert nsi_transport._pool._max_connections == 2
+
+
+def test_iter_chunks():
+    assert list(streaming.iter_chunks(b"abcde", chunk_size=2)) == [b"ab", b"cd", b"e"]
+    assert list(streaming.iter_chunks("abc", chunk_size=2)) == [b"ab", b"c"]
+    assert list(streaming.iter_chunks(io.BytesIO(b"abc"), chunk_size=2)) == [
+        b"ab",
+        b"c",
+    ]
+
+
+def test_gzip_stream():
+    chunks = streaming.gzip_stream([b"abc"] * 1000)
+    assert gzip.decompress(b"".join(chunks)) == b"abc" * 1000
+
+
+def test_open_upload_path(tmp_path):
+    sdmx_file = tmp_path / "data.csv"
+    sdmx_file.write_bytes(b"a,b\n")
+
+    with streaming.open_upload(sdmx_file) as source:
+        assert streaming.upload_name(source) == "data.csv"
+        assert source.read() == b"a,b\n"
+    assert source.closed
+
+
+def test_open_upload_raw_content():
+    with streaming.open_upload(b"raw") as source:
+        assert source == b"raw"
+        assert streaming.upload_name(source) == "file"
+
+
+def test_upload_content():
+    assert streaming.upload_content(b"raw") == b"raw"
+    chunks = streaming.upload_content(io.BytesIO(b"raw"), chunk_size=2)
+    assert list(chunks) == [b"ra", b"w"]
+    compressed = streaming.upload_content(b"raw", compress=True)
+    assert gzip.decompress(b"".join(compressed)) == b"raw"
+
+
+def test_async_stream():
+    async def collect():
+        """Collect the async stream.
+
+        Returns:
+            The chunks.
+        """
+        return [chunk async for chunk in streaming.async_stream([b"a", b"b"])]
+
+    assert asyncio.run(collect()) == [b"a", b"b"]
+
+
+def fast_policy(**kwargs):
+    """Retry policy without delays.
+
+    Args:
+        kwargs: Policy arguments.
+
+    Returns:
+        The policy.
+    """
+    return retry.RetryPolicy(backoff_factor=0, jitter=0, **kwargs)
+
+
+def test_retry_get_on_503(httpx_mock):
+    policy = fast_policy()
+    client = transport.create_client(retry=policy)
+    httpx_mock.add_response(url="https://nsi/x", status_code=503)
+    httpx_mock.add_response(url="https://nsi/x", status_code=200)
+
+    response = client.get("https://nsi/x")
+
+    assert response.status_code == 200
+    assert response.extensions["retries"] == 1
+    assert policy.stats.snapshot()["retries_by_reason"] == {"503": 1}
+
+
+def test_retry_exhausted(httpx_mock):
+    policy = fast_policy(max_retries=2)
+    client = transport.create_client(retry=policy)
+    httpx_mock.add_response(url="https://nsi/x", status_code=502, is_reusable=True)
+
+    assert client.get("https://nsi/x").status_code == 502
+    assert policy.stats.snapshot() == {
+        "requests": 1,
+        "retries": 2,
+        "retries_by_reason": {"502": 2},
+        "exhausted": 1,
+    }
+
+
+def test_retry_post_only_when_idempotent(httpx_mock):
+    client = transport.create_client(retry=fast_policy())
+    httpx_mock.add_response(url="https://transfer/import", status_code=503)
+    httpx_mock.add_response(url="https://transfer/status", status_code=503)
+    httpx_mock.add_response(url="https://transfer/status", status_code=200)
+
+    assert client.post("https://transfer/import").status_code == 503
+    response = client.post("https://transfer/status", extensions={"idempotent": True})
+    assert response.status_code == 200
+
+
+def test_retry_connect_error_any_method(httpx_mock):
+    client = transport.create_client(retry=fast_policy())
+    httpx_mock.add_exception(httpx.ConnectError("refused"))
+    httpx_mock.add_response(url="https://transfer/import", status_code=200)
+
+    assert client.post("https://transfer/import", data={"a": 1}).status_code == 200
+
+
+def test_retry_disabled_per_request(httpx_mock):
+    client = transport.create_client(retry=fast_policy())
+    httpx_mock.add_response(url="https://nsi/x", status_code=503)
+
+    response = client.get("https://nsi/x", extensions={"retry": None})
+    assert response.status_code == 503
+
+
+def test_retry_after(httpx_mock, mocker):
+    sleep = mocker.patch.object(retry.time, "sleep")
+    client = transport.create_client(retry=fast_policy(max_retry_after=10))
+    httpx_mock.add_response(
+        url="https://nsi/x", status_code=429, headers={"Retry-After": "7"}
+    )
+    httpx_mock.add_response(
+        url="https://nsi/x", status_code=429, headers={"Retry-After": "60"}
+    )
+
+    assert client.get("https://nsi/x").status_code == 429
+    sleep.assert_called_once_with(7.0)
+
+
+def test_async_retry(httpx_mock):
+    client = transport.create_async_client(retry=fast_policy())
+    httpx_mock.add_response(url="https://nsi/x", status_code=504)
+    httpx_mock.add_response(url="https://nsi/x", status_code=200)
+
+    response = asyncio.run(client.get("https://nsi/x"))
+    assert response.extensions["retries"] == 1
+
+
+def test_instrumentation_records_requests(httpx_mock):
+    records = []
+    metrics = Instrumentation(exporters=[records.append])
+    client = transport.create_client(retry=fast_policy(), instrumentation=metrics)
+    url = "https://nsi/rest/data/OECD,DF_A/all"
+    httpx_mock.add_response(url=url, status_code=503)
+    httpx_mock.add_response(url=url, content=b"abc")
+    httpx_mock.add_response(url="https://nsi/1.1/requests/42", status_code=404)
+
+    client.get(url)
+    client.post("https://nsi/1.1/requests/42", content=b"hello")
+
+    snapshot = metrics.snapshot()
+    data = snapshot["GET nsi/rest/data/OECD,DF_A"]
+    assert data["count"] == 1
+    assert data["retries"] == 1
+    assert data["response_bytes"] == 3
+    assert data["statuses"] == {200: 1}
+    errors = snapshot["POST nsi/1.1/requests/{id}"]
+    assert errors["errors"] == 1
+    assert errors["request_bytes"] == 5
+    assert len(records) == 2
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_instrumentation_streamed_response(httpx_mock):
+    metrics = Instrumentation()
+    client = transport.create_client(instrumentation=metrics)
+    httpx_mock.add_response(url="https://nsi/x", content=b"0123456789")
+
+    with client.stream("GET", "https://nsi/x") as response:
+        next(response.iter_raw(4))
+        assert metrics.snapshot() == {}
+
+    assert metrics.snapshot()["GET nsi/x"]["count"] == 1
+
+
+def test_async_instrumentation(httpx_mock):
+    metrics = Instrumentation()
+    client = metrics.instrument(httpx.AsyncClient())
+    httpx_mock.add_response(url="https://nsi/x", content=b"abc")
+
+    asyncio.run(client.get("https://nsi/x"))
+
+    assert metrics.snapshot()["GET nsi/x"]["response_bytes"] == 3
+
+
+def test_prometheus_exporter(fake_prometheus):
+    registry = {}
+    exporter = PrometheusExporter(registry=registry, buckets=(0.1, 1.0))
+
+    exporter(RECORD)
+
+    labels = ("labels", ("GET", "nsi", "/rest/data/OECD,DF_A", 200))
+    duration = registry["http_client_request_duration_seconds"]
+    assert duration.kwargs["buckets"] == (0.1, 1.0)
+    assert duration.kwargs["namespace"] == "statsuite"
+    assert duration.calls == [labels, ("observe", 0.25)]
+    assert registry["http_client_request_bytes"].calls == [labels, ("inc", 0)]
+    assert registry["http_client_response_bytes"].calls == [labels, ("inc", 3)]
+    assert registry["http_client_retries"].calls == [labels, ("inc", 1)]
+    PrometheusExporter()
+    assert "http_client_retries" in fake_prometheus.REGISTRY
+
+
+def test_opentelemetry_exporter(fake_opentelemetry):
+    exporter = OpenTelemetryExporter()
+
+    exporter(RECORD)
+
+    attributes = {
+        "http.request.method": "GET",
+        "server.address": "nsi",
+        "url.template": "/rest/data/OECD,DF_A",
+        "http.response.status_code": 200,
+    }
+    instruments = fake_opentelemetry.instruments
+    duration = instruments["http.client.request.duration"]
+    assert duration.kwargs == {"unit": "s"}
+    assert duration.calls == [("record", 0.25, attributes)]
+    assert instruments["http.client.request.body.size"].calls == [
+        ("add", 0, attributes)
+    ]
+    assert instruments["http.client.response.body.size"].calls == [
+        ("add", 3, attributes)
+    ]
+    assert instruments["http.client.retries"].calls == [("add", 1, attributes)]
+
+
+def test_instrumentation_sends_records_to_exporters(fake_opentelemetry, httpx_mock):
+    metrics = Instrumentation(exporters=[OpenTelemetryExporter()])
+    client = transport.create_client(instrumentation=metrics)
+    httpx_mock.add_response(url="https://nsi/x", content=b"abc")
+
+    client.get("https://nsi/x")
+
+    retries = fake_opentelemetry.instruments["http.client.retries"]
+    assert retries.calls[0][2]["url.template"] == "/x"
+
+
+def test_prometheus_exporter_with_prometheus_client():
+    prometheus_client = pytest.importorskip("prometheus_client")
+    registry = prometheus_client.CollectorRegistry()
+
+    PrometheusExporter(registry=registry)(RECORD)
+
+    labels = {
+        "method": "GET",
+        "host": "nsi",
+        "endpoint": "/rest/data/OECD,DF_A",
+        "status": "200",
+    }
+    sample = registry.get_sample_value
+    assert sample("statsuite_http_client_request_duration_seconds_sum", labels) == 0.25
+    assert sample("statsuite_http_client_response_bytes_total", labels) == 3
+    assert sample("statsuite_http_client_retries_total", labels) == 1
+
+
+def test_opentelemetry_exporter_with_opentelemetry_api():
+    metrics = pytest.importorskip("opentelemetry.metrics")
+
+    OpenTelemetryExporter(metrics.NoOpMeter("statsuite_lib"))(RECORD)
+
+
+@pytest.mark.parametrize(
+    "exporter, module, extra",
+    [
+        (PrometheusExporter, "prometheus_client", "prometheus"),
+        (OpenTelemetryExporter, "opentelemetry.metrics", "otel"),
+    ],
+)
+def test_exporters_name_their_extra(monkeypatch, exporter, module, extra):
+    monkeypatch.setitem(sys.modules, module, None)
+
+    with pytest.raises(ImportError, match=rf"statsuite-lib\[{extra}\]"):
+        exporter()